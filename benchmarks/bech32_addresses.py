@@ -0,0 +1,216 @@
+"""Benchmark bech32 encoding and decoding of addresses, against the previous bit by bit implementation.
+
+A corpus of random Shelley addresses (base, pointer, enterprise and stake, of keys and scripts, on mainnet and
+testnet) is encoded and decoded:
+
+* ``bech32``: :func:`pycardano.crypto.bech32.encode` and :func:`pycardano.crypto.bech32.decode` alone.
+* ``Address``: ``Address.encode`` and ``Address.from_primitive`` of each address.
+* ``Address many``: ``Address.encode_many`` and ``Address.decode_many`` of all addresses.
+
+The ``reference`` rows use the previous implementation, copied below: its checksum loops over the 5 bits of each
+character, ``convertbits`` builds lists bit group by bit group, and ``encode`` decodes its result again to verify
+it. For the ``Address`` rows, it is patched into :mod:`pycardano.address`. ``--distinct`` sets the number of
+distinct addresses, which ``Address.decode_many`` only decodes once each.
+
+Usage::
+
+    python benchmarks/bech32_addresses.py [--addresses N] [--distinct N] [--repeat N]
+"""
+
+import argparse
+import contextlib
+import random
+import time
+from unittest import mock
+
+import pycardano.address
+from pycardano import Address, Network, PointerAddress, ScriptHash, VerificationKeyHash
+from pycardano.crypto.bech32 import decode, encode
+
+_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+
+
+def _reference_polymod(values):
+    generator = [0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3]
+    chk = 1
+    for value in values:
+        top = chk >> 25
+        chk = (chk & 0x1FFFFFF) << 5 ^ value
+        for i in range(5):
+            chk ^= generator[i] if ((top >> i) & 1) else 0
+    return chk
+
+
+def _reference_hrp_expand(hrp):
+    return [ord(x) >> 5 for x in hrp] + [0] + [ord(x) & 31 for x in hrp]
+
+
+def _reference_bech32_decode(bech):
+    if (any(ord(x) < 33 or ord(x) > 126 for x in bech)) or (
+        bech.lower() != bech and bech.upper() != bech
+    ):
+        return (None, None)
+    bech = bech.lower()
+    pos = bech.rfind("1")
+    if pos < 1 or pos + 7 > len(bech) or len(bech) > 108:
+        return (None, None)
+    if not all(x in _CHARSET for x in bech[pos + 1 :]):
+        return (None, None)
+    hrp = bech[:pos]
+    data = [_CHARSET.find(x) for x in bech[pos + 1 :]]
+    if _reference_polymod(_reference_hrp_expand(hrp) + data) != 1:
+        return (None, None)
+    return (hrp, data[:-6])
+
+
+def _reference_convertbits(data, frombits, tobits, pad=True):
+    acc = 0
+    bits = 0
+    ret = []
+    maxv = (1 << tobits) - 1
+    max_acc = (1 << (frombits + tobits - 1)) - 1
+    for value in data:
+        if value < 0 or (value >> frombits):
+            return None
+        acc = ((acc << frombits) | value) & max_acc
+        bits += frombits
+        while bits >= tobits:
+            bits -= tobits
+            ret.append((acc >> bits) & maxv)
+    if pad:
+        if bits:
+            ret.append((acc << (tobits - bits)) & maxv)
+    elif bits >= frombits or ((acc << (tobits - bits)) & maxv):
+        return None
+    return ret
+
+
+def reference_decode(addr):
+    _, data = _reference_bech32_decode(addr)
+    decoded = _reference_convertbits(data, 5, 8, False)
+    if decoded is None or len(decoded) < 2 or len(decoded) > 108:
+        return None
+    return decoded
+
+
+def reference_encode(hrp, witprog):
+    data = _reference_convertbits(witprog, 8, 5)
+    values = _reference_hrp_expand(hrp) + data
+    polymod = _reference_polymod(values + [0, 0, 0, 0, 0, 0]) ^ 1
+    checksum = [(polymod >> 5 * (5 - i)) & 31 for i in range(6)]
+    ret = hrp + "1" + "".join([_CHARSET[d] for d in data + checksum])
+    if _reference_bech32_decode(ret) == (None, None):
+        return None
+    return ret
+
+
+def random_address(rnd):
+    def part(kind):
+        return kind(rnd.randbytes(28))
+
+    network = rnd.choice([Network.MAINNET, Network.TESTNET])
+    payment = part(rnd.choice([VerificationKeyHash, ScriptHash]))
+    staking = part(rnd.choice([VerificationKeyHash, ScriptHash]))
+    shape = rnd.random()
+    if shape < 0.7:
+        return Address(payment, staking, network)
+    if shape < 0.8:
+        pointer = PointerAddress(rnd.randrange(2**27), rnd.randrange(64), 0)
+        return Address(payment, pointer, network)
+    if shape < 0.95:
+        return Address(payment, None, network)
+    return Address(None, staking, network)
+
+
+def timed(function, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--addresses", type=int, default=10000)
+    parser.add_argument("--distinct", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    distinct = [random_address(rnd) for _ in range(args.distinct or args.addresses)]
+    addresses = [distinct[i % len(distinct)] for i in range(args.addresses)]
+    rnd.shuffle(addresses)
+    encoded = [str(address) for address in addresses]
+    payloads = [(address.hrp, bytes(address)) for address in addresses]
+
+    assert [reference_encode(hrp, data) for hrp, data in payloads] == encoded
+    assert [encode(hrp, data) for hrp, data in payloads] == encoded
+    assert [bytes(reference_decode(s)) for s in encoded] == [
+        data for _, data in payloads
+    ]
+    assert Address.decode_many(encoded) == addresses
+
+    def patched():
+        stack = contextlib.ExitStack()
+        stack.enter_context(
+            mock.patch.object(pycardano.address, "encode", reference_encode)
+        )
+        stack.enter_context(
+            mock.patch.object(pycardano.address, "decode", reference_decode)
+        )
+        return stack
+
+    rows = [
+        (
+            "bech32",
+            "reference",
+            lambda: [reference_encode(hrp, data) for hrp, data in payloads],
+            lambda: [reference_decode(s) for s in encoded],
+        ),
+        (
+            "bech32",
+            "table",
+            lambda: [encode(hrp, data) for hrp, data in payloads],
+            lambda: [decode(s) for s in encoded],
+        ),
+    ]
+    for impl in ("reference", "table"):
+        rows.append(
+            (
+                "Address",
+                impl,
+                lambda: [address.encode() for address in addresses],
+                lambda: [Address.from_primitive(s) for s in encoded],
+            )
+        )
+    rows.append(
+        (
+            "Address many",
+            "table",
+            lambda: Address.encode_many(addresses),
+            lambda: Address.decode_many(encoded),
+        )
+    )
+
+    print(
+        f"{'api':<13} {'impl':<10} {'encode (s)':>10} {'decode (s)':>10} "
+        f"{'encode/s':>10} {'decode/s':>10}"
+    )
+    for api, impl, encode_all, decode_all in rows:
+        with (
+            patched()
+            if api == "Address" and impl == "reference"
+            else (contextlib.nullcontext())
+        ):
+            encode_time = timed(encode_all, args.repeat)
+            decode_time = timed(decode_all, args.repeat)
+        print(
+            f"{api:<13} {impl:<10} {encode_time:>10.3f} {decode_time:>10.3f} "
+            f"{args.addresses / encode_time:>10.0f} {args.addresses / decode_time:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
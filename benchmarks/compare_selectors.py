@@ -0,0 +1,156 @@
+"""Compare UTxO selectors by the transactions ``TransactionBuilder`` builds with them from synthetic wallets.
+
+Each wallet pays a series of random amounts to another address. For every selector, the average fee, number of
+inputs, number of outputs, change lovelace and build time are reported, along with the number of payments the
+selector failed to build, because no selection was found or the transaction was too large.
+
+Wallets:
+
+* ``retail``: a few hundred ADA-only UTxOs of 1 to 500 ADA.
+* ``exchange``: many ADA-only UTxOs of 1 to 100,000 ADA.
+* ``tokens``: ADA-only UTxOs and UTxOs holding one of a few tokens, paying ADA and tokens.
+
+Usage::
+
+    python benchmarks/compare_selectors.py [--payments N] [--seed N]
+
+Protocol parameters are those of the test suite's ``FixedChainContext``, run from the repository root.
+"""
+
+import argparse
+import logging
+import random
+import time
+from test.pycardano.util import FixedChainContext
+
+from pycardano import (
+    Address,
+    Asset,
+    AssetName,
+    BranchAndBoundSelector,
+    LargestFirstSelector,
+    MultiAsset,
+    Network,
+    RandomImproveMultiAsset,
+    TransactionBuilder,
+    TransactionInput,
+    TransactionOutput,
+    UTxO,
+    Value,
+    VerificationKeyHash,
+)
+from pycardano.exception import InvalidTransactionException, UTxOSelectionException
+from pycardano.hash import ScriptHash, TransactionId
+from pycardano.logging import logger
+
+WALLET = Address(VerificationKeyHash(b"1" * 28), network=Network.TESTNET)
+RECEIVER = Address(VerificationKeyHash(b"2" * 28), network=Network.TESTNET)
+POLICY = ScriptHash(b"3" * 28)
+TOKENS = [AssetName(f"token{i}".encode()) for i in range(5)]
+
+
+class WalletContext(FixedChainContext):
+    def __init__(self, utxos):
+        self.wallet_utxos = utxos
+
+    def _utxos(self, address):
+        return self.wallet_utxos
+
+
+def ada_utxo(i, lovelace, multi_asset=None):
+    return UTxO(
+        TransactionInput(TransactionId(i.to_bytes(32, "big")), i % 4),
+        TransactionOutput(WALLET, Value(lovelace, multi_asset or MultiAsset())),
+    )
+
+
+def retail(rng):
+    utxos = [ada_utxo(i, rng.randint(1, 500) * 1_000_000) for i in range(300)]
+    payments = lambda: Value(rng.randint(1, 200) * 1_000_000)  # noqa: E731
+    return utxos, payments
+
+
+def exchange(rng):
+    utxos = [
+        ada_utxo(i, int(10 ** rng.uniform(6, 11)) // 1000 * 1000) for i in range(20_000)
+    ]
+    payments = lambda: Value(int(10 ** rng.uniform(7, 10)))  # noqa: E731
+    return utxos, payments
+
+
+def tokens(rng):
+    utxos = []
+    for i in range(2_000):
+        if i % 10 == 0:
+            token = TOKENS[i // 10 % len(TOKENS)]
+            multi_asset = MultiAsset({POLICY: Asset({token: rng.randint(1, 1_000)})})
+            utxos.append(ada_utxo(i, 1_500_000, multi_asset))
+        else:
+            utxos.append(ada_utxo(i, rng.randint(1, 1_000) * 1_000_000))
+
+    def payments():
+        token = rng.choice(TOKENS)
+        return Value(
+            rng.randint(2, 100) * 1_000_000,
+            MultiAsset({POLICY: Asset({token: rng.randint(1, 1_500)})}),
+        )
+
+    return utxos, payments
+
+
+def build(context, selector, amount):
+    builder = TransactionBuilder(context, utxo_selectors=[selector])
+    builder.add_input_address(WALLET)
+    builder.add_output(TransactionOutput(RECEIVER, amount))
+    return builder.build(change_address=WALLET)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--payments", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    # Failed builds log the whole builder state
+    logger.setLevel(logging.ERROR)
+
+    selectors = {
+        "random improve": lambda: RandomImproveMultiAsset(),
+        "largest first": lambda: LargestFirstSelector(),
+        "branch and bound": lambda: BranchAndBoundSelector(fallbacks=[]),
+    }
+    for wallet_name, wallet in (
+        ("retail", retail),
+        ("exchange", exchange),
+        ("tokens", tokens),
+    ):
+        utxos, payments = wallet(random.Random(args.seed))
+        amounts = [payments() for _ in range(args.payments)]
+        context = WalletContext(utxos)
+        print(f"{wallet_name} ({len(utxos)} UTxOs, {args.payments} payments):")
+        for selector_name, selector in selectors.items():
+            random.seed(args.seed)
+            fee = inputs = outputs = change = seconds = 0.0
+            failed = 0
+            for amount in amounts:
+                start = time.perf_counter()
+                try:
+                    body = build(context, selector(), amount)
+                except (UTxOSelectionException, InvalidTransactionException):
+                    failed += 1
+                    continue
+                finally:
+                    seconds += time.perf_counter() - start
+                fee += body.fee
+                inputs += len(body.inputs)
+                outputs += len(body.outputs)
+                change += sum(o.lovelace for o in body.outputs if o.address == WALLET)
+            built = max(args.payments - failed, 1)
+            print(
+                f"  {selector_name:>16}: fee {fee / built:,.0f}, inputs {inputs / built:.1f}, "
+                f"outputs {outputs / built:.1f}, change {change / built / 1e6:,.1f} ADA, "
+                f"{seconds * 1e3 / args.payments:.1f} ms/tx, {failed} failed"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark ``Transaction.from_cbor`` with the C extension and the pure Python implementation of cbor2.
+
+Both the CBOR decoding step alone (:func:`pycardano.serialization.decode_cbor`) and the full ``from_cbor``,
+which also restores the typed objects from the decoded primitives, are timed. Getting the transaction id is timed
+for both ``Transaction`` and ``LazyTransaction``, which only decodes the fields that are accessed.
+
+Usage::
+
+    python benchmarks/decode_transactions.py [--corpus FILE ...] [--repeat N]
+
+The corpus is made of text files with one transaction CBOR hex per line, lines starting with ``#`` are ignored.
+By default, the transactions captured from mainnet and the ones written by ``generate_transactions.py`` are used.
+Each implementation runs in its own interpreter, the pure Python one is selected by making ``_cbor2`` (the C
+extension) unimportable before cbor2 is imported.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+DEFAULT_CORPUS = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", name)
+    for name in ("mainnet_transactions.txt", "generated_transactions.txt")
+]
+
+
+def load_corpus(paths):
+    corpus = []
+    for path in paths:
+        with open(path) as f:
+            corpus.extend(
+                bytes.fromhex(line.strip())
+                for line in f
+                if line.strip() and not line.startswith("#")
+            )
+    return corpus
+
+
+def run(corpus_paths, repeat):
+    import cbor2
+
+    from pycardano import LazyTransaction, Transaction
+    from pycardano.serialization import decode_cbor
+
+    corpus = load_corpus(corpus_paths)
+    for payload in corpus:
+        Transaction.from_cbor(payload)
+
+    timings = {}
+    for name, func in (
+        ("decode", decode_cbor),
+        ("from_cbor", Transaction.from_cbor),
+        ("id", lambda payload: Transaction.from_cbor(payload).id),
+        ("lazy id", lambda payload: LazyTransaction.from_cbor(payload).id),
+    ):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for payload in corpus:
+                func(payload)
+        timings[name] = time.perf_counter() - start
+
+    return {
+        "implementation": (
+            "C extension" if cbor2.loads.__module__ == "_cbor2" else "pure Python"
+        ),
+        "transactions": len(corpus) * repeat,
+        "bytes": sum(len(p) for p in corpus) * repeat,
+        "seconds": timings,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", nargs="+", default=DEFAULT_CORPUS)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--pure", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        if args.pure:
+            sys.modules["_cbor2"] = None  # type: ignore
+        print(json.dumps(run(args.corpus, args.repeat)))
+        return
+
+    results = []
+    for pure in (False, True):
+        cmd = [
+            sys.executable,
+            __file__,
+            "--single",
+            "--corpus",
+            *args.corpus,
+            "--repeat",
+            str(args.repeat),
+        ]
+        if pure:
+            cmd.append("--pure")
+        output = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        results.append(json.loads(output.stdout))
+
+    for step in results[0]["seconds"]:
+        print(f"{step}:")
+        for r in results:
+            seconds = r["seconds"][step]
+            print(
+                f"  {r['implementation']:>12}: {r['transactions']} txs, "
+                f"{seconds * 1e6 / r['transactions']:.1f} us/tx, "
+                f"{r['bytes'] / seconds / 1e6:.2f} MB/s"
+            )
+        speedup = results[1]["seconds"][step] / results[0]["seconds"][step]
+        print(f"  {'speedup':>12}: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Benchmark ``Transaction.to_cbor`` with and without validation.
+
+Typical transactions are read from a corpus of mainnet-shaped transactions, a large one is generated with many inputs,
+outputs and native assets. For each, the time of :meth:`validate` alone, ``to_cbor()`` and
+``to_cbor(validate=False)`` is reported.
+
+Usage::
+
+    python benchmarks/encode_transactions.py [--corpus FILE ...] [--repeat N]
+
+The corpus is made of text files with one transaction CBOR hex per line, lines starting with ``#`` are ignored.
+By default, the transactions captured from mainnet and the ones written by ``generate_transactions.py`` are used.
+"""
+
+import argparse
+import os
+import time
+
+from pycardano import (
+    Address,
+    MultiAsset,
+    Network,
+    Transaction,
+    TransactionBody,
+    TransactionInput,
+    TransactionOutput,
+    TransactionWitnessSet,
+    Value,
+    VerificationKeyHash,
+    VerificationKeyWitness,
+)
+from pycardano.hash import TransactionId
+from pycardano.key import PaymentVerificationKey
+from pycardano.serialization import NonEmptyOrderedSet, OrderedSet
+
+DEFAULT_CORPUS = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", name)
+    for name in ("mainnet_transactions.txt", "generated_transactions.txt")
+]
+
+
+def load_corpus(paths):
+    corpus = []
+    for path in paths:
+        with open(path) as f:
+            corpus.extend(
+                Transaction.from_cbor(line.strip())
+                for line in f
+                if line.strip() and not line.startswith("#")
+            )
+    return corpus
+
+
+def large_transaction(n_inputs=100, n_outputs=100, n_assets=20):
+    address = Address(VerificationKeyHash(b"1" * 28), network=Network.MAINNET)
+    multi_asset = MultiAsset.from_primitive(
+        {
+            bytes([i]) * 28: {f"token{j}".encode(): j + 1 for j in range(n_assets)}
+            for i in range(3)
+        }
+    )
+    body = TransactionBody(
+        inputs=OrderedSet(
+            [
+                TransactionInput(TransactionId(bytes([i % 256]) * 32), i)
+                for i in range(n_inputs)
+            ]
+        ),
+        outputs=[
+            TransactionOutput(address, Value(2_000_000 + i, multi_asset))
+            for i in range(n_outputs)
+        ],
+        fee=200_000,
+    )
+    witness_set = TransactionWitnessSet(
+        vkey_witnesses=NonEmptyOrderedSet(
+            [
+                VerificationKeyWitness(
+                    PaymentVerificationKey(bytes([i]) * 32), bytes([i]) * 64
+                )
+                for i in range(10)
+            ]
+        )
+    )
+    return Transaction(body, witness_set)
+
+
+def timeit(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def report(name, txs, repeat):
+    print(f"{name} ({len(txs)} txs, {sum(len(tx.to_cbor()) for tx in txs)} bytes):")
+    timings = {}
+    for step, func in (
+        ("validate()", lambda tx: tx.validate()),
+        ("to_cbor()", lambda tx: tx.to_cbor()),
+        ("to_cbor(validate=False)", lambda tx: tx.to_cbor(validate=False)),
+    ):
+        timings[step] = sum(timeit(lambda: func(tx), repeat) for tx in txs) / len(txs)
+        print(f"  {step:>24}: {timings[step] * 1e6:.1f} us/tx")
+    saving = 1 - timings["to_cbor(validate=False)"] / timings["to_cbor()"]
+    print(f"  {'saving':>24}: {saving:.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", nargs="+", default=DEFAULT_CORPUS)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    report("typical", load_corpus(args.corpus), args.repeat)
+    report("large", [large_transaction()], max(args.repeat // 10, 1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""Generate a corpus of Babbage and Conway era transactions for the transaction benchmarks.
+
+The transactions are built with pycardano from a seeded random generator, so the corpus is reproducible. They are
+shaped after the traffic of mainnet, a corpus captured from the chain is in ``data/mainnet_transactions.txt``:
+
+* ``payment``: ADA transfers between base addresses, some with a CIP-20 message.
+* ``multi-asset``: transfers of native assets of several policies.
+* ``plutus``: Plutus V2 and V3 script spends, with redeemers, datums in the witness set and inline datums, the
+  script being a reference script. Collateral return, reference inputs and required signers are set.
+* ``reference script``: outputs deploying a Plutus V3 reference script, with an inline datum.
+* ``mint``: native script mints, with CIP-25 metadata.
+* ``governance``: Conway certificates (registration and vote delegation), withdrawals, votes and donations.
+
+Keys, hashes and signatures are random bytes, scripts are random bytes of realistic sizes: the transactions decode
+and encode like the real ones, but are not valid on chain.
+
+Usage::
+
+    python benchmarks/generate_transactions.py [--count N] [--seed N] [--output FILE]
+"""
+
+import argparse
+import os
+import random
+
+from cbor2 import CBORTag
+
+from pycardano import (
+    Address,
+    AlonzoMetadata,
+    AuxiliaryData,
+    ExecutionUnits,
+    Metadata,
+    MultiAsset,
+    Network,
+    PlutusV2Script,
+    PlutusV3Script,
+    RawPlutusData,
+    Redeemer,
+    RedeemerTag,
+    ScriptAll,
+    ScriptHash,
+    ScriptPubkey,
+    Transaction,
+    TransactionBody,
+    TransactionInput,
+    TransactionOutput,
+    TransactionWitnessSet,
+    Value,
+    VerificationKeyHash,
+    VerificationKeyWitness,
+    Withdrawals,
+)
+from pycardano.certificate import (
+    DRep,
+    DRepKind,
+    PoolKeyHash,
+    StakeAndVoteDelegation,
+    StakeCredential,
+    StakeRegistrationConway,
+    VoteDelegation,
+)
+from pycardano.governance import (
+    GovActionId,
+    GovActionIdToVotingProcedure,
+    Vote,
+    Voter,
+    VoterType,
+    VotingProcedure,
+    VotingProcedures,
+)
+from pycardano.hash import AuxiliaryDataHash, ScriptDataHash, TransactionId
+from pycardano.key import PaymentVerificationKey
+from pycardano.nativescript import InvalidHereAfter
+from pycardano.plutus import RedeemerKey, RedeemerMap, RedeemerValue
+from pycardano.serialization import NonEmptyOrderedSet
+
+DEFAULT_OUTPUT = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "generated_transactions.txt"
+)
+
+SHAPES = (
+    "payment",
+    "multi-asset",
+    "plutus",
+    "reference script",
+    "mint",
+    "governance",
+)
+
+
+class Generator:
+    def __init__(self, seed):
+        self.rnd = random.Random(seed)
+        # Policies and scripts are shared between transactions, like popular tokens and dApps are
+        self.policies = [ScriptHash(self.rnd.randbytes(28)) for _ in range(12)]
+        self.script_addresses = [
+            Address(
+                ScriptHash(self.rnd.randbytes(28)), self.key_hash(), Network.MAINNET
+            )
+            for _ in range(4)
+        ]
+
+    def key_hash(self):
+        return VerificationKeyHash(self.rnd.randbytes(28))
+
+    def address(self):
+        return Address(self.key_hash(), self.key_hash(), Network.MAINNET)
+
+    def inputs(self, count):
+        return [
+            TransactionInput(
+                TransactionId(self.rnd.randbytes(32)), self.rnd.randrange(8)
+            )
+            for _ in range(count)
+        ]
+
+    def coin(self, low=1_000_000, high=500_000_000):
+        return self.rnd.randrange(low, high)
+
+    def multi_asset(self, policies, assets):
+        return MultiAsset.from_primitive(
+            {
+                bytes(policy): {
+                    self.asset_name(): self.rnd.choice(
+                        [1, self.rnd.randrange(1, 10**12)]
+                    )
+                    for _ in range(self.rnd.randint(1, assets))
+                }
+                for policy in self.rnd.sample(self.policies, policies)
+            }
+        )
+
+    def asset_name(self):
+        if self.rnd.random() < 0.5:
+            return f"Token{self.rnd.randrange(10000)}".encode()
+        # CIP-68 reference and user token labels
+        return self.rnd.choice([b"\x00\x06\x43\xb0", b"\x00\x0d\xe1\x40"]) + (
+            self.rnd.randbytes(self.rnd.randint(4, 28))
+        )
+
+    def datum(self, depth=3):
+        fields = []
+        for _ in range(self.rnd.randint(1, 5)):
+            kind = self.rnd.random()
+            if depth and kind < 0.3:
+                fields.append(self.datum(depth - 1))
+            elif kind < 0.6:
+                fields.append(self.rnd.randbytes(self.rnd.choice([28, 32])))
+            else:
+                fields.append(self.rnd.randrange(10**12))
+        return CBORTag(121 + self.rnd.randrange(3), fields)
+
+    def witnesses(self, count):
+        return NonEmptyOrderedSet(
+            [
+                VerificationKeyWitness(
+                    PaymentVerificationKey(self.rnd.randbytes(32)),
+                    self.rnd.randbytes(64),
+                )
+                for _ in range(count)
+            ]
+        )
+
+    def metadata(self, label, value):
+        return AuxiliaryData(AlonzoMetadata(metadata=Metadata({label: value})))
+
+    def message(self):
+        return self.metadata(
+            674, {"msg": [f"Order {self.rnd.randrange(10**8)}", "Thank you!"]}
+        )
+
+    def transaction(self, shape):
+        body = TransactionBody(
+            inputs=NonEmptyOrderedSet(self.inputs(self.rnd.randint(1, 4))),
+            outputs=[
+                TransactionOutput(self.address(), self.coin(), post_alonzo=True),
+                TransactionOutput(self.address(), self.coin(), post_alonzo=True),
+            ],
+            fee=self.rnd.randrange(160_000, 400_000),
+            ttl=self.rnd.randrange(140_000_000, 150_000_000),
+        )
+        witness_set = TransactionWitnessSet(vkey_witnesses=self.witnesses(1))
+        auxiliary_data = None
+
+        if shape == "payment":
+            if self.rnd.random() < 0.3:
+                auxiliary_data = self.message()
+        elif shape == "multi-asset":
+            for output in body.outputs:
+                output.amount = Value(
+                    self.coin(1_200_000, 5_000_000),
+                    self.multi_asset(self.rnd.randint(1, 6), 8),
+                )
+        elif shape == "plutus":
+            self.plutus(body, witness_set)
+        elif shape == "reference script":
+            script = PlutusV3Script(
+                self.rnd.randbytes(self.rnd.randrange(1_000, 8_000))
+            )
+            body.outputs.insert(
+                0,
+                TransactionOutput(
+                    self.rnd.choice(self.script_addresses),
+                    self.coin(10_000_000, 40_000_000),
+                    datum=RawPlutusData(self.datum()),
+                    script=script,
+                ),
+            )
+        elif shape == "mint":
+            self.mint(body, witness_set)
+            auxiliary_data = self.metadata(
+                721,
+                {
+                    bytes(policy).hex(): {
+                        name.payload.decode("latin-1"): {
+                            "name": f"Collectible #{self.rnd.randrange(10000)}",
+                            "image": f"ipfs://Qm{self.rnd.randbytes(22).hex()}",
+                            "mediaType": "image/png",
+                        }
+                        for name in assets
+                    }
+                    for policy, assets in body.mint.items()
+                },
+            )
+        else:
+            self.governance(body, witness_set)
+
+        if auxiliary_data is not None:
+            body.auxiliary_data_hash = AuxiliaryDataHash(self.rnd.randbytes(32))
+        return Transaction(body, witness_set, auxiliary_data=auxiliary_data)
+
+    def plutus(self, body, witness_set):
+        conway = self.rnd.random() < 0.5
+        script_inputs = self.inputs(self.rnd.randint(1, 3))
+        body.inputs = NonEmptyOrderedSet(list(body.inputs) + script_inputs)
+        body.outputs.insert(
+            0,
+            TransactionOutput(
+                self.rnd.choice(self.script_addresses),
+                Value(self.coin(2_000_000, 50_000_000), self.multi_asset(2, 3)),
+                datum=RawPlutusData(self.datum()),
+                post_alonzo=True,
+            ),
+        )
+        body.validity_start = body.ttl - 1_000
+        body.collateral = NonEmptyOrderedSet(self.inputs(1))
+        body.collateral_return = TransactionOutput(
+            body.outputs[-1].address, self.coin(), post_alonzo=True
+        )
+        body.total_collateral = body.fee * 3 // 2
+        body.reference_inputs = NonEmptyOrderedSet(self.inputs(self.rnd.randint(1, 3)))
+        body.required_signers = NonEmptyOrderedSet([self.key_hash()])
+        body.script_data_hash = ScriptDataHash(self.rnd.randbytes(32))
+
+        ex_units = [
+            ExecutionUnits(
+                self.rnd.randrange(100_000, 4_000_000),
+                self.rnd.randrange(50_000_000, 1_500_000_000),
+            )
+            for _ in script_inputs
+        ]
+        data = [RawPlutusData(self.datum(1)) for _ in script_inputs]
+        if conway:
+            witness_set.redeemer = RedeemerMap(
+                {
+                    RedeemerKey(RedeemerTag.SPEND, i): RedeemerValue(d, units)
+                    for i, (d, units) in enumerate(zip(data, ex_units))
+                }
+            )
+        else:
+            redeemers = []
+            for i, (d, units) in enumerate(zip(data, ex_units)):
+                redeemer = Redeemer(d, units)
+                redeemer.tag = RedeemerTag.SPEND
+                redeemer.index = i
+                redeemers.append(redeemer)
+            witness_set.redeemer = redeemers
+        if self.rnd.random() < 0.5:
+            witness_set.plutus_data = NonEmptyOrderedSet(
+                [RawPlutusData(self.datum()) for _ in script_inputs]
+            )
+        if self.rnd.random() < 0.2:
+            # Some dApps still attach their scripts instead of referencing them
+            witness_set.plutus_v2_script = NonEmptyOrderedSet(
+                [PlutusV2Script(self.rnd.randbytes(self.rnd.randrange(2_000, 6_000)))]
+            )
+        witness_set.vkey_witnesses = self.witnesses(2)
+
+    def mint(self, body, witness_set):
+        key = PaymentVerificationKey(self.rnd.randbytes(32))
+        script = ScriptAll(
+            [
+                ScriptPubkey(key.hash()),
+                InvalidHereAfter(body.ttl + self.rnd.randrange(10**7)),
+            ]
+        )
+        body.mint = MultiAsset.from_primitive(
+            {
+                bytes(script.hash()): {
+                    f"Collectible{self.rnd.randrange(10000):04}".encode(): 1
+                    for _ in range(self.rnd.randint(1, 10))
+                }
+            }
+        )
+        body.outputs[0].amount = Value(self.coin(1_500_000, 5_000_000), body.mint)
+        witness_set.native_scripts = NonEmptyOrderedSet([script])
+        witness_set.vkey_witnesses = NonEmptyOrderedSet(
+            [
+                VerificationKeyWitness(key, self.rnd.randbytes(64)),
+                *self.witnesses(1),
+            ]
+        )
+
+    def governance(self, body, witness_set):
+        stake = StakeCredential(self.key_hash())
+        drep = self.rnd.choice(
+            [
+                DRep(DRepKind.VERIFICATION_KEY_HASH, self.key_hash()),
+                DRep(DRepKind.ALWAYS_ABSTAIN),
+                DRep(DRepKind.ALWAYS_NO_CONFIDENCE),
+            ]
+        )
+        kind = self.rnd.random()
+        if kind < 0.4:
+            body.certificates = NonEmptyOrderedSet(
+                [
+                    StakeRegistrationConway(stake, 2_000_000),
+                    StakeAndVoteDelegation(
+                        stake, PoolKeyHash(self.rnd.randbytes(28)), drep
+                    ),
+                ]
+            )
+        elif kind < 0.8:
+            body.certificates = NonEmptyOrderedSet([VoteDelegation(stake, drep)])
+            body.withdraws = Withdrawals(
+                {
+                    bytes(Address(staking_part=self.key_hash())): self.coin(
+                        1_000, 50_000_000
+                    )
+                }
+            )
+        else:
+            voting_procedures = VotingProcedures()
+            voting_procedures[Voter(self.key_hash(), VoterType.DREP)] = (
+                GovActionIdToVotingProcedure(
+                    {
+                        GovActionId(
+                            TransactionId(self.rnd.randbytes(32)), i
+                        ): VotingProcedure(self.rnd.choice(list(Vote)), None)
+                        for i in range(self.rnd.randint(1, 3))
+                    }
+                )
+            )
+            body.voting_procedures = voting_procedures
+            body.donation = self.coin(1_000_000, 10_000_000)
+        witness_set.vkey_witnesses = self.witnesses(2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=48)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    generator = Generator(args.seed)
+    lines = [
+        "# Babbage and Conway era transactions generated by benchmarks/generate_transactions.py "
+        f"(--count {args.count} --seed {args.seed}), one CBOR hex string per line.",
+        "# Keys, hashes, signatures and scripts are random: the transactions are not valid on chain.",
+    ]
+    for i in range(args.count):
+        shape = SHAPES[i % len(SHAPES)]
+        cbor = generator.transaction(shape).to_cbor()
+        # Make sure the corpus can be read back
+        assert Transaction.from_cbor(cbor).to_cbor() == cbor
+        lines.append(f"# {shape}")
+        lines.append(cbor.hex())
+
+    with open(args.output, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark Ogmios queries over a new websocket connection per query, and over persistent pooled connections.
+
+A local fake Ogmios server answers ``queryLedgerState/epoch`` queries. Each query is sent:
+
+* ``per-query``: over a new connection of the ``ogmios`` client, as ``OgmiosV6ChainContext`` used to do.
+* ``pooled``: with ``OgmiosV6ChainContext``, over persistent connections on which queries are pipelined.
+
+Queries are sent one after the other, then by a number of threads. ``--latency`` delays the server's handshakes
+and responses by some milliseconds, like the round trip to a remote Ogmios would.
+
+Usage::
+
+    python benchmarks/ogmios_connections.py [--queries N] [--threads N] [--pool-size N] [--latency MS]
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ogmios.client import Client as OgmiosClient
+from websockets.asyncio.server import serve
+
+from pycardano.backend.ogmios_v6 import OgmiosV6ChainContext
+
+
+def start_server(latency):
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+
+    async def respond(connection, request):
+        await asyncio.sleep(latency)
+        response = {"jsonrpc": "2.0", "method": request["method"], "result": 400}
+        if "id" in request:
+            response["id"] = request["id"]
+        await connection.send(json.dumps(response))
+
+    async def handle(connection):
+        async for message in connection:
+            asyncio.create_task(respond(connection, json.loads(message)))
+
+    async def process_request(connection, request):
+        await asyncio.sleep(latency)
+
+    async def start():
+        return await serve(handle, "127.0.0.1", 0, process_request=process_request)
+
+    server = asyncio.run_coroutine_threadsafe(start(), loop).result()
+    return server.sockets[0].getsockname()[1]
+
+
+def per_query(port):
+    def query():
+        with OgmiosClient("127.0.0.1", port) as client:
+            epoch, _ = client.query_epoch.execute()
+            return epoch
+
+    return query
+
+
+def pooled(port, pool_size):
+    context = OgmiosV6ChainContext("127.0.0.1", port, connection_pool_size=pool_size)
+    return lambda: context.epoch
+
+
+def run(query, queries, threads):
+    start = time.perf_counter()
+    if threads == 1:
+        for _ in range(queries):
+            query()
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(lambda _: query(), range(queries)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--pool-size", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0)
+    args = parser.parse_args()
+
+    port = start_server(args.latency / 1000)
+    methods = [
+        ("per-query", per_query(port)),
+        ("pooled", pooled(port, args.pool_size)),
+    ]
+
+    print(f"{'method':<10} {'threads':>7} {'total (s)':>10} {'queries/s':>10}")
+    for threads in (1, args.threads):
+        for name, query in methods:
+            # Warm up, e.g. open the persistent connections
+            query()
+            elapsed = run(query, args.queries, threads)
+            print(
+                f"{name:<10} {threads:>7} {elapsed:>10.3f} {args.queries / elapsed:>10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
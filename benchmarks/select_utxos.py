@@ -0,0 +1,103 @@
+"""Benchmark coin selection from a large wallet, with the UTxOs given as a list and as a ``UTxOPool``.
+
+The wallet holds mostly ADA-only UTxOs and a few UTxOs with native assets, like an exchange hot wallet. Each
+selector is timed for repeated ADA-only and native asset requests. The pool is built once and reused by all
+selections, which is what a wallet service keeping its UTxOs in memory would do.
+
+Usage::
+
+    python benchmarks/select_utxos.py [--utxos N] [--repeat N]
+
+Protocol parameters are those of the test suite's ``FixedChainContext``, run from the repository root.
+"""
+
+import argparse
+import random
+import time
+from test.pycardano.util import FixedChainContext
+
+from pycardano import (
+    Address,
+    Asset,
+    AssetName,
+    LargestFirstSelector,
+    MultiAsset,
+    Network,
+    RandomImproveMultiAsset,
+    TransactionInput,
+    TransactionOutput,
+    UTxO,
+    UTxOPool,
+    Value,
+    VerificationKeyHash,
+)
+from pycardano.hash import ScriptHash, TransactionId
+
+ADDRESS = Address(VerificationKeyHash(b"1" * 28), network=Network.MAINNET)
+POLICY = ScriptHash(b"2" * 28)
+
+
+def utxos(n_utxos):
+    rng = random.Random(42)
+    result = []
+    for i in range(n_utxos):
+        if i % 1000 == 0:
+            amount = Value(
+                2_000_000,
+                MultiAsset({POLICY: Asset({AssetName(b"token"): 1_000})}),
+            )
+        else:
+            amount = Value(rng.randint(1_000_000, 100_000_000))
+        result.append(
+            UTxO(
+                TransactionInput(TransactionId(i.to_bytes(32, "big")), 0),
+                TransactionOutput(ADDRESS, amount),
+            )
+        )
+    return result
+
+
+def requests():
+    return {
+        "ADA": [TransactionOutput(ADDRESS, Value(500_000_000))],
+        "asset": [
+            TransactionOutput(
+                ADDRESS,
+                Value(
+                    2_000_000,
+                    MultiAsset({POLICY: Asset({AssetName(b"token"): 2_500})}),
+                ),
+            )
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--utxos", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    context = FixedChainContext()
+    wallet = utxos(args.utxos)
+    pool = UTxOPool(wallet)
+    print(f"{args.utxos} UTxOs:")
+    for selector_name, selector in (
+        ("largest first", LargestFirstSelector),
+        ("random improve", RandomImproveMultiAsset),
+    ):
+        for request_name, request in requests().items():
+            for source_name, source in (("list", wallet), ("pool", pool)):
+                random.seed(0)
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    selected, _ = selector().select(source, request, context)
+                seconds = (time.perf_counter() - start) / args.repeat
+                print(
+                    f"  {selector_name:>14}, {request_name:>5}, {source_name}: "
+                    f"{seconds * 1e3:.1f} ms, {len(selected)} inputs"
+                )
+
+
+if __name__ == "__main__":
+    main()
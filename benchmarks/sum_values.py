@@ -0,0 +1,99 @@
+"""Benchmark summing the amounts of many multi-asset UTxOs.
+
+The amounts are summed with ``Value.__iadd__``, with ``Value.__add__`` and with a
+:class:`~pycardano.transaction.ValueAccumulator`. The UTxOs hold tokens of a number of policies, so the sum grows to
+many distinct assets, like the balance of a token-heavy wallet.
+
+Usage::
+
+    python benchmarks/sum_values.py [--utxos N] [--policies N] [--tokens N] [--repeat N]
+"""
+
+import argparse
+import time
+
+from pycardano import (
+    Address,
+    Asset,
+    AssetName,
+    MultiAsset,
+    Network,
+    TransactionInput,
+    TransactionOutput,
+    UTxO,
+    Value,
+    ValueAccumulator,
+    VerificationKeyHash,
+)
+from pycardano.hash import ScriptHash, TransactionId
+
+
+def utxos(n_utxos, n_policies, n_tokens):
+    address = Address(VerificationKeyHash(b"1" * 28), network=Network.MAINNET)
+    policies = [ScriptHash(i.to_bytes(28, "big")) for i in range(n_policies)]
+    names = [AssetName(f"token{i}".encode()) for i in range(n_tokens)]
+    result = []
+    for i in range(n_utxos):
+        # Each UTxO holds a few tokens of a single policy
+        multi_asset = MultiAsset(
+            {
+                policies[i % n_policies]: Asset(
+                    {names[(i + j) % n_tokens]: i + j + 1 for j in range(3)}
+                )
+            }
+        )
+        result.append(
+            UTxO(
+                TransactionInput(TransactionId(i.to_bytes(32, "big")), 0),
+                TransactionOutput(address, Value(1_000_000 + i, multi_asset)),
+            )
+        )
+    return result
+
+
+def sum_iadd(utxos):
+    total = Value()
+    for u in utxos:
+        total += u.output.amount
+    return total
+
+
+def sum_add(utxos):
+    return sum((u.output.amount for u in utxos), Value())
+
+
+def sum_accumulator(utxos):
+    total = ValueAccumulator()
+    for u in utxos:
+        total += u.output.amount
+    return total.to_value()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--utxos", type=int, default=10_000)
+    parser.add_argument("--policies", type=int, default=100)
+    parser.add_argument("--tokens", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pool = utxos(args.utxos, args.policies, args.tokens)
+    expected = None
+    print(f"{args.utxos} UTxOs, {args.policies} policies x {args.tokens} tokens:")
+    for name, func in (
+        ("Value +=", sum_iadd),
+        ("Value +", sum_add),
+        ("ValueAccumulator", sum_accumulator),
+    ):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            total = func(pool)
+        seconds = (time.perf_counter() - start) / args.repeat
+        if expected is None:
+            expected = total
+        assert total == expected, f"{name} computed a different sum"
+        print(f"  {name:>16}: {seconds * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,7 @@ from __future__ import annotations
 import binascii
 import os
 from enum import Enum
-from typing import Optional, Type, Union
+from typing import Dict, Iterable, List, Optional, Type, Union
 
 import base58
 import cbor2
@@ -30,6 +30,9 @@ from pycardano.serialization import CBORSerializable, limit_primitive_type
 
 __all__ = ["AddressType", "PointerAddress", "Address"]
 
+# Prefixes of base58 encoded Byron addresses
+_BYRON_PREFIXES = ("Ae2td", "Ddz")
+
 
 class AddressType(Enum):
     """
@@ -395,6 +398,52 @@ class Address(CBORSerializable):
         """
         return cls.from_primitive(data)
 
+    @classmethod
+    def decode_many(cls, data: Iterable[str]) -> List[Address]:
+        """Decode many bech32 (Shelley) or base58 (Byron) strings into address objects.
+
+        Equivalent to calling :meth:`decode` on each string, with less overhead per string. Equal strings, e.g. the
+        addresses of UTxOs held by the same address, are decoded once, into the same address object.
+
+        Args:
+            data (Iterable[str]): Encoded addresses.
+
+        Returns:
+            List[Address]: Decoded addresses, in the same order as the strings.
+
+        Raises:
+            DecodingException: When one of the strings is not a valid address.
+        """
+        decoded: Dict[str, Address] = {}
+        addresses = []
+        for value in data:
+            address = decoded.get(value)
+            if address is None:
+                payload = (
+                    decode(value)
+                    if isinstance(value, str) and not value.startswith(_BYRON_PREFIXES)
+                    else None
+                )
+                address = decoded[value] = (
+                    cls.from_primitive(value)
+                    if payload is None
+                    else cls._from_bytes(payload)
+                )
+            addresses.append(address)
+        return addresses
+
+    @staticmethod
+    def encode_many(addresses: Iterable[Address]) -> List[str]:
+        """Encode many addresses, see :meth:`encode`.
+
+        Args:
+            addresses (Iterable[Address]): Addresses to encode.
+
+        Returns:
+            List[str]: Encoded addresses, in the same order as the addresses.
+        """
+        return [address.encode() for address in addresses]
+
     def to_primitive(self) -> bytes:
         return bytes(self)
 
@@ -404,7 +453,7 @@ class Address(CBORSerializable):
         # Convert string to bytes
         if isinstance(value, str):
             # Check for Byron Base58 prefixes (common Byron patterns)
-            if value.startswith(("Ae2td", "Ddz")):
+            if value.startswith(_BYRON_PREFIXES):
                 return cls._from_byron_base58(value)
 
             # Try Bech32 decode for Shelley addresses
@@ -417,20 +466,24 @@ class Address(CBORSerializable):
                 except Exception as e:
                     raise DecodingException(f"Failed to decode address string: {e}")
 
-        # At this point, value is always bytes
-        # Check if it's a Byron address (CBOR with tag 24)
-        try:
-            decoded = cbor2.loads(value)
-            if isinstance(decoded, (tuple, list)) and len(decoded) == 2:
-                if isinstance(decoded[0], CBORTag) and decoded[0].tag == 24:
-                    # This is definitely a Byron address - validate and decode it
-                    return cls._from_byron_cbor(value)
-        except DecodingException:
-            # Byron decoding failed with validation error - re-raise it
-            raise
-        except Exception:
-            # Not Byron CBOR (general CBOR decode error), continue with Shelley decoding
-            pass
+        return cls._from_bytes(value)
+
+    @classmethod
+    def _from_bytes(cls: Type[Address], value: bytes) -> Address:
+        # Check if it's a Byron address (CBOR with tag 24), whose bytes are an array of 2 items
+        if value[:1] == b"\x82":
+            try:
+                decoded = cbor2.loads(value)
+                if isinstance(decoded, (tuple, list)) and len(decoded) == 2:
+                    if isinstance(decoded[0], CBORTag) and decoded[0].tag == 24:
+                        # This is definitely a Byron address - validate and decode it
+                        return cls._from_byron_cbor(value)
+            except DecodingException:
+                # Byron decoding failed with validation error - re-raise it
+                raise
+            except Exception:
+                # Not Byron CBOR (general CBOR decode error), continue with Shelley decoding
+                pass
 
         # Shelley address decoding (existing logic)
         header = value[0]
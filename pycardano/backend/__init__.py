@@ -2,6 +2,11 @@
 
 from .base import *
 from .blockfrost import *
+from .cache import *
 from .cardano_cli import *
+from .http_pool import *
 from .ogmios_v5 import *
 from .ogmios_v6 import *
+from .pending import *
+from .utxo_index import *
+from .websocket_pool import *
@@ -1,8 +1,20 @@
 """Defines interfaces for client codes to interact (read/write) with the blockchain."""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from fractions import Fraction
-from typing import Dict, List, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
 
 from pycardano.address import Address
 from pycardano.exception import InvalidArgumentException
@@ -16,11 +28,18 @@ __all__ = [
     "GenesisParameters",
     "ProtocolParameters",
     "ChainContext",
+    "AsyncChainContext",
+    "AsyncChainContextAdapter",
     "ALONZO_COINS_PER_UTXO_WORD",
 ]
 
 ALONZO_COINS_PER_UTXO_WORD = 34482
 
+# Maximum number of addresses whose UTxOs are queried concurrently by the utxos_many of backends that opt in
+_UTXOS_MANY_MAX_WORKERS = 16
+
+_T = TypeVar("_T")
+
 
 @dataclass(frozen=True)
 class GenesisParameters:
@@ -118,6 +137,10 @@ class ProtocolParameters:
 class ChainContext:
     """Interfaces through which the library interacts with Cardano blockchain."""
 
+    _utxos_many_workers: int = 1
+    """Number of threads :meth:`utxos_many` queries addresses with by default. Backends whose :meth:`utxos` is
+    thread-safe and mostly waits for the network opt in to concurrent queries by raising it."""
+
     @property
     def protocol_param(self) -> ProtocolParameters:
         """Get current protocol parameters"""
@@ -165,6 +188,36 @@ class ChainContext:
         """
         raise NotImplementedError()
 
+    def utxos_many(self, addresses: Iterable[Union[str, Address]]) -> List[List[UTxO]]:
+        """Get all UTxOs associated with each of many addresses.
+
+        By default, the UTxOs of the addresses are queried one after the other with :meth:`utxos`, or concurrently
+        by backends that opt in. Backends that can query the UTxOs of many addresses at once override
+        :meth:`_utxos_many`.
+
+        Args:
+            addresses (Iterable[Union[str, Address]]): Addresses, potentially bech32 encoded
+
+        Returns:
+            List[List[UTxO]]: A list of UTxOs for each address, in the same order as the addresses.
+        """
+        return self._utxos_many([str(address) for address in addresses])
+
+    def _utxos_many(self, addresses: List[str]) -> List[List[UTxO]]:
+        """Get all UTxOs associated with each of many addresses.
+
+        Args:
+            addresses (List[str]): Addresses encoded with bech32.
+
+        Returns:
+            List[List[UTxO]]: A list of UTxOs for each address, in the same order as the addresses.
+        """
+        workers = min(len(addresses), self._utxos_many_workers)
+        if workers <= 1:
+            return [self.utxos(address) for address in addresses]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.utxos, addresses))
+
     @log_state
     def submit_tx(self, tx: Union[Transaction, bytes, str]):
         """Submit a transaction to the blockchain.
@@ -218,3 +271,276 @@ class ChainContext:
             List[ExecutionUnits]: A list of execution units calculated for each of the transaction's redeemers
         """
         raise NotImplementedError()
+
+
+class AsyncChainContext:
+    """Interfaces through which the library interacts with Cardano blockchain, without blocking an event loop.
+
+    The counterpart of :class:`ChainContext` for asyncio: queries are coroutines, e.g.
+    ``await context.protocol_param()`` instead of ``context.protocol_param``. A transaction builder with an
+    asynchronous context is built with :meth:`pycardano.txbuilder.TransactionBuilder.build_async`.
+    """
+
+    async def protocol_param(self) -> ProtocolParameters:
+        """Get current protocol parameters"""
+        raise NotImplementedError()
+
+    async def genesis_param(self) -> GenesisParameters:
+        """Get chain genesis parameters"""
+        raise NotImplementedError()
+
+    @property
+    def network(self) -> Network:
+        """Get current network"""
+        raise NotImplementedError()
+
+    async def epoch(self) -> int:
+        """Current epoch number"""
+        raise NotImplementedError()
+
+    async def last_block_slot(self) -> int:
+        """Slot number of last block"""
+        raise NotImplementedError()
+
+    async def utxos(self, address: Union[str, Address]) -> List[UTxO]:
+        """Get all UTxOs associated with an address.
+
+        Args:
+            address (Union[str, Address]): An address, potentially bech32 encoded
+
+        Returns:
+            List[UTxO]: A list of UTxOs.
+        """
+        return await self._utxos(str(address))
+
+    async def _utxos(self, address: str) -> List[UTxO]:
+        """Get all UTxOs associated with an address.
+
+        Args:
+            address (str): An address encoded with bech32.
+
+        Returns:
+            List[UTxO]: A list of UTxOs.
+        """
+        raise NotImplementedError()
+
+    async def utxos_many(
+        self, addresses: Iterable[Union[str, Address]]
+    ) -> List[List[UTxO]]:
+        """Get all UTxOs associated with each of many addresses.
+
+        By default, the UTxOs of the addresses are queried one after the other with :meth:`utxos`, or concurrently
+        by backends that opt in. Backends that can query the UTxOs of many addresses at once override
+        :meth:`_utxos_many`.
+
+        Args:
+            addresses (Iterable[Union[str, Address]]): Addresses, potentially bech32 encoded
+
+        Returns:
+            List[List[UTxO]]: A list of UTxOs for each address, in the same order as the addresses.
+        """
+        return await self._utxos_many([str(address) for address in addresses])
+
+    async def _utxos_many(self, addresses: List[str]) -> List[List[UTxO]]:
+        """Get all UTxOs associated with each of many addresses.
+
+        Args:
+            addresses (List[str]): Addresses encoded with bech32.
+
+        Returns:
+            List[List[UTxO]]: A list of UTxOs for each address, in the same order as the addresses.
+        """
+        return list(await asyncio.gather(*(self.utxos(a) for a in addresses)))
+
+    async def submit_tx(self, tx: Union[Transaction, bytes, str]):
+        """Submit a transaction to the blockchain.
+
+        Args:
+            tx (Union[Transaction, bytes, str]): The transaction to be submitted.
+
+        Raises:
+            :class:`InvalidArgumentException`: When the transaction is invalid.
+            :class:`TransactionFailedException`: When fails to submit the transaction to blockchain.
+        """
+        if isinstance(tx, Transaction):
+            return await self.submit_tx_cbor(tx.to_cbor())
+        elif isinstance(tx, bytes) or isinstance(tx, str):
+            return await self.submit_tx_cbor(tx)
+        else:
+            raise InvalidArgumentException(
+                f"Invalid transaction type: {type(tx)}, expected Transaction, bytes, or str"
+            )
+
+    async def submit_tx_cbor(self, cbor: Union[bytes, str]):
+        """Submit a transaction to the blockchain.
+
+        Args:
+            cbor (Union[bytes, str]): The serialized transaction to be submitted.
+
+        Raises:
+            :class:`InvalidArgumentException`: When the transaction is invalid.
+            :class:`TransactionFailedException`: When fails to submit the transaction to blockchain.
+        """
+        raise NotImplementedError()
+
+    async def evaluate_tx(self, tx: Transaction) -> Dict[str, ExecutionUnits]:
+        """Evaluate execution units of a transaction.
+
+        Args:
+            transaction (Transaction): The transaction to be evaluated.
+
+        Returns:
+            Dict[str, ExecutionUnits]: Execution units calculated for each of the transaction's redeemers
+        """
+        return await self.evaluate_tx_cbor(tx.to_cbor())
+
+    async def evaluate_tx_cbor(
+        self, cbor: Union[bytes, str]
+    ) -> Dict[str, ExecutionUnits]:
+        """Evaluate execution units of a transaction.
+
+        Args:
+            cbor (Union[bytes, str]): The serialized transaction to be evaluated.
+
+        Returns:
+            Dict[str, ExecutionUnits]: Execution units calculated for each of the transaction's redeemers
+        """
+        raise NotImplementedError()
+
+
+class AsyncChainContextAdapter(AsyncChainContext):
+    """An asynchronous chain context that runs the queries of a synchronous chain context in threads.
+
+    This makes any :class:`ChainContext`, e.g. :class:`pycardano.backend.blockfrost.BlockFrostChainContext` or
+    :class:`pycardano.backend.kupo.KupoChainContextExtension`, usable from an event loop. Queries are run in a
+    thread pool owned by the adapter, so that they never wait for the tasks of the default executor of the loop.
+
+    Args:
+        wrapped_backend (ChainContext): The chain context to query.
+        max_workers (int): Maximum number of queries run concurrently.
+    """
+
+    _wrapped_backend: ChainContext
+    _executor: ThreadPoolExecutor
+
+    def __init__(self, wrapped_backend: ChainContext, max_workers: int = 32):
+        self._wrapped_backend = wrapped_backend
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    async def _run(self, func: Callable[[], _T]) -> _T:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func)
+
+    async def protocol_param(self) -> ProtocolParameters:
+        """Get current protocol parameters"""
+        return await self._run(lambda: self._wrapped_backend.protocol_param)
+
+    async def genesis_param(self) -> GenesisParameters:
+        """Get chain genesis parameters"""
+        return await self._run(lambda: self._wrapped_backend.genesis_param)
+
+    @property
+    def network(self) -> Network:
+        """Get current network"""
+        return self._wrapped_backend.network
+
+    async def epoch(self) -> int:
+        """Current epoch number"""
+        return await self._run(lambda: self._wrapped_backend.epoch)
+
+    async def last_block_slot(self) -> int:
+        """Slot number of last block"""
+        return await self._run(lambda: self._wrapped_backend.last_block_slot)
+
+    async def _utxos(self, address: str) -> List[UTxO]:
+        return await self._run(lambda: self._wrapped_backend.utxos(address))
+
+    async def _utxos_many(self, addresses: List[str]) -> List[List[UTxO]]:
+        return await self._run(lambda: self._wrapped_backend.utxos_many(addresses))
+
+    async def submit_tx_cbor(self, cbor: Union[bytes, str]):
+        return await self._run(lambda: self._wrapped_backend.submit_tx_cbor(cbor))
+
+    async def evaluate_tx_cbor(
+        self, cbor: Union[bytes, str]
+    ) -> Dict[str, ExecutionUnits]:
+        return await self._run(lambda: self._wrapped_backend.evaluate_tx_cbor(cbor))
+
+    def close(self):
+        """Shut down the thread pool of the adapter."""
+        self._executor.shutdown(wait=False)
+
+
+class _SyncChainContext(ChainContext):
+    """A synchronous view of an asynchronous chain context, used in a worker thread while building a transaction.
+
+    Queries are run on the event loop of the asynchronous context, and their results are kept for the lifetime of
+    this context, i.e. one build.
+    """
+
+    _context: AsyncChainContext
+    _loop: asyncio.AbstractEventLoop
+    _values: Dict[str, Any]
+    _utxos_by_address: Dict[str, List[UTxO]]
+
+    def __init__(
+        self,
+        context: AsyncChainContext,
+        loop: asyncio.AbstractEventLoop,
+        values: Optional[Dict[str, Any]] = None,
+        utxos: Optional[Dict[str, List[UTxO]]] = None,
+    ):
+        self._context = context
+        self._loop = loop
+        self._values = dict(values or {})
+        self._utxos_by_address = dict(utxos or {})
+
+    def _run(self, coroutine: Coroutine[Any, Any, _T]) -> _T:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def _get(self, name: str) -> Any:
+        if name not in self._values:
+            self._values[name] = self._run(getattr(self._context, name)())
+        return self._values[name]
+
+    @property
+    def protocol_param(self) -> ProtocolParameters:
+        return self._get("protocol_param")
+
+    @property
+    def genesis_param(self) -> GenesisParameters:
+        return self._get("genesis_param")
+
+    @property
+    def network(self) -> Network:
+        return self._context.network
+
+    @property
+    def epoch(self) -> int:
+        return self._get("epoch")
+
+    @property
+    def last_block_slot(self) -> int:
+        return self._get("last_block_slot")
+
+    def _utxos(self, address: str) -> List[UTxO]:
+        if address not in self._utxos_by_address:
+            self._utxos_by_address[address] = self._run(self._context.utxos(address))
+        return self._utxos_by_address[address]
+
+    def _utxos_many(self, addresses: List[str]) -> List[List[UTxO]]:
+        missing = [
+            address
+            for address in dict.fromkeys(addresses)
+            if address not in self._utxos_by_address
+        ]
+        if missing:
+            self._utxos_by_address.update(
+                zip(missing, self._run(self._context.utxos_many(missing)))
+            )
+        return [self._utxos_by_address[address] for address in addresses]
+
+    def submit_tx_cbor(self, cbor: Union[bytes, str]):
+        return self._run(self._context.submit_tx_cbor(cbor))
+
+    def evaluate_tx_cbor(self, cbor: Union[bytes, str]) -> Dict[str, ExecutionUnits]:
+        return self._run(self._context.evaluate_tx_cbor(cbor))
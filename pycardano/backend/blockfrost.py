@@ -11,11 +11,13 @@ from blockfrost.utils import Namespace
 
 from pycardano.address import Address
 from pycardano.backend.base import (
+    _UTXOS_MANY_MAX_WORKERS,
     ALONZO_COINS_PER_UTXO_WORD,
     ChainContext,
     GenesisParameters,
     ProtocolParameters,
 )
+from pycardano.backend.cache import ChainCache, ContentAddressedCache, MemoryCache
 from pycardano.exception import TransactionFailedException
 from pycardano.hash import SCRIPT_HASH_SIZE, DatumHash, ScriptHash
 from pycardano.nativescript import NativeScript
@@ -54,19 +56,33 @@ class BlockFrostChainContext(ChainContext):
         project_id (str): A BlockFrost project ID obtained from https://blockfrost.io.
         network (Network): Network to use.
         base_url (str): Base URL for the BlockFrost API. Defaults to the preprod url.
+        cache (Optional[ChainCache]): Cache of protocol parameters, genesis parameters and UTxOs, which other
+            chain contexts and processes can share, see :mod:`pycardano.backend.cache`. Defaults to a
+            :class:`pycardano.backend.cache.MemoryCache`.
+        utxo_cache_ttl (float): Seconds for which the UTxOs of an address are cached, or 0 to not cache them.
+        content_cache (Optional[ContentAddressedCache]): Cache of the reference scripts of UTxOs. Each script is
+            only fetched once, even when many UTxOs being queried concurrently refer to it.
     """
 
     api: BlockFrostApi
     _epoch_info: Namespace
     _epoch: Optional[int] = None
+    # Each query is a separate HTTP request
+    _utxos_many_workers = _UTXOS_MANY_MAX_WORKERS
     _genesis_param: Optional[GenesisParameters] = None
     _protocol_param: Optional[ProtocolParameters] = None
+    _cache: ChainCache
+    _utxo_cache_ttl: float
+    _content_cache: ContentAddressedCache
 
     def __init__(
         self,
         project_id: str,
         network: Optional[Network] = None,
         base_url: Optional[str] = None,
+        cache: Optional[ChainCache] = None,
+        utxo_cache_ttl: float = 0,
+        content_cache: Optional[ContentAddressedCache] = None,
     ):
         if network is not None:
             warnings.warn(
@@ -91,6 +107,12 @@ class BlockFrostChainContext(ChainContext):
         if "mainnet" in self._base_url:
             self._network = Network.MAINNET
 
+        self._cache = cache if cache is not None else MemoryCache()
+        self._utxo_cache_ttl = utxo_cache_ttl
+        self._content_cache = (
+            content_cache if content_cache is not None else ContentAddressedCache()
+        )
+
         self.api = BlockFrostApi(project_id=self._project_id, base_url=self._base_url)
         self._epoch_info = self.api.epoch_latest()
         self._epoch = None
@@ -123,56 +145,70 @@ class BlockFrostChainContext(ChainContext):
     @property
     def genesis_param(self) -> GenesisParameters:
         if not self._genesis_param or self._check_epoch_and_update():
-            params = vars(self.api.genesis())
-            self._genesis_param = GenesisParameters(**params)
+            self._genesis_param = self._cache.get_or_fetch(
+                f"genesis_param:{self._base_url}:{self._epoch_info.epoch}",
+                lambda: GenesisParameters(**vars(self.api.genesis())),
+            )
         return self._genesis_param
 
     @property
     def protocol_param(self) -> ProtocolParameters:
         if not self._protocol_param or self._check_epoch_and_update():
-            params = self.api.epoch_latest_parameters()
-            self._protocol_param = ProtocolParameters(
-                min_fee_constant=int(params.min_fee_b),
-                min_fee_coefficient=int(params.min_fee_a),
-                max_block_size=int(params.max_block_size),
-                max_tx_size=int(params.max_tx_size),
-                max_block_header_size=int(params.max_block_header_size),
-                key_deposit=int(params.key_deposit),
-                pool_deposit=int(params.pool_deposit),
-                pool_influence=Fraction(params.a0),
-                monetary_expansion=Fraction(params.rho),
-                treasury_expansion=Fraction(params.tau),
-                decentralization_param=Fraction(params.decentralisation_param),
-                extra_entropy=params.extra_entropy,
-                protocol_major_version=int(params.protocol_major_ver),
-                protocol_minor_version=int(params.protocol_minor_ver),
-                min_utxo=int(params.min_utxo),
-                min_pool_cost=int(params.min_pool_cost),
-                price_mem=Fraction(params.price_mem),
-                price_step=Fraction(params.price_step),
-                max_tx_ex_mem=int(params.max_tx_ex_mem),
-                max_tx_ex_steps=int(params.max_tx_ex_steps),
-                max_block_ex_mem=int(params.max_block_ex_mem),
-                max_block_ex_steps=int(params.max_block_ex_steps),
-                max_val_size=int(params.max_val_size),
-                collateral_percent=int(params.collateral_percent),
-                max_collateral_inputs=int(params.max_collateral_inputs),
-                coins_per_utxo_word=int(params.coins_per_utxo_word)
-                or ALONZO_COINS_PER_UTXO_WORD,
-                coins_per_utxo_byte=int(params.coins_per_utxo_size),
-                cost_models={
-                    k: v.to_dict() for k, v in params.cost_models.to_dict().items()
-                },
-                maximum_reference_scripts_size={"bytes": 200000},
-                min_fee_reference_scripts={
-                    "base": params.min_fee_ref_script_cost_per_byte,
-                    "range": 200000,
-                    "multiplier": 1,
-                },
+            # Protocol parameters only change at epoch boundaries
+            self._protocol_param = self._cache.get_or_fetch(
+                f"protocol_param:{self._base_url}:{self._epoch_info.epoch}",
+                self._fetch_protocol_param,
             )
         return self._protocol_param
 
+    def _fetch_protocol_param(self) -> ProtocolParameters:
+        params = self.api.epoch_latest_parameters()
+        return ProtocolParameters(
+            min_fee_constant=int(params.min_fee_b),
+            min_fee_coefficient=int(params.min_fee_a),
+            max_block_size=int(params.max_block_size),
+            max_tx_size=int(params.max_tx_size),
+            max_block_header_size=int(params.max_block_header_size),
+            key_deposit=int(params.key_deposit),
+            pool_deposit=int(params.pool_deposit),
+            pool_influence=Fraction(params.a0),
+            monetary_expansion=Fraction(params.rho),
+            treasury_expansion=Fraction(params.tau),
+            decentralization_param=Fraction(params.decentralisation_param),
+            extra_entropy=params.extra_entropy,
+            protocol_major_version=int(params.protocol_major_ver),
+            protocol_minor_version=int(params.protocol_minor_ver),
+            min_utxo=int(params.min_utxo),
+            min_pool_cost=int(params.min_pool_cost),
+            price_mem=Fraction(params.price_mem),
+            price_step=Fraction(params.price_step),
+            max_tx_ex_mem=int(params.max_tx_ex_mem),
+            max_tx_ex_steps=int(params.max_tx_ex_steps),
+            max_block_ex_mem=int(params.max_block_ex_mem),
+            max_block_ex_steps=int(params.max_block_ex_steps),
+            max_val_size=int(params.max_val_size),
+            collateral_percent=int(params.collateral_percent),
+            max_collateral_inputs=int(params.max_collateral_inputs),
+            coins_per_utxo_word=int(params.coins_per_utxo_word)
+            or ALONZO_COINS_PER_UTXO_WORD,
+            coins_per_utxo_byte=int(params.coins_per_utxo_size),
+            cost_models={
+                k: v.to_dict() for k, v in params.cost_models.to_dict().items()
+            },
+            maximum_reference_scripts_size={"bytes": 200000},
+            min_fee_reference_scripts={
+                "base": params.min_fee_ref_script_cost_per_byte,
+                "range": 200000,
+                "multiplier": 1,
+            },
+        )
+
     def _get_script(self, script_hash: str) -> ScriptType:
+        return self._content_cache.get_or_fetch(
+            f"script:{script_hash}", lambda: self._fetch_script(script_hash)
+        )
+
+    def _fetch_script(self, script_hash: str) -> ScriptType:
         script_type = self.api.script(script_hash).type
         if script_type.lower().startswith("plutusv"):
             ps = PlutusScript.from_version(
@@ -187,6 +223,15 @@ class BlockFrostChainContext(ChainContext):
             return NativeScript.from_dict(script_json)
 
     def _utxos(self, address: str) -> List[UTxO]:
+        if not self._utxo_cache_ttl:
+            return self._fetch_utxos(address)
+        return self._cache.get_or_fetch(
+            f"utxos:{self._base_url}:{address}",
+            lambda: self._fetch_utxos(address),
+            ttl=self._utxo_cache_ttl,
+        )
+
+    def _fetch_utxos(self, address: str) -> List[UTxO]:
         try:
             results = self.api.address_utxos(address, gather_pages=True)
         except ApiError as e:
@@ -0,0 +1,486 @@
+"""Caches of chain data, e.g. protocol parameters, scripts, datums and UTxOs, which chain contexts can share.
+
+A chain context stores the data it queries in a :class:`ChainCache`. By default each context has its own
+:class:`MemoryCache`, but contexts can share one cache, and processes can share a :class:`SqliteCache` or a
+:class:`SharedMemoryCache`, e.g. the workers of a web server, or a process and its next run.
+
+Scripts and datums, which never change, are stored in a :class:`ContentAddressedCache`.
+"""
+
+import contextlib
+import dataclasses
+import math
+import os
+import sqlite3
+import stat
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from decimal import Decimal
+from fractions import Fraction
+from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+import cbor2
+from cachetools import TLRUCache
+
+from pycardano.serialization import CBORSerializable
+
+__all__ = [
+    "ChainCache",
+    "MemoryCache",
+    "SqliteCache",
+    "SharedMemoryCache",
+    "ContentAddressedCache",
+]
+
+_T = TypeVar("_T")
+
+_MISSING = object()
+
+
+class ChainCache:
+    """Interface of a cache of chain data.
+
+    Keys are strings, and values are chain data, e.g. :class:`pycardano.backend.base.ProtocolParameters` or lists
+    of :class:`pycardano.transaction.UTxO`. Each entry expires after its own time to live, and a cache evicts
+    entries to stay within its maximum size.
+    """
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a cached value.
+
+        Args:
+            key (str): Key of the value.
+            default (Any): Value to return if the key is not cached, or has expired.
+
+        Returns:
+            Any: The cached value, or the default value.
+        """
+        raise NotImplementedError()
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Cache a value.
+
+        Args:
+            key (str): Key of the value.
+            value (Any): The value.
+            ttl (Optional[float]): Seconds after which the value expires, or None to never expire it.
+        """
+        raise NotImplementedError()
+
+    def delete(self, key: str):
+        """Remove a value from the cache, if it is cached.
+
+        Args:
+            key (str): Key of the value.
+        """
+        raise NotImplementedError()
+
+    def clear(self):
+        """Remove all values from the cache."""
+        raise NotImplementedError()
+
+    def get_or_fetch(
+        self, key: str, fetch: Callable[[], _T], ttl: Optional[float] = None
+    ) -> _T:
+        """Get a cached value, or fetch and cache it if it is not cached.
+
+        Args:
+            key (str): Key of the value.
+            fetch (Callable[[], _T]): Function fetching the value.
+            ttl (Optional[float]): Seconds after which a fetched value expires, or None to never expire it.
+
+        Returns:
+            _T: The value.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = fetch()
+            self.set(key, value, ttl)
+        return value
+
+
+def _time_to_use(key: str, entry: Tuple[Any, Optional[float]], now: float) -> float:
+    ttl = entry[1]
+    return math.inf if ttl is None else now + ttl
+
+
+class MemoryCache(ChainCache):
+    """A cache in the memory of the process, which evicts the least recently used entries when it is full.
+
+    Values are stored as they are, not copied, and can be shared by all chain contexts and threads of the process.
+
+    Args:
+        maxsize (int): Maximum number of entries.
+    """
+
+    maxsize: int
+    _cache: TLRUCache
+    _lock: threading.Lock
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._cache = TLRUCache(maxsize=maxsize, ttu=_time_to_use)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._cache.expire()
+            return len(self._cache)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._cache.get(key)
+        return default if entry is None else entry[0]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        with self._lock:
+            self._cache[key] = (value, ttl)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+def _check_owner(path: str):
+    """Raise a :class:`PermissionError` unless a file is owned by the current user, and a directory is private."""
+    st = os.lstat(path)
+    if st.st_uid != os.getuid():
+        raise PermissionError(f"{path} is not owned by the current user.")
+    if stat.S_ISLNK(st.st_mode) or (
+        stat.S_ISDIR(st.st_mode) and st.st_mode & (stat.S_IRWXG | stat.S_IRWXO)
+    ):
+        raise PermissionError(f"{path} is accessible to other users.")
+
+
+# Tag of the CBOR encoding of a PyCardano object, holding the name of its type and its content
+_OBJECT_TAG = 28793
+
+_PLAIN_TYPES = (
+    type(None),
+    bool,
+    int,
+    float,
+    str,
+    bytes,
+    Fraction,
+    Decimal,
+    datetime,
+)
+
+
+def _type_name(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _chain_data_type(name: str) -> Optional[Type]:
+    """Find the PyCardano type of chain data of a name, without importing any module."""
+    module_name, _, qualname = name.partition(":")
+    if module_name.split(".")[0] != "pycardano":
+        return None
+    cls: Any = sys.modules.get(module_name)
+    for attribute in qualname.split("."):
+        cls = getattr(cls, attribute, None)
+    if isinstance(cls, type) and (
+        issubclass(cls, (CBORSerializable, bytes)) or dataclasses.is_dataclass(cls)
+    ):
+        return cls
+    return None
+
+
+def _to_primitive(value: Any) -> Any:
+    if type(value) in _PLAIN_TYPES:
+        return value
+    if type(value) in (list, tuple):
+        return [_to_primitive(v) for v in value]
+    if type(value) is dict:
+        return {_to_primitive(k): _to_primitive(v) for k, v in value.items()}
+    if type(value) is cbor2.CBORTag:
+        return cbor2.CBORTag(value.tag, _to_primitive(value.value))
+    name = _type_name(type(value))
+    if _chain_data_type(name) is not type(value):
+        raise TypeError(f"Can't cache a value of type {name}.")
+    if dataclasses.is_dataclass(value):
+        # Field by field, as a CBOR round trip would normalize some values, e.g. decode the raw datum of an output
+        try:
+            fields = {
+                field.name: _to_primitive(getattr(value, field.name))
+                for field in dataclasses.fields(value)
+                if field.init
+            }
+            return cbor2.CBORTag(_OBJECT_TAG, [name, fields])
+        except TypeError:
+            # e.g. raw Plutus data, whose fields are CBOR containers
+            if not isinstance(value, CBORSerializable):
+                raise
+    if isinstance(value, CBORSerializable):
+        return cbor2.CBORTag(_OBJECT_TAG, [name, value.to_cbor()])
+    return cbor2.CBORTag(_OBJECT_TAG, [name, bytes(value)])
+
+
+def _tag_hook(decoder: Any, tag: cbor2.CBORTag) -> Any:
+    if tag.tag != _OBJECT_TAG:
+        return tag
+    name, content = tag.value
+    cls = _chain_data_type(name)
+    if cls is None:
+        raise ValueError(f"Cached value of unknown type {name}.")
+    if dataclasses.is_dataclass(cls) and isinstance(content, dict):
+        return cls(**content)
+    if issubclass(cls, CBORSerializable):
+        return cls.from_cbor(content)
+    return cls(content)
+
+
+def _dumps(value: Any) -> bytes:
+    return cbor2.dumps(_to_primitive(value))
+
+
+def _loads(data: bytes) -> Any:
+    return cbor2.loads(data, tag_hook=_tag_hook)
+
+
+class SqliteCache(ChainCache):
+    """A cache in a SQLite database file, which processes can share, and which persists across restarts.
+
+    Values are stored as CBOR, and only plain data and PyCardano types of chain data, i.e. CBOR serializables,
+    scripts and dataclasses, are restored from it. The database file is created only accessible to the current
+    user, and a :class:`PermissionError` is raised if it is owned by another user. Expired entries are removed
+    regularly, and when the cache holds more than ``maxsize`` entries, the least recently stored ones are evicted.
+    The number of entries can exceed ``maxsize`` by up to 64 between evictions.
+
+    Each thread of each process uses its own connection to the database.
+
+    Args:
+        path (str): Path of the database file, which is created if it does not exist.
+        maxsize (Optional[int]): Maximum number of entries, or None for no maximum.
+        timeout (float): Seconds to wait for other processes to release a lock on the database.
+    """
+
+    _PRUNE_INTERVAL = 64
+
+    path: str
+    maxsize: Optional[int]
+    timeout: float
+
+    def __init__(self, path: str, maxsize: Optional[int] = 100000, timeout: float = 10):
+        self.path = path
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._local = threading.local()
+        self._sets = 0
+        if hasattr(os, "getuid"):
+            with contextlib.suppress(FileExistsError):
+                # SQLite creates the journal files with the permissions of the database file
+                os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600))
+            _check_owner(path)
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL, stored REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_stored ON entries (stored)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # A connection can't be used by other threads, nor inherited by a child process
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def __len__(self) -> int:
+        (count,) = (
+            self._connection()
+            .execute(
+                "SELECT COUNT(*) FROM entries WHERE expires IS NULL OR expires > ?",
+                (time.time(),),
+            )
+            .fetchone()
+        )
+        return count
+
+    def get(self, key: str, default: Any = None) -> Any:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM entries WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return default if row is None else _loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        now = time.time()
+        self._connection().execute(
+            "INSERT OR REPLACE INTO entries (key, value, expires, stored) VALUES (?, ?, ?, ?)",
+            (
+                key,
+                _dumps(value),
+                None if ttl is None else now + ttl,
+                now,
+            ),
+        )
+        self._sets += 1
+        if self._sets % self._PRUNE_INTERVAL == 0:
+            self._prune(now)
+
+    def _prune(self, now: float):
+        connection = self._connection()
+        connection.execute("DELETE FROM entries WHERE expires <= ?", (now,))
+        if self.maxsize is not None:
+            connection.execute(
+                "DELETE FROM entries WHERE key IN "
+                "(SELECT key FROM entries ORDER BY stored DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+
+    def delete(self, key: str):
+        self._connection().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        self._connection().execute("DELETE FROM entries")
+
+    def close(self):
+        """Close the connection of the current thread. It is reopened on next use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.pid == os.getpid():
+            connection.close()
+        self._local.connection = None
+
+
+class SharedMemoryCache(SqliteCache):
+    """A :class:`SqliteCache` in shared memory, which the processes of a machine share without any disk I/O.
+
+    The database is stored in a directory of the current user in ``/dev/shm``, a file system in memory, or in the
+    temporary directory on systems without it. Other users can't access the directory, and a
+    :class:`PermissionError` is raised if it is not private. The database persists until the machine restarts, or
+    the cache is cleared.
+
+    Args:
+        name (str): Name of the cache. Caches of the same name are shared.
+        maxsize (Optional[int]): Maximum number of entries, or None for no maximum.
+        timeout (float): Seconds to wait for other processes to release a lock on the database.
+    """
+
+    def __init__(
+        self,
+        name: str = "pycardano",
+        maxsize: Optional[int] = 100000,
+        timeout: float = 10,
+    ):
+        directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        if hasattr(os, "getuid"):
+            # Other users could create a database of a predictable name in the shared directory
+            directory = os.path.join(directory, f"pycardano-{os.getuid()}")
+            with contextlib.suppress(FileExistsError):
+                os.mkdir(directory, 0o700)
+            _check_owner(directory)
+        super().__init__(
+            os.path.join(directory, f"{name}.cache.sqlite"),
+            maxsize=maxsize,
+            timeout=timeout,
+        )
+
+
+class ContentAddressedCache(ChainCache):
+    """A cache of values addressed by a hash of their content, e.g. scripts and datums, which never expire.
+
+    Values are kept in memory, and also in a second tier if ``disk`` is given, e.g. a :class:`SqliteCache` in which
+    they persist across restarts and are shared by processes. Values found in the second tier are kept in memory.
+
+    Concurrent fetches of a missing value are coalesced: the first thread fetches it, and the other threads wait
+    for its result instead of fetching it again. A fetched None, e.g. a datum that a backend doesn't know yet, is
+    not cached, so that the value is fetched again on next use.
+
+    Args:
+        maxsize (int): Maximum number of values in memory. The least recently used ones are evicted.
+        disk (Optional[ChainCache]): Second tier of the cache.
+    """
+
+    disk: Optional[ChainCache]
+    _memory: MemoryCache
+    _fetching: Dict[str, Future]
+    _lock: threading.Lock
+
+    def __init__(self, maxsize: int = 10000, disk: Optional[ChainCache] = None):
+        self.disk = disk
+        self._memory = MemoryCache(maxsize=maxsize)
+        self._fetching = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._memory.get(key, _MISSING)
+        if value is _MISSING and self.disk is not None:
+            value = self.disk.get(key, _MISSING)
+            if value is not _MISSING:
+                self._memory.set(key, value)
+        return default if value is _MISSING else value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Cache a value.
+
+        Args:
+            key (str): Key of the value, e.g. its hash.
+            value (Any): The value.
+            ttl (Optional[float]): Ignored, the value never expires.
+        """
+        self._memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def delete(self, key: str):
+        self._memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self):
+        self._memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def get_or_fetch(
+        self, key: str, fetch: Callable[[], _T], ttl: Optional[float] = None
+    ) -> _T:
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            future = self._fetching.get(key)
+            fetching = future is None
+            if future is None:
+                future = self._fetching[key] = Future()
+        if not fetching:
+            return future.result()
+
+        try:
+            # Another thread could have fetched the value since it was looked up
+            value = self.get(key, _MISSING)
+            if value is _MISSING:
+                value = fetch()
+                if value is not None:
+                    self.set(key, value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._fetching[key]
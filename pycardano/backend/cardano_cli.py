@@ -14,7 +14,7 @@ from typing import Dict, List, Optional, Union
 
 import cbor2
 import docker
-from cachetools import Cache, LRUCache, TTLCache, func
+from cachetools import func
 from docker.errors import APIError
 
 from pycardano.address import Address
@@ -24,6 +24,7 @@ from pycardano.backend.base import (
     GenesisParameters,
     ProtocolParameters,
 )
+from pycardano.backend.cache import ChainCache, MemoryCache
 from pycardano.exception import (
     CardanoCliError,
     PyCardanoException,
@@ -99,6 +100,13 @@ class DockerConfig:
 
 
 class CardanoCliChainContext(ChainContext):
+    """A chain context querying a local node with the cardano-cli.
+
+    Protocol parameters, genesis parameters and UTxOs are stored in ``cache``, which other chain contexts and
+    processes can share, see :mod:`pycardano.backend.cache`. By default, they are stored in a
+    :class:`pycardano.backend.cache.MemoryCache` of ``utxo_cache_size + datum_cache_size`` entries.
+    """
+
     _binary: Path
     _socket: Optional[Path]
     _config_file: Path
@@ -107,8 +115,7 @@ class CardanoCliChainContext(ChainContext):
     _last_chain_tip_fetch: float
     _genesis_param: Optional[GenesisParameters]
     _protocol_param: Optional[ProtocolParameters]
-    _utxo_cache: Cache
-    _datum_cache: Cache
+    _cache: ChainCache
     _docker_config: Optional[DockerConfig]
     _network_magic_number: Optional[int]
 
@@ -123,6 +130,7 @@ class CardanoCliChainContext(ChainContext):
         datum_cache_size: int = 10000,
         docker_config: Optional[DockerConfig] = None,
         network_magic_number: Optional[int] = None,
+        cache: Optional[ChainCache] = None,
     ):
         if docker_config is None:
             if not binary.exists() or not binary.is_file():
@@ -152,19 +160,19 @@ class CardanoCliChainContext(ChainContext):
         self._last_chain_tip_fetch = 0
         self._genesis_param = None
         self._protocol_param = None
+        self._docker_config = docker_config
+        self._network_magic_number = network_magic_number
+        self._cache = (
+            cache
+            if cache is not None
+            else MemoryCache(maxsize=utxo_cache_size + datum_cache_size)
+        )
         if refetch_chain_tip_interval is None:
             self._refetch_chain_tip_interval = float(
                 self.genesis_param.slot_length
                 / self.genesis_param.active_slots_coefficient
             )
 
-        self._utxo_cache = TTLCache(
-            ttl=self._refetch_chain_tip_interval, maxsize=utxo_cache_size
-        )
-        self._datum_cache = LRUCache(maxsize=datum_cache_size)
-        self._docker_config = docker_config
-        self._network_magic_number = network_magic_number
-
     @property
     def _network_args(self) -> List[str]:
         if self._network is CardanoCliNetwork.CUSTOM:
@@ -172,6 +180,10 @@ class CardanoCliChainContext(ChainContext):
         else:
             return self._network.value
 
+    @property
+    def _cache_namespace(self) -> str:
+        return " ".join(["cardano-cli"] + self._network_args)
+
     def _run_command(self, cmd: List[str]) -> str:
         """
         Runs the command in the cardano-cli. If the docker configuration is set, it will run the command in the
@@ -339,12 +351,24 @@ class CardanoCliChainContext(ChainContext):
     def protocol_param(self) -> ProtocolParameters:
         """Get current protocol parameters"""
         if not self._protocol_param or self._is_chain_tip_updated():
-            self._protocol_param = self._fetch_protocol_param()
+            self._protocol_param = self._cache.get_or_fetch(
+                f"protocol_param:{self._cache_namespace}",
+                self._fetch_protocol_param,
+                ttl=self._refetch_chain_tip_interval,
+            )
         return self._protocol_param
 
     @property
     def genesis_param(self) -> GenesisParameters:
         """Get chain genesis parameters"""
+        if not self._genesis_param:
+            # The genesis of a network never changes
+            self._genesis_param = self._cache.get_or_fetch(
+                f"genesis_param:{self._cache_namespace}", self._fetch_genesis_param
+            )
+        return self._genesis_param
+
+    def _fetch_genesis_param(self) -> GenesisParameters:
         genesis_params = self._query_genesis_config()
         return GenesisParameters(
             active_slots_coefficient=genesis_params["activeSlotsCoeff"],
@@ -426,10 +450,13 @@ class CardanoCliChainContext(ChainContext):
         Returns:
             List[UTxO]: A list of UTxOs.
         """
-        key = (self.last_block_slot, address)
-        if key in self._utxo_cache:
-            return self._utxo_cache[key]
+        return self._cache.get_or_fetch(
+            f"utxos:{self._cache_namespace}:{self.last_block_slot}:{address}",
+            lambda: self._fetch_utxos(address),
+            ttl=self._refetch_chain_tip_interval,
+        )
 
+    def _fetch_utxos(self, address: str) -> List[UTxO]:
         result = self._run_command(
             ["query", "utxo", "--address", address, "--out-file", "/dev/stdout"]
             + self._network_args
@@ -487,8 +514,6 @@ class CardanoCliChainContext(ChainContext):
 
             utxos.append(UTxO(tx_in, tx_out))
 
-        self._utxo_cache[key] = utxos
-
         return utxos
 
     def submit_tx_cbor(self, cbor: Union[bytes, str]) -> str:
@@ -0,0 +1,254 @@
+"""A pooled HTTP session, which bounds concurrent requests, and retries them with exponential backoff."""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+__all__ = ["HTTPSessionPool", "HTTPPoolMetrics"]
+
+# Methods that can be sent twice without side effects
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+@dataclass(frozen=True)
+class HTTPPoolMetrics:
+    """Metrics of the requests sent through a :class:`HTTPSessionPool`."""
+
+    requests: int
+    """Number of requests sent, retries included"""
+
+    retries: int
+    """Number of retries"""
+
+    failures: int
+    """Number of requests which failed after all their retries, because of an error or of a retryable status"""
+
+    in_flight: int
+    """Number of requests being sent, or waiting for a response"""
+
+    max_in_flight: int
+    """Maximum number of requests in flight at once"""
+
+    waiting: int
+    """Number of requests waiting for another request to complete, to be sent"""
+
+    connections: int
+    """Number of connections opened"""
+
+    wait_time: float
+    """Total seconds requests waited for another request to complete"""
+
+    backoff_time: float
+    """Total seconds waited between retries"""
+
+    status_codes: Dict[int, int] = field(default_factory=dict)
+    """Number of responses of each status code"""
+
+
+class HTTPSessionPool:
+    """A :class:`requests.Session`, whose connections are kept alive and reused by the requests of all threads.
+
+    At most ``size`` requests are sent at once, the others wait for one of them to complete. The session is
+    recreated after the process is forked.
+
+    A request is retried up to ``max_retries`` times when it is rate limited (status 429). Requests with idempotent
+    methods, e.g. GET, are also retried after a server error (status 500, 502, 503 or 504), a connection error, or
+    a timeout. The n-th retry waits ``backoff_factor * 2 ** (n - 1)`` seconds, or the number of seconds of the
+    Retry-After header of the response if it is longer, and at most ``max_backoff`` seconds.
+
+    Args:
+        size (int): Maximum number of concurrent requests, and of connections kept alive to each host.
+        timeout (Union[None, float, Tuple[float, float]]): Seconds to wait to connect, and to receive data, or a
+            tuple of both, or None to wait indefinitely.
+        max_retries (int): Maximum number of retries of a request.
+        backoff_factor (float): Seconds to wait before the first retry.
+        max_backoff (float): Maximum seconds to wait between retries.
+        headers (Optional[dict]): Headers of all requests.
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    size: int
+    timeout: Union[None, float, Tuple[float, float]]
+    max_retries: int
+    backoff_factor: float
+    max_backoff: float
+    headers: dict
+    _session: Optional[requests.Session]
+    _adapter: Optional[HTTPAdapter]
+    _pid: int
+    _slots: threading.BoundedSemaphore
+    _status_codes: Dict[int, int]
+
+    def __init__(
+        self,
+        size: int = 16,
+        timeout: Union[None, float, Tuple[float, float]] = 60,
+        max_retries: int = 5,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30,
+        headers: Optional[dict] = None,
+    ):
+        if size < 1:
+            raise ValueError(f"Pool size must be positive, got {size}")
+        self.size = size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.headers = headers or {}
+        self._session = None
+        self._adapter = None
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+
+        self._requests = 0
+        self._retries = 0
+        self._failures = 0
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._waiting = 0
+        self._wait_time = 0.0
+        self._backoff_time = 0.0
+        self._status_codes = {}
+
+    def _get_session(self) -> requests.Session:
+        with self._lock:
+            # A session inherited from a parent process shares its connections
+            if self._session is None or self._pid != os.getpid():
+                self._adapter = HTTPAdapter(
+                    pool_maxsize=self.size, pool_block=True, max_retries=0
+                )
+                self._session = requests.Session()
+                self._session.headers.update(self.headers)
+                self._session.mount("http://", self._adapter)
+                self._session.mount("https://", self._adapter)
+                self._pid = os.getpid()
+            return self._session
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        session = self._get_session()
+        start = time.perf_counter()
+        with self._lock:
+            self._waiting += 1
+        with self._slots:
+            with self._lock:
+                self._waiting -= 1
+                self._wait_time += time.perf_counter() - start
+                self._requests += 1
+                self._in_flight += 1
+                self._max_in_flight = max(self._max_in_flight, self._in_flight)
+            try:
+                response = session.request(method, url, **kwargs)
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+        with self._lock:
+            self._status_codes[response.status_code] = (
+                self._status_codes.get(response.status_code, 0) + 1
+            )
+        return response
+
+    def _backoff(self, retry: int, response: Optional[requests.Response]) -> float:
+        delay = self.backoff_factor * 2**retry
+        retry_after = None if response is None else response.headers.get("Retry-After")
+        # Retry-After can also be an HTTP date, which is ignored
+        if retry_after is not None and retry_after.isdigit():
+            delay = max(delay, int(retry_after))
+        return min(delay, self.max_backoff)
+
+    def request(
+        self, method: str, url: str, retry: Optional[bool] = None, **kwargs
+    ) -> requests.Response:
+        """Send a request, and retry it if it fails.
+
+        Args:
+            method (str): HTTP method, e.g. "GET".
+            url (str): URL of the request.
+            retry (Optional[bool]): Whether to retry the request after a server error, a connection error or a
+                timeout. Defaults to whether the method is idempotent. Rate limited requests are always retried.
+            **kwargs: Other arguments of :meth:`requests.Session.request`.
+
+        Returns:
+            requests.Response: The response, which can be an error response, e.g. if the request was still rate
+            limited after all its retries.
+
+        Raises:
+            requests.ConnectionError: When the request fails to connect, after all its retries.
+            requests.Timeout: When the request times out, after all its retries.
+        """
+        if retry is None:
+            retry = method.upper() in _IDEMPOTENT_METHODS
+        kwargs.setdefault("timeout", self.timeout)
+        retries = 0
+        while True:
+            response: Optional[requests.Response] = None
+            try:
+                response = self._send(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if not retry or retries >= self.max_retries:
+                    with self._lock:
+                        self._failures += 1
+                    raise
+            if response is not None:
+                status = response.status_code
+                if status not in self.RETRY_STATUSES or (status != 429 and not retry):
+                    return response
+                if retries >= self.max_retries:
+                    with self._lock:
+                        self._failures += 1
+                    return response
+                # Release the connection of the response
+                response.close()
+
+            delay = self._backoff(retries, response)
+            with self._lock:
+                self._retries += 1
+                self._backoff_time += delay
+            time.sleep(delay)
+            retries += 1
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request, see :meth:`request`."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Send a POST request, see :meth:`request`."""
+        return self.request("POST", url, **kwargs)
+
+    def _connections(self) -> int:
+        adapter = self._adapter
+        if adapter is None or self._pid != os.getpid():
+            return 0
+        pools = adapter.poolmanager.pools
+        return sum(pools[key].num_connections for key in pools.keys())
+
+    @property
+    def metrics(self) -> HTTPPoolMetrics:
+        """A snapshot of the metrics of the requests sent."""
+        with self._lock:
+            return HTTPPoolMetrics(
+                requests=self._requests,
+                retries=self._retries,
+                failures=self._failures,
+                in_flight=self._in_flight,
+                max_in_flight=self._max_in_flight,
+                waiting=self._waiting,
+                connections=self._connections(),
+                wait_time=self._wait_time,
+                backoff_time=self._backoff_time,
+                status_codes=dict(self._status_codes),
+            )
+
+    def close(self):
+        """Close the connections of the session. They are reopened by the next request."""
+        with self._lock:
+            session, self._session, self._adapter = self._session, None, None
+        if session is not None and self._pid == os.getpid():
+            session.close()
@@ -1,14 +1,19 @@
-from typing import Dict, List, Optional, Tuple, Union
-
-import requests
-from cachetools import Cache, LRUCache, TTLCache
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from pycardano.address import Address
-from pycardano.backend.base import ChainContext, GenesisParameters, ProtocolParameters
+from pycardano.backend.base import (
+    _UTXOS_MANY_MAX_WORKERS,
+    ChainContext,
+    GenesisParameters,
+    ProtocolParameters,
+)
 from pycardano.backend.blockfrost import _try_fix_script
+from pycardano.backend.cache import ChainCache, ContentAddressedCache, MemoryCache
+from pycardano.backend.http_pool import HTTPPoolMetrics, HTTPSessionPool
 from pycardano.hash import DatumHash, ScriptHash
 from pycardano.network import Network
-from pycardano.plutus import ExecutionUnits, PlutusScript
+from pycardano.plutus import ExecutionUnits, PlutusScript, ScriptType
 from pycardano.serialization import RawCBOR
 from pycardano.transaction import (
     Asset,
@@ -40,10 +45,33 @@ def extract_asset_info(asset_hash: str) -> Tuple[str, ScriptHash, AssetName]:
 
 
 class KupoChainContextExtension(ChainContext):
+    """A chain context querying UTxOs, datums and scripts from `Kupo <https://cardanosolutions.github.io/kupo/>`_,
+    and everything else from a wrapped chain context.
+
+    UTxOs are stored in ``cache``, and datums and scripts in ``content_cache``, which other chain contexts and
+    processes can share, see :mod:`pycardano.backend.cache`. Each datum and script is only fetched once, even when
+    many UTxOs being queried concurrently refer to it.
+
+    Requests to Kupo are sent through ``http_pool``, which keeps connections alive, bounds concurrent requests, and
+    retries them when they are rate limited or fail, see :class:`pycardano.backend.http_pool.HTTPSessionPool`.
+
+    Args:
+        wrapped_backend (ChainContext): Chain context of all other queries, and of UTxOs if ``kupo_url`` is None.
+        kupo_url (Optional[str]): URL of Kupo.
+        refetch_chain_tip_interval (int): Seconds after which cached UTxOs expire.
+        utxo_cache_size (int): Number of cached UTxO lists of the default cache.
+        datum_cache_size (int): Number of datums and scripts of the default content cache kept in memory.
+        cache (Optional[ChainCache]): Cache of UTxOs. Defaults to a :class:`pycardano.backend.cache.MemoryCache`.
+        content_cache (Optional[ContentAddressedCache]): Cache of datums and scripts.
+        http_pool (Optional[HTTPSessionPool]): Session of the requests to Kupo. Defaults to a session of
+            :class:`pycardano.backend.http_pool.HTTPSessionPool` with default settings.
+    """
+
     _wrapped_backend: ChainContext
     _kupo_url: Optional[str]
-    _utxo_cache: Cache
-    _datum_cache: Cache
+    _cache: ChainCache
+    _content_cache: ContentAddressedCache
+    _http_pool: HTTPSessionPool
     _refetch_chain_tip_interval: int
 
     def __init__(
@@ -53,14 +81,34 @@ class KupoChainContextExtension(ChainContext):
         refetch_chain_tip_interval: int = 10,
         utxo_cache_size: int = 1000,
         datum_cache_size: int = 1000,
+        cache: Optional[ChainCache] = None,
+        content_cache: Optional[ContentAddressedCache] = None,
+        http_pool: Optional[HTTPSessionPool] = None,
     ):
         self._kupo_url = kupo_url
         self._wrapped_backend = wrapped_backend
         self._refetch_chain_tip_interval = refetch_chain_tip_interval
-        self._utxo_cache = TTLCache(
-            ttl=self._refetch_chain_tip_interval, maxsize=utxo_cache_size
+        self._cache = cache if cache is not None else MemoryCache(utxo_cache_size)
+        self._content_cache = (
+            content_cache
+            if content_cache is not None
+            else ContentAddressedCache(datum_cache_size)
         )
-        self._datum_cache = LRUCache(maxsize=datum_cache_size)
+        self._http_pool = http_pool if http_pool is not None else HTTPSessionPool()
+
+    @property
+    def http_metrics(self) -> HTTPPoolMetrics:
+        """Metrics of the requests to Kupo"""
+        return self._http_pool.metrics
+
+    def close(self):
+        """Close the connections to Kupo. They are reopened by the next query."""
+        self._http_pool.close()
+
+    def _get(self, url: str) -> Any:
+        response = self._http_pool.get(url)
+        response.raise_for_status()
+        return response.json()
 
     @property
     def genesis_param(self) -> GenesisParameters:
@@ -88,6 +136,9 @@ class KupoChainContextExtension(ChainContext):
         """Last block slot"""
         return self._wrapped_backend.last_block_slot
 
+    def _utxo_cache_key(self, slot: int, address: str) -> str:
+        return f"utxos:{self._kupo_url}:{slot}:{address}"
+
     def _utxos(self, address: str) -> List[UTxO]:
         """Get all UTxOs associated with an address.
 
@@ -97,18 +148,58 @@ class KupoChainContextExtension(ChainContext):
         Returns:
             List[UTxO]: A list of UTxOs.
         """
-        key = (self.last_block_slot, address)
-        if key in self._utxo_cache:
-            return self._utxo_cache[key]
+        return self._cache.get_or_fetch(
+            self._utxo_cache_key(self.last_block_slot, address),
+            lambda: (
+                self._utxos_kupo(address)
+                if self._kupo_url
+                else self._wrapped_backend.utxos(address)
+            ),
+            ttl=self._refetch_chain_tip_interval,
+        )
 
-        if self._kupo_url:
-            utxos = self._utxos_kupo(address)
-        else:
-            utxos = self._wrapped_backend.utxos(address)
+    def _utxos_many(self, addresses: List[str]) -> List[List[UTxO]]:
+        """Get all UTxOs associated with each of many addresses.
 
-        self._utxo_cache[key] = utxos
+        UTxOs that are not cached are queried from Kupo concurrently, or from the wrapped backend all at once.
 
-        return utxos
+        Args:
+            addresses (List[str]): Addresses encoded with bech32.
+
+        Returns:
+            List[List[UTxO]]: A list of UTxOs for each address, in the same order as the addresses.
+        """
+        slot = self.last_block_slot
+        results: Dict[str, List[UTxO]] = {}
+        missing = []
+        for address in dict.fromkeys(addresses):
+            utxos = self._cache.get(self._utxo_cache_key(slot, address))
+            if utxos is not None:
+                results[address] = utxos
+            else:
+                missing.append(address)
+
+        if len(missing) > 1 and self._kupo_url:
+            with ThreadPoolExecutor(
+                max_workers=min(
+                    len(missing), _UTXOS_MANY_MAX_WORKERS, self._http_pool.size
+                )
+            ) as executor:
+                fetched = list(executor.map(self._utxos_kupo, missing))
+        elif self._kupo_url:
+            fetched = [self._utxos_kupo(address) for address in missing]
+        else:
+            fetched = self._wrapped_backend.utxos_many(missing)
+
+        for address, utxos in zip(missing, fetched):
+            results[address] = utxos
+            self._cache.set(
+                self._utxo_cache_key(slot, address),
+                utxos,
+                ttl=self._refetch_chain_tip_interval,
+            )
+
+        return [results[address] for address in addresses]
 
     def _get_datum_from_kupo(self, datum_hash: str) -> Optional[RawCBOR]:
         """Get datum from Kupo.
@@ -119,23 +210,49 @@ class KupoChainContextExtension(ChainContext):
         Returns:
             Optional[RawCBOR]: A datum.
         """
-        datum = self._datum_cache.get(datum_hash, None)
+        if self._kupo_url is None:
+            raise AssertionError(
+                "kupo_url object attribute has not been assigned properly."
+            )
+
+        kupo_datum_url = self._kupo_url + "/datums/" + datum_hash
+
+        def fetch() -> Optional[RawCBOR]:
+            datum_result = self._get(kupo_datum_url)
+            if datum_result and datum_result["datum"] != datum_hash:
+                return RawCBOR(bytes.fromhex(datum_result["datum"]))
+            return None
 
-        if datum is not None:
-            return datum
+        return self._content_cache.get_or_fetch(f"datum:{datum_hash}", fetch)
 
+    def _get_script_from_kupo(self, script_hash: str) -> ScriptType:
+        """Get script from Kupo.
+
+        Args:
+            script_hash (str): A script hash.
+
+        Returns:
+            ScriptType: A script.
+        """
         if self._kupo_url is None:
             raise AssertionError(
                 "kupo_url object attribute has not been assigned properly."
             )
 
-        kupo_datum_url = self._kupo_url + "/datums/" + datum_hash
-        datum_result = requests.get(kupo_datum_url).json()
-        if datum_result and datum_result["datum"] != datum_hash:
-            datum = RawCBOR(bytes.fromhex(datum_result["datum"]))
+        kupo_script_url = self._kupo_url + "/scripts/" + script_hash
+
+        def fetch() -> ScriptType:
+            script = self._get(kupo_script_url)
+            ver = int(script["language"].removeprefix("plutus:v"))
+            if 1 <= ver <= 3:
+                return _try_fix_script(
+                    script_hash,
+                    PlutusScript.from_version(ver, bytes.fromhex(script["script"])),
+                )
+            else:
+                raise ValueError("Unknown plutus script type")
 
-        self._datum_cache[datum_hash] = datum
-        return datum
+        return self._content_cache.get_or_fetch(f"script:{script_hash}", fetch)
 
     def _utxos_kupo(self, address: str) -> List[UTxO]:
         """Get all UTxOs associated with an address with Kupo.
@@ -154,7 +271,7 @@ class KupoChainContextExtension(ChainContext):
             )
 
         kupo_utxo_url = self._kupo_url + "/matches/" + address + "?unspent"
-        results = requests.get(kupo_utxo_url).json()
+        results = self._get(kupo_utxo_url)
 
         utxos = []
 
@@ -170,16 +287,7 @@ class KupoChainContextExtension(ChainContext):
                 script = None
                 script_hash = result.get("script_hash", None)
                 if script_hash:
-                    kupo_script_url = self._kupo_url + "/scripts/" + script_hash
-                    script = requests.get(kupo_script_url).json()
-                    ver = int(script["language"].removeprefix("plutus:v"))
-                    if 1 <= ver <= 3:
-                        script = PlutusScript.from_version(
-                            ver, bytes.fromhex(script["script"])
-                        )
-                        script = _try_fix_script(script_hash, script)
-                    else:
-                        raise ValueError("Unknown plutus script type")
+                    script = self._get_script_from_kupo(script_hash)
 
                 datum = None
                 datum_hash = (
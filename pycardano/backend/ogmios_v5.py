@@ -1,11 +1,9 @@
-import json
 import time
 from datetime import datetime, timezone
 from enum import Enum
 from fractions import Fraction
 from typing import Any, Dict, List, Optional, Union
 
-import websocket
 from cachetools import Cache, LRUCache, TTLCache, func
 
 from pycardano.address import Address
@@ -16,6 +14,7 @@ from pycardano.backend.base import (
     ProtocolParameters,
 )
 from pycardano.backend.kupo import KupoChainContextExtension, extract_asset_info
+from pycardano.backend.websocket_pool import WebSocketConnectionPool
 from pycardano.exception import TransactionFailedException
 from pycardano.hash import DatumHash
 from pycardano.network import Network
@@ -40,10 +39,25 @@ class OgmiosQueryType(str, Enum):
     EvaluateTx = "EvaluateTx"
 
 
+class _OgmiosV5ConnectionPool(WebSocketConnectionPool):
+    """Ogmios v5 responds to a request with its ``mirror`` as ``reflection``, instead of a JSON-RPC id."""
+
+    def _tag(self, message: dict, request_id: int):
+        message["mirror"] = {"id": request_id}
+
+    def _response_id(self, response: dict) -> Any:
+        return (response.get("reflection") or {}).get("id")
+
+
 class OgmiosV5ChainContext(ChainContext):
-    """Legacy Ogmios Chain Context for Ogmios v5"""
+    """Legacy Ogmios Chain Context for Ogmios v5
+
+    Requests are pipelined over ``connection_pool_size`` persistent websocket connections, which threads can share,
+    see :class:`pycardano.backend.websocket_pool.WebSocketConnectionPool`.
+    """
 
     _ws_url: str
+    _pool: WebSocketConnectionPool
     _network: Network
     _service_name: str
     _last_known_block_slot: int
@@ -61,8 +75,13 @@ class OgmiosV5ChainContext(ChainContext):
         refetch_chain_tip_interval: Optional[float] = None,
         utxo_cache_size: int = 10000,
         datum_cache_size: int = 10000,
+        connection_pool_size: int = 1,
+        timeout: Optional[float] = None,
     ):
         self._ws_url = ws_url
+        self._pool = _OgmiosV5ConnectionPool(
+            ws_url, size=connection_pool_size, timeout=timeout
+        )
         self._network = network
         self._service_name = "ogmios.v1:compact" if compact_result else "ogmios"
         self._last_known_block_slot = 0
@@ -86,9 +105,7 @@ class OgmiosV5ChainContext(ChainContext):
         self._datum_cache = LRUCache(maxsize=datum_cache_size)
 
     def _request(self, method: OgmiosQueryType, args: JsonDict) -> Any:
-        ws = websocket.WebSocket()
-        ws.connect(self._ws_url)
-        request = json.dumps(
+        response = self._pool.request(
             {
                 "type": "jsonwsp/request",
                 "version": "1.0",
@@ -96,16 +113,18 @@ class OgmiosV5ChainContext(ChainContext):
                 "methodname": method.value,
                 "args": args,
             },
-            separators=(",", ":"),
+            # Not retried, a transaction submitted before its connection closed could be submitted twice
+            retry=method != OgmiosQueryType.SubmitTx,
         )
-        ws.send(request)
-        response = ws.recv()
-        ws.close()
         if "result" not in response:
             raise TransactionFailedException(
                 f"Ogmios ran into an error. Reponse: {response}"
             )
-        return json.loads(response)["result"]
+        return response["result"]
+
+    def close(self):
+        """Close the websocket connections to Ogmios. They are reopened by the next request."""
+        self._pool.close()
 
     def _query_current_protocol_params(self) -> JsonDict:
         args = {"query": "currentProtocolParameters"}
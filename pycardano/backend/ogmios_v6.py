@@ -1,20 +1,38 @@
+import asyncio
+import itertools
+import json
 import time
-from typing import Dict, List, Optional, Union
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar, Union
 
-from cachetools import Cache, LRUCache, TTLCache, func
-from ogmios.client import Client as OgmiosClient
+from cachetools import Cache, TTLCache, func
 from ogmios.datatypes import Address as OgmiosAddress
 from ogmios.datatypes import Era as OgmiosEra
 from ogmios.datatypes import ProtocolParameters as OgmiosProtocolParameters
 from ogmios.datatypes import Tip as OgmiosTip
-from ogmios.datatypes import TxOutputReference as OgmiosTxOutputReference
 from ogmios.datatypes import Utxo as OgmiosUtxo
+from ogmios.statequery import (
+    QueryEpoch,
+    QueryEraSummaries,
+    QueryGenesisConfiguration,
+    QueryNetworkTip,
+    QueryProtocolParameters,
+    QueryRewardAccountSummaries,
+    QueryUtxo,
+)
+from ogmios.txsubmit import EvaluateTransaction, SubmitTransaction
 from ogmios.utils import GenesisParameters as OgmiosGenesisParameters
-from ogmios.utils import get_current_era
+from websockets.asyncio.client import ClientConnection, connect
 
 from pycardano.address import Address
-from pycardano.backend.base import ChainContext, GenesisParameters, ProtocolParameters
+from pycardano.backend.base import (
+    AsyncChainContext,
+    ChainContext,
+    GenesisParameters,
+    ProtocolParameters,
+)
+from pycardano.backend.cache import ChainCache, ContentAddressedCache, MemoryCache
 from pycardano.backend.kupo import KupoChainContextExtension
+from pycardano.backend.websocket_pool import WebSocketConnectionPool
 from pycardano.hash import DatumHash, ScriptHash
 from pycardano.network import Network
 from pycardano.plutus import (
@@ -37,21 +55,37 @@ from pycardano.transaction import (
 ALONZO_COINS_PER_UTXO_WORD = 34482
 DEFAULT_REFETCH_INTERVAL = 1000
 
-__all__ = ["OgmiosV6ChainContext", "OgmiosChainContext", "KupoOgmiosV6ChainContext"]
+_T = TypeVar("_T")
+
+__all__ = [
+    "OgmiosV6ChainContext",
+    "OgmiosChainContext",
+    "KupoOgmiosV6ChainContext",
+    "AsyncOgmiosV6ChainContext",
+]
 
 
 class OgmiosV6ChainContext(ChainContext):
-    """Ogmios chain context for use with PyCardano"""
+    """Ogmios chain context for use with PyCardano
+
+    Queries are pipelined over ``connection_pool_size`` persistent websocket connections, which threads can share,
+    see :class:`pycardano.backend.websocket_pool.WebSocketConnectionPool`. A query fails with :class:`TimeoutError`
+    if Ogmios does not respond within ``timeout`` seconds, or never if ``timeout`` is None.
+
+    Protocol parameters, genesis parameters and UTxOs are stored in ``cache``, which other chain contexts and
+    processes can share, see :mod:`pycardano.backend.cache`. By default, they are stored in a
+    :class:`pycardano.backend.cache.MemoryCache` of ``utxo_cache_size + datum_cache_size`` entries.
+    """
 
     _network: Network
-    _client: OgmiosClient
+    _pool: WebSocketConnectionPool
     _service_name: str
     _last_known_block_slot: int
     _last_chain_tip_fetch: float
     _genesis_param: Optional[GenesisParameters]
     _protocol_param: Optional[OgmiosProtocolParameters]
-    _utxo_cache: Cache
-    _datum_cache: Cache
+    _cache: ChainCache
+    _cache_namespace: str
 
     def __init__(
         self,
@@ -64,6 +98,9 @@ class OgmiosV6ChainContext(ChainContext):
         datum_cache_size: int = 10000,
         network: Network = Network.TESTNET,
         additional_headers: Optional[dict] = None,
+        connection_pool_size: int = 1,
+        timeout: Optional[float] = None,
+        cache: Optional[ChainCache] = None,
     ):
         self.host = host
         self.port = port
@@ -71,6 +108,13 @@ class OgmiosV6ChainContext(ChainContext):
         self.secure = secure
         self.additional_headers = additional_headers or {}
         self._network = network
+        url = f"{'wss' if secure else 'ws'}://{host}:{port}/{path}"
+        self._pool = WebSocketConnectionPool(
+            url,
+            size=connection_pool_size,
+            additional_headers=self.additional_headers,
+            timeout=timeout,
+        )
         self._service_name = "ogmios"
         self._last_known_block_slot = 0
         self._refetch_chain_tip_interval = (
@@ -82,46 +126,59 @@ class OgmiosV6ChainContext(ChainContext):
         self._genesis_param = None
         self._protocol_param = None
 
-        self._utxo_cache = TTLCache(
-            ttl=self._refetch_chain_tip_interval, maxsize=utxo_cache_size
+        self._cache = (
+            cache
+            if cache is not None
+            else MemoryCache(maxsize=utxo_cache_size + datum_cache_size)
         )
-        self._datum_cache = LRUCache(maxsize=datum_cache_size)
+        self._cache_namespace = url
+
+    def _request(
+        self, method: str, params: Optional[dict] = None, retry: bool = True
+    ) -> dict:
+        request: Dict[str, Any] = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            request["params"] = params
+        return self._pool.request(request, retry=retry)
+
+    def close(self):
+        """Close the websocket connections to Ogmios. They are reopened by the next query."""
+        self._pool.close()
 
     def _query_current_era(self) -> OgmiosEra:
-        with OgmiosClient(
-            self.host, self.port, self.path, self.secure, self.additional_headers
-        ) as client:
-            return get_current_era(client)
+        response = self._request("queryLedgerState/eraSummaries")
+        era_summaries, _ = QueryEraSummaries._parse_QueryEraSummaries_response(response)
+        return OgmiosEra.by_index(len(era_summaries) - 1)
 
     def _query_current_epoch(self) -> int:
-        with OgmiosClient(
-            self.host, self.port, self.path, self.secure, self.additional_headers
-        ) as client:
-            epoch, _ = client.query_epoch.execute()
-            return epoch
+        response = self._request("queryLedgerState/epoch")
+        epoch, _ = QueryEpoch._parse_QueryEpoch_response(response)
+        return epoch
 
     def _query_chain_tip(self) -> OgmiosTip:
-        with OgmiosClient(
-            self.host, self.port, self.path, self.secure, self.additional_headers
-        ) as client:
-            tip, _ = client.query_network_tip.execute()
-            return tip
-
-    def _query_utxos_by_address(self, address: Address) -> List[OgmiosUtxo]:
-        with OgmiosClient(
-            self.host, self.port, self.path, self.secure, self.additional_headers
-        ) as client:
-            utxos, _ = client.query_utxo.execute([address])
-            return utxos
+        response = self._request("queryNetwork/tip")
+        tip, _ = QueryNetworkTip._parse_QueryNetworkTip_response(response)
+        return tip
+
+    def _query_utxos(self, params: dict) -> List[OgmiosUtxo]:
+        response = self._request("queryLedgerState/utxo", params)
+        utxos, _ = QueryUtxo._parse_QueryUtxo_response(response)
+        return utxos
+
+    def _query_utxos_by_address(self, address: OgmiosAddress) -> List[OgmiosUtxo]:
+        return self._query_utxos({"addresses": [address.address]})
+
+    def _query_utxos_by_addresses(
+        self, addresses: List[OgmiosAddress]
+    ) -> List[OgmiosUtxo]:
+        return self._query_utxos(
+            {"addresses": [address.address for address in addresses]}
+        )
 
     def _query_utxos_by_tx_id(self, tx_id: str, index: int) -> List[OgmiosUtxo]:
-        with OgmiosClient(
-            self.host, self.port, self.path, self.secure, self.additional_headers
-        ) as client:
-            utxos, _ = client.query_utxo.execute(
-                [OgmiosTxOutputReference(tx_id, index)]
-            )
-            return utxos
+        return self._query_utxos(
+            {"outputReferences": [{"transaction": {"id": tx_id}, "index": index}]}
+        )
 
     def _is_chain_tip_updated(self):
         # fetch at most every twenty seconds!
@@ -143,67 +200,32 @@ class OgmiosV6ChainContext(ChainContext):
     @property
     def protocol_param(self) -> ProtocolParameters:
         if not self._protocol_param or self._is_chain_tip_updated():
-            self._protocol_param = self._fetch_protocol_param()
+            self._protocol_param = self._cache.get_or_fetch(
+                f"protocol_param:{self._cache_namespace}",
+                self._fetch_protocol_param,
+                ttl=self._refetch_chain_tip_interval,
+            )
         return self._protocol_param
 
     def _fetch_protocol_param(self) -> ProtocolParameters:
-        with OgmiosClient(
-            self.host, self.port, self.path, self.secure, self.additional_headers
-        ) as client:
-            protocol_parameters, _ = client.query_protocol_parameters.execute()
-            pyc_protocol_params = ProtocolParameters(
-                min_fee_constant=protocol_parameters.min_fee_constant.lovelace,
-                min_fee_coefficient=protocol_parameters.min_fee_coefficient,
-                min_pool_cost=protocol_parameters.min_stake_pool_cost.lovelace,
-                max_block_size=protocol_parameters.max_block_body_size.get("bytes"),
-                max_tx_size=protocol_parameters.max_transaction_size.get("bytes"),
-                max_block_header_size=protocol_parameters.max_block_header_size.get(
-                    "bytes"
-                ),
-                key_deposit=protocol_parameters.stake_credential_deposit.lovelace,
-                pool_deposit=protocol_parameters.stake_pool_deposit.lovelace,
-                pool_influence=eval(protocol_parameters.stake_pool_pledge_influence),
-                monetary_expansion=eval(protocol_parameters.monetary_expansion),
-                treasury_expansion=eval(protocol_parameters.treasury_expansion),
-                decentralization_param=None,  # type: ignore[arg-type]
-                extra_entropy=protocol_parameters.extra_entropy,
-                protocol_major_version=protocol_parameters.version.get("major"),
-                protocol_minor_version=protocol_parameters.version.get("minor"),
-                min_utxo=None,  # type: ignore[arg-type]
-                price_mem=eval(
-                    protocol_parameters.script_execution_prices.get("memory")
-                ),
-                price_step=eval(protocol_parameters.script_execution_prices.get("cpu")),
-                max_tx_ex_mem=protocol_parameters.max_execution_units_per_transaction.get(
-                    "memory"
-                ),
-                max_tx_ex_steps=protocol_parameters.max_execution_units_per_transaction.get(
-                    "cpu"
-                ),
-                max_block_ex_mem=protocol_parameters.max_execution_units_per_block.get(
-                    "memory"
-                ),
-                max_block_ex_steps=protocol_parameters.max_execution_units_per_block.get(
-                    "cpu"
-                ),
-                max_val_size=protocol_parameters.max_value_size.get("bytes"),
-                collateral_percent=protocol_parameters.collateral_percentage,
-                max_collateral_inputs=protocol_parameters.max_collateral_inputs,
-                coins_per_utxo_word=ALONZO_COINS_PER_UTXO_WORD,
-                coins_per_utxo_byte=protocol_parameters.min_utxo_deposit_coefficient,
-                cost_models=self._parse_cost_models(
-                    protocol_parameters.plutus_cost_models
-                ),
-                maximum_reference_scripts_size=protocol_parameters.max_ref_script_size,
-                min_fee_reference_scripts=protocol_parameters.min_fee_ref_scripts,
-            )
-            return pyc_protocol_params
+        response = self._request("queryLedgerState/protocolParameters")
+        protocol_parameters, _ = (
+            QueryProtocolParameters._parse_QueryProtocolParameters_response(response)
+        )
+        return _protocol_param_from_ogmios(protocol_parameters)
 
     @property
     def genesis_param(self) -> GenesisParameters:
         if not self._genesis_param or self._is_chain_tip_updated():
             # TODO transform to PyCardano GenesisParameters?
-            self._genesis_param = self._fetch_genesis_param()  # type: ignore[assignment]
+            # The raw configurations are cached, as caches only restore PyCardano types and plain data
+            self._genesis_param = _genesis_param_from_ogmios(  # type: ignore[assignment]
+                self._cache.get_or_fetch(
+                    f"genesis_param:{self._cache_namespace}",
+                    self._fetch_genesis_configurations,
+                    ttl=self._refetch_chain_tip_interval,
+                )
+            )
 
             # Update the refetch interval if we haven't calculated it yet
             if (
@@ -218,11 +240,11 @@ class OgmiosV6ChainContext(ChainContext):
                 )
         return self._genesis_param  # type: ignore[return-value]
 
-    def _fetch_genesis_param(self) -> OgmiosGenesisParameters:
-        with OgmiosClient(
-            self.host, self.port, self.path, self.secure, self.additional_headers
-        ) as client:
-            return OgmiosGenesisParameters(client, self._query_current_era())
+    def _fetch_genesis_configurations(self) -> List[dict]:
+        return [
+            self._request("queryNetwork/genesisConfiguration", {"era": era.value})
+            for era in _genesis_eras(self._query_current_era())
+        ]
 
     @property
     def network(self) -> Network:
@@ -238,16 +260,52 @@ class OgmiosV6ChainContext(ChainContext):
         tip = self._query_chain_tip()
         return tip.slot
 
+    def _utxo_cache_key(self, slot: int, address: str) -> str:
+        return f"utxos:{self._cache_namespace}:{slot}:{address}"
+
     def _utxos(self, address: str) -> List[UTxO]:
-        key = (self.last_block_slot, address)
-        if key in self._utxo_cache:
-            return self._utxo_cache[key]
+        return self._cache.get_or_fetch(
+            self._utxo_cache_key(self.last_block_slot, address),
+            lambda: self._utxos_ogmios(OgmiosAddress(address=address)),
+            ttl=self._refetch_chain_tip_interval,
+        )
 
-        utxos = self._utxos_ogmios(OgmiosAddress(address=address))
+    def _utxos_many(self, addresses: List[str]) -> List[List[UTxO]]:
+        """Get all UTxOs associated with each of many addresses, with a single query for those not cached.
 
-        self._utxo_cache[key] = utxos
+        Args:
+            addresses (List[str]): Addresses encoded with bech32.
 
-        return utxos
+        Returns:
+            List[List[UTxO]]: A list of UTxOs for each address, in the same order as the addresses.
+        """
+        slot = self.last_block_slot
+        results: Dict[str, List[UTxO]] = {}
+        for address in dict.fromkeys(addresses):
+            utxos = self._cache.get(self._utxo_cache_key(slot, address))
+            if utxos is not None:
+                results[address] = utxos
+
+        missing = [
+            address for address in dict.fromkeys(addresses) if address not in results
+        ]
+        if missing:
+            for address in missing:
+                results[address] = []
+            for result in self._query_utxos_by_addresses(
+                [OgmiosAddress(address=address) for address in missing]
+            ):
+                results.setdefault(result.address, []).append(
+                    self._utxo_from_ogmios_result(result)
+                )
+            for address in missing:
+                self._cache.set(
+                    self._utxo_cache_key(slot, address),
+                    results[address],
+                    ttl=self._refetch_chain_tip_interval,
+                )
+
+        return [results[address] for address in addresses]
 
     def _check_utxo_unspent(self, tx_id: str, index: int) -> bool:
         results = self._query_utxos_by_tx_id(tx_id, index)
@@ -272,50 +330,7 @@ class OgmiosV6ChainContext(ChainContext):
 
     def _utxo_from_ogmios_result(self, utxo: OgmiosUtxo) -> UTxO:
         """Convert an Ogmios UTxO result to a PyCardano UTxO."""
-        tx_in = TransactionInput.from_primitive([utxo.tx_id, utxo.index])
-        lovelace_amount = utxo.value.get("ada").get("lovelace", 0)
-        script = utxo.script
-        if script:
-            # TODO: Need to test with native scripts
-            if script["language"].startswith("plutus:v"):
-                script = PlutusScript.from_version(
-                    int(script["language"].removeprefix("plutus:v")),
-                    bytes.fromhex(script["cbor"]),
-                )
-            else:
-                raise ValueError("Unknown plutus script type")
-        datum_hash = (
-            DatumHash.from_primitive(utxo.datum_hash) if utxo.datum_hash else None
-        )
-        datum = None
-        if utxo.datum and utxo.datum != utxo.datum_hash:
-            datum = RawCBOR(bytes.fromhex(utxo.datum))
-        if set(utxo.value.keys()) == {"ada"}:
-            tx_out = TransactionOutput(
-                Address.from_primitive(utxo.address),
-                amount=lovelace_amount,
-                datum_hash=datum_hash,
-                datum=datum,
-                script=script,
-            )
-        else:
-            multi_assets = MultiAsset()
-            for asset_hex, token in utxo.value.items():
-                if asset_hex != "ada":
-                    for token_name_hex, quantity in token.items():
-                        policy = ScriptHash.from_primitive(asset_hex)
-                        token_name = AssetName.from_primitive(token_name_hex)
-                        multi_assets.setdefault(policy, Asset())[token_name] = quantity
-
-            tx_out = TransactionOutput(
-                Address.from_primitive(utxo.address),
-                amount=Value(lovelace_amount, multi_assets),
-                datum_hash=datum_hash,
-                datum=datum,
-                script=script,
-            )
-        pyc_utxo = UTxO(tx_in, tx_out)
-        return pyc_utxo
+        return _utxo_from_ogmios(utxo)
 
     def utxo_by_tx_id(self, tx_id: str, index: int) -> Optional[UTxO]:
         utxos = self._query_utxos_by_tx_id(tx_id, index)
@@ -326,65 +341,37 @@ class OgmiosV6ChainContext(ChainContext):
     def query_account_reward_summaries(
         self, scripts: Optional[List[str]] = None, keys: Optional[List[str]] = None
     ) -> List[dict]:
-        with OgmiosClient(
-            self.host, self.port, self.path, self.secure, self.additional_headers
-        ) as client:
-            summaries, _ = client.query_reward_account_summaries.execute(
-                scripts=scripts, keys=keys
+        params = {}
+        if scripts is not None:
+            params["scripts"] = scripts
+        if keys is not None:
+            params["keys"] = keys
+        response = self._request("queryLedgerState/rewardAccountSummaries", params)
+        summaries, _ = (
+            QueryRewardAccountSummaries._parse_QueryRewardAccountSummaries_response(
+                response
             )
-            return summaries
+        )
+        return summaries
 
     def submit_tx_cbor(self, cbor: Union[bytes, str]):
         if isinstance(cbor, bytes):
             cbor = cbor.hex()
-        with OgmiosClient(
-            self.host, self.port, self.path, self.secure, self.additional_headers
-        ) as client:
-            client.submit_transaction.execute(cbor)
+        # Not retried, a transaction submitted before its connection closed could be submitted twice
+        response = self._request(
+            "submitTransaction", {"transaction": {"cbor": cbor}}, retry=False
+        )
+        SubmitTransaction._parse_SubmitTransaction_response(response)
 
     def evaluate_tx_cbor(self, cbor: Union[bytes, str]) -> Dict[str, ExecutionUnits]:
         if isinstance(cbor, bytes):
             cbor = cbor.hex()
-        with OgmiosClient(
-            self.host, self.port, self.path, self.secure, self.additional_headers
-        ) as client:
-            result, _ = client.evaluate_transaction.execute(cbor)
-            result_dict = {}
-            for res in result:
-                purpose = res["validator"]["purpose"]
-                # Hotfix: this purpose has been renamed in the latest version of Ogmios
-                if purpose == "withdraw":
-                    purpose = "withdrawal"
-                result_dict[f"{purpose}:{res['validator']['index']}"] = ExecutionUnits(
-                    mem=res["budget"]["memory"],
-                    steps=res["budget"]["cpu"],
-                )
-            return result_dict
+        response = self._request("evaluateTransaction", {"transaction": {"cbor": cbor}})
+        result, _ = EvaluateTransaction._parse_EvaluateTransaction_response(response)
+        return _execution_units_from_ogmios(result)
 
     def _parse_cost_models(self, plutus_cost_models):
-        ogmios_cost_models = plutus_cost_models or {}
-
-        cost_models = {}
-        if "plutus:v1" in ogmios_cost_models:
-            cost_models["PlutusV1"] = dict(
-                zip(
-                    sorted(PLUTUS_V1_COST_MODEL.keys()),
-                    ogmios_cost_models["plutus:v1"].copy(),
-                )
-            )
-        if "plutus:v2" in ogmios_cost_models:
-            cost_models["PlutusV2"] = dict(
-                zip(
-                    sorted(PLUTUS_V2_COST_MODEL.keys()),
-                    ogmios_cost_models["plutus:v2"].copy(),
-                )
-            )
-        if "plutus:v3" in ogmios_cost_models:
-            cost_models["PlutusV3"] = {}
-            width = len(f'{len(ogmios_cost_models["plutus:v3"])}')
-            for i, v in enumerate(ogmios_cost_models["plutus:v3"].copy()):
-                cost_models["PlutusV3"][f"{i:0{width}d}"] = v
-        return cost_models
+        return _parse_cost_models(plutus_cost_models)
 
 
 class OgmiosChainContext(OgmiosV6ChainContext):
@@ -404,6 +391,8 @@ def KupoOgmiosV6ChainContext(
     network: Network = Network.TESTNET,
     additional_headers: Optional[dict] = None,
     kupo_url: Optional[str] = None,
+    cache: Optional[ChainCache] = None,
+    content_cache: Optional[ContentAddressedCache] = None,
 ) -> KupoChainContextExtension:
     return KupoChainContextExtension(
         OgmiosV6ChainContext(
@@ -416,6 +405,434 @@ def KupoOgmiosV6ChainContext(
             datum_cache_size,
             network,
             additional_headers,
+            cache=cache,
         ),
         kupo_url,
+        cache=cache,
+        content_cache=content_cache,
+    )
+
+
+class AsyncOgmiosV6ChainContext(AsyncChainContext):
+    """Ogmios chain context for use with asyncio.
+
+    All queries are sent over one websocket connection, which is opened on first use and reopened after it is
+    closed. Responses are matched to their queries by JSON-RPC id, so that concurrent queries don't wait for each
+    other. Concurrent queries of the chain tip and of the protocol parameters are coalesced into one.
+
+    The context is bound to the event loop it is first used in. Close it with :meth:`close`, or use it as an
+    asynchronous context manager.
+    """
+
+    _network: Network
+    _url: str
+    _connection: Optional[ClientConnection]
+    _connect_lock: Optional[asyncio.Lock]
+    _receiver: Optional["asyncio.Task[None]"]
+    _responses: Dict[int, "asyncio.Future[dict]"]
+    _fetching: Dict[str, "asyncio.Future[Any]"]
+    _last_known_block_slot: int
+    _last_chain_tip_fetch: float
+    _last_block_slot: Optional[int]
+    _last_block_slot_fetch: float
+    _genesis_param: Optional[OgmiosGenesisParameters]
+    _protocol_param: Optional[ProtocolParameters]
+    _utxo_cache: Cache
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 1337,
+        path: str = "",
+        secure: bool = False,
+        refetch_chain_tip_interval: Optional[float] = None,
+        utxo_cache_size: int = 10000,
+        network: Network = Network.TESTNET,
+        additional_headers: Optional[dict] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.secure = secure
+        self.additional_headers = additional_headers or {}
+        self._network = network
+        self._url = f"{'wss' if secure else 'ws'}://{host}:{port}/{path}"
+        self._connection = None
+        self._connect_lock = None
+        self._receiver = None
+        self._request_ids = itertools.count()
+        self._responses = {}
+        self._fetching = {}
+        self._last_known_block_slot = 0
+        self._refetch_chain_tip_interval = (
+            refetch_chain_tip_interval
+            if refetch_chain_tip_interval is not None
+            else DEFAULT_REFETCH_INTERVAL
+        )
+        self._last_chain_tip_fetch = 0
+        self._last_block_slot = None
+        self._last_block_slot_fetch = 0
+        self._genesis_param = None
+        self._protocol_param = None
+        self._utxo_cache = TTLCache(
+            ttl=self._refetch_chain_tip_interval, maxsize=utxo_cache_size
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Close the websocket connection."""
+        connection, receiver = self._connection, self._receiver
+        if connection is not None:
+            await connection.close()
+        if receiver is not None:
+            await receiver
+
+    async def _connect(self) -> ClientConnection:
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._connection is None:
+                self._connection = await connect(
+                    self._url, additional_headers=self.additional_headers, max_size=None
+                )
+                self._receiver = asyncio.create_task(self._receive(self._connection))
+            return self._connection
+
+    async def _receive(self, connection: ClientConnection):
+        error: Exception = ConnectionError("Connection to Ogmios closed")
+        try:
+            async for message in connection:
+                response = json.loads(message)
+                future = self._responses.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except Exception as e:
+            error = e
+        finally:
+            # The queries still waiting for a response were sent over this connection, they fail with it
+            if self._connection is connection:
+                self._connection = None
+            for future in self._responses.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._responses.clear()
+
+    async def _request(self, method: str, params: Optional[dict] = None) -> dict:
+        connection = await self._connect()
+        request_id = next(self._request_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._responses[request_id] = future
+        request: Dict[str, Any] = {"jsonrpc": "2.0", "method": method, "id": request_id}
+        if params is not None:
+            request["params"] = params
+        try:
+            await connection.send(json.dumps(request))
+            return await future
+        finally:
+            self._responses.pop(request_id, None)
+
+    async def _coalesce(self, key: str, fetch: Callable[[], Awaitable[_T]]) -> _T:
+        """Await the pending fetch of a key, or start one, such that concurrent callers share a single query."""
+        future = self._fetching.get(key)
+        if future is None:
+            future = self._fetching[key] = asyncio.ensure_future(fetch())
+            future.add_done_callback(lambda _: self._fetching.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _is_chain_tip_updated(self) -> bool:
+        if time.time() - self._last_chain_tip_fetch < self._refetch_chain_tip_interval:
+            return False
+        self._last_chain_tip_fetch = time.time()
+        slot = await self.last_block_slot()
+        if self._last_known_block_slot < slot:
+            self._last_known_block_slot = slot
+            return True
+        else:
+            return False
+
+    async def protocol_param(self) -> ProtocolParameters:
+        if not self._protocol_param or await self._is_chain_tip_updated():
+            self._protocol_param = await self._coalesce(
+                "protocol_param", self._fetch_protocol_param
+            )
+        return self._protocol_param
+
+    async def _fetch_protocol_param(self) -> ProtocolParameters:
+        response = await self._request("queryLedgerState/protocolParameters")
+        protocol_parameters, _ = (
+            QueryProtocolParameters._parse_QueryProtocolParameters_response(response)
+        )
+        return _protocol_param_from_ogmios(protocol_parameters)
+
+    async def genesis_param(self) -> GenesisParameters:
+        if not self._genesis_param or await self._is_chain_tip_updated():
+            genesis_param = await self._coalesce(
+                "genesis_param", self._fetch_genesis_param
+            )
+            self._genesis_param = genesis_param
+
+            # Update the refetch interval if we haven't calculated it yet
+            if (
+                self._refetch_chain_tip_interval == DEFAULT_REFETCH_INTERVAL
+                and genesis_param.slot_length is not None
+                and genesis_param.active_slots_coefficient is not None
+            ):
+                self._refetch_chain_tip_interval = genesis_param.slot_length / float(
+                    genesis_param.active_slots_coefficient
+                )
+        return self._genesis_param  # type: ignore[return-value]
+
+    async def _fetch_genesis_param(self) -> OgmiosGenesisParameters:
+        response = await self._request("queryLedgerState/eraSummaries")
+        era_summaries, _ = QueryEraSummaries._parse_QueryEraSummaries_response(response)
+        latest_era = OgmiosEra.by_index(len(era_summaries) - 1)
+
+        responses = await asyncio.gather(
+            *(
+                self._request("queryNetwork/genesisConfiguration", {"era": era.value})
+                for era in _genesis_eras(latest_era)
+            )
+        )
+        return _genesis_param_from_ogmios(list(responses))
+
+    @property
+    def network(self) -> Network:
+        return self._network
+
+    async def epoch(self) -> int:
+        response = await self._request("queryLedgerState/epoch")
+        epoch, _ = QueryEpoch._parse_QueryEpoch_response(response)
+        return epoch
+
+    async def last_block_slot(self) -> int:
+        if (
+            self._last_block_slot is None
+            or time.time() - self._last_block_slot_fetch >= 1
+        ):
+            self._last_block_slot = await self._coalesce(
+                "last_block_slot", self._fetch_last_block_slot
+            )
+            self._last_block_slot_fetch = time.time()
+        return self._last_block_slot
+
+    async def _fetch_last_block_slot(self) -> int:
+        response = await self._request("queryNetwork/tip")
+        tip, _ = QueryNetworkTip._parse_QueryNetworkTip_response(response)
+        return tip.slot
+
+    async def _query_utxos(self, addresses: List[str]) -> List[OgmiosUtxo]:
+        response = await self._request(
+            "queryLedgerState/utxo", {"addresses": addresses}
+        )
+        utxos, _ = QueryUtxo._parse_QueryUtxo_response(response)
+        return utxos
+
+    async def _utxos(self, address: str) -> List[UTxO]:
+        return (await self._utxos_many([address]))[0]
+
+    async def _utxos_many(self, addresses: List[str]) -> List[List[UTxO]]:
+        """Get all UTxOs associated with each of many addresses, with a single query for those not cached.
+
+        Args:
+            addresses (List[str]): Addresses encoded with bech32.
+
+        Returns:
+            List[List[UTxO]]: A list of UTxOs for each address, in the same order as the addresses.
+        """
+        slot = await self.last_block_slot()
+        results: Dict[str, List[UTxO]] = {}
+        for address in addresses:
+            key = (slot, address)
+            if key in self._utxo_cache:
+                results[address] = self._utxo_cache[key]
+
+        missing = [
+            address for address in dict.fromkeys(addresses) if address not in results
+        ]
+        if missing:
+            for address in missing:
+                results[address] = []
+            for result in await self._query_utxos(missing):
+                results.setdefault(result.address, []).append(_utxo_from_ogmios(result))
+            for address in missing:
+                self._utxo_cache[(slot, address)] = results[address]
+
+        return [results[address] for address in addresses]
+
+    async def submit_tx_cbor(self, cbor: Union[bytes, str]):
+        if isinstance(cbor, bytes):
+            cbor = cbor.hex()
+        response = await self._request(
+            "submitTransaction", {"transaction": {"cbor": cbor}}
+        )
+        SubmitTransaction._parse_SubmitTransaction_response(response)
+
+    async def evaluate_tx_cbor(
+        self, cbor: Union[bytes, str]
+    ) -> Dict[str, ExecutionUnits]:
+        if isinstance(cbor, bytes):
+            cbor = cbor.hex()
+        response = await self._request(
+            "evaluateTransaction", {"transaction": {"cbor": cbor}}
+        )
+        result, _ = EvaluateTransaction._parse_EvaluateTransaction_response(response)
+        return _execution_units_from_ogmios(result)
+
+
+def _protocol_param_from_ogmios(
+    protocol_parameters: OgmiosProtocolParameters,
+) -> ProtocolParameters:
+    return ProtocolParameters(
+        min_fee_constant=protocol_parameters.min_fee_constant.lovelace,
+        min_fee_coefficient=protocol_parameters.min_fee_coefficient,
+        min_pool_cost=protocol_parameters.min_stake_pool_cost.lovelace,
+        max_block_size=protocol_parameters.max_block_body_size.get("bytes"),
+        max_tx_size=protocol_parameters.max_transaction_size.get("bytes"),
+        max_block_header_size=protocol_parameters.max_block_header_size.get("bytes"),
+        key_deposit=protocol_parameters.stake_credential_deposit.lovelace,
+        pool_deposit=protocol_parameters.stake_pool_deposit.lovelace,
+        pool_influence=eval(protocol_parameters.stake_pool_pledge_influence),
+        monetary_expansion=eval(protocol_parameters.monetary_expansion),
+        treasury_expansion=eval(protocol_parameters.treasury_expansion),
+        decentralization_param=None,  # type: ignore[arg-type]
+        extra_entropy=protocol_parameters.extra_entropy,
+        protocol_major_version=protocol_parameters.version.get("major"),
+        protocol_minor_version=protocol_parameters.version.get("minor"),
+        min_utxo=None,  # type: ignore[arg-type]
+        price_mem=eval(protocol_parameters.script_execution_prices.get("memory")),
+        price_step=eval(protocol_parameters.script_execution_prices.get("cpu")),
+        max_tx_ex_mem=protocol_parameters.max_execution_units_per_transaction.get(
+            "memory"
+        ),
+        max_tx_ex_steps=protocol_parameters.max_execution_units_per_transaction.get(
+            "cpu"
+        ),
+        max_block_ex_mem=protocol_parameters.max_execution_units_per_block.get(
+            "memory"
+        ),
+        max_block_ex_steps=protocol_parameters.max_execution_units_per_block.get("cpu"),
+        max_val_size=protocol_parameters.max_value_size.get("bytes"),
+        collateral_percent=protocol_parameters.collateral_percentage,
+        max_collateral_inputs=protocol_parameters.max_collateral_inputs,
+        coins_per_utxo_word=ALONZO_COINS_PER_UTXO_WORD,
+        coins_per_utxo_byte=protocol_parameters.min_utxo_deposit_coefficient,
+        cost_models=_parse_cost_models(protocol_parameters.plutus_cost_models),
+        maximum_reference_scripts_size=protocol_parameters.max_ref_script_size,
+        min_fee_reference_scripts=protocol_parameters.min_fee_ref_scripts,
     )
+
+
+def _genesis_eras(latest_era: OgmiosEra) -> List[OgmiosEra]:
+    """Eras up to the latest era which have a genesis configuration."""
+    eras = []
+    for era in OgmiosEra:
+        if OgmiosEra.is_genesis_era(era):
+            eras.append(era)
+        if era == latest_era:
+            break
+    return eras
+
+
+def _genesis_param_from_ogmios(responses: List[dict]) -> OgmiosGenesisParameters:
+    """Combine the genesis configurations of eras, like ``OgmiosGenesisParameters(client, latest_era)`` does."""
+    genesis_param = OgmiosGenesisParameters.__new__(OgmiosGenesisParameters)
+    for response in responses:
+        configuration, _ = (
+            QueryGenesisConfiguration._parse_QueryGenesisConfiguration_response(
+                response
+            )
+        )
+        genesis_param.era = configuration.era
+        genesis_param.__dict__.update(configuration.__dict__)
+    return genesis_param
+
+
+def _utxo_from_ogmios(utxo: OgmiosUtxo) -> UTxO:
+    """Convert an Ogmios UTxO result to a PyCardano UTxO."""
+    tx_in = TransactionInput.from_primitive([utxo.tx_id, utxo.index])
+    lovelace_amount = utxo.value.get("ada").get("lovelace", 0)
+    script = utxo.script
+    if script:
+        # TODO: Need to test with native scripts
+        if script["language"].startswith("plutus:v"):
+            script = PlutusScript.from_version(
+                int(script["language"].removeprefix("plutus:v")),
+                bytes.fromhex(script["cbor"]),
+            )
+        else:
+            raise ValueError("Unknown plutus script type")
+    datum_hash = DatumHash.from_primitive(utxo.datum_hash) if utxo.datum_hash else None
+    datum = None
+    if utxo.datum and utxo.datum != utxo.datum_hash:
+        datum = RawCBOR(bytes.fromhex(utxo.datum))
+    if set(utxo.value.keys()) == {"ada"}:
+        tx_out = TransactionOutput(
+            Address.from_primitive(utxo.address),
+            amount=lovelace_amount,
+            datum_hash=datum_hash,
+            datum=datum,
+            script=script,
+        )
+    else:
+        multi_assets = MultiAsset()
+        for asset_hex, token in utxo.value.items():
+            if asset_hex != "ada":
+                for token_name_hex, quantity in token.items():
+                    policy = ScriptHash.from_primitive(asset_hex)
+                    token_name = AssetName.from_primitive(token_name_hex)
+                    multi_assets.setdefault(policy, Asset())[token_name] = quantity
+
+        tx_out = TransactionOutput(
+            Address.from_primitive(utxo.address),
+            amount=Value(lovelace_amount, multi_assets),
+            datum_hash=datum_hash,
+            datum=datum,
+            script=script,
+        )
+    pyc_utxo = UTxO(tx_in, tx_out)
+    return pyc_utxo
+
+
+def _execution_units_from_ogmios(result: List[dict]) -> Dict[str, ExecutionUnits]:
+    result_dict = {}
+    for res in result:
+        purpose = res["validator"]["purpose"]
+        # Hotfix: this purpose has been renamed in the latest version of Ogmios
+        if purpose == "withdraw":
+            purpose = "withdrawal"
+        result_dict[f"{purpose}:{res['validator']['index']}"] = ExecutionUnits(
+            mem=res["budget"]["memory"],
+            steps=res["budget"]["cpu"],
+        )
+    return result_dict
+
+
+def _parse_cost_models(plutus_cost_models):
+    ogmios_cost_models = plutus_cost_models or {}
+
+    cost_models = {}
+    if "plutus:v1" in ogmios_cost_models:
+        cost_models["PlutusV1"] = dict(
+            zip(
+                sorted(PLUTUS_V1_COST_MODEL.keys()),
+                ogmios_cost_models["plutus:v1"].copy(),
+            )
+        )
+    if "plutus:v2" in ogmios_cost_models:
+        cost_models["PlutusV2"] = dict(
+            zip(
+                sorted(PLUTUS_V2_COST_MODEL.keys()),
+                ogmios_cost_models["plutus:v2"].copy(),
+            )
+        )
+    if "plutus:v3" in ogmios_cost_models:
+        cost_models["PlutusV3"] = {}
+        width = len(f'{len(ogmios_cost_models["plutus:v3"])}')
+        for i, v in enumerate(ogmios_cost_models["plutus:v3"].copy()):
+            cost_models["PlutusV3"][f"{i:0{width}d}"] = v
+    return cost_models
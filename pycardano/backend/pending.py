@@ -0,0 +1,305 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Union
+
+from pycardano.backend.base import ChainContext, GenesisParameters, ProtocolParameters
+from pycardano.hash import TransactionId
+from pycardano.network import Network
+from pycardano.plutus import ExecutionUnits
+from pycardano.transaction import Transaction, TransactionInput, UTxO
+
+__all__ = ["PendingUTxOChainContext"]
+
+
+@dataclass
+class _PendingTransaction:
+    inputs: List[TransactionInput]
+
+    outputs: List[UTxO]
+
+    submitted_at: float
+
+    ttl: Optional[int]
+
+    # Address of the output whose presence confirms the transaction
+    watched_address: Optional[str]
+
+    # Input -> address holding it, for the inputs whose address is known
+    input_addresses: Dict[TransactionInput, str] = field(default_factory=dict)
+
+
+class PendingUTxOChainContext(ChainContext):
+    """A chain context that applies submitted but unconfirmed transactions to the UTxOs of another chain context.
+
+    Transactions submitted through this context are pending until they are confirmed. The UTxOs returned by
+    :meth:`utxos` exclude the inputs spent by pending transactions and include the outputs they produce, so a
+    transaction can be built on top of the previous one, without waiting for the previous one to be confirmed.
+
+    Whenever UTxOs are queried, the address of the last output of each pending transaction, usually its change
+    output, and the addresses of their inputs when known, are queried from the wrapped context too, with the same
+    :meth:`ChainContext.utxos_many` call. Transactions with many outputs, like payouts, thus only add one address
+    to the query. A pending transaction is confirmed, and removed, once the wrapped context returns one of its
+    outputs, once one of its inputs is no longer returned at its address, i.e. it was spent by this or a
+    conflicting transaction, or once a transaction spending one of its outputs is confirmed. A pending transaction
+    expires, and is removed, once the last block slot reaches its validity end (TTL), or after ``pending_ttl``
+    seconds when given. All other queries are delegated to the wrapped context.
+
+    The context can be shared by threads building and submitting transactions.
+
+    Args:
+        wrapped_backend (ChainContext): The chain context to query and submit transactions to.
+        pending_ttl (Optional[float]): Seconds after which a pending transaction expires. Defaults to None, which
+            only expires transactions at their validity end.
+    """
+
+    _wrapped_backend: ChainContext
+    _pending_ttl: Optional[float]
+    # Guards the pending transactions, and the indices of their inputs and outputs
+    _lock: threading.RLock
+    _pending: Dict[TransactionId, _PendingTransaction]
+    # Input spent by a pending transaction -> id of the transaction
+    _spent: Dict[TransactionInput, TransactionId]
+    # Address -> outputs of pending transactions to this address
+    _produced: Dict[str, Dict[TransactionInput, UTxO]]
+
+    def __init__(
+        self, wrapped_backend: ChainContext, pending_ttl: Optional[float] = None
+    ):
+        self._wrapped_backend = wrapped_backend
+        self._pending_ttl = pending_ttl
+        self._lock = threading.RLock()
+        self._pending = {}
+        self._spent = {}
+        self._produced = {}
+
+    @property
+    def genesis_param(self) -> GenesisParameters:
+        """Get chain genesis parameters"""
+        return self._wrapped_backend.genesis_param
+
+    @property
+    def protocol_param(self) -> ProtocolParameters:
+        """Get current protocol parameters"""
+        return self._wrapped_backend.protocol_param
+
+    @property
+    def network(self) -> Network:
+        """Get current network"""
+        return self._wrapped_backend.network
+
+    @property
+    def epoch(self) -> int:
+        """Current epoch number"""
+        return self._wrapped_backend.epoch
+
+    @property
+    def last_block_slot(self) -> int:
+        """Last block slot"""
+        return self._wrapped_backend.last_block_slot
+
+    @property
+    def pending(self) -> List[TransactionId]:
+        """Ids of the pending transactions, in the order they were submitted."""
+        with self._lock:
+            return list(self._pending)
+
+    def add_pending(self, tx: Transaction):
+        """Apply a transaction submitted by other means to the UTxOs, until it is confirmed or expires.
+
+        Args:
+            tx (Transaction): The submitted transaction.
+        """
+        tx_id = tx.id
+        body = tx.transaction_body
+        pending = _PendingTransaction(
+            # Collaterals are only spent if the transaction fails, and then its outputs are not produced
+            inputs=list(body.inputs),
+            outputs=[
+                UTxO(TransactionInput(tx_id, i), output)
+                for i, output in enumerate(body.outputs)
+            ],
+            submitted_at=time.monotonic(),
+            ttl=body.ttl,
+            watched_address=str(body.outputs[-1].address) if body.outputs else None,
+        )
+        with self._lock:
+            if tx_id in self._pending:
+                return
+            self._pending[tx_id] = pending
+            for tx_in in pending.inputs:
+                self._spent[tx_in] = tx_id
+                # The address of an input is known when it is the output of another pending transaction
+                spending = self._pending.get(tx_in.transaction_id)
+                if spending is not None and tx_in.index < len(spending.outputs):
+                    pending.input_addresses[tx_in] = str(
+                        spending.outputs[tx_in.index].output.address
+                    )
+            for utxo in pending.outputs:
+                self._produced.setdefault(str(utxo.output.address), {})[
+                    utxo.input
+                ] = utxo
+
+    def remove_pending(self, tx_id: TransactionId):
+        """Stop applying a pending transaction to the UTxOs, e.g. because it was confirmed or rejected.
+
+        Args:
+            tx_id (TransactionId): Id of the transaction.
+        """
+        with self._lock:
+            pending = self._pending.pop(tx_id, None)
+            if pending is None:
+                return
+            for tx_in in pending.inputs:
+                if self._spent.get(tx_in) == tx_id:
+                    del self._spent[tx_in]
+            for utxo in pending.outputs:
+                address = str(utxo.output.address)
+                produced = self._produced[address]
+                del produced[utxo.input]
+                if not produced:
+                    del self._produced[address]
+
+    def _confirm(self, tx_id: TransactionId):
+        # A transaction can only be confirmed after the transactions whose outputs it spends
+        confirmed = [tx_id]
+        while confirmed:
+            tx_id = confirmed.pop()
+            pending = self._pending.get(tx_id)
+            if pending is not None:
+                confirmed.extend(tx_in.transaction_id for tx_in in pending.inputs)
+                self.remove_pending(tx_id)
+
+    def _expire(self, slot: Optional[int]):
+        now = time.monotonic()
+        expired = set()
+        # Transactions spending the outputs of expired transactions expire too, they come later in submission order
+        for tx_id, pending in self._pending.items():
+            if (
+                (
+                    self._pending_ttl is not None
+                    and now - pending.submitted_at > self._pending_ttl
+                )
+                or (
+                    slot is not None and pending.ttl is not None and slot >= pending.ttl
+                )
+                or any(tx_in.transaction_id in expired for tx_in in pending.inputs)
+            ):
+                expired.add(tx_id)
+        for tx_id in expired:
+            self.remove_pending(tx_id)
+
+    def _pending_addresses(self) -> Set[str]:
+        addresses: Set[str] = set()
+        for pending in self._pending.values():
+            if pending.watched_address is not None:
+                addresses.add(pending.watched_address)
+            addresses.update(pending.input_addresses.values())
+        return addresses
+
+    def _update(self, utxos_by_address: Dict[str, List[UTxO]], slot: Optional[int]):
+        self._expire(slot)
+        unspent = set()
+        for address, utxos in utxos_by_address.items():
+            for utxo in utxos:
+                unspent.add(utxo.input)
+                tx_id = self._spent.get(utxo.input)
+                if tx_id is not None:
+                    self._pending[tx_id].input_addresses[utxo.input] = address
+
+        for tx_id, pending in list(self._pending.items()):
+            if any(utxo.input in unspent for utxo in pending.outputs):
+                self._confirm(tx_id)
+
+        # An input that is not returned at its address anymore was spent, unless it is produced by a pending
+        # transaction
+        for tx_id, pending in list(self._pending.items()):
+            if tx_id in self._pending and any(
+                address in utxos_by_address
+                and tx_in not in unspent
+                and tx_in.transaction_id not in self._pending
+                for tx_in, address in pending.input_addresses.items()
+            ):
+                self._confirm(tx_id)
+
+    def _utxos(self, address: str) -> List[UTxO]:
+        """Get all UTxOs associated with an address, with pending transactions applied.
+
+        Args:
+            address (str): An address encoded with bech32.
+
+        Returns:
+            List[UTxO]: A list of UTxOs.
+        """
+        return self._utxos_many([address])[0]
+
+    def _utxos_many(self, addresses: List[str]) -> List[List[UTxO]]:
+        """Get all UTxOs associated with each of many addresses, with pending transactions applied.
+
+        Args:
+            addresses (List[str]): Addresses encoded with bech32.
+
+        Returns:
+            List[List[UTxO]]: A list of UTxOs for each address, in the same order as the addresses.
+        """
+        with self._lock:
+            # The addresses of pending transactions are queried along, to confirm them
+            queried = addresses + sorted(
+                self._pending_addresses().difference(addresses)
+            )
+            has_ttl = any(pending.ttl is not None for pending in self._pending.values())
+        # The wrapped context is not queried while holding the lock
+        slot = self.last_block_slot if has_ttl else None
+        if len(queried) == 1:
+            results = [self._wrapped_backend.utxos(queried[0])]
+        else:
+            results = self._wrapped_backend.utxos_many(queried)
+
+        with self._lock:
+            if self._pending:
+                self._update(dict(zip(queried, results)), slot)
+            return [
+                self._apply_pending(address, utxos)
+                for address, utxos in zip(addresses, results)
+            ]
+
+    def _apply_pending(self, address: str, utxos: List[UTxO]) -> List[UTxO]:
+        if not self._pending:
+            return utxos
+
+        result = [utxo for utxo in utxos if utxo.input not in self._spent]
+        known = {utxo.input for utxo in utxos}
+        result.extend(
+            utxo
+            for tx_in, utxo in self._produced.get(address, {}).items()
+            if tx_in not in self._spent and tx_in not in known
+        )
+        return result
+
+    def submit_tx_cbor(self, cbor: Union[bytes, str]):
+        """Submit a transaction to the blockchain, and apply it to the UTxOs until it is confirmed or expires.
+
+        Args:
+            cbor (Union[bytes, str]): The transaction to be submitted.
+
+        Raises:
+            :class:`InvalidArgumentException`: When the transaction is invalid.
+            :class:`TransactionFailedException`: When fails to submit the transaction to blockchain.
+        """
+        result = self._wrapped_backend.submit_tx_cbor(cbor)
+        self.add_pending(Transaction.from_cbor(cbor))
+        return result
+
+    def evaluate_tx_cbor(self, cbor: Union[bytes, str]) -> Dict[str, ExecutionUnits]:
+        """Evaluate execution units of a transaction.
+
+        Args:
+            cbor (Union[bytes, str]): The serialized transaction to be evaluated.
+
+        Returns:
+            Dict[str, ExecutionUnits]: A list of execution units calculated for each of the transaction's redeemers
+
+        Raises:
+            :class:`TransactionFailedException`: When fails to evaluate the transaction.
+        """
+        return self._wrapped_backend.evaluate_tx_cbor(cbor)
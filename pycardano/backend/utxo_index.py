@@ -0,0 +1,451 @@
+"""An index of the UTxOs of watched addresses, kept current by following the chain with Ogmios chain-sync."""
+
+import json
+import threading
+from collections import deque
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+from ogmios.datatypes import Utxo as OgmiosUtxo
+from ogmios.errors import ResponseError
+from ogmios.statequery import QueryUtxo
+from websockets.sync.client import ClientConnection, connect
+
+from pycardano.address import Address
+from pycardano.backend.base import ChainContext, GenesisParameters, ProtocolParameters
+from pycardano.backend.ogmios_v6 import _utxo_from_ogmios
+from pycardano.logging import logger
+from pycardano.network import Network
+from pycardano.plutus import ExecutionUnits
+from pycardano.transaction import UTxO
+
+__all__ = ["ChainSyncUTxOIndex"]
+
+# Transaction id and index of an output
+_OutputReference = Tuple[str, int]
+
+# Ogmios code of a findIntersection error, when none of the points is on the chain
+_INTERSECTION_NOT_FOUND = 1000
+
+# Number of recent points sent to find an intersection when reconnecting
+_INTERSECTION_POINTS = 32
+
+
+class _ResyncRequired(Exception):
+    """The index can't be rolled back to a point of the chain, and must be seeded again."""
+
+
+@dataclass
+class _BlockDelta:
+    """The changes a block made to the index, to undo them when the block is rolled back."""
+
+    previous: Union[str, dict]
+    """Point of the index before the block, "origin" or a dict of the slot and id of the previous block"""
+
+    point: dict
+    """Slot and id of the block"""
+
+    changes: List[Tuple[bool, str, UTxO]] = field(default_factory=list)
+    """Whether each UTxO was created or spent, its address and the UTxO, in the order they were applied"""
+
+
+class ChainSyncUTxOIndex(ChainContext):
+    """A chain context that keeps the UTxOs of a set of addresses in memory, and updates them block by block.
+
+    The UTxOs of the watched addresses are queried once from Ogmios, then a background thread follows the chain
+    from that point with the chain-sync protocol of Ogmios: the inputs each new block spends are removed from the
+    index, and its outputs to watched addresses are added. When blocks are rolled back, their changes are undone,
+    up to ``rollback_depth`` blocks back. A deeper rollback, or a connection that can't resume where it left off,
+    seeds the index again.
+
+    :meth:`utxos` of a watched address is answered from memory, without any query, in time proportional to the
+    number of UTxOs of the address. UTxOs of other addresses, and all other queries, are delegated to the wrapped
+    context. Until the index is synced, e.g. while it is seeded or after its connection is lost, :meth:`utxos`
+    waits up to ``sync_timeout`` seconds for it, then falls back to the wrapped context.
+
+    Args:
+        wrapped_backend (ChainContext): The chain context to delegate other queries and transactions to.
+        addresses (Iterable[Union[str, Address]]): Addresses whose UTxOs are indexed.
+        host (str): Host of Ogmios.
+        port (int): Port of Ogmios.
+        path (str): Path of the Ogmios websocket URL.
+        secure (bool): Whether to connect to Ogmios with TLS.
+        additional_headers (Optional[dict]): Additional headers of the websocket handshake.
+        rollback_depth (int): Number of recent blocks whose changes are kept to roll them back. Blocks deeper than
+            the security parameter of the chain (2160 blocks on mainnet) can't be rolled back.
+        pipeline (int): Number of blocks requested ahead of the ones received.
+        sync_timeout (float): Seconds :meth:`utxos` waits for the index to be synced.
+        reconnect_interval (float): Seconds to wait before reconnecting after the connection fails.
+    """
+
+    _wrapped_backend: ChainContext
+    _watched: frozenset
+    _by_address: Dict[str, Dict[_OutputReference, UTxO]]
+    _address_of: Dict[_OutputReference, str]
+    _point: Union[None, str, dict]
+    _deltas: Deque[_BlockDelta]
+    _synced: threading.Event
+    _closed: threading.Event
+    _websocket: Optional[ClientConnection]
+    error: Optional[Exception]
+
+    def __init__(
+        self,
+        wrapped_backend: ChainContext,
+        addresses: Iterable[Union[str, Address]],
+        host: str = "localhost",
+        port: int = 1337,
+        path: str = "",
+        secure: bool = False,
+        additional_headers: Optional[dict] = None,
+        rollback_depth: int = 2160,
+        pipeline: int = 100,
+        sync_timeout: float = 60,
+        reconnect_interval: float = 1,
+    ):
+        if pipeline < 1:
+            raise ValueError(f"Pipeline must be positive, got {pipeline}")
+        self._wrapped_backend = wrapped_backend
+        self._watched = frozenset(str(address) for address in addresses)
+        self.url = f"{'wss' if secure else 'ws'}://{host}:{port}/{path}"
+        self.additional_headers = additional_headers or {}
+        self.pipeline = pipeline
+        self.sync_timeout = sync_timeout
+        self.reconnect_interval = reconnect_interval
+        self.error = None
+
+        self._by_address = {}
+        self._address_of = {}
+        self._point = None
+        self._deltas = deque(maxlen=rollback_depth)
+        self._lock = threading.Lock()
+        self._synced = threading.Event()
+        self._closed = threading.Event()
+        self._websocket = None
+        self._thread = threading.Thread(
+            target=self._run, name="ChainSyncUTxOIndex", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def addresses(self) -> frozenset:
+        """Watched addresses, encoded with bech32."""
+        return self._watched
+
+    @property
+    def point(self) -> Union[None, str, dict]:
+        """Point of the chain the index is at: None before it is seeded, "origin", or the slot and id of a block."""
+        with self._lock:
+            return self._point
+
+    @property
+    def synced(self) -> bool:
+        """Whether the index caught up with the tip of the chain, and follows it."""
+        return self._synced.is_set()
+
+    def wait_synced(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the index to be synced.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            bool: Whether the index is synced.
+        """
+        return self._synced.wait(timeout)
+
+    def close(self):
+        """Stop following the chain, and close the connection to Ogmios."""
+        self._closed.set()
+        self._synced.clear()
+        websocket = self._websocket
+        if websocket is not None:
+            websocket.close()
+        self._thread.join()
+
+    def _run(self):
+        while not self._closed.is_set():
+            try:
+                with ExitStack() as stack:
+                    # Recent versions of websockets require the connection to be used as a context manager
+                    self._websocket = stack.enter_context(
+                        connect(
+                            self.url,
+                            additional_headers=self.additional_headers,
+                            max_size=None,
+                        )
+                    )
+                    # The index could have been closed while connecting
+                    if self._closed.is_set():
+                        return
+                    self._follow(self._websocket)
+            except _ResyncRequired as e:
+                logger.info(f"Seeding the UTxO index again: {e}")
+                with self._lock:
+                    self._point = None
+                continue
+            except Exception as e:
+                if self._closed.is_set():
+                    return
+                self.error = e
+                logger.warning(f"UTxO index disconnected from {self.url}: {e}")
+            finally:
+                self._websocket = None
+                self._synced.clear()
+            self._closed.wait(self.reconnect_interval)
+
+    def _request(
+        self, websocket: ClientConnection, method: str, params: Optional[dict] = None
+    ) -> dict:
+        request: Dict[str, Any] = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            request["params"] = params
+        websocket.send(json.dumps(request, separators=(",", ":")))
+        return self._check(json.loads(websocket.recv()))
+
+    @staticmethod
+    def _check(response: dict) -> dict:
+        if "error" in response:
+            raise ResponseError(f"Ogmios responded with error: {response['error']}")
+        return response
+
+    def _find_intersection(
+        self, websocket: ClientConnection, points: List[Union[str, dict]]
+    ):
+        websocket.send(
+            json.dumps(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "findIntersection",
+                    "params": {"points": points},
+                },
+                separators=(",", ":"),
+            )
+        )
+        response = json.loads(websocket.recv())
+        if response.get("error", {}).get("code") == _INTERSECTION_NOT_FOUND:
+            raise _ResyncRequired("None of the recent points is on the chain")
+        self._check(response)
+
+    def _follow(self, websocket: ClientConnection):
+        with self._lock:
+            points: List[Union[str, dict]] = []
+            if self._point is not None:
+                points.append(self._point)
+                points.extend(delta.previous for delta in reversed(self._deltas))
+        if points:
+            # Resume where the index left off, the first block received rolls it back to the intersection
+            self._find_intersection(websocket, points[:_INTERSECTION_POINTS])
+        else:
+            self._seed(websocket)
+            self._synced.set()
+
+        for _ in range(self.pipeline):
+            websocket.send('{"jsonrpc":"2.0","method":"nextBlock"}')
+        while True:
+            result = self._check(json.loads(websocket.recv()))["result"]
+            # Keep the number of requested blocks constant
+            websocket.send('{"jsonrpc":"2.0","method":"nextBlock"}')
+            if result["direction"] == "forward":
+                self._roll_forward(result["block"])
+            else:
+                self._roll_backward(result["point"])
+            if _same_point(self._point, result["tip"]):
+                self._synced.set()
+
+    def _seed(self, websocket: ClientConnection):
+        tip = self._request(websocket, "queryNetwork/tip")["result"]
+        utxos: List[OgmiosUtxo] = []
+        if tip != "origin" and self._watched:
+            # Query the UTxOs at the tip, from which the chain is then followed
+            self._request(websocket, "acquireLedgerState", {"point": tip})
+            response = self._request(
+                websocket, "queryLedgerState/utxo", {"addresses": sorted(self._watched)}
+            )
+            utxos, _ = QueryUtxo._parse_QueryUtxo_response(response)
+            self._request(websocket, "releaseLedgerState")
+        self._find_intersection(websocket, [tip])
+
+        with self._lock:
+            self._by_address = {}
+            self._address_of = {}
+            self._deltas.clear()
+            for utxo in utxos:
+                self._add(utxo.address, _utxo_from_ogmios(utxo))
+            self._point = tip
+
+    def _add(self, address: str, utxo: UTxO):
+        reference = (str(utxo.input.transaction_id), utxo.input.index)
+        self._by_address.setdefault(address, {})[reference] = utxo
+        self._address_of[reference] = address
+
+    def _remove(self, reference: _OutputReference) -> Optional[Tuple[str, UTxO]]:
+        address = self._address_of.pop(reference, None)
+        if address is None:
+            return None
+        utxos = self._by_address[address]
+        utxo = utxos.pop(reference)
+        if not utxos:
+            del self._by_address[address]
+        return address, utxo
+
+    def _roll_forward(self, block: dict):
+        with self._lock:
+            # Blocks are only received once the index is seeded
+            assert self._point is not None
+            delta = _BlockDelta(
+                previous=self._point, point={"slot": block["slot"], "id": block["id"]}
+            )
+            for tx in block.get("transactions", []):
+                outputs = tx.get("outputs", [])
+                # A transaction whose scripts failed only spends its collaterals, and returns their excess
+                if tx.get("spends", "inputs") == "inputs":
+                    spent = tx.get("inputs", [])
+                    created = list(enumerate(outputs))
+                else:
+                    spent = tx.get("collaterals", [])
+                    created = (
+                        [(len(outputs), tx["collateralReturn"])]
+                        if tx.get("collateralReturn")
+                        else []
+                    )
+                for tx_in in spent:
+                    removed = self._remove((tx_in["transaction"]["id"], tx_in["index"]))
+                    if removed is not None:
+                        delta.changes.append((False, *removed))
+                for index, output in created:
+                    address = output["address"]
+                    if address not in self._watched:
+                        continue
+                    utxo = _utxo_from_ogmios(
+                        OgmiosUtxo(
+                            tx_id=tx["id"],
+                            index=index,
+                            address=address,
+                            value=output["value"],
+                            datum_hash=output.get("datumHash"),
+                            datum=output.get("datum"),
+                            script=output.get("script"),
+                        )
+                    )
+                    self._add(address, utxo)
+                    delta.changes.append((True, address, utxo))
+            self._deltas.append(delta)
+            self._point = delta.point
+
+    def _roll_backward(self, point: Union[str, dict]):
+        with self._lock:
+            while self._deltas and self._deltas[-1].point["slot"] > _slot(point):
+                delta = self._deltas.pop()
+                for created, address, utxo in reversed(delta.changes):
+                    if created:
+                        self._remove((str(utxo.input.transaction_id), utxo.input.index))
+                    else:
+                        self._add(address, utxo)
+                self._point = delta.previous
+            if not _same_point(self._point, point):
+                raise _ResyncRequired(
+                    f"Rolled back to slot {_slot(point)}, before the recent blocks"
+                )
+
+    def _utxos(self, address: str) -> List[UTxO]:
+        """Get all UTxOs associated with an address, from the index if the address is watched.
+
+        Args:
+            address (str): An address encoded with bech32.
+
+        Returns:
+            List[UTxO]: A list of UTxOs.
+        """
+        if address not in self._watched or not self._synced.wait(self.sync_timeout):
+            return self._wrapped_backend.utxos(address)
+        with self._lock:
+            return list(self._by_address.get(address, {}).values())
+
+    def _utxos_many(self, addresses: List[str]) -> List[List[UTxO]]:
+        """Get all UTxOs associated with each of many addresses, from the index for watched addresses.
+
+        Args:
+            addresses (List[str]): Addresses encoded with bech32.
+
+        Returns:
+            List[List[UTxO]]: A list of UTxOs for each address, in the same order as the addresses.
+        """
+        results: List[Optional[List[UTxO]]] = [None] * len(addresses)
+        if any(address in self._watched for address in addresses) and (
+            self._synced.wait(self.sync_timeout)
+        ):
+            with self._lock:
+                for i, address in enumerate(addresses):
+                    if address in self._watched:
+                        results[i] = list(self._by_address.get(address, {}).values())
+        unindexed = [i for i, utxos in enumerate(results) if utxos is None]
+        if unindexed:
+            fetched = self._wrapped_backend.utxos_many(
+                [addresses[i] for i in unindexed]
+            )
+            for i, utxos in zip(unindexed, fetched):
+                results[i] = utxos
+        return [utxos if utxos is not None else [] for utxos in results]
+
+    @property
+    def genesis_param(self) -> GenesisParameters:
+        """Get chain genesis parameters"""
+        return self._wrapped_backend.genesis_param
+
+    @property
+    def protocol_param(self) -> ProtocolParameters:
+        """Get current protocol parameters"""
+        return self._wrapped_backend.protocol_param
+
+    @property
+    def network(self) -> Network:
+        """Get current network"""
+        return self._wrapped_backend.network
+
+    @property
+    def epoch(self) -> int:
+        """Current epoch number"""
+        return self._wrapped_backend.epoch
+
+    @property
+    def last_block_slot(self) -> int:
+        """Last block slot"""
+        return self._wrapped_backend.last_block_slot
+
+    def submit_tx_cbor(self, cbor: Union[bytes, str]):
+        """Submit a transaction to the blockchain.
+
+        Args:
+            cbor (Union[bytes, str]): The transaction to be submitted.
+
+        Raises:
+            :class:`InvalidArgumentException`: When the transaction is invalid.
+            :class:`TransactionFailedException`: When fails to submit the transaction to blockchain.
+        """
+        return self._wrapped_backend.submit_tx_cbor(cbor)
+
+    def evaluate_tx_cbor(self, cbor: Union[bytes, str]) -> Dict[str, ExecutionUnits]:
+        """Evaluate execution units of a transaction.
+
+        Args:
+            cbor (Union[bytes, str]): The serialized transaction to be evaluated.
+
+        Returns:
+            Dict[str, ExecutionUnits]: A list of execution units calculated for each of the transaction's redeemers
+
+        Raises:
+            :class:`TransactionFailedException`: When fails to evaluate the transaction.
+        """
+        return self._wrapped_backend.evaluate_tx_cbor(cbor)
+
+
+def _slot(point: Union[str, dict]) -> int:
+    return point["slot"] if isinstance(point, dict) else -1
+
+
+def _same_point(point: Union[None, str, dict], other: Union[str, dict]) -> bool:
+    if isinstance(point, dict) and isinstance(other, dict):
+        return point["slot"] == other["slot"] and point["id"] == other["id"]
+    return point == other
@@ -0,0 +1,195 @@
+"""Persistent websocket connections, over which JSON requests of many threads are pipelined."""
+
+import itertools
+import json
+import os
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import ExitStack
+from typing import Any, Dict, List, Optional
+
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.client import ClientConnection, connect
+
+__all__ = ["WebSocketConnectionPool"]
+
+
+class _Connection:
+    """A websocket connection, and the futures of the requests waiting for a response over it."""
+
+    def __init__(self, url: str, additional_headers: dict):
+        self._exit_stack = ExitStack()
+        # Recent versions of websockets require the connection to be used as a context manager
+        self.websocket: ClientConnection = self._exit_stack.enter_context(
+            connect(url, additional_headers=additional_headers, max_size=None)
+        )
+        self.pid = os.getpid()
+        self.error: Optional[Exception] = None
+        self._pending: Dict[Any, Future] = {}
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._close_lock = threading.Lock()
+
+    def send(self, request_id: Any, message: str) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self.error is not None:
+                raise ConnectionError(str(self.error))
+            self._pending[request_id] = future
+        try:
+            with self._send_lock:
+                self.websocket.send(message)
+        except ConnectionClosed as e:
+            raise ConnectionError(f"Connection closed: {e}") from e
+        return future
+
+    def resolve(self, request_id: Any, response: dict):
+        with self._lock:
+            future = self._pending.pop(request_id, None)
+        if future is not None:
+            future.set_result(response)
+
+    def forget(self, request_id: Any):
+        with self._lock:
+            self._pending.pop(request_id, None)
+
+    def fail(self, error: Exception):
+        with self._lock:
+            if self.error is None:
+                self.error = error
+            futures = list(self._pending.values())
+            self._pending.clear()
+        for future in futures:
+            if not future.done():
+                future.set_exception(self.error)
+
+    def close(self):
+        with self._close_lock:
+            self._exit_stack.close()
+
+
+class WebSocketConnectionPool:
+    """A small pool of persistent websocket connections to a JSON-RPC server, e.g. Ogmios.
+
+    Connections are opened on first use and reopened after they are closed, or after the process is forked. Each
+    request is tagged with a unique id, and sent over the next connection of the pool without waiting for the
+    responses of previous requests. A thread of each connection receives the responses, and matches them to their
+    requests by id. The pool can be shared by any number of threads.
+
+    A request that fails because its connection is closed is retried once over a new connection, unless
+    ``retry=False`` is given, e.g. to not submit a transaction twice.
+
+    Args:
+        url (str): Websocket URL of the server.
+        size (int): Number of connections.
+        additional_headers (Optional[dict]): Additional headers of the websocket handshakes.
+        timeout (Optional[float]): Seconds to wait for a response, or None to wait indefinitely.
+    """
+
+    url: str
+    size: int
+    additional_headers: dict
+    timeout: Optional[float]
+    _connections: List[Optional[_Connection]]
+
+    def __init__(
+        self,
+        url: str,
+        size: int = 1,
+        additional_headers: Optional[dict] = None,
+        timeout: Optional[float] = None,
+    ):
+        if size < 1:
+            raise ValueError(f"Pool size must be positive, got {size}")
+        self.url = url
+        self.size = size
+        self.additional_headers = additional_headers or {}
+        self.timeout = timeout
+        self._connections = [None] * size
+        self._lock = threading.Lock()
+        self._request_ids = itertools.count()
+        self._next_slot = itertools.cycle(range(size))
+
+    def _tag(self, message: dict, request_id: int):
+        """Add the id of a request to its message."""
+        message["id"] = request_id
+
+    def _response_id(self, response: dict) -> Any:
+        """Get the id of the request a response answers."""
+        return response.get("id")
+
+    def _connection(self, slot: int) -> _Connection:
+        with self._lock:
+            connection = self._connections[slot]
+            # A connection inherited from a parent process is shared with it, and has no receiving thread
+            if (
+                connection is None
+                or connection.error is not None
+                or connection.pid != os.getpid()
+            ):
+                connection = _Connection(self.url, self.additional_headers)
+                self._connections[slot] = connection
+                threading.Thread(
+                    target=self._receive, args=(connection,), daemon=True
+                ).start()
+            return connection
+
+    def _receive(self, connection: _Connection):
+        error: Exception = ConnectionError(f"Connection to {self.url} closed")
+        try:
+            for message in connection.websocket:
+                response = json.loads(message)
+                connection.resolve(self._response_id(response), response)
+        except Exception as e:
+            error = ConnectionError(f"Connection to {self.url} failed: {e}")
+        finally:
+            connection.fail(error)
+            connection.close()
+
+    def request(self, message: dict, retry: bool = True) -> dict:
+        """Send a request, and wait for its response.
+
+        Args:
+            message (dict): The request, without id.
+            retry (bool): Whether to retry the request once if its connection is closed.
+
+        Returns:
+            dict: The response.
+
+        Raises:
+            ConnectionError: When the connection is closed before the response is received.
+            TimeoutError: When no response is received within the timeout of the pool.
+        """
+        message = dict(message)
+        slot = next(self._next_slot)
+        retries = 1 if retry else 0
+        while True:
+            request_id = next(self._request_ids)
+            self._tag(message, request_id)
+            connection = self._connection(slot)
+            try:
+                future = connection.send(
+                    request_id, json.dumps(message, separators=(",", ":"))
+                )
+                return future.result(self.timeout)
+            except ConnectionError as e:
+                connection.fail(e)
+                if not retries:
+                    raise
+                retries -= 1
+            except FutureTimeoutError:
+                raise TimeoutError(
+                    f"No response from {self.url} within {self.timeout} seconds"
+                )
+            finally:
+                connection.forget(request_id)
+
+    def close(self):
+        """Close all connections of the pool. They are reopened by the next request."""
+        with self._lock:
+            connections = [c for c in self._connections if c is not None]
+            self._connections = [None] * self.size
+        for connection in connections:
+            if connection.pid == os.getpid():
+                connection.close()
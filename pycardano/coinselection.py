@@ -3,8 +3,10 @@ This module contains algorithms that select UTxOs from a parent list to satisfy
 """
 
 import random
+import time
+from collections import defaultdict
 from copy import deepcopy
-from typing import Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 from pycardano.address import Address
 from pycardano.backend.base import ChainContext
@@ -14,16 +16,202 @@ from pycardano.exception import (
     MaxInputCountExceededException,
     UTxOSelectionException,
 )
-from pycardano.transaction import TransactionOutput, UTxO, Value
+from pycardano.hash import ScriptHash, VerificationKeyHash
+from pycardano.serialization import _cbor_head_size
+from pycardano.transaction import (
+    AssetName,
+    TransactionInput,
+    TransactionOutput,
+    UTxO,
+    Value,
+    ValueAccumulator,
+)
 from pycardano.utils import max_tx_fee, min_lovelace_post_alonzo
 
-__all__ = ["UTxOSelector", "LargestFirstSelector", "RandomImproveMultiAsset"]
+__all__ = [
+    "UTxOPool",
+    "UTxOSelector",
+    "LargestFirstSelector",
+    "RandomImproveMultiAsset",
+    "BranchAndBoundSelector",
+]
 
 _FAKE_ADDR = Address.from_primitive(
     "addr1q8m9x2zsux7va6w892g38tvchnzahvcd9tykqf3ygnmwta8k2v59pcduem5uw253zwke30x9mwes62kfvqnzg38kuh6q966kg7"
 )
 
 
+# Size of the parts of a transaction besides its inputs and outputs: the transaction array, the body map, the keys
+# and headers of the inputs and outputs, the fee and the ttl, and the empty witness set, validity flag and metadata.
+_TX_OVERHEAD_SIZE = 1 + 1 + 2 * (1 + 3) + 2 * (1 + 9) + 3
+
+# Size of a key witness, an array of a 32-byte key and a 64-byte signature, with the key and header of the witness
+# array for the first one.
+_KEY_WITNESS_SIZE = 1 + (2 + 32) + (2 + 64) + 2
+
+
+def _change_output_fee(context: ChainContext) -> int:
+    """The fee paid for an ADA-only change output.
+
+    The output is sized with a base address and the largest lovelace amount of 5 bytes, so the fee is not
+    underestimated for the change outputs of common transactions.
+    """
+    return (
+        len(TransactionOutput(_FAKE_ADDR, Value(2**32 - 1)).to_cbor())
+        * context.protocol_param.min_fee_coefficient
+    )
+
+
+def _witness_key(utxo: UTxO) -> Optional[VerificationKeyHash]:
+    payment_part = utxo.output.address.payment_part
+    return payment_part if isinstance(payment_part, VerificationKeyHash) else None
+
+
+def _changeless_fee_allowance(utxos: Iterable[UTxO], context: ChainContext) -> int:
+    """The lovelace a selection of ``utxos`` by :class:`BranchAndBoundSelector` may leave to be paid as fee, when it
+    has no change output: the fee of the change output, and of a key witness for each key of ``utxos``.
+    """
+    keys = {_witness_key(u) for u in utxos} - {None}
+    return (
+        _change_output_fee(context)
+        + len(keys) * _KEY_WITNESS_SIZE * context.protocol_param.min_fee_coefficient
+    )
+
+
+def _without(utxos: List[UTxO], removed: List[UTxO]) -> List[UTxO]:
+    if not removed:
+        return utxos
+    inputs = {utxo.input for utxo in removed}
+    return [utxo for utxo in utxos if utxo.input not in inputs]
+
+
+class UTxOPool:
+    """A pool of UTxOs to select inputs from, indexed for coin selection.
+
+    UTxOs are identified by their :class:`TransactionInput` and iterated in the order they were added. The pool
+    keeps an index of its UTxOs sorted by lovelace and an index of the UTxOs holding each native asset. Both are
+    built on first use and reused by later selections until more UTxOs are added. UTxOs can be excluded from the
+    pool, e.g. once they are spent, in constant time and without rebuilding the indexes.
+
+    Selectors accept a pool wherever they accept a list of UTxOs.
+
+    Args:
+        utxos (Optional[Iterable[UTxO]]): UTxOs to add to the pool.
+    """
+
+    def __init__(self, utxos: Optional[Iterable[UTxO]] = None) -> None:
+        self._utxos: Dict[TransactionInput, UTxO] = {}
+        self._excluded: Set[TransactionInput] = set()
+        # Number of UTxOs in the pool that are excluded
+        self._excluded_count = 0
+        self._by_lovelace: Optional[List[UTxO]] = None
+        self._by_asset: Optional[Dict[Tuple[ScriptHash, AssetName], List[UTxO]]] = None
+        if utxos is not None:
+            self.extend(utxos)
+
+    def add(self, utxo: UTxO) -> bool:
+        """Add a UTxO to the pool.
+
+        Args:
+            utxo (UTxO): The UTxO to add.
+
+        Returns:
+            bool: False if the pool already has a UTxO with the same input, in which case the pool is unchanged.
+        """
+        if utxo.input in self._utxos:
+            return False
+        self._utxos[utxo.input] = utxo
+        if utxo.input in self._excluded:
+            self._excluded_count += 1
+        self._by_lovelace = None
+        self._by_asset = None
+        return True
+
+    def extend(self, utxos: Iterable[UTxO]):
+        """Add UTxOs to the pool, skipping those whose input is already in the pool.
+
+        Args:
+            utxos (Iterable[UTxO]): UTxOs to add.
+        """
+        for utxo in utxos:
+            self.add(utxo)
+
+    def exclude(self, *utxos: Union[UTxO, TransactionInput]):
+        """Exclude UTxOs from the pool.
+
+        Excluded UTxOs are skipped by iteration and by the indexes. A UTxO can be excluded before it is added,
+        it will then never be available.
+
+        Args:
+            *utxos (Union[UTxO, TransactionInput]): UTxOs to exclude, or their inputs.
+        """
+        for utxo in utxos:
+            tx_in = utxo.input if isinstance(utxo, UTxO) else utxo
+            if tx_in not in self._excluded:
+                self._excluded.add(tx_in)
+                if tx_in in self._utxos:
+                    self._excluded_count += 1
+
+    def is_excluded(self, utxo: Union[UTxO, TransactionInput]) -> bool:
+        """Whether a UTxO, or the UTxO of an input, is excluded."""
+        return (utxo.input if isinstance(utxo, UTxO) else utxo) in self._excluded
+
+    def _available(self, utxos: Iterable[UTxO]) -> List[UTxO]:
+        if not self._excluded_count:
+            return list(utxos)
+        excluded = self._excluded
+        return [utxo for utxo in utxos if utxo.input not in excluded]
+
+    def sorted_by_lovelace(self) -> List[UTxO]:
+        """Available UTxOs sorted by ascending lovelace.
+
+        UTxOs with the same amount of lovelace are kept in the order they were added, so the result is the same as
+        sorting the pool's UTxOs with :func:`sorted`.
+
+        Returns:
+            List[UTxO]: A new list of the available UTxOs.
+        """
+        if self._by_lovelace is None:
+            self._by_lovelace = sorted(
+                self._utxos.values(), key=lambda utxo: utxo.output.lovelace
+            )
+        return self._available(self._by_lovelace)
+
+    def with_asset(self, policy_id: ScriptHash, asset_name: AssetName) -> List[UTxO]:
+        """Available UTxOs holding a positive amount of a native asset, in the order they were added.
+
+        Args:
+            policy_id (ScriptHash): Policy ID of the asset.
+            asset_name (AssetName): Name of the asset.
+
+        Returns:
+            List[UTxO]: A new list of the available UTxOs holding the asset.
+        """
+        if self._by_asset is None:
+            by_asset = defaultdict(list)
+            for utxo in self._utxos.values():
+                for pid, asset in utxo.output.amount.multi_asset.items():
+                    for name, amount in asset.items():
+                        if amount > 0:
+                            by_asset[(pid, name)].append(utxo)
+            self._by_asset = dict(by_asset)
+        return self._available(self._by_asset.get((policy_id, asset_name), ()))
+
+    def __iter__(self) -> Iterator[UTxO]:
+        return iter(self._available(self._utxos.values()))
+
+    def __len__(self) -> int:
+        return len(self._utxos) - self._excluded_count
+
+    def __contains__(self, utxo: object) -> bool:
+        if isinstance(utxo, UTxO):
+            utxo = utxo.input
+        return utxo in self._utxos and utxo not in self._excluded
+
+    def __repr__(self):
+        return f"UTxOPool({list(self)})"
+
+
 class UTxOSelector:
     """UTxOSelector defines an interface through which a subset of UTxOs should be selected from a parent set
     with a selection strategy and given constraints.
@@ -31,7 +219,7 @@ class UTxOSelector:
 
     def select(
         self,
-        utxos: List[UTxO],
+        utxos: Union[List[UTxO], UTxOPool],
         outputs: List[TransactionOutput],
         context: ChainContext,
         max_input_count: Optional[int] = None,
@@ -43,7 +231,7 @@ class UTxOSelector:
         is equal to or larger than the sum of a set of outputs.
 
         Args:
-            utxos (List[UTxO]): A list of UTxO to select from.
+            utxos (Union[List[UTxO], UTxOPool]): A list or a pool of UTxO to select from.
             outputs (List[TransactionOutput]): A list of transaction outputs which the selected set should satisfy.
             context (ChainContext): A chain context where protocol parameters could be retrieved.
             max_input_count (int): Max number of input UTxOs to select.
@@ -80,7 +268,7 @@ class LargestFirstSelector(UTxOSelector):
 
     def select(
         self,
-        utxos: List[UTxO],
+        utxos: Union[List[UTxO], UTxOPool],
         outputs: List[TransactionOutput],
         context: ChainContext,
         max_input_count: Optional[int] = None,
@@ -88,7 +276,11 @@ class LargestFirstSelector(UTxOSelector):
         respect_min_utxo: Optional[bool] = True,
         existing_amount: Optional[Value] = None,
     ) -> Tuple[List[UTxO], Value]:
-        available: List[UTxO] = sorted(utxos, key=lambda utxo: utxo.output.lovelace)
+        available: List[UTxO]
+        if isinstance(utxos, UTxOPool):
+            available = utxos.sorted_by_lovelace()
+        else:
+            available = sorted(utxos, key=lambda utxo: utxo.output.lovelace)
         max_fee = max_tx_fee(context) if include_max_fee else 0
         total_requested = Value(max_fee)
         for o in outputs:
@@ -111,7 +303,7 @@ class LargestFirstSelector(UTxOSelector):
         if respect_min_utxo:
             change = selected_amount - total_requested
             min_change_amount = min_lovelace_post_alonzo(
-                TransactionOutput(_FAKE_ADDR, deepcopy(change)), context
+                TransactionOutput(_FAKE_ADDR, change), context
             )
             if change.coin < min_change_amount:
                 additional, _ = self.select(
@@ -232,41 +424,33 @@ class RandomImproveMultiAsset(UTxOSelector):
         upper_bound: Value,
         max_input_count: Optional[int] = None,
     ):
-        if not remaining or self._find_diff_by_former(ideal, selected_amount) <= 0:
-            # In case where there is no remaining UTxOs or we already selected more than ideal,
-            # we cannot improve by randomly adding more UTxOs, therefore return immediate.
-            return
-        if max_input_count is not None and len(selected) > max_input_count:
-            raise MaxInputCountExceededException(
-                f"Max input count: {max_input_count} exceeded!"
-            )
-
-        i, to_add = self._get_next_random(remaining)
-        if (
-            abs(
-                self._find_diff_by_former(ideal, selected_amount + to_add.output.amount)
-            )
-            < abs(self._find_diff_by_former(ideal, selected_amount))
-            and self._find_diff_by_former(
-                upper_bound, selected_amount + to_add.output.amount
-            )
-            >= 0
-        ):
-            selected.append(to_add)
-            selected_amount += to_add.output.amount
+        # Random picks are removed from remaining whether they are selected or not
+        while remaining and self._find_diff_by_former(ideal, selected_amount) > 0:
+            if max_input_count is not None and len(selected) > max_input_count:
+                raise MaxInputCountExceededException(
+                    f"Max input count: {max_input_count} exceeded!"
+                )
 
-        self._improve(
-            selected,
-            selected_amount,
-            remaining[:i] + remaining[i + 1 :],
-            ideal,
-            upper_bound,
-            max_input_count,
-        )
+            i, to_add = self._get_next_random(remaining)
+            if (
+                abs(
+                    self._find_diff_by_former(
+                        ideal, selected_amount + to_add.output.amount
+                    )
+                )
+                < abs(self._find_diff_by_former(ideal, selected_amount))
+                and self._find_diff_by_former(
+                    upper_bound, selected_amount + to_add.output.amount
+                )
+                >= 0
+            ):
+                selected.append(to_add)
+                selected_amount += to_add.output.amount
+            remaining.pop(i)
 
     def select(
         self,
-        utxos: List[UTxO],
+        utxos: Union[List[UTxO], UTxOPool],
         outputs: List[TransactionOutput],
         context: ChainContext,
         max_input_count: Optional[int] = None,
@@ -290,7 +474,21 @@ class RandomImproveMultiAsset(UTxOSelector):
         selected_amount = existing_amount if existing_amount is not None else Value()
 
         for r in request_sorted:
-            self._random_select_subset(r, remaining, selected, selected_amount)
+            if isinstance(utxos, UTxOPool) and not r.coin:
+                # Only pick from UTxOs holding the requested asset
+                ((policy_id, asset),) = r.multi_asset.items()
+                ((asset_name, _),) = asset.items()
+                taken = {utxo.input for utxo in selected}
+                candidates = [
+                    utxo
+                    for utxo in utxos.with_asset(policy_id, asset_name)
+                    if utxo.input not in taken
+                ]
+                num_selected_before = len(selected)
+                self._random_select_subset(r, candidates, selected, selected_amount)
+                remaining = _without(remaining, selected[num_selected_before:])
+            else:
+                self._random_select_subset(r, remaining, selected, selected_amount)
             if max_input_count and len(selected) > max_input_count:
                 raise MaxInputCountExceededException(
                     f"Max input count: {max_input_count} exceeded!"
@@ -312,13 +510,12 @@ class RandomImproveMultiAsset(UTxOSelector):
                 )
             except UTxOSelectionException:
                 pass
-            new_selected = selected[num_selected_before:]
-            remaining = [utxo for utxo in remaining if utxo not in new_selected]
+            remaining = _without(remaining, selected[num_selected_before:])
 
         if respect_min_utxo:
             change = selected_amount - request_sum
             min_change_amount = min_lovelace_post_alonzo(
-                TransactionOutput(_FAKE_ADDR, deepcopy(change)), context
+                TransactionOutput(_FAKE_ADDR, change), context
             )
 
             if change.coin < min_change_amount:
@@ -339,3 +536,361 @@ class RandomImproveMultiAsset(UTxOSelector):
                     selected_amount += u.output.amount
 
         return selected, selected_amount - request_sum
+
+
+class BranchAndBoundSelector(UTxOSelector):
+    """Branch and bound selection that searches for the input set wasting the least lovelace.
+
+    The waste of a selection is the fee paid for its inputs plus the lovelace selected in excess of the request.
+    When no native asset is left for change, a selection without change output is searched for first: the
+    lovelace it selects in excess, at most the fee of a change output, is left to be paid as fee. Otherwise, the
+    minimum lovelace of the change output is part of the request, so a selection without waste pays exactly for
+    the request, its own inputs and the change output. Compared to :class:`LargestFirstSelector` and
+    :class:`RandomImproveMultiAsset`, this leaves smaller change outputs and keeps large UTxOs available for
+    later transactions.
+
+    Native assets are selected first: for each requested asset, the UTxO holding the smallest sufficient amount
+    is picked, or the UTxO holding the largest amount when none is sufficient, until the asset is covered.
+    The remaining lovelace is then searched for among the ADA-only UTxOs with a depth-first branch and bound
+    search, similar to the one of `Bitcoin Core <https://murch.one/erhardt2016coinselection.pdf>`_.
+    The search stops when it is exhausted, after ``max_tries`` steps or once ``time_budget`` seconds passed,
+    and the best selection found so far is returned.
+
+    The fee of an input is estimated from its size, and the fee of a key witness is added for each key the selected
+    inputs are spent with. Keys the transaction is already witnessed by are not known to the selector, so a
+    selection without change output may pay for witnesses the transaction already has. When the maximum fee is
+    included in the request, inputs and witnesses are free, and selections without change output must match the
+    request exactly. Selections are limited to ``max_input_count`` inputs and to inputs fitting in the maximum
+    transaction size together with the requested outputs, the change output and the rest of the transaction.
+
+    When no selection is found, the selectors in ``fallbacks`` are tried in order.
+
+    Args:
+        time_budget (float): Maximum time in seconds spent searching for lovelace. Defaults to 0.1.
+        max_tries (int): Maximum number of search steps. Defaults to 100,000.
+        fallbacks (Optional[List[UTxOSelector]]): Selectors to try when no selection is found. Defaults to
+            :class:`RandomImproveMultiAsset` and :class:`LargestFirstSelector`. With an empty list, the selection
+            error is raised.
+    """
+
+    def __init__(
+        self,
+        time_budget: float = 0.1,
+        max_tries: int = 100_000,
+        fallbacks: Optional[List[UTxOSelector]] = None,
+    ) -> None:
+        self.time_budget = time_budget
+        self.max_tries = max_tries
+        self.fallbacks: List[UTxOSelector] = (
+            fallbacks
+            if fallbacks is not None
+            else [RandomImproveMultiAsset(), LargestFirstSelector()]
+        )
+
+    def select(
+        self,
+        utxos: Union[List[UTxO], UTxOPool],
+        outputs: List[TransactionOutput],
+        context: ChainContext,
+        max_input_count: Optional[int] = None,
+        include_max_fee: Optional[bool] = True,
+        respect_min_utxo: Optional[bool] = True,
+        existing_amount: Optional[Value] = None,
+    ) -> Tuple[List[UTxO], Value]:
+        try:
+            return self._select(
+                utxos,
+                outputs,
+                context,
+                max_input_count,
+                include_max_fee,
+                respect_min_utxo,
+                existing_amount,
+            )
+        except UTxOSelectionException as e:
+            if not self.fallbacks:
+                raise
+            error = e
+
+        for selector in self.fallbacks:
+            try:
+                return selector.select(
+                    utxos,
+                    outputs,
+                    context,
+                    max_input_count,
+                    include_max_fee,
+                    respect_min_utxo,
+                    deepcopy(existing_amount),
+                )
+            except UTxOSelectionException as e:
+                error = e
+        raise error
+
+    def _select(
+        self,
+        utxos: Union[List[UTxO], UTxOPool],
+        outputs: List[TransactionOutput],
+        context: ChainContext,
+        max_input_count: Optional[int],
+        include_max_fee: Optional[bool],
+        respect_min_utxo: Optional[bool],
+        existing_amount: Optional[Value],
+    ) -> Tuple[List[UTxO], Value]:
+        requested = ValueAccumulator(max_tx_fee(context) if include_max_fee else 0)
+        size_budget = context.protocol_param.max_tx_size - _TX_OVERHEAD_SIZE
+        for o in outputs:
+            requested += o.amount
+            size_budget -= len(o.to_cbor())
+        request = requested.to_value()
+        pool = utxos if isinstance(utxos, UTxOPool) else UTxOPool(utxos)
+        fee_per_byte = (
+            0 if include_max_fee else context.protocol_param.min_fee_coefficient
+        )
+
+        total = ValueAccumulator()
+        if existing_amount is not None:
+            total += existing_amount
+        selected: List[UTxO] = []
+        taken: Set[TransactionInput] = set()
+        fees = 0
+        witness_fee = _KEY_WITNESS_SIZE * fee_per_byte
+        keys: Set[VerificationKeyHash] = set()
+
+        def take(utxo: UTxO):
+            nonlocal fees, size_budget
+            selected.append(utxo)
+            taken.add(utxo.input)
+            total.add(utxo.output.amount)
+            size = _input_size(utxo.input)
+            fees += size * fee_per_byte
+            size_budget -= size
+            key = _witness_key(utxo)
+            if key is not None and key not in keys:
+                keys.add(key)
+                fees += witness_fee
+                size_budget -= _KEY_WITNESS_SIZE
+
+        # Native assets
+        for policy_id, asset in request.multi_asset.items():
+            for asset_name, amount in asset.items():
+                needed = amount - total.multi_asset.get(policy_id, {}).get(
+                    asset_name, 0
+                )
+                while needed > 0:
+                    holders = [
+                        (u.output.amount.multi_asset[policy_id][asset_name], u)
+                        for u in pool.with_asset(policy_id, asset_name)
+                        if u.input not in taken
+                    ]
+                    if not holders:
+                        raise InsufficientUTxOBalanceException(
+                            "UTxO Balance insufficient!"
+                        )
+                    sufficient = [c for c in holders if c[0] >= needed]
+                    if sufficient:
+                        held, utxo = min(
+                            sufficient,
+                            key=lambda c: (c[0], len(c[1].output.amount.multi_asset)),
+                        )
+                    else:
+                        held, utxo = max(holders, key=lambda c: c[0])
+                    take(utxo)
+                    needed -= held
+
+        # Lovelace
+        target = request.coin + fees - total.coin
+        min_change = 0
+        changeless = False
+        tolerance = 0
+        if respect_min_utxo:
+            leftover = total.multi_asset - request.multi_asset
+            # Change holding more than 2^32 - 1 lovelace is far above its minimum, so size the change output
+            # with the largest amount below it.
+            change_output = TransactionOutput(
+                _FAKE_ADDR, Value(2**32 - 1, leftover.filter(lambda p, n, v: v > 0))
+            )
+            size_budget -= len(change_output.to_cbor())
+            min_change = min_lovelace_post_alonzo(change_output, context)
+            if not change_output.amount.multi_asset:
+                # Lovelace left in excess of the target can be paid as fee instead of a change output, as long
+                # as it costs no more than the change output would.
+                changeless = True
+                tolerance = _change_output_fee(context) if fee_per_byte else 0
+
+        if max_input_count and len(selected) > max_input_count:
+            raise MaxInputCountExceededException(
+                f"Max input count: {max_input_count} exceeded!"
+            )
+        if size_budget < 0:
+            raise UTxOSelectionException("Max transaction size exceeded!")
+
+        if target + min_change > 0 and not (changeless and -tolerance <= target <= 0):
+            candidates = []
+            for u in reversed(pool.sorted_by_lovelace()):
+                if u.input in taken or u.output.amount.multi_asset:
+                    continue
+                size = _input_size(u.input)
+                fee = size * fee_per_byte
+                # Skip UTxOs that cannot pay for their own input
+                if u.output.lovelace > fee:
+                    candidates.append((u.output.lovelace - fee, fee, size, u))
+            # Candidates equal in effective value, fee and size are next to each other, so the search can skip them
+            candidates.sort(key=lambda c: c[:3], reverse=True)
+            max_count = max_input_count - len(selected) if max_input_count else None
+            start = time.perf_counter()
+            found: Optional[List[UTxO]] = None
+            if changeless and target > 0:
+                # A selection without change output is searched for first, for half of the time budget at most
+                try:
+                    found = self._search(
+                        target,
+                        candidates,
+                        max_count,
+                        size_budget,
+                        start + self.time_budget / 2,
+                        witness_fee,
+                        keys,
+                        tolerance,
+                    )
+                except UTxOSelectionException:
+                    pass
+            if found is None:
+                found = self._search(
+                    target + min_change,
+                    candidates,
+                    max_count,
+                    size_budget,
+                    start + self.time_budget,
+                    witness_fee,
+                    keys,
+                )
+            for utxo in found:
+                take(utxo)
+
+        return selected, total.to_value() - request
+
+    def _search(
+        self,
+        target: int,
+        candidates: List[Tuple[int, int, int, UTxO]],
+        max_count: Optional[int],
+        size_budget: int,
+        deadline: float,
+        witness_fee: int,
+        witnessed: Set[VerificationKeyHash],
+        max_excess: Optional[int] = None,
+    ) -> List[UTxO]:
+        """Find the UTxOs whose effective values add up to at least ``target`` with the least waste.
+
+        Candidates are tuples of effective value, i.e. lovelace minus input fee, input fee, input size and UTxO,
+        sorted by descending effective value. ``witness_fee`` is added to the target for each key of the chosen
+        UTxOs which is not in ``witnessed``. When ``max_excess`` is given, only selections exceeding the target by
+        at most ``max_excess`` are accepted.
+        """
+        n = len(candidates)
+        if sum(c[0] for c in candidates) < target:
+            raise InsufficientUTxOBalanceException("UTxO Balance insufficient!")
+
+        # Effective value of all candidates from index i on
+        remaining = [0] * (n + 1)
+        for i in range(n - 1, -1, -1):
+            remaining[i] = remaining[i + 1] + candidates[i][0]
+
+        best: Optional[List[int]] = None
+        best_waste = 0
+        limited = False
+
+        keys = [_witness_key(c[3]) for c in candidates]
+        # Chosen candidates by key, for the keys not witnessed yet
+        key_counts: Dict[VerificationKeyHash, int] = defaultdict(int)
+
+        chosen: List[int] = []
+        value = 0
+        fees = 0
+        size = 0
+        # Fee and size of the witnesses of the chosen candidates
+        witnesses_fee = 0
+        witnesses_size = 0
+        i = 0
+        tries = 0
+        while tries < self.max_tries:
+            tries += 1
+            if tries % 1000 == 0 and time.perf_counter() > deadline:
+                break
+
+            backtrack = False
+            needed = target + witnesses_fee
+            if value + remaining[i] < needed:
+                # Not reachable with the candidates left
+                backtrack = True
+            elif best is not None and fees + witnesses_fee >= best_waste:
+                backtrack = True
+            elif (max_count is not None and len(chosen) > max_count) or (
+                size + witnesses_size > size_budget
+            ):
+                limited = True
+                backtrack = True
+            elif max_excess is not None and value - needed > max_excess:
+                # Including more candidates only adds to the excess, UTxOs hold more than the fee of a witness
+                backtrack = True
+            elif value >= needed:
+                # The witnesses are paid for by the excess
+                waste = fees + value - target
+                if best is None or waste < best_waste:
+                    best = list(chosen)
+                    best_waste = waste
+                    if waste == 0:
+                        break
+                backtrack = True
+
+            if backtrack:
+                if not chosen:
+                    break
+                # Exclude the last chosen candidate, and the following ones with the same effective value, fee
+                # and size, which would lead to the same selections.
+                j = chosen.pop()
+                effective, fee, input_size, _ = candidates[j]
+                value -= effective
+                fees -= fee
+                size -= input_size
+                key = keys[j]
+                if key is not None and key not in witnessed:
+                    key_counts[key] -= 1
+                    if not key_counts[key]:
+                        witnesses_fee -= witness_fee
+                        witnesses_size -= _KEY_WITNESS_SIZE
+                i = j + 1
+                while (
+                    i < n
+                    and candidates[i][:3] == candidates[j][:3]
+                    and keys[i] == keys[j]
+                ):
+                    i += 1
+            else:
+                # Include the next candidate
+                effective, fee, input_size, _ = candidates[i]
+                chosen.append(i)
+                value += effective
+                fees += fee
+                size += input_size
+                key = keys[i]
+                if key is not None and key not in witnessed:
+                    key_counts[key] += 1
+                    if key_counts[key] == 1:
+                        witnesses_fee += witness_fee
+                        witnesses_size += _KEY_WITNESS_SIZE
+                i += 1
+
+        if best is None:
+            if limited:
+                raise MaxInputCountExceededException(
+                    "No selection found within max input count and transaction size!"
+                )
+            raise UTxOSelectionException("No selection found!")
+        return [candidates[j][3] for j in best]
+
+
+def _input_size(tx_in: TransactionInput) -> int:
+    # An array of a 32-byte transaction id and an index
+    return 1 + 2 + 32 + _cbor_head_size(tx_in.index)
@@ -19,10 +19,16 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
-"""Reference implementation for Bech32/Bech32m and segwit addresses."""
+"""Reference implementation for Bech32/Bech32m and segwit addresses.
 
+The checksum is computed with a table of the generator combinations, one lookup per character instead of five
+conditional XORs, and the conversion between bytes and 5-bit values is done by the base32 codec of the standard
+library, which groups bits the same way, with a different alphabet.
+"""
 
+import base64
 from enum import Enum
+from functools import lru_cache
 
 
 class Encoding(Enum):
@@ -35,27 +41,59 @@ class Encoding(Enum):
 CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
 BECH32M_CONST = 0x2BC830A3
 
+_GENERATOR = [0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3]
 
-def bech32_polymod(values):
-    """Internal function that computes the Bech32 checksum."""
-    generator = [0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3]
-    chk = 1
+# XOR of the generators selected by each combination of the 5 top bits of the checksum
+_GENERATOR_TABLE = tuple(
+    _GENERATOR[0] * (top & 1)
+    ^ _GENERATOR[1] * (top >> 1 & 1)
+    ^ _GENERATOR[2] * (top >> 2 & 1)
+    ^ _GENERATOR[3] * (top >> 3 & 1)
+    ^ _GENERATOR[4] * (top >> 4 & 1)
+    for top in range(32)
+)
+
+_BASE32_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZ234567"
+
+# Translations between the base32 alphabet, the bech32 charset and 5-bit values
+_BASE32_TO_CHARSET = bytes.maketrans(_BASE32_ALPHABET, CHARSET.encode())
+_BASE32_TO_VALUES = bytes.maketrans(_BASE32_ALPHABET, bytes(range(32)))
+_VALUES_TO_BASE32 = bytes.maketrans(bytes(range(32)), _BASE32_ALPHABET)
+
+# Values of the characters of the charset, 255 for all other characters
+_CHARSET_TO_VALUES = bytes(
+    CHARSET.find(chr(i)) if chr(i) in CHARSET else 255 for i in range(256)
+)
+
+_CHECKSUM_PADDING = bytes(6)
+
+
+def _polymod(chk, values):
+    table = _GENERATOR_TABLE
     for value in values:
-        top = chk >> 25
-        chk = (chk & 0x1FFFFFF) << 5 ^ value
-        for i in range(5):
-            chk ^= generator[i] if ((top >> i) & 1) else 0
+        chk = ((chk & 0x1FFFFFF) << 5) ^ value ^ table[chk >> 25]
     return chk
 
 
+def bech32_polymod(values):
+    """Internal function that computes the Bech32 checksum."""
+    return _polymod(1, values)
+
+
 def bech32_hrp_expand(hrp):
     """Expand the HRP into values for checksum computation."""
     return [ord(x) >> 5 for x in hrp] + [0] + [ord(x) & 31 for x in hrp]
 
 
+@lru_cache(maxsize=64)
+def _hrp_polymod(hrp):
+    """Checksum of the expanded HRP, from which the checksum of the data continues."""
+    return bech32_polymod(bech32_hrp_expand(hrp))
+
+
 def bech32_verify_checksum(hrp, data):
     """Verify a checksum given HRP and converted data characters."""
-    const = bech32_polymod(bech32_hrp_expand(hrp) + data)
+    const = _polymod(_hrp_polymod(hrp), data)
     if const == 1:
         return Encoding.BECH32
     if const == BECH32M_CONST:
@@ -63,42 +101,82 @@ def bech32_verify_checksum(hrp, data):
     return None
 
 
+def _checksum(hrp, data, spec):
+    const = BECH32M_CONST if spec == Encoding.BECH32M else 1
+    polymod = _polymod(_polymod(_hrp_polymod(hrp), data), _CHECKSUM_PADDING) ^ const
+    return "".join(
+        [CHARSET[(polymod >> shift) & 31] for shift in (25, 20, 15, 10, 5, 0)]
+    )
+
+
 def bech32_create_checksum(hrp, data, spec):
     """Compute the checksum values given HRP and data."""
-    values = bech32_hrp_expand(hrp) + data
-    const = BECH32M_CONST if spec == Encoding.BECH32M else 1
-    polymod = bech32_polymod(values + [0, 0, 0, 0, 0, 0]) ^ const
-    return [(polymod >> 5 * (5 - i)) & 31 for i in range(6)]
+    return [CHARSET.find(x) for x in _checksum(hrp, data, spec)]
 
 
 def bech32_encode(hrp, data, spec):
     """Compute a Bech32 string given HRP and data values."""
-    combined = data + bech32_create_checksum(hrp, data, spec)
-    return hrp + "1" + "".join([CHARSET[d] for d in combined])
+    return hrp + "1" + "".join([CHARSET[d] for d in data]) + _checksum(hrp, data, spec)
 
 
-def bech32_decode(bech):
-    """Validate a Bech32/Bech32m string, and determine HRP and data."""
-    if (any(ord(x) < 33 or ord(x) > 126 for x in bech)) or (
-        bech.lower() != bech and bech.upper() != bech
+def _bech32_decode(bech):
+    """Validate a Bech32/Bech32m string, and determine HRP, data as bytes of 5-bit values, and encoding."""
+    # Only ASCII characters from 33 to 126, in a single case
+    if (
+        not bech.isascii()
+        or not bech.isprintable()
+        or " " in bech
+        or (bech.lower() != bech and bech.upper() != bech)
     ):
-        return (None, None, None)
+        return None
     bech = bech.lower()
     pos = bech.rfind("1")
     if pos < 1 or pos + 7 > len(bech) or len(bech) > 108:
-        return (None, None, None)
-    if not all(x in CHARSET for x in bech[pos + 1 :]):
-        return (None, None, None)
+        return None
+    data = bech[pos + 1 :].encode().translate(_CHARSET_TO_VALUES)
+    if 255 in data:
+        return None
     hrp = bech[:pos]
-    data = [CHARSET.find(x) for x in bech[pos + 1 :]]
     spec = bech32_verify_checksum(hrp, data)
     if spec is None:
-        return (None, None, None)
+        return None
     return (hrp, data[:-6], spec)
 
 
+def bech32_decode(bech):
+    """Validate a Bech32/Bech32m string, and determine HRP and data."""
+    decoded = _bech32_decode(bech)
+    if decoded is None:
+        return (None, None, None)
+    hrp, data, spec = decoded
+    return (hrp, list(data), spec)
+
+
+def _to_values(data):
+    """Convert bytes to 5-bit values, padding the last one with zero bits."""
+    return base64.b32encode(data).rstrip(b"=").translate(_BASE32_TO_VALUES)
+
+
+def _from_values(values):
+    """Convert 5-bit values to bytes, or None if the values have more than 4 padding bits, or non-zero ones."""
+    bits = len(values) * 5 % 8
+    if bits >= 5 or (bits and values[-1] & ((1 << bits) - 1)):
+        return None
+    encoded = values.translate(_VALUES_TO_BASE32)
+    return base64.b32decode(encoded + b"=" * (-len(encoded) % 8))
+
+
 def convertbits(data, frombits, tobits, pad=True):
     """General power-of-2 base conversion."""
+    if frombits == 8 and tobits == 5 and pad:
+        try:
+            return list(_to_values(bytes(data)))
+        except ValueError:
+            return None
+    if frombits == 5 and tobits == 8 and not pad:
+        values = bytes(data) if all(0 <= value < 32 for value in data) else None
+        decoded = None if values is None else _from_values(values)
+        return None if decoded is None else list(decoded)
     acc = 0
     bits = 0
     ret = []
@@ -121,17 +199,29 @@ def convertbits(data, frombits, tobits, pad=True):
 
 
 def decode(addr):
-    """Decode a segwit address."""
-    _, data, _ = bech32_decode(addr)
-    decoded = convertbits(data, 5, 8, False)
-    if decoded is None or len(decoded) < 2 or len(decoded) > 108:
+    """Decode a segwit address, and return its data as bytes, or None if the address is invalid."""
+    decoded = _bech32_decode(addr)
+    if decoded is None:
         return None
-    return decoded
-
-
-def encode(hrp, witprog):
-    """Encode a segwit address."""
-    ret = bech32_encode(hrp, convertbits(witprog, 8, 5), 0)
-    if bech32_decode(ret) == (None, None, None):
+    data = _from_values(decoded[1])
+    if data is None or len(data) < 2 or len(data) > 108:
+        return None
+    return data
+
+
+def encode(hrp, witprog, verify=False):
+    """Encode a segwit address.
+
+    The encoded address is only decoded again to verify it when ``verify`` is true, and None is returned if it
+    is invalid, e.g. longer than 108 characters.
+    """
+    encoded = base64.b32encode(bytes(witprog)).rstrip(b"=")
+    ret = (
+        hrp
+        + "1"
+        + encoded.translate(_BASE32_TO_CHARSET).decode()
+        + _checksum(hrp, encoded.translate(_BASE32_TO_VALUES), Encoding.BECH32)
+    )
+    if verify and _bech32_decode(ret) is None:
         return None
     return ret
@@ -26,9 +26,11 @@ def log_state(func):
     def wrapper(obj, *args, **kwargs):
         try:
             output = func(obj, *args, **kwargs)
-            logger.debug(
-                f"Class: {obj.__class__}, method: {func}, state:\n {pformat(vars(obj), indent=2)}"
-            )
+            # Formatting the state is expensive, only do it when it is logged
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Class: {obj.__class__}, method: {func}, state:\n {pformat(vars(obj), indent=2)}"
+                )
             return output
         except Exception as e:
             logger.warning(
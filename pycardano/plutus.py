@@ -27,6 +27,7 @@ from pycardano.serialization import (
     IndefiniteList,
     Primitive,
     RawCBOR,
+    _KeepsOriginalCBOR,
     default_encoder,
     limit_primitive_type,
 )
@@ -800,7 +801,7 @@ RawDatum = Union[PlutusData, dict, int, bytes, IndefiniteList, RawCBOR, CBORTag]
 
 
 @dataclass(repr=True)
-class RawPlutusData(CBORSerializable):
+class RawPlutusData(CBORSerializable, _KeepsOriginalCBOR):
     data: RawDatum
 
     def to_primitive(self) -> Primitive:
@@ -3,27 +3,35 @@
 from __future__ import annotations
 
 import json
+import operator
 import os
 import re
 import typing
 from collections import OrderedDict, UserList, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from copy import deepcopy
-from dataclasses import Field, dataclass, field, fields
+from dataclasses import MISSING, dataclass, field, fields
 from datetime import datetime
 from decimal import Decimal
+from enum import Enum
 from fractions import Fraction
 from functools import wraps
 from inspect import getfullargspec, isclass
+from mmap import mmap
 from typing import (
     Any,
+    BinaryIO,
     Callable,
     ClassVar,
     Dict,
     Generic,
     Iterable,
+    Iterator,
     List,
     Optional,
-    Sequence,
+    Set,
+    Tuple,
     Type,
     TypeVar,
     Union,
@@ -32,17 +40,16 @@ from typing import (
 )
 
 import cbor2
-
-from pycardano.logging import logger
-
-# Remove the semantic decoder for 258 (CBOR tag for set) as we care about the order of elements
-try:
-    cbor2._decoder.semantic_decoders.pop(258)
-except Exception as e:
-    logger.warning("Failed to remove semantic decoder for CBOR tag 258", e)
-    pass
-
-from cbor2 import CBOREncoder, CBORSimpleValue, CBORTag, FrozenDict, dumps, undefined
+from cbor2 import (
+    CBORDecodeEOF,
+    CBORDecodeValueError,
+    CBOREncoder,
+    CBORSimpleValue,
+    CBORTag,
+    FrozenDict,
+    dumps,
+    undefined,
+)
 from frozenlist import FrozenList
 from pprintpp import pformat
 
@@ -51,6 +58,9 @@ from pycardano.types import check_type, typechecked
 
 __all__ = [
     "default_encoder",
+    "decode_cbor",
+    "iter_cbor",
+    "skip_validation",
     "IndefiniteList",
     "IndefiniteFrozenList",
     "Primitive",
@@ -195,22 +205,378 @@ def limit_primitive_type(*allowed_types):
 CBORBase = TypeVar("CBORBase", bound="CBORSerializable")
 
 
-def decode_array(self, subtype: int) -> Sequence[Any]:
-    # Major tag 4
-    length = self._decode_length(subtype, allow_indefinite=True)
+_SET_TAG = 258
+"""CBOR tag of a set (#6.258)."""
+
+_SUBSTITUTE_TAG_BASE = int.from_bytes(b"pycardan", "big")
+
+
+def _substitute_tags(attempt: int) -> Tuple[int, int]:
+    """Private tag numbers that stand in for tag 258 and indefinite arrays while cbor2 decodes a payload.
+
+    Neither implementation of cbor2 (C extension or pure Python) lets us customize how a set (#6.258) or an
+    indefinite-length array is decoded: the former becomes an unordered python set and the latter a plain list.
+    Both implementations, however, pass unknown tags to ``tag_hook``. Before decoding, the heads of these items are
+    therefore rewritten into tags with the numbers returned here, which are turned back into
+    ``CBORTag(258, [...])`` and :class:`IndefiniteFrozenList` by :func:`_restore_substituted_tag`.
+    """
+    return _SUBSTITUTE_TAG_BASE + 2 * attempt, _SUBSTITUTE_TAG_BASE + 2 * attempt + 1
 
-    if length is None:
-        ret = IndefiniteFrozenList(list(self.decode_array(subtype=subtype)))
+
+def _find_substitutions(
+    data: bytes, set_tag: int, indefinite_tag: int
+) -> Optional[List[Tuple[int, int, bytes]]]:
+    """Walk through the first data item in ``data`` and locate the heads that need to be substituted.
+
+    Only the heads of data items are inspected, byte and text strings are skipped over entirely.
+
+    Args:
+        data (bytes): CBOR bytes.
+        set_tag (int): Tag number that replaces tag 258.
+        indefinite_tag (int): Tag number that wraps indefinite-length arrays.
+
+    Returns:
+        Optional[List[Tuple[int, int, bytes]]]: A list of ``(start, end, replacement)`` edits sorted by position,
+            or None if ``data`` already contains one of the substitute tags.
+
+    Raises:
+        CBORDecodeError: When ``data`` is not well-formed CBOR.
+    """
+    set_head = b"\xdb" + set_tag.to_bytes(8, "big")
+    indefinite_head = b"\xdb" + indefinite_tag.to_bytes(8, "big") + b"\x9f"
+    edits: List[Tuple[int, int, bytes]] = []
+    # Number of items left in each enclosing container, -1 for indefinite-length containers.
+    stack: List[int] = []
+    remaining = 1
+    pos = 0
+    try:
+        while True:
+            if remaining == 0:
+                if not stack:
+                    return edits
+                remaining = stack.pop()
+                continue
+            start = pos
+            initial_byte = data[pos]
+            pos += 1
+            major_type = initial_byte >> 5
+            subtype = initial_byte & 31
+            if subtype < 24:
+                length = subtype
+            elif subtype == 24:
+                length = data[pos]
+                pos += 1
+            elif subtype < 28:
+                size = 1 << (subtype - 24)
+                if pos + size > len(data):
+                    raise IndexError
+                length = int.from_bytes(data[pos : pos + size], "big")
+                pos += size
+            elif subtype == 31:
+                if initial_byte == 0xFF:
+                    if remaining != -1:
+                        raise CBORDecodeValueError("unexpected break code")
+                    remaining = stack.pop()
+                    continue
+                length = -1
+            else:
+                raise CBORDecodeValueError(
+                    f"invalid additional information {subtype} at position {start}"
+                )
+
+            if major_type == 6:
+                if length == _SET_TAG:
+                    edits.append((start, pos, set_head))
+                elif length == set_tag or length == indefinite_tag:
+                    return None
+                # The tagged item is the next item in the same container, so "remaining" is left untouched.
+                continue
+
+            if remaining > 0:
+                remaining -= 1
+
+            if major_type == 4:
+                if length == -1:
+                    edits.append((start, pos, indefinite_head))
+                    stack.append(remaining)
+                    remaining = -1
+                elif length:
+                    stack.append(remaining)
+                    remaining = length
+            elif major_type == 5:
+                if length == -1 or length:
+                    stack.append(remaining)
+                    remaining = -1 if length == -1 else 2 * length
+            elif major_type == 2 or major_type == 3:
+                if length == -1:
+                    stack.append(remaining)
+                    remaining = -1
+                else:
+                    pos += length
+    except IndexError:
+        raise CBORDecodeEOF("premature end of stream")
+
+
+def _restore_substituted_tag(set_tag: int, indefinite_tag: int, tag: CBORTag) -> Any:
+    if tag.tag == set_tag:
+        return CBORTag(_SET_TAG, tag.value)
+    elif tag.tag == indefinite_tag:
+        ret = IndefiniteFrozenList(list(tag.value))
         ret.freeze()
         return ret
+    return tag
+
+
+def decode_cbor(payload: bytes) -> Primitive:
+    """Decode CBOR bytes into primitives.
+
+    Unlike :func:`cbor2.loads`, elements of sets (#6.258) keep their encoded order and are returned as
+    ``CBORTag(258, [...])``, and indefinite-length arrays are returned as :class:`IndefiniteFrozenList`, so that the
+    decoded value can be re-encoded into the same bytes. The C extension of cbor2 is used when it is installed.
+
+    Args:
+        payload (bytes): CBOR bytes.
+
+    Returns:
+        :const:`Primitive`: The decoded value.
+
+    Examples:
+        >>> decode_cbor(bytes.fromhex("d9010283030102"))
+        CBORTag(258, [3, 1, 2])
+        >>> decoded = decode_cbor(bytes.fromhex("9f0102ff"))
+        >>> isinstance(decoded, IndefiniteFrozenList), list(decoded)
+        (True, [1, 2])
+    """
+    # Every encoding of tag 258 ends with bytes 0x01 0x02, payloads without them and without any indefinite-length
+    # array head could be passed to cbor2 directly.
+    if b"\x9f" not in payload and b"\x01\x02" not in payload:
+        return cbor2.loads(payload)
+
+    attempt = 0
+    while True:
+        set_tag, indefinite_tag = _substitute_tags(attempt)
+        edits = _find_substitutions(payload, set_tag, indefinite_tag)
+        if edits is not None:
+            break
+        attempt += 1
+
+    if not edits:
+        return cbor2.loads(payload)
+
+    chunks = []
+    last = 0
+    for start, end, replacement in edits:
+        chunks.append(payload[last:start])
+        chunks.append(replacement)
+        last = end
+    chunks.append(payload[last:])
+
+    return cbor2.loads(
+        b"".join(chunks),
+        tag_hook=lambda _, tag: _restore_substituted_tag(set_tag, indefinite_tag, tag),
+    )
+
+
+def _read_cbor_head(data: memoryview, pos: int) -> Tuple[int, int, int]:
+    """Read the head of the data item that starts at ``pos``.
+
+    Returns:
+        Tuple[int, int, int]: Major type, argument (-1 for indefinite lengths and the break code) and the position
+            right after the head.
+    """
+    initial_byte = data[pos]
+    pos += 1
+    subtype = initial_byte & 31
+    if subtype < 24:
+        argument = subtype
+    elif subtype < 28:
+        size = 1 << (subtype - 24)
+        if pos + size > len(data):
+            raise CBORDecodeEOF("premature end of stream")
+        argument = int.from_bytes(data[pos : pos + size], "big")
+        pos += size
+    elif subtype == 31:
+        argument = -1
     else:
-        return self.decode_array(subtype=subtype)
+        raise CBORDecodeValueError(
+            f"invalid additional information {subtype} at position {pos - 1}"
+        )
+    return initial_byte >> 5, argument, pos
+
+
+def _cbor_head_size(argument: int) -> int:
+    """Size of the head of a data item whose argument (value, length or tag number) is ``argument``."""
+    if argument < 24:
+        return 1
+    elif argument < 1 << 8:
+        return 2
+    elif argument < 1 << 16:
+        return 3
+    elif argument < 1 << 32:
+        return 5
+    return 9
+
+
+def _skip_cbor_item(data: memoryview, pos: int) -> int:
+    """Find where the data item that starts at ``pos`` ends, without decoding it."""
+    # Number of items left in each enclosing container, -1 for indefinite-length containers.
+    stack: List[int] = []
+    remaining = 1
+    try:
+        while True:
+            if remaining == 0:
+                if not stack:
+                    break
+                remaining = stack.pop()
+                continue
+            major_type, argument, pos = _read_cbor_head(data, pos)
+            if major_type == 7 and argument == -1:
+                if remaining != -1:
+                    raise CBORDecodeValueError("unexpected break code")
+                remaining = stack.pop()
+                continue
+            if major_type == 6:
+                # The tagged item is the next item in the same container
+                continue
+
+            if remaining > 0:
+                remaining -= 1
+
+            if argument == -1:
+                stack.append(remaining)
+                remaining = -1
+            elif major_type == 2 or major_type == 3:
+                pos += argument
+            elif major_type == 4 and argument:
+                stack.append(remaining)
+                remaining = argument
+            elif major_type == 5 and argument:
+                stack.append(remaining)
+                remaining = 2 * argument
+    except IndexError:
+        raise CBORDecodeEOF("premature end of stream")
+    if pos > len(data):
+        raise CBORDecodeEOF("premature end of stream")
+    return pos
+
+
+def _iter_encoded_items(data: memoryview) -> Iterator[memoryview]:
+    """Iterate over the encoded items of an encoded array or map, without decoding them.
+
+    Tags in front of the array or map are skipped. The keys and values of a map are returned alternately.
+    Each item is returned as a view that starts with the item and extends to the end of ``data``, the item is only
+    skipped over when the iteration continues.
+    """
+    major_type, argument, pos = _read_cbor_head(data, 0)
+    while major_type == 6:
+        major_type, argument, pos = _read_cbor_head(data, pos)
+    if major_type != 4 and major_type != 5:
+        raise CBORDecodeValueError(
+            f"Expect an array or a map, got major type {major_type}."
+        )
+
+    count = 0
+    if argument != -1 and major_type == 5:
+        argument *= 2
+    while count != argument and data[pos] != 0xFF:
+        yield data[pos:]
+        pos = _skip_cbor_item(data, pos)
+        count += 1
 
 
-try:
-    cbor2._decoder.major_decoders[4] = decode_array
-except Exception as e:
-    logger.warning("Failed to replace major decoder for indefinite array", e)
+def _split_cbor(data: memoryview) -> Tuple[int, List[memoryview], memoryview]:
+    """Split an encoded array or map into its encoded items, without decoding them.
+
+    Tags in front of the array or map are skipped. The keys and values of a map are returned alternately.
+
+    Returns:
+        Tuple[int, List[memoryview], memoryview]: The major type (4 for arrays, 5 for maps), a view of each item and
+            a view of the whole array or map. ``data`` might extend past the array or map.
+    """
+    major_type, argument, pos = _read_cbor_head(data, 0)
+    while major_type == 6:
+        major_type, argument, pos = _read_cbor_head(data, pos)
+    if major_type != 4 and major_type != 5:
+        raise CBORDecodeValueError(
+            f"Expect an array or a map, got major type {major_type}."
+        )
+
+    if argument != -1 and major_type == 5:
+        argument *= 2
+    items: List[memoryview] = []
+    try:
+        while len(items) != argument:
+            if argument == -1 and data[pos] == 0xFF:
+                pos += 1
+                break
+            end = _skip_cbor_item(data, pos)
+            items.append(data[pos:end])
+            pos = end
+    except IndexError:
+        raise CBORDecodeEOF("premature end of stream")
+    return major_type, items, data[:pos]
+
+
+def iter_cbor(
+    cls: Type[CBORBase], stream: Union[BinaryIO, mmap], chunk_size: int = 1 << 16
+) -> Iterator[CBORBase]:
+    """Restore CBORSerializable objects one by one from a stream of consecutive CBOR items.
+
+    The stream is read in chunks, and only the item being restored is kept in memory, so large files, archives of
+    transactions or chain dumps can be read with bounded memory.
+
+    Args:
+        cls (Type[CBORBase]): The class of the items, e.g. :class:`pycardano.transaction.Transaction`. Classes with
+            a custom :meth:`CBORSerializable.from_cbor`, like :class:`pycardano.transaction.LazyTransaction`,
+            are supported.
+        stream (Union[BinaryIO, mmap]): A binary file, an :class:`mmap.mmap` or a socket wrapped by
+            ``socket.makefile("rb")``. Items are read until the end of the stream.
+        chunk_size (int): Number of bytes to read from the stream at a time.
+
+    Yields:
+        CBORBase: Restored objects, in the order they appear in the stream.
+
+    Raises:
+        CBORDecodeEOF: When the stream ends in the middle of an item.
+
+    Examples:
+        >>> import io
+        >>> from pycardano import TransactionInput
+        >>> stream = io.BytesIO(bytes.fromhex(
+        ...     "825820" + "11" * 32 + "00" + "825820" + "22" * 32 + "01"))
+        >>> [tx_in.index for tx_in in iter_cbor(TransactionInput, stream)]
+        [0, 1]
+    """
+    # Streams that return whatever is available, like sockets, shouldn't block until a whole chunk is received.
+    read = getattr(stream, "read1", None) or stream.read
+    buffer = bytearray()
+    pos = 0
+    eof = False
+    while True:
+        end = -1
+        if pos < len(buffer):
+            with memoryview(buffer) as view:
+                try:
+                    end = _skip_cbor_item(view, pos)
+                except CBORDecodeEOF:
+                    pass
+        if end != -1:
+            payload = bytes(buffer[pos:end])
+            pos = end
+            yield cls.from_cbor(payload)
+        elif eof:
+            if pos < len(buffer):
+                raise CBORDecodeEOF("premature end of stream")
+            return
+        else:
+            del buffer[:pos]
+            pos = 0
+            # Items larger than a chunk are read in growing chunks, so they are scanned a logarithmic number of times.
+            chunk = read(max(chunk_size, len(buffer)))
+            if chunk:
+                buffer += chunk
+            else:
+                eof = True
 
 
 def default_encoder(
@@ -255,7 +621,737 @@ def default_encoder(
     elif isinstance(value, FrozenDict):
         encoder.encode(dict(value))
     else:
+        _encode_cbor_serializable(encoder, value)
+
+
+def _encode_cbor_serializable(encoder: CBOREncoder, value: CBORSerializable):
+    if _CHECKED_ORIGINALS.get() is None:
+        token = _CHECKED_ORIGINALS.set({})
+        try:
+            _encode_cbor_serializable(encoder, value)
+        finally:
+            _CHECKED_ORIGINALS.reset(token)
+        return
+
+    original_cbor = _get_original_cbor(value)
+    if original_cbor is not None:
+        # Unmodified objects that were decoded from CBOR are written as they were received.
+        encoder.write(bytes(original_cbor))
+    elif (
+        type(value).to_validated_primitive
+        is not CBORSerializable.to_validated_primitive
+    ):
         encoder.encode(value.to_validated_primitive())
+    else:
+        # CBORSerializables are streamed into the encoder one level at a time, instead of being converted into a
+        # tree of primitives first. Nested CBORSerializables come back to this function through the encoder.
+        # Validating the outermost one is enough, because validation is recursive.
+        key = id(encoder)
+        if key in _STREAMING_ENCODERS:
+            encoder.encode(_to_shallow_primitive(value))
+        else:
+            if _VALIDATION_ENABLED.get():
+                value.validate()
+            _STREAMING_ENCODERS.add(key)
+            try:
+                encoder.encode(_to_shallow_primitive(value))
+            finally:
+                _STREAMING_ENCODERS.discard(key)
+
+
+_STREAMING_ENCODERS: Set[int] = set()
+"""IDs of encoders in the middle of encoding a validated :class:`CBORSerializable`."""
+
+_VALIDATION_ENABLED: ContextVar[bool] = ContextVar("validation_enabled", default=True)
+
+
+@contextmanager
+def skip_validation() -> Iterator[None]:
+    """Serialize CBORSerializables without validating them first.
+
+    Inside this context, :meth:`CBORSerializable.to_cbor` and :meth:`CBORSerializable.to_validated_primitive` don't
+    call :meth:`CBORSerializable.validate`. This is meant for objects that were already validated, or were decoded from
+    trusted data, e.g. transactions fetched from the chain. Invalid objects could produce invalid CBOR silently.
+
+    Examples:
+        >>> from pycardano import TransactionInput
+        >>> tx_in = TransactionInput.from_primitive([b"1" * 32, 0])
+        >>> with skip_validation():
+        ...     tx_in.to_cbor_hex()
+        '825820313131313131313131313131313131313131313131313131313131313131313100'
+    """
+    token = _VALIDATION_ENABLED.set(False)
+    try:
+        yield
+    finally:
+        _VALIDATION_ENABLED.reset(token)
+
+
+def _to_shallow_primitive(
+    value: CBORSerializable,
+) -> Union[Primitive, CBORSerializable]:
+    """Convert a CBORSerializable to the primitive that :meth:`CBORSerializable.to_primitive` would build its
+    result from, so encoding the returned value produces the same bytes as encoding ``value.to_primitive()``.
+    """
+    if type(value).to_primitive is not CBORSerializable.to_primitive:
+        return value.to_primitive()
+    result = value.to_shallow_primitive()
+    # The order of elements in a python set depends on how the set is built, so sets are rebuilt the same way
+    # to_primitive does.
+    if isinstance(result, list):
+        if any(isinstance(v, set) for v in result):
+            result = [
+                _to_primitive_tree(v) if isinstance(v, set) else v for v in result
+            ]
+    elif isinstance(result, dict):
+        if any(isinstance(v, set) for v in result.values()):
+            result = type(result)(
+                (k, _to_primitive_tree(v) if isinstance(v, set) else v)
+                for k, v in result.items()
+            )
+    elif isinstance(result, set):
+        result = _to_primitive_tree(result)
+    return result
+
+
+def _to_primitive_tree(value: Any, freeze: bool = False) -> Any:
+    """Convert a value and its elements to CBOR primitives recursively, see :meth:`CBORSerializable.to_primitive`.
+
+    Containers are copied. Keys of dictionaries and elements of sets are frozen to keep them hashable.
+    """
+    if isinstance(value, CBORSerializable):
+        return _to_primitive_tree(value.to_primitive(), freeze)
+    elif isinstance(value, (dict, OrderedDict, defaultdict)):
+        _dict = type(value)()
+        if hasattr(value, "default_factory"):
+            _dict.setdefault(value.default_factory)
+        for k, v in value.items():
+            _dict[_to_primitive_tree(k, freeze=True)] = _to_primitive_tree(v, freeze)
+        if freeze:
+            return FrozenDict(_dict)
+        return _dict
+    elif isinstance(value, set):
+        _set = set(_to_primitive_tree(v, freeze=True) for v in value)
+        if freeze:
+            return frozenset(_set)
+        return _set
+    elif isinstance(value, tuple):
+        return tuple(_to_primitive_tree(v, freeze) for v in value)
+    elif isinstance(value, (IndefiniteFrozenList, FrozenList, IndefiniteList, list)):
+        _list = [_to_primitive_tree(v, freeze) for v in value]
+
+        already_frozen = isinstance(value, (IndefiniteFrozenList, FrozenList))
+        should_freeze = already_frozen or freeze
+
+        if not should_freeze:
+            return IndefiniteList(_list) if isinstance(value, IndefiniteList) else _list
+
+        is_indefinite = isinstance(value, (IndefiniteFrozenList, IndefiniteList))
+        fl = IndefiniteFrozenList(_list) if is_indefinite else FrozenList(_list)
+        fl.freeze()
+        return fl
+    elif isinstance(value, CBORTag):
+        return CBORTag(value.tag, _to_primitive_tree(value.value, freeze))
+    else:
+        return value
+
+
+class _KeepsOriginalCBOR:
+    """Mixin for CBORSerializables that remember the CBOR they were decoded from by :meth:`CBORSerializable.from_cbor`.
+
+    As long as such an object and everything it refers to are left unchanged, it is encoded by writing the original
+    bytes back, without serializing or validating it again. This makes re-encoding and hashing decoded objects cheap,
+    and keeps their hashes stable even when the original encoding is not the one pycardano would produce. Assigning
+    or mutating anything reachable from the object makes it fall back to regular serialization.
+
+    The original CBOR is a view into the decoded payload, which is kept alive as long as the object is.
+    """
+
+    __slots__ = ("_original_cbor",)
+
+    def _keep_original_cbor(self, cbor: memoryview):
+        """Remember the CBOR this object was decoded from. ``cbor`` starts with the object, and might extend past it.
+
+        Subclasses that contain other :class:`_KeepsOriginalCBOR` objects override this method to pass them their
+        part of ``cbor``, before calling this implementation.
+        """
+        self._original_cbor: Optional[_OriginalCBOR] = _OriginalCBOR(self, cbor)
+
+    def _keep_original_field_cbor(self, name: str, value: Any, cbor: memoryview):
+        """Pass the CBOR field ``name`` was decoded from to its value, if the value keeps its original CBOR."""
+        if isinstance(value, _KeepsOriginalCBOR):
+            value._keep_original_cbor(cbor)
+
+
+class _OriginalCBOR:
+    """The CBOR an object was decoded from, with a snapshot of the object graph it was decoded into.
+
+    The snapshot holds every object reachable from the decoded object, in depth-first order. Containers are closed by
+    :data:`_SNAPSHOT_END`. Comparing it by identity with a fresh snapshot tells whether anything was replaced, added or
+    removed since. Holding references to the objects also ensures their ids can't be reused by new objects.
+    Objects that keep their own original CBOR are not descended into, they are checked separately.
+    """
+
+    __slots__ = ("_cbor", "_trimmed", "snapshot", "keepers")
+
+    def __init__(self, obj: _KeepsOriginalCBOR, cbor: memoryview):
+        self._cbor = cbor
+        self._trimmed = False
+        self.snapshot: List[Any] = []
+        self.keepers: List[_KeepsOriginalCBOR] = []
+        _snapshot_state(obj, self.snapshot, self.keepers)
+
+    @property
+    def cbor(self) -> memoryview:
+        # Where the object ends is only looked up when its CBOR is needed.
+        if not self._trimmed:
+            self._cbor = self._cbor[: _skip_cbor_item(self._cbor, 0)]
+            self._trimmed = True
+        return self._cbor
+
+    def is_valid_for(self, obj: _KeepsOriginalCBOR) -> bool:
+        snapshot: List[Any] = []
+        keepers: List[_KeepsOriginalCBOR] = []
+        _snapshot_state(obj, snapshot, keepers)
+        return _is_unchanged(snapshot, self.snapshot, keepers)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        # A copy is serialized from scratch.
+        return None
+
+    def __reduce__(self):
+        return _none, ()
+
+
+class _LazyOriginalCBOR(_OriginalCBOR):
+    """The CBOR a :class:`_LazyCBORSerializable` was decoded from.
+
+    Fields that weren't accessed yet can't have changed. The others are snapshotted one by one as they get decoded,
+    see :class:`_OriginalCBOR`.
+    """
+
+    __slots__ = ("fields",)
+
+    def __init__(self, obj: _LazyCBORSerializable, cbor: memoryview, trimmed: bool):
+        self._cbor = cbor
+        self._trimmed = trimmed
+        self.fields: Dict[str, List[Any]] = {}
+        for name, value in obj.__dict__.items():
+            self.add_field(name, value)
+
+    def add_field(self, name: str, value: Any):
+        snapshot: List[Any] = []
+        _snapshot(value, snapshot, [])
+        self.fields[name] = snapshot
+
+    def is_valid_for(self, obj: _KeepsOriginalCBOR) -> bool:
+        state = obj.__dict__
+        if len(state) != len(self.fields):
+            return False
+        for name, value in state.items():
+            expected = self.fields.get(name)
+            if expected is None:
+                return False
+            snapshot: List[Any] = []
+            keepers: List[_KeepsOriginalCBOR] = []
+            _snapshot(value, snapshot, keepers)
+            if not _is_unchanged(snapshot, expected, keepers):
+                return False
+        return True
+
+
+def _is_unchanged(
+    snapshot: List[Any], expected: List[Any], keepers: List[_KeepsOriginalCBOR]
+) -> bool:
+    return (
+        len(snapshot) == len(expected)
+        and all(map(operator.is_, snapshot, expected))
+        and all(_get_original_cbor(k) is not None for k in keepers)
+    )
+
+
+def _none() -> None:
+    return None
+
+
+_SNAPSHOT_END = object()
+
+_IMMUTABLE_TYPES = frozenset((type(None), bool, int, float, str, bytes, Fraction))
+
+
+def _snapshot_state(obj: Any, snapshot: List[Any], keepers: List[Any]):
+    state = getattr(obj, "__dict__", None)
+    if state is not None:
+        for value in state.values():
+            # Immutable values are appended right away, which saves a call for most values
+            if type(value) in _IMMUTABLE_TYPES:
+                snapshot.append(value)
+            else:
+                _snapshot(value, snapshot, keepers)
+        snapshot.append(_SNAPSHOT_END)
+
+
+# How :func:`_snapshot` descends into values, by type
+_LEAF, _KEEPER, _ORDERED_SET, _STATE, _MAPPING, _SEQUENCE, _TAG = range(7)
+
+_SNAPSHOT_KINDS: Dict[type, int] = {t: _LEAF for t in _IMMUTABLE_TYPES}
+
+
+def _snapshot_kind(cls: type) -> int:
+    if issubclass(cls, Enum):
+        return _LEAF
+    elif issubclass(cls, _KeepsOriginalCBOR):
+        return _KEEPER
+    elif issubclass(cls, OrderedSet):
+        return _ORDERED_SET
+    elif issubclass(cls, (CBORSerializable, ByteString, RawCBOR)):
+        return _STATE
+    elif issubclass(cls, dict):
+        return _MAPPING
+    elif issubclass(cls, (list, tuple, set, frozenset, UserList, FrozenList)):
+        return _SEQUENCE
+    elif issubclass(cls, CBORTag):
+        return _TAG
+    return _LEAF
+
+
+def _snapshot(value: Any, snapshot: List[Any], keepers: List[Any]):
+    snapshot.append(value)
+    cls = type(value)
+    kind = _SNAPSHOT_KINDS.get(cls)
+    if kind is None:
+        kind = _SNAPSHOT_KINDS[cls] = _snapshot_kind(cls)
+    if kind == _LEAF:
+        return
+    if kind == _KEEPER:
+        if getattr(value, "_original_cbor", None) is not None:
+            keepers.append(value)
+            return
+        kind = _ORDERED_SET if isinstance(value, OrderedSet) else _STATE
+    if kind == _STATE:
+        _snapshot_state(value, snapshot, keepers)
+    elif kind == _ORDERED_SET:
+        # The items and how they are encoded, without the list the items are indexed by
+        snapshot.append(value._use_tag)
+        snapshot.append(value._is_indefinite_list)
+        for v in value:
+            _snapshot(v, snapshot, keepers)
+        snapshot.append(_SNAPSHOT_END)
+    elif kind == _MAPPING:
+        for k, v in value.items():
+            # Keys can be changed in place too, like the index of a RedeemerKey. Hashes and asset names, the most
+            # common keys, keep their payload in a slot, which can't be changed.
+            if type(k) in _IMMUTABLE_TYPES or not getattr(k, "__dict__", True):
+                snapshot.append(k)
+            else:
+                _snapshot(k, snapshot, keepers)
+            if type(v) in _IMMUTABLE_TYPES:
+                snapshot.append(v)
+            else:
+                _snapshot(v, snapshot, keepers)
+        snapshot.append(_SNAPSHOT_END)
+    elif kind == _SEQUENCE:
+        for v in value:
+            if type(v) in _IMMUTABLE_TYPES:
+                snapshot.append(v)
+            else:
+                _snapshot(v, snapshot, keepers)
+        snapshot.append(_SNAPSHOT_END)
+    else:
+        snapshot.append(value.tag)
+        _snapshot(value.value, snapshot, keepers)
+
+
+def _has_original_cbor(value: _KeepsOriginalCBOR) -> bool:
+    return getattr(value, "_original_cbor", None) is not None
+
+
+def _get_original_cbor(value: Any) -> Optional[memoryview]:
+    """Get the CBOR a :class:`_KeepsOriginalCBOR` was decoded from, if it is still unchanged since."""
+    if not isinstance(value, _KeepsOriginalCBOR):
+        return None
+    original = getattr(value, "_original_cbor", None)
+    if original is None:
+        return None
+    checked = _CHECKED_ORIGINALS.get()
+    if checked is not None:
+        # Objects can't change while they are being encoded, so they are only checked once
+        entry = checked.get(id(value))
+        if entry is not None and entry[0] is value:
+            return entry[1]
+    if not original.is_valid_for(value):
+        value._original_cbor = None
+        cbor = None
+    else:
+        cbor = original.cbor
+    if checked is not None:
+        checked[id(value)] = (value, cbor)
+    return cbor
+
+
+_CHECKED_ORIGINALS: ContextVar[
+    Optional[Dict[int, Tuple[Any, Optional[memoryview]]]]
+] = ContextVar("checked_originals", default=None)
+"""Objects checked by :func:`_get_original_cbor` during the current encoding, by id, with the result of the check.
+The objects are held, so their ids can't be reused by new objects during the encoding."""
+
+
+class _LazyField:
+    """Data descriptor of a field of a :class:`_LazyCBORSerializable`, which decodes the field on first access."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, obj: Optional[_LazyCBORSerializable], objtype=None) -> Any:
+        if obj is None:
+            return self
+        try:
+            return obj.__dict__[self.name]
+        except KeyError:
+            return obj._decode_field(self.name)
+
+    def __set__(self, obj: _LazyCBORSerializable, value: Any):
+        obj.__dict__[self.name] = value
+
+
+class _EncodedFields:
+    """The CBOR of a :class:`_LazyCBORSerializable`, and where each of its fields is encoded in it once located.
+
+    The views are read-only, so copies of an object share them.
+    """
+
+    __slots__ = ("cbor", "fields")
+
+    def __init__(self, cbor: memoryview):
+        self.cbor = cbor
+        self.fields: Optional[Dict[str, memoryview]] = None
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return _restore_encoded_fields, (
+            bytes(self.cbor[: _skip_cbor_item(self.cbor, 0)]),
+        )
+
+
+def _restore_encoded_fields(cbor: bytes) -> _EncodedFields:
+    return _EncodedFields(memoryview(cbor))
+
+
+class _LazyCBORSerializable(_KeepsOriginalCBOR):
+    """Mixin that makes a dataclass based :class:`ArrayCBORSerializable` or :class:`MapCBORSerializable` decode
+    lazily.
+
+    :meth:`from_cbor` only scans the CBOR for where each field is encoded, fields are decoded when they are accessed
+    for the first time. Fields listed in :attr:`_LAZY_FIELDS` are decoded lazily as well, into the given class, and
+    are only scanned when one of their own fields is accessed.
+    Otherwise, lazy objects behave like the class they extend: they are instances of it, compare equal to its
+    instances with the same fields, and keep their original CBOR like :class:`_KeepsOriginalCBOR`.
+
+    Subclasses put the mixin in front of the class they make lazy, and are not dataclasses themselves::
+
+        class LazyTransactionBody(_LazyCBORSerializable, TransactionBody):
+            pass
+    """
+
+    __slots__ = ("_encoded_fields",)
+
+    _LAZY_FIELDS: Dict[str, Type[_LazyCBORSerializable]] = {}
+    """Fields decoded into another lazy class, by name."""
+
+    _eager_class: type = object
+    """The class that is made lazy."""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._eager_class = next(
+            c for c in cls.__bases__ if not issubclass(c, _LazyCBORSerializable)
+        )
+        for f in fields(cls):
+            setattr(cls, f.name, _LazyField(f.name))
+
+    @classmethod
+    def from_cbor(cls, payload: Union[str, bytes]) -> Any:
+        """Restore an object from CBOR, without decoding any of its fields yet.
+
+        Args:
+            payload (Union[str, bytes]): CBOR bytes or hex string to restore from.
+
+        Returns:
+            Restored object of the specific subclass type.
+
+        Raises:
+            DeserializeException: When the CBOR is not an array or map with the fields of this class. Errors in the
+                fields themselves are only raised when the fields are accessed.
+        """
+        if isinstance(payload, str):
+            payload = bytes.fromhex(payload)
+
+        assert isinstance(payload, bytes)
+
+        return cls._from_encoded(memoryview(payload))
+
+    @classmethod
+    def _from_encoded(
+        cls, cbor: memoryview, locate: bool = True
+    ) -> _LazyCBORSerializable:
+        """Create an object from its CBOR.
+
+        Args:
+            cbor (memoryview): CBOR that starts with the object. Unless ``locate`` is False, it can extend past the
+                object.
+            locate (bool): Whether to locate the fields right away, which checks the CBOR has the expected shape.
+                Otherwise, map fields are located when a field is accessed for the first time.
+        """
+        obj = cls.__new__(cls)
+        obj._keep_encoded_fields(cbor, locate)
+        return obj
+
+    def _keep_encoded_fields(self, cbor: memoryview, locate: bool):
+        self._encoded_fields: _EncodedFields = _EncodedFields(cbor)
+        # The unknown fields of arrays need to be set before the object is snapshotted.
+        if locate or not isinstance(self, MapCBORSerializable):
+            self._encoded_fields.fields = self._locate_fields(cbor)
+        self._original_cbor = _LazyOriginalCBOR(self, cbor, trimmed=not locate)
+
+    def _locate_fields(self, cbor: memoryview) -> Dict[str, memoryview]:
+        cls = type(self)
+        try:
+            major_type, items, _ = _split_cbor(cbor)
+        except cbor2.CBORDecodeError as e:
+            raise DeserializeException(
+                f"Cannot deserialize {cls.__name__} from CBOR: {e}"
+            ) from e
+
+        plan = _get_codec_plan(cls)
+        encoded_fields = {}
+        if issubclass(cls, MapCBORSerializable):
+            if major_type != 5:
+                raise DeserializeException(
+                    f"Expect a map to deserialize {cls.__name__}, got an array."
+                )
+            keys = plan.keys
+            for i in range(0, len(items), 2):
+                key = cbor2.loads(items[i])
+                if key not in keys:
+                    raise DeserializeException(f"Unexpected map key {key} in CBOR.")
+                encoded_fields[keys[key][0]] = items[i + 1]
+        else:
+            if major_type != 4:
+                raise DeserializeException(
+                    f"Expect an array to deserialize {cls.__name__}, got a map."
+                )
+            init_fields = plan.init_fields
+            for (name, _), item in zip(init_fields, items):
+                encoded_fields[name] = item
+            for i in range(len(init_fields), len(items)):
+                setattr(
+                    self,
+                    f"unknown_field{i - len(init_fields)}",
+                    decode_cbor(bytes(items[i])),
+                )
+        return encoded_fields
+
+    def _decode_field(self, name: str) -> Any:
+        # Objects that were not created by from_cbor have all their fields set already.
+        encoded = getattr(self, "_encoded_fields", None)
+        if encoded is not None and encoded.fields is None:
+            encoded.fields = self._locate_fields(encoded.cbor)
+        cbor = None if encoded is None else cast(dict, encoded.fields).get(name)
+        if cbor is None:
+            f = self.__dataclass_fields__[name]  # type: ignore[attr-defined]
+            if f.default_factory is not MISSING:
+                value = f.default_factory()
+            elif f.default is not MISSING:
+                value = f.default
+            else:
+                raise AttributeError(
+                    f"'{type(self).__name__}' object has no attribute '{name}'"
+                )
+        elif name in self._LAZY_FIELDS:
+            value = self._LAZY_FIELDS[name]._from_encoded(cbor, locate=False)
+        else:
+            try:
+                restore = _get_codec_plan(type(self)).restorers[name]
+                value = restore(decode_cbor(bytes(cbor)))
+            except cbor2.CBORDecodeError as e:
+                raise DeserializeException(
+                    f"Cannot deserialize {name} of {type(self).__name__}: {e}"
+                ) from e
+            self._keep_original_field_cbor(name, value, cbor)
+
+        self.__dict__[name] = value
+        original = getattr(self, "_original_cbor", None)
+        if isinstance(original, _LazyOriginalCBOR):
+            original.add_field(name, value)
+        return value
+
+    def __eq__(self, other):
+        if not isinstance(other, self._eager_class):
+            return NotImplemented
+        return all(
+            getattr(self, f.name) == getattr(other, f.name)
+            for f in fields(cast(Any, self))
+            if f.compare
+        )
+
+    def __repr__(self):
+        for f in fields(cast(Any, self)):
+            getattr(self, f.name)
+        return super().__repr__()
+
+
+def _check_type(value: Any, type_hint: Any) -> bool:
+    """Check whether a value matches a type hint, and validate the CBORSerializables in it along the way."""
+    if type_hint is Any:
+        return True
+
+    if isinstance(value, CBORSerializable):
+        value.validate()
+
+    origin = getattr(type_hint, "__origin__", None)
+    if origin is None:
+        return isinstance(value, type_hint)
+    elif origin is ClassVar:
+        return _check_type(value, type_hint.__args__[0])
+    elif origin is Union:
+        return any(_check_type(value, arg) for arg in type_hint.__args__)
+    elif origin is Dict or isinstance(value, (dict, FrozenDict)):
+        key_type, value_type = type_hint.__args__
+        return all(
+            _check_type(k, key_type) and _check_type(v, value_type)
+            for k, v in value.items()
+        )
+    elif origin in (list, set, tuple, frozenset, OrderedSet):
+        if value is None:
+            return True
+        args = type_hint.__args__
+        if len(args) == 1:
+            return all(_check_type(item, args[0]) for item in value)
+        elif len(args) > 1:
+            return all(_check_type(item, arg) for item, arg in zip(value, args))
+    return True  # We don't know how to check this type
+
+
+_TYPE_CHECKS: Dict[Any, Callable[[Any], bool]] = {}
+
+
+def _get_type_check(type_hint: Any) -> Callable[[Any], bool]:
+    """Get a function equivalent to ``lambda v: _check_type(v, type_hint)``, cached per type hint."""
+    try:
+        return _TYPE_CHECKS[type_hint]
+    except KeyError:
+        check = _TYPE_CHECKS[type_hint] = _compile_type_check(type_hint)
+        return check
+    except TypeError:
+        # Unhashable type hint
+        return _compile_type_check(type_hint)
+
+
+def _compile_type_check(type_hint: Any) -> Callable[[Any], bool]:
+    if type_hint is Any:
+        return lambda v: True
+
+    try:
+        check_structure = _compile_structure_check(type_hint)
+    except Exception:
+        return lambda v: _check_type(v, type_hint)
+
+    def check(v):
+        if isinstance(v, CBORSerializable):
+            v.validate()
+        return check_structure(v)
+
+    return check
+
+
+def _compile_structure_check(type_hint: Any) -> Callable[[Any], bool]:
+    """Compile the part of :func:`_check_type` that follows the validation of the value itself."""
+    origin = getattr(type_hint, "__origin__", None)
+    if origin is None:
+        return lambda v: isinstance(v, type_hint)
+    elif origin is ClassVar:
+        return _compile_union_member_check(type_hint.__args__[0])
+    elif origin is Union:
+        arg_checks = [_compile_union_member_check(arg) for arg in type_hint.__args__]
+        return lambda v: any(check(v) for check in arg_checks)
+
+    args = type_hint.__args__
+    check_items: Optional[Callable[[Any], bool]] = None
+    if origin in (list, set, tuple, frozenset, OrderedSet):
+        if len(args) == 1:
+            check_item = _get_type_check(args[0])
+
+            def check_homogeneous_items(v):
+                return v is None or all(check_item(item) for item in v)
+
+            check_items = check_homogeneous_items
+        elif len(args) > 1:
+            item_checks = [_get_type_check(arg) for arg in args]
+
+            def check_positional_items(v):
+                return v is None or all(
+                    check(item) for item, check in zip(v, item_checks)
+                )
+
+            check_items = check_positional_items
+
+    if len(args) == 2:
+        check_key, check_value = _get_type_check(args[0]), _get_type_check(args[1])
+
+        def check_dict(v):
+            return all(check_key(k) and check_value(w) for k, w in v.items())
+
+    else:
+
+        def check_dict(v):
+            # Raises the same error as _check_type
+            key_type, value_type = args
+            return True
+
+    def check_container(v):
+        if origin is Dict or isinstance(v, (dict, FrozenDict)):
+            return check_dict(v)
+        elif check_items is not None:
+            return check_items(v)
+        return True
+
+    return check_container
+
+
+def _compile_union_member_check(type_hint: Any) -> Callable[[Any], bool]:
+    # The value was validated already before checking it against the members of the union
+    if type_hint is Any:
+        return lambda v: True
+    return _compile_structure_check(type_hint)
+
+
+def _get_field_checks(
+    cls: type,
+) -> Tuple[Tuple[str, Any, Callable[[Any], bool]], ...]:
+    """Get ``(name, type hint, check)`` of every type hinted attribute of a class, used by
+    :meth:`CBORSerializable.validate`.
+
+    Type hints are resolved once per class, the first time an instance is validated.
+    """
+    # Look up in the class's own namespace, so a subclass doesn't pick up the checks of its parent.
+    checks = cls.__dict__.get("_field_checks")
+    if checks is None:
+        checks = tuple(
+            (name, type_hint, _get_type_check(type_hint))
+            for name, type_hint in get_type_hints(cls).items()
+        )
+        setattr(cls, "_field_checks", checks)
+    return checks
 
 
 @typechecked
@@ -305,54 +1401,7 @@ class CBORSerializable:
             SerializeException: When the object or its elements could not be converted to
                 CBOR primitive types.
         """
-        result = self.to_shallow_primitive()
-
-        def _dfs(value, freeze=False):
-            if isinstance(value, CBORSerializable):
-                return _dfs(value.to_primitive(), freeze)
-            elif isinstance(value, (dict, OrderedDict, defaultdict)):
-                _dict = type(value)()
-                if hasattr(value, "default_factory"):
-                    _dict.setdefault(value.default_factory)
-                for k, v in value.items():
-                    _dict[_dfs(k, freeze=True)] = _dfs(v, freeze)
-                if freeze:
-                    return FrozenDict(_dict)
-                return _dict
-            elif isinstance(value, set):
-                _set = set(_dfs(v, freeze=True) for v in value)
-                if freeze:
-                    return frozenset(_set)
-                return _set
-            elif isinstance(value, tuple):
-                return tuple(_dfs(v, freeze) for v in value)
-            elif isinstance(
-                value, (IndefiniteFrozenList, FrozenList, IndefiniteList, list)
-            ):
-                _list = [_dfs(v, freeze) for v in value]
-
-                already_frozen = isinstance(value, (IndefiniteFrozenList, FrozenList))
-                should_freeze = already_frozen or freeze
-
-                if not should_freeze:
-                    return (
-                        IndefiniteList(_list)
-                        if isinstance(value, IndefiniteList)
-                        else _list
-                    )
-
-                is_indefinite = isinstance(
-                    value, (IndefiniteFrozenList, IndefiniteList)
-                )
-                fl = IndefiniteFrozenList(_list) if is_indefinite else FrozenList(_list)
-                fl.freeze()
-                return fl
-            elif isinstance(value, CBORTag):
-                return CBORTag(value.tag, _dfs(value.value, freeze))
-            else:
-                return value
-
-        return _dfs(result)
+        return _to_primitive_tree(self.to_shallow_primitive())
 
     def validate(self):
         """Validate the data stored in the current instance. Defaults to always pass.
@@ -360,43 +1409,9 @@ class CBORSerializable:
         Raises:
             InvalidDataException: When the data is invalid.
         """
-        type_hints = get_type_hints(self.__class__)
-
-        def _check_recursive(value, type_hint):
-            if type_hint is Any:
-                return True
-
-            if isinstance(value, CBORSerializable):
-                value.validate()
-
-            origin = getattr(type_hint, "__origin__", None)
-            if origin is None:
-                return isinstance(value, type_hint)
-            elif origin is ClassVar:
-                return _check_recursive(value, type_hint.__args__[0])
-            elif origin is Union:
-                return any(_check_recursive(value, arg) for arg in type_hint.__args__)
-            elif origin is Dict or isinstance(value, (dict, FrozenDict)):
-                key_type, value_type = type_hint.__args__
-                return all(
-                    _check_recursive(k, key_type) and _check_recursive(v, value_type)
-                    for k, v in value.items()
-                )
-            elif origin in (list, set, tuple, frozenset, OrderedSet):
-                if value is None:
-                    return True
-                args = type_hint.__args__
-                if len(args) == 1:
-                    return all(_check_recursive(item, args[0]) for item in value)
-                elif len(args) > 1:
-                    return all(
-                        _check_recursive(item, arg) for item, arg in zip(value, args)
-                    )
-            return True  # We don't know how to check this type
-
-        for field_name, field_type in type_hints.items():
+        for field_name, field_type, check in _get_field_checks(self.__class__):
             field_value = getattr(self, field_name)
-            if not _check_recursive(field_value, field_type):
+            if not check(field_value):
                 raise TypeError(
                     f"Field '{field_name}' should be of type {field_type}, "
                     f"got {repr(field_value)} instead."
@@ -413,7 +1428,8 @@ class CBORSerializable:
             SerializeException: When the object or its elements could not be converted to
                 CBOR primitive types.
         """
-        self.validate()
+        if _VALIDATION_ENABLED.get():
+            self.validate()
         return self.to_primitive()
 
     @classmethod
@@ -437,9 +1453,13 @@ class CBORSerializable:
             f"'from_primitive()' is not implemented by {cls.__name__}."
         )
 
-    def to_cbor(self) -> bytes:
+    def to_cbor(self, validate: bool = True) -> bytes:
         """Encode a Python object into CBOR bytes.
 
+        Args:
+            validate (bool): Whether to validate the object with :meth:`validate` before encoding it. Only skip the
+                validation for objects that are known to be valid, see :func:`skip_validation`.
+
         Returns:
             bytes: Python object encoded in cbor bytes.
 
@@ -462,15 +1482,21 @@ class CBORSerializable:
             >>> a.to_cbor().hex()
             '820102'
         """
+        if not validate:
+            with skip_validation():
+                return dumps(self, default=default_encoder)
         return dumps(self, default=default_encoder)
 
-    def to_cbor_hex(self) -> str:
+    def to_cbor_hex(self, validate: bool = True) -> str:
         """Encode a Python object into CBOR hex.
 
+        Args:
+            validate (bool): Whether to validate the object with :meth:`validate` before encoding it.
+
         Returns:
             str: Python object encoded in cbor hex string.
         """
-        return self.to_cbor().hex()
+        return self.to_cbor(validate).hex()
 
     @classmethod
     def from_cbor(cls: Type[CBORBase], payload: Union[str, bytes]) -> CBORBase:
@@ -540,9 +1566,13 @@ class CBORSerializable:
 
         assert isinstance(payload, bytes)
 
-        value = cbor2.loads(payload)
+        value = decode_cbor(payload)
+        obj = cls.from_primitive(value)
 
-        return cls.from_primitive(value)
+        if isinstance(obj, _KeepsOriginalCBOR):
+            obj._keep_original_cbor(memoryview(payload))
+
+        return obj
 
     def __repr__(self):
         return pformat(vars(self), indent=2)
@@ -669,24 +1699,6 @@ class CBORSerializable:
             return cls.from_json(f.read())
 
 
-def _restore_dataclass_field(
-    f: Field, v: Primitive
-) -> Union[Primitive, CBORSerializable]:
-    """Try to restore a value back to its original type based on information given in field.
-
-    Args:
-        f (dataclass_field): A data class field.
-        v (:const:`Primitive`): A CBOR primitive.
-
-    Returns:
-        Union[:const:`Primitive`, CBORSerializable]: A CBOR primitive or a CBORSerializable.
-    """
-
-    if "object_hook" in f.metadata:
-        return f.metadata["object_hook"](v)
-    return _restore_typed_primitive(cast(Any, f.type), v)
-
-
 def _restore_typed_primitive(
     t: typing.Type, v: Primitive
 ) -> Union[Primitive, CBORSerializable]:
@@ -772,6 +1784,215 @@ def _restore_typed_primitive(
     raise DeserializeException(f"Cannot deserialize object: \n{v}\n to type {t}.")
 
 
+_RESTORERS: Dict[Any, Callable[[Primitive], Any]] = {}
+
+
+def _restorer_key(t: Any) -> Any:
+    """The key of the restorer of ``t`` in the cache.
+
+    ``Union[A, B]`` and ``Union[B, A]`` are equal, but their members are tried in a different order, so the key
+    includes the arguments of ``t`` and of the types nested in it, in order.
+    """
+    args = typing.get_args(t)
+    if not args:
+        return t
+    return t, tuple(_restorer_key(arg) for arg in args)
+
+
+def _get_restorer(t: Any) -> Callable[[Primitive], Any]:
+    """Get a function that restores a primitive to type ``t``, equivalent to
+    ``lambda v: _restore_typed_primitive(t, v)``.
+
+    The inspection of ``t`` is done only once, the result is cached per type.
+    """
+    try:
+        key = _restorer_key(t)
+        return _RESTORERS[key]
+    except KeyError:
+        restorer = _RESTORERS[key] = _compile_restorer(t)
+        return restorer
+    except TypeError:
+        # Unhashable type annotation
+        return _compile_restorer(t)
+
+
+def _compile_restorer(t: Any) -> Callable[[Primitive], Any]:
+    if t is Any:
+        return _identity
+
+    try:
+        restorer = _compile_non_primitive_restorer(t)
+    except Exception:
+        return lambda v: _restore_typed_primitive(t, v)
+
+    if t in PRIMITIVE_TYPES:
+        return lambda v: v if isinstance(v, t) else restorer(v)
+    return restorer
+
+
+def _compile_non_primitive_restorer(t: Any) -> Callable[[Primitive], Any]:
+    is_cbor_serializable = False
+    try:
+        is_cbor_serializable = issubclass(t, CBORSerializable)
+    except TypeError:
+        origin = typing.get_origin(t)
+        if origin is not None:
+            try:
+                is_cbor_serializable = issubclass(origin, CBORSerializable)
+            except TypeError:
+                pass
+
+    if is_cbor_serializable:
+        if "type_args" in getfullargspec(t.from_primitive).args:
+            type_args = typing.get_args(t)
+            return lambda v: t.from_primitive(v, type_args=type_args)
+        return lambda v: t.from_primitive(v)
+    elif hasattr(t, "__origin__") and (t.__origin__ is list):
+        t_args = t.__args__
+        if len(t_args) != 1:
+            raise DeserializeException(
+                f"List types need exactly one type argument, but got {t_args}"
+            )
+        restore_item = _get_restorer(t_args[0])
+
+        def restore_list(v):
+            if not isinstance(v, (list, IndefiniteList)):
+                raise DeserializeException(f"Expected type list but got {type(v)}")
+            return [restore_item(w) for w in v]
+
+        return restore_list
+    elif isclass(t) and t == ByteString:
+
+        def restore_byte_string(v):
+            if not isinstance(v, bytes):
+                raise DeserializeException(f"Expected type bytes but got {type(v)}")
+            return ByteString(v)
+
+        return restore_byte_string
+    elif hasattr(t, "__origin__") and (t.__origin__ is dict):
+        t_args = t.__args__
+        if len(t_args) != 2:
+            raise DeserializeException(
+                f"Dict types need exactly two type arguments, but got {t_args}"
+            )
+        restore_key = _get_restorer(t_args[0])
+        restore_val = _get_restorer(t_args[1])
+
+        def restore_dict(v):
+            if not isinstance(v, dict):
+                raise DeserializeException(f"Expected dict type but got {type(v)}")
+            return {restore_key(key): restore_val(val) for key, val in v.items()}
+
+        return restore_dict
+    elif hasattr(t, "__origin__") and (
+        t.__origin__ is Union or t.__origin__ is Optional
+    ):
+        t_args = t.__args__
+        restore_args = [_get_restorer(arg) for arg in t_args]
+
+        def restore_union(v):
+            for restore_arg in restore_args:
+                try:
+                    return restore_arg(v)
+                except DeserializeException:
+                    pass
+            raise DeserializeException(
+                f"Cannot deserialize object: \n{v}\n in any valid type from {t_args}."
+            )
+
+        return restore_union
+    elif isclass(t) and issubclass(t, IndefiniteList):
+
+        def restore_indefinite_list(v):
+            try:
+                return t(v)
+            except TypeError:
+                raise DeserializeException(
+                    f"Can not initialize IndefiniteList from {v}"
+                )
+
+        return restore_indefinite_list
+
+    def fail(v):
+        raise DeserializeException(f"Cannot deserialize object: \n{v}\n to type {t}.")
+
+    return fail
+
+
+class _CodecPlan:
+    """(De)serialization steps of a dataclass based :class:`CBORSerializable`, derived from its fields once.
+
+    Restorers are only resolved when the class is deserialized for the first time, because resolving them needs the
+    type hints of the class, which might not be available when an instance is serialized.
+
+    Attributes:
+        fields (Tuple[Tuple[Any, str, bool], ...]): ``(key, name, optional)`` of all fields, in declaration order.
+        init_fields (Tuple[Tuple[str, Callable], ...]): ``(name, restorer)`` of fields accepted by ``__init__``.
+        keys (Dict[Any, Tuple[str, Callable]]): Map key of each field in ``init_fields`` to its name and restorer.
+        restorers (Dict[str, Callable]): Restorer of each field in ``init_fields`` by name.
+    """
+
+    __slots__ = ("cls", "fields", "_init_fields", "_keys", "_restorers")
+
+    def __init__(self, cls: type):
+        self.cls = cls
+        self.fields = tuple(
+            (f.metadata.get("key", f.name), f.name, bool(f.metadata.get("optional")))
+            for f in fields(cls)
+        )
+        self._init_fields: Optional[Tuple[Tuple[str, Callable], ...]] = None
+        self._keys: Optional[Dict[Any, Tuple[str, Callable]]] = None
+        self._restorers: Optional[Dict[str, Callable]] = None
+
+    @property
+    def init_fields(self) -> Tuple[Tuple[str, Callable], ...]:
+        if self._init_fields is None:
+            self._compile_restorers()
+        return cast(Tuple[Tuple[str, Callable], ...], self._init_fields)
+
+    @property
+    def keys(self) -> Dict[Any, Tuple[str, Callable]]:
+        if self._keys is None:
+            self._compile_restorers()
+        return cast(Dict[Any, Tuple[str, Callable]], self._keys)
+
+    @property
+    def restorers(self) -> Dict[str, Callable]:
+        if self._restorers is None:
+            self._compile_restorers()
+        return cast(Dict[str, Callable], self._restorers)
+
+    def _compile_restorers(self):
+        init_fields = []
+        keys = {}
+        type_hints = None
+        for f in fields(self.cls):
+            if not f.init:
+                continue
+            if not isclass(f.type):
+                if type_hints is None:
+                    type_hints = get_type_hints(self.cls)
+                f.type = type_hints[f.name]
+            if "object_hook" in f.metadata:
+                restorer = f.metadata["object_hook"]
+            else:
+                restorer = _get_restorer(f.type)
+            init_fields.append((f.name, restorer))
+            keys[f.metadata.get("key", f.name)] = (f.name, restorer)
+        self._init_fields = tuple(init_fields)
+        self._keys = keys
+        self._restorers = dict(init_fields)
+
+
+def _get_codec_plan(cls: type) -> _CodecPlan:
+    # Look up in the class's own namespace, so a subclass doesn't pick up the plan of its parent.
+    plan = cls.__dict__.get("_codec_plan")
+    if plan is None:
+        plan = _CodecPlan(cls)
+        setattr(cls, "_codec_plan", plan)
+    return plan
+
+
 ArrayBase = TypeVar("ArrayBase", bound="ArrayCBORSerializable")
 """A generic type that is bounded by ArrayCBORSerializable."""
 
@@ -846,9 +2067,9 @@ class ArrayCBORSerializable(CBORSerializable):
                 types.
         """
         primitives = []
-        for f in fields(self):
-            val = getattr(self, f.name)
-            if val is None and f.metadata.get("optional"):
+        for _, name, optional in _get_codec_plan(self.__class__).fields:
+            val = getattr(self, name)
+            if val is None and optional:
                 continue
             primitives.append(val)
         return primitives
@@ -870,18 +2091,11 @@ class ArrayCBORSerializable(CBORSerializable):
         Raises:
             DeserializeException: When the object could not be restored from primitives.
         """
-        all_fields = [f for f in fields(cls) if f.init]
+        init_fields = _get_codec_plan(cls).init_fields
 
-        restored_vals = []
-        type_hints = get_type_hints(cls)
-        for f, v in zip(all_fields, values):
-            if not isclass(f.type):
-                f.type = type_hints[f.name]
-            v = _restore_dataclass_field(f, v)
-            restored_vals.append(v)
-        obj = cls(*restored_vals)
-        for i in range(len(all_fields), len(values)):
-            setattr(obj, f"unknown_field{i - len(all_fields)}", values[i])
+        obj = cls(*[restore(v) for (_, restore), v in zip(init_fields, values)])
+        for i in range(len(init_fields), len(values)):
+            setattr(obj, f"unknown_field{i - len(init_fields)}", values[i])
         return obj
 
     def __repr__(self):
@@ -951,15 +2165,11 @@ class MapCBORSerializable(CBORSerializable):
 
     def to_shallow_primitive(self) -> Primitive:
         primitives = {}
-        for f in fields(self):
-            if "key" in f.metadata:
-                key = f.metadata["key"]
-            else:
-                key = f.name
+        for key, name, optional in _get_codec_plan(self.__class__).fields:
             if key in primitives:
                 raise SerializeException(f"Key: '{key}' already exists in the map.")
-            val = getattr(self, f.name)
-            if val is None and f.metadata.get("optional"):
+            val = getattr(self, name)
+            if val is None and optional:
                 continue
             primitives[key] = val
         return primitives
@@ -979,19 +2189,14 @@ class MapCBORSerializable(CBORSerializable):
         Raises:
             :class:`pycardano.exception.DeserializeException`: When the object could not be restored from primitives.
         """
-        all_fields = {f.metadata.get("key", f.name): f for f in fields(cls) if f.init}
+        keys = _get_codec_plan(cls).keys
 
         kwargs = {}
-        type_hints = get_type_hints(cls)
-        for key in values:
-            if key not in all_fields:
+        for key, v in values.items():
+            if key not in keys:
                 raise DeserializeException(f"Unexpected map key {key} in CBOR.")
-            f = all_fields[key]
-            v = values[key]
-            if not isclass(f.type):
-                f.type = type_hints[f.name]
-            v = _restore_dataclass_field(f, v)
-            kwargs[f.name] = v
+            name, restore = keys[key]
+            kwargs[name] = restore(v)
         return cls(**kwargs)
 
     def __repr__(self):
@@ -1035,6 +2240,9 @@ class DictCBORSerializable(CBORSerializable):
         self.data = dict(*args, **kwargs)
 
     def __getattr__(self, item):
+        # Not set yet while unpickling
+        if item == "data":
+            raise AttributeError(item)
         return getattr(self.data, item)
 
     def __setitem__(self, key: Any, value: Any):
@@ -1080,7 +2288,8 @@ class DictCBORSerializable(CBORSerializable):
         # Sort keys in a map according to https://datatracker.ietf.org/doc/html/rfc7049#section-3.9
         def _get_sortable_val(key):
             if isinstance(key, CBORSerializable):
-                cbor_bytes = key.to_cbor()
+                # Keys are validated by validate(), their CBOR is only needed for sorting here
+                cbor_bytes = key.to_cbor(validate=False)
             else:
                 cbor_bytes = dumps(key)
             return len(cbor_bytes), cbor_bytes
@@ -1138,26 +2347,64 @@ def list_hook(
     return lambda vals: [cls.from_primitive(v) for v in vals]
 
 
+_CBOR_KEYED_TYPES = (bool, float, Fraction, Decimal, ByteString)
+"""Hashable types whose instances can be equal to values with a different CBOR, e.g. ``True == 1``."""
+
+_CBOR_KEY = object()
+"""Marks the keys of :class:`OrderedSet` items that are keyed by their CBOR, so they can't collide with items."""
+
+
+def _has_structural_hash(item_type: type) -> bool:
+    """Whether instances of ``item_type`` are hashed and compared by value, consistently with their CBOR."""
+    return (
+        item_type.__hash__ is not None
+        and item_type.__hash__ is not object.__hash__
+        and item_type.__eq__ is not object.__eq__
+        and not issubclass(item_type, _CBOR_KEYED_TYPES)
+    )
+
+
 class OrderedSet(Generic[T], CBORSerializable):
+    """A set that keeps the order in which items are added, serialized to a CBOR array with the set tag (258).
+
+    Items are told apart by value: hashable items, e.g. hashes, transaction inputs, numbers or bytes, by their hash and
+    equality, other items by their CBOR. Like the keys of a dict, items must not be changed while they are in the set.
+    """
+
     def __init__(
         self,
         iterable: Optional[Union[List[T], IndefiniteList]] = None,
         use_tag: bool = True,
     ):
         super().__init__()
-        self._dict: Dict[bytes, int] = {}
-        self._list: List[T] = []
+        # Key of each item -> item, in insertion order
+        self._items: Dict[Any, T] = {}
+        # The items, once they are indexed, until an item is removed
+        self._list: Optional[List[T]] = None
         self._use_tag = use_tag
         self._is_indefinite_list = False
         if iterable:
             self._is_indefinite_list = isinstance(iterable, IndefiniteList)
             self.extend(iterable)
 
+    def _key(self, item: Any) -> Any:
+        if _has_structural_hash(type(item)):
+            try:
+                hash(item)
+                return item
+            except TypeError:
+                # E.g. a tuple holding a list
+                pass
+        with skip_validation():
+            return (_CBOR_KEY, dumps(item, default=default_encoder))
+
     def append(self, item: T) -> None:
-        if item in self:
+        key = self._key(item)
+        if key in self._items:
             return
-        self._list.append(item)
-        self._dict[dumps(item, default=default_encoder)] = len(self._list) - 1
+        self._items[key] = item
+        if self._list is not None:
+            self._list.append(item)
 
     def extend(self, items: Iterable[T]) -> None:
         self._is_indefinite_list = isinstance(items, IndefiniteList)
@@ -1165,26 +2412,27 @@ class OrderedSet(Generic[T], CBORSerializable):
             self.append(item)
 
     def remove(self, item: T) -> None:
-        if item not in self:
-            return
-        index = self._dict.pop(dumps(item, default=default_encoder))
-        self._list.pop(index)
-        # Update the indices in the dictionary
-        for key, idx in self._dict.items():
-            if idx > index:
-                self._dict[key] = idx - 1
+        key = self._key(item)
+        if key in self._items:
+            del self._items[key]
+            self._list = None
 
     def __contains__(self, item: object) -> bool:
-        return dumps(item, default=default_encoder) in self._dict
+        return self._key(item) in self._items
 
     def __iter__(self):
-        return iter(self._list)
+        return iter(self._items.values())
 
     def __getitem__(self, index: int) -> T:
-        return self._list[index]
+        if self._list is None:
+            self._list = list(self._items.values())
+        try:
+            return self._list[index]
+        except IndexError:
+            raise IndexError("OrderedSet index out of range") from None
 
     def __len__(self) -> int:
-        return len(self._list)
+        return len(self._items)
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, OrderedSet):
@@ -1241,6 +2489,14 @@ class OrderedSet(Generic[T], CBORSerializable):
     def __deepcopy__(self, memo):
         return self.__class__(deepcopy(list(self), memo), use_tag=self._use_tag)
 
+    def __reduce__(self):
+        # The keys of items keyed by their CBOR hold _CBOR_KEY, which is a different object once unpickled.
+        items = list(self)
+        return self.__class__, (
+            IndefiniteList(items) if self._is_indefinite_list else items,
+            self._use_tag,
+        )
+
     def __hash__(self):
         return hash(self.to_shallow_primitive())
 
@@ -2,9 +2,8 @@
 
 from __future__ import annotations
 
-from copy import deepcopy
 from dataclasses import dataclass, field
-from typing import Any, Callable, List, Optional, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
 
 import cbor2
 from cbor2 import CBORTag
@@ -39,12 +38,16 @@ from pycardano.serialization import (
     NonEmptyOrderedSet,
     OrderedSet,
     Primitive,
+    _iter_encoded_items,
+    _KeepsOriginalCBOR,
+    _LazyCBORSerializable,
+    decode_cbor,
     default_encoder,
     limit_primitive_type,
     list_hook,
 )
 from pycardano.types import typechecked
-from pycardano.witness import TransactionWitnessSet
+from pycardano.witness import LazyTransactionWitnessSet, TransactionWitnessSet
 
 __all__ = [
     "TransactionInput",
@@ -52,10 +55,13 @@ __all__ = [
     "Asset",
     "MultiAsset",
     "Value",
+    "ValueAccumulator",
     "TransactionOutput",
     "UTxO",
     "TransactionBody",
     "Transaction",
+    "LazyTransactionBody",
+    "LazyTransaction",
     "Withdrawals",
 ]
 
@@ -70,7 +76,7 @@ class TransactionInput(ArrayCBORSerializable):
     index: int
 
     def __hash__(self):
-        return hash(str(self.transaction_id) + str(self.index))
+        return hash((self.transaction_id, self.index))
 
 
 class AssetName(ConstrainedBytes):
@@ -80,6 +86,44 @@ class AssetName(ConstrainedBytes):
         return f"AssetName({self.payload})"
 
 
+def _merge_amounts(amounts: dict, other: dict, subtract: bool = False) -> dict:
+    """Add the amounts in ``other`` to a copy of ``amounts`` (or subtract them), leaving out zero amounts."""
+    merged = dict(amounts)
+    if subtract:
+        for key, amount in other.items():
+            merged[key] = merged.get(key, 0) - amount
+    else:
+        for key, amount in other.items():
+            merged[key] = merged.get(key, 0) + amount
+    if 0 in merged.values():
+        merged = {key: amount for key, amount in merged.items() if amount != 0}
+    return merged
+
+
+def _merge_multi_assets(
+    multi_asset: MultiAsset, other: MultiAsset, subtract: bool = False
+) -> dict:
+    """Like :func:`_merge_amounts`, for the assets of each policy. Policies left without assets are left out.
+
+    The assets in the result are new objects, they can be modified without affecting ``multi_asset`` or ``other``.
+    """
+    merged = {}
+    other_data = other.data
+    for policy_id, asset in multi_asset.data.items():
+        other_asset = other_data.get(policy_id)
+        amounts = _merge_amounts(
+            asset.data, other_asset.data if other_asset is not None else {}, subtract
+        )
+        if amounts:
+            merged[policy_id] = asset.__class__(amounts)
+    for policy_id, other_asset in other_data.items():
+        if policy_id not in multi_asset.data:
+            amounts = _merge_amounts({}, other_asset.data, subtract)
+            if amounts:
+                merged[policy_id] = other_asset.__class__(amounts)
+    return merged
+
+
 @typechecked
 class Asset(DictCBORSerializable):
     KEY_TYPE = AssetName
@@ -88,9 +132,9 @@ class Asset(DictCBORSerializable):
 
     def normalize(self) -> Asset:
         """Normalize the Asset by removing zero values."""
-        for k, v in list(self.items()):
-            if v == 0:
-                self.pop(k)
+        if 0 in self.data.values():
+            for k in [k for k, v in self.data.items() if v == 0]:
+                del self.data[k]
 
         return self
 
@@ -98,21 +142,14 @@ class Asset(DictCBORSerializable):
         return self + other
 
     def __add__(self, other: Asset) -> Asset:
-        new_asset = deepcopy(self)
-        for n in other:
-            new_asset[n] = new_asset.get(n, 0) + other[n]
-        return new_asset.normalize()
+        return self.__class__(_merge_amounts(self.data, other.data))
 
     def __iadd__(self, other: Asset) -> Asset:
-        new_item = self + other
-        self.data = new_item.data
-        return self.normalize()
+        self.data = _merge_amounts(self.data, other.data)
+        return self
 
     def __sub__(self, other: Asset) -> Asset:
-        new_asset = deepcopy(self)
-        for n in other:
-            new_asset[n] = new_asset.get(n, 0) - other[n]
-        return new_asset.normalize()
+        return self.__class__(_merge_amounts(self.data, other.data, subtract=True))
 
     def __eq__(self, other):
         if not isinstance(other, Asset):
@@ -154,7 +191,7 @@ class Asset(DictCBORSerializable):
         return res
 
     def to_shallow_primitive(self) -> dict:
-        x = deepcopy(self).normalize()
+        x = self.__class__(_merge_amounts(self.data, {}))
         return super(self.__class__, x).to_shallow_primitive()
 
 
@@ -176,21 +213,14 @@ class MultiAsset(DictCBORSerializable):
         return self
 
     def __add__(self, other):
-        new_multi_asset = deepcopy(self)
-        for p in other:
-            new_multi_asset[p] = new_multi_asset.get(p, Asset()) + other[p]
-        return new_multi_asset.normalize()
+        return self.__class__(_merge_multi_assets(self, other))
 
     def __iadd__(self, other):
-        new_item = self + other
-        self.data = new_item.data
-        return self.normalize()
+        self.data = _merge_multi_assets(self, other)
+        return self
 
     def __sub__(self, other: MultiAsset) -> MultiAsset:
-        new_multi_asset = deepcopy(self)
-        for p in other:
-            new_multi_asset[p] = new_multi_asset.get(p, Asset()) - other[p]
-        return new_multi_asset.normalize()
+        return self.__class__(_merge_multi_assets(self, other, subtract=True))
 
     def __eq__(self, other):
         if not isinstance(other, MultiAsset):
@@ -277,7 +307,7 @@ class MultiAsset(DictCBORSerializable):
         return res
 
     def to_shallow_primitive(self) -> dict:
-        x = deepcopy(self).normalize()
+        x = self.__class__(_merge_multi_assets(self, self.__class__()))
         return super(self.__class__, x).to_shallow_primitive()
 
 
@@ -299,9 +329,10 @@ class Value(ArrayCBORSerializable):
         return Value(self.coin + other.coin, self.multi_asset + other.multi_asset)
 
     def __iadd__(self, other: Union[Value, int]):
-        new_item = self + other
-        self.coin = new_item.coin
-        self.multi_asset = new_item.multi_asset
+        if isinstance(other, int):
+            other = Value(other)
+        self.coin += other.coin
+        self.multi_asset = self.multi_asset + other.multi_asset
         return self
 
     def __sub__(self, other: Union[Value, int]) -> Value:
@@ -340,6 +371,91 @@ class Value(ArrayCBORSerializable):
             return self.coin
 
 
+class ValueAccumulator:
+    """A mutable sum of :class:`Value`, to add up the amounts of many UTxOs or outputs.
+
+    Adding :class:`Value` objects together copies all the assets accumulated so far on every addition. An accumulator
+    keeps the amount of each asset in a flat ``(policy_id, asset_name) -> amount`` mapping instead, which is updated in
+    place, so each addition only costs as much as the number of assets being added.
+
+    Args:
+        value (Union[Value, MultiAsset, int]): Initial amount.
+
+    Examples:
+        >>> policy_id = ScriptHash(b"1" * 28)
+        >>> total = ValueAccumulator(1_000_000)
+        >>> total += Value(2_000_000, MultiAsset({policy_id: Asset({AssetName(b"Token"): 5})}))
+        >>> total -= MultiAsset({policy_id: Asset({AssetName(b"Token"): 2})})
+        >>> total.to_value() == Value(3_000_000, MultiAsset({policy_id: Asset({AssetName(b"Token"): 3})}))
+        True
+    """
+
+    __slots__ = ("coin", "_amounts")
+
+    def __init__(self, value: Union[Value, MultiAsset, int] = 0):
+        self.coin = 0
+        self._amounts: Dict[Tuple[ScriptHash, AssetName], int] = {}
+        self.add(value)
+
+    def add(
+        self, value: Union[Value, MultiAsset, int], subtract: bool = False
+    ) -> ValueAccumulator:
+        """Add ``value`` to the accumulated amount, or subtract it.
+
+        Args:
+            value (Union[Value, MultiAsset, int]): The amount to add or subtract.
+            subtract (bool): Whether to subtract ``value`` instead of adding it.
+
+        Returns:
+            ValueAccumulator: This accumulator.
+        """
+        if isinstance(value, int):
+            self.coin += -value if subtract else value
+            return self
+        if isinstance(value, Value):
+            self.coin += -value.coin if subtract else value.coin
+            multi_asset = value.multi_asset
+        elif isinstance(value, MultiAsset):
+            multi_asset = value
+        else:
+            raise TypeError(f"Cannot add {type(value)} to a ValueAccumulator.")
+        amounts = self._amounts
+        for policy_id, asset in multi_asset.data.items():
+            for asset_name, amount in asset.data.items():
+                key = (policy_id, asset_name)
+                if subtract:
+                    amounts[key] = amounts.get(key, 0) - amount
+                else:
+                    amounts[key] = amounts.get(key, 0) + amount
+        return self
+
+    def __iadd__(self, other: Union[Value, MultiAsset, int]) -> ValueAccumulator:
+        return self.add(other)
+
+    def __isub__(self, other: Union[Value, MultiAsset, int]) -> ValueAccumulator:
+        return self.add(other, subtract=True)
+
+    @property
+    def multi_asset(self) -> MultiAsset:
+        """The accumulated assets, without the ones whose amount adds up to zero."""
+        multi_asset = MultiAsset()
+        data = multi_asset.data
+        for (policy_id, asset_name), amount in self._amounts.items():
+            if amount != 0:
+                asset = data.get(policy_id)
+                if asset is None:
+                    asset = data[policy_id] = Asset()
+                asset.data[asset_name] = amount
+        return multi_asset
+
+    def to_value(self) -> Value:
+        """Get the accumulated amount as a new :class:`Value`."""
+        return Value(self.coin, self.multi_asset)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(coin={self.coin}, multi_asset={self.multi_asset})"
+
+
 @dataclass(repr=False)
 class _Script(ArrayCBORSerializable):
     _TYPE: int = field(init=False, default=0)
@@ -394,9 +510,11 @@ class _DatumOption(ArrayCBORSerializable):
             return _DatumOption(DatumHash(values[1]))
         else:
             assert isinstance(values[1], CBORTag)
-            v = cbor2.loads(values[1].value)
+            v = decode_cbor(values[1].value)
             if isinstance(v, CBORTag):
-                return _DatumOption(RawPlutusData.from_primitive(v))
+                datum = RawPlutusData.from_primitive(v)
+                datum._keep_original_cbor(memoryview(values[1].value))
+                return _DatumOption(datum)
             else:
                 return _DatumOption(v)
 
@@ -413,7 +531,7 @@ class _ScriptRef(CBORSerializable):
         cls: Type[_ScriptRef], value: List[Primitive], type_args: Optional[tuple] = None
     ) -> _ScriptRef:
         assert isinstance(value, CBORTag)
-        return cls(_Script.from_primitive(cbor2.loads(value.value)))
+        return cls(_Script.from_primitive(decode_cbor(value.value)))
 
 
 @dataclass(repr=False)
@@ -450,7 +568,7 @@ class _TransactionOutputLegacy(ArrayCBORSerializable):
 
 
 @dataclass(repr=False)
-class TransactionOutput(CBORSerializable):
+class TransactionOutput(CBORSerializable, _KeepsOriginalCBOR):
     address: Address
 
     amount: Union[Value]
@@ -562,7 +680,7 @@ class Withdrawals(DictCBORSerializable):
 
 
 @dataclass(repr=False)
-class TransactionBody(MapCBORSerializable):
+class TransactionBody(MapCBORSerializable, _KeepsOriginalCBOR):
     inputs: Union[List[TransactionInput], OrderedSet[TransactionInput]] = field(
         default_factory=OrderedSet,
         metadata={"key": 0},
@@ -676,6 +794,31 @@ class TransactionBody(MapCBORSerializable):
                 f"Mint amount must be between {_MIN_INT64} and {_MAX_INT64}. \n Mint amount: {self.mint}"
             )
 
+    def _keep_original_cbor(self, cbor: memoryview):
+        # Keys of the fields holding outputs
+        pending = {1} if self.collateral_return is None else {1, 16}
+        items = _iter_encoded_items(cbor)
+        for key_cbor in items:
+            value_cbor = next(items)
+            key = cbor2.loads(key_cbor)
+            if key == 1:
+                self._keep_original_field_cbor("outputs", self.outputs, value_cbor)
+            elif key == 16:
+                self._keep_original_field_cbor(
+                    "collateral_return", self.collateral_return, value_cbor
+                )
+            pending.discard(key)
+            if not pending:
+                break
+        super()._keep_original_cbor(cbor)
+
+    def _keep_original_field_cbor(self, name: str, value: Any, cbor: memoryview):
+        if name == "outputs":
+            for output, output_cbor in zip(value, _iter_encoded_items(cbor)):
+                output._keep_original_cbor(output_cbor)
+        else:
+            super()._keep_original_field_cbor(name, value, cbor)
+
     def hash(self) -> bytes:
         return blake2b(self.to_cbor(), TRANSACTION_HASH_SIZE, encoder=RawEncoder)  # type: ignore
 
@@ -685,7 +828,7 @@ class TransactionBody(MapCBORSerializable):
 
 
 @dataclass(repr=False)
-class Transaction(ArrayCBORSerializable):
+class Transaction(ArrayCBORSerializable, _KeepsOriginalCBOR):
     transaction_body: TransactionBody
 
     transaction_witness_set: TransactionWitnessSet
@@ -706,6 +849,43 @@ class Transaction(ArrayCBORSerializable):
     def json_description(self) -> str:
         return "Ledger Cddl Format"
 
+    def _keep_original_cbor(self, cbor: memoryview):
+        self.transaction_body._keep_original_cbor(next(_iter_encoded_items(cbor)))
+        super()._keep_original_cbor(cbor)
+
     @property
     def id(self) -> TransactionId:
         return self.transaction_body.id
+
+
+class LazyTransactionBody(_LazyCBORSerializable, TransactionBody):
+    """A :class:`TransactionBody` that decodes each of its fields on first access.
+
+    :meth:`from_cbor` only locates the fields in the CBOR. Computing :attr:`id` of an unmodified body hashes the
+    original CBOR without decoding any field.
+    """
+
+
+class LazyTransaction(_LazyCBORSerializable, Transaction):
+    """A :class:`Transaction` that decodes each of its fields on first access.
+
+    The body and the witness set are decoded into :class:`LazyTransactionBody` and
+    :class:`~pycardano.witness.LazyTransactionWitnessSet`, so only the fields that are used get decoded. This is
+    useful to scan many transactions for a few fields, e.g. ids, inputs or outputs. Lazy transactions can be used
+    like transactions decoded by :meth:`Transaction.from_cbor` otherwise, including modifying them.
+
+    Examples:
+        >>> tx = Transaction(TransactionBody(fee=200000), TransactionWitnessSet())
+        >>> lazy_tx = LazyTransaction.from_cbor(tx.to_cbor())
+        >>> lazy_tx.id == tx.id
+        True
+        >>> lazy_tx.transaction_body.fee
+        200000
+        >>> lazy_tx == tx
+        True
+    """
+
+    _LAZY_FIELDS = {
+        "transaction_body": LazyTransactionBody,
+        "transaction_witness_set": LazyTransactionWitnessSet,
+    }
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
-from copy import deepcopy
+import asyncio
+from copy import copy, deepcopy
 from dataclasses import dataclass, field, fields
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from functools import lru_cache, partial
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from weakref import WeakKeyDictionary
+
+from cachetools import LRUCache
+from cbor2 import dumps
 
 from pycardano import RedeemerMap
 from pycardano.address import Address, AddressType
-from pycardano.backend.base import ChainContext
+from pycardano.backend.base import AsyncChainContext, ChainContext, _SyncChainContext
 from pycardano.certificate import (
     Certificate,
     PoolRegistration,
@@ -25,9 +31,12 @@ from pycardano.certificate import (
     VoteDelegation,
 )
 from pycardano.coinselection import (
+    BranchAndBoundSelector,
     LargestFirstSelector,
     RandomImproveMultiAsset,
+    UTxOPool,
     UTxOSelector,
+    _changeless_fee_allowance,
 )
 from pycardano.exception import (
     InsufficientUTxOBalanceException,
@@ -69,7 +78,17 @@ from pycardano.plutus import (
     datum_hash,
     script_hash,
 )
-from pycardano.serialization import NonEmptyOrderedSet, OrderedSet
+from pycardano.serialization import (
+    NonEmptyOrderedSet,
+    OrderedSet,
+    _cbor_head_size,
+    _get_codec_plan,
+    _has_original_cbor,
+    _is_unchanged,
+    _snapshot,
+    default_encoder,
+    skip_validation,
+)
 from pycardano.transaction import (
     Asset,
     AssetName,
@@ -80,12 +99,13 @@ from pycardano.transaction import (
     TransactionOutput,
     UTxO,
     Value,
+    ValueAccumulator,
     Withdrawals,
 )
 from pycardano.utils import fee, max_tx_fee, min_lovelace_post_alonzo, script_data_hash
 from pycardano.witness import TransactionWitnessSet, VerificationKeyWitness
 
-__all__ = ["TransactionBuilder"]
+__all__ = ["TransactionBuilder", "BatchTransactionBuilder"]
 
 FAKE_VKEY = VerificationKey.from_primitive(
     bytes.fromhex("5797dc2cc919dfec0bb849551ebdf30d96e5cbe0f33f734a87fe826db30f7ef9")
@@ -98,11 +118,165 @@ FAKE_TX_SIGNATURE = bytes.fromhex(
 )
 
 
+@lru_cache(maxsize=None)
+def _fake_vkey_witness(index: int) -> VerificationKeyWitness:
+    """Fake witness of the ``index``-th required key, each fake witness is unique within a witness set.
+
+    The same witness objects are reused across fee estimations, so their size is only computed once.
+    """
+    # Convert index to 32 bytes and use AND operation to create unique keys
+    i_bytes = index.to_bytes(32, "big")
+    unique_vkey = VerificationKey.from_primitive(
+        bytes(x & y for x, y in zip(FAKE_VKEY.payload, i_bytes))
+    )
+    # 64 bytes for signature
+    unique_sig = bytes(x & y for x, y in zip(FAKE_TX_SIGNATURE, i_bytes + i_bytes))
+    return VerificationKeyWitness(unique_vkey, unique_sig)
+
+
+_EVALUATION_CACHE_SIZE = 256
+
+# Fields of the builder with the redeemers of minting, withdrawal and certificate scripts
+_SCRIPT_TO_REDEEMERS_FIELDS = (
+    "_minting_script_to_redeemers",
+    "_withdrawal_script_to_redeemers",
+    "_certificate_script_to_redeemers",
+)
+
+# Chain context -> hash of an evaluated transaction body -> execution units of the transaction
+_evaluation_cache: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def _evaluate_tx(context: ChainContext, tx: Transaction) -> Dict[str, ExecutionUnits]:
+    """Evaluate execution units of a transaction with ``context``, or get them from a previous evaluation.
+
+    The body of a transaction determines its scripts, datums and redeemers through their hashes, so transactions with
+    the same body have the same execution units, e.g. when the same transaction is built again.
+    """
+    try:
+        cache = _evaluation_cache.get(context)
+        if cache is None:
+            cache = _evaluation_cache[context] = LRUCache(
+                maxsize=_EVALUATION_CACHE_SIZE
+            )
+    except TypeError:
+        # The context can't be weakly referenced, or isn't hashable
+        return context.evaluate_tx(tx)
+    key = tx.transaction_body.hash()
+    result = cache.get(key)
+    if result is None:
+        result = cache[key] = context.evaluate_tx(tx)
+    return result
+
+
+def _to_multi_asset(
+    policies: List[Tuple[ScriptHash, Dict[AssetName, int]]],
+) -> MultiAsset:
+    return MultiAsset({policy_id: Asset(assets) for policy_id, assets in policies})
+
+
+class _TransactionSizeModel:
+    """Compute the size of the CBOR of the fake transactions built to estimate fees, incrementally.
+
+    A fake transaction, its body and its witness set are built again for every estimate, but most of what they hold,
+    e.g. inputs, outputs, scripts, datums and fake witnesses, are the same objects as in the previous estimate. The
+    size of the transaction is summed from the size of its components, and a component is only encoded again if it
+    changed since it was last encoded. Changes are detected by comparing snapshots of the components, like objects
+    decoded from CBOR do to know whether their original CBOR is still valid.
+
+    Components are validated when they are encoded, as they would be by :meth:`Transaction.to_cbor`. Only the sizes
+    of the components of the latest transaction are kept.
+    """
+
+    _CONTAINERS = (Transaction, TransactionBody, TransactionWitnessSet)
+
+    def __init__(self) -> None:
+        # id of a component -> (component, snapshot of the component, size, whether it was validated)
+        self._sizes: Dict[int, Tuple[Any, List[Any], int, bool]] = {}
+
+    def size(self, tx: Transaction) -> int:
+        """Get the size of ``tx`` serialized to CBOR, i.e. ``len(tx.to_cbor())``."""
+        used: Dict[int, Tuple[Any, List[Any], int, bool]] = {}
+        size = self._size(tx, True, used)
+        self._sizes = used
+        return size
+
+    def _size(self, value: Any, validate: bool, used: dict) -> int:
+        value_type = type(value)
+        if value is None or value_type is bool:
+            return 1
+        elif value_type is int and 0 <= value < 1 << 64:
+            return _cbor_head_size(value)
+        elif value_type is list:
+            return _cbor_head_size(len(value)) + sum(
+                self._size(v, validate, used) for v in value
+            )
+        elif (
+            value_type is OrderedSet or value_type is NonEmptyOrderedSet
+        ) and not value._is_indefinite_list:
+            if validate:
+                value.validate()
+            return (
+                (_cbor_head_size(258) if value._use_tag else 0)
+                + _cbor_head_size(len(value))
+                + sum(self._size(v, validate, used) for v in value)
+            )
+        elif value_type in self._CONTAINERS and not _has_original_cbor(value):
+            return self._container_size(value, validate, used)
+        return self._component_size(value, validate, used)
+
+    def _container_size(self, value: Any, validate: bool, used: dict) -> int:
+        if isinstance(value, TransactionBody):
+            # The body only validates the amounts it mints, not its fields.
+            if validate:
+                value.validate()
+            validate = False
+        size = 0
+        count = 0
+        for key, name, optional in _get_codec_plan(type(value)).fields:
+            v = getattr(value, name)
+            if v is None and optional:
+                continue
+            if not isinstance(value, Transaction):
+                size += self._size(key, validate, used)
+            size += self._size(v, validate, used)
+            count += 1
+        return _cbor_head_size(count) + size
+
+    def _component_size(self, value: Any, validate: bool, used: dict) -> int:
+        key = id(value)
+        snapshot: List[Any] = []
+        keepers: List[Any] = []
+        _snapshot(value, snapshot, keepers)
+        cached = self._sizes.get(key)
+        if (
+            cached is not None
+            and (cached[3] or not validate)
+            and _is_unchanged(snapshot, cached[1], keepers)
+        ):
+            size, validated = cached[2], cached[3]
+        elif validate:
+            size, validated = len(dumps(value, default=default_encoder)), True
+        else:
+            with skip_validation():
+                size, validated = len(dumps(value, default=default_encoder)), False
+        used[key] = (value, snapshot, size, validated)
+        return size
+
+    def __deepcopy__(self, memo):
+        # Sizes are cached by the ids of the components, which are different in a copy.
+        return _TransactionSizeModel()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({len(self._sizes)} sizes)"
+
+
 @dataclass
 class TransactionBuilder:
     """A class builder that makes it easy to build a transaction."""
 
     context: ChainContext
+    """Chain context to query, or an :class:`AsyncChainContext` to build with :meth:`build_async`."""
 
     utxo_selectors: List[UTxOSelector] = field(
         default_factory=lambda: [LargestFirstSelector(), RandomImproveMultiAsset()]
@@ -208,6 +382,14 @@ class TransactionBuilder:
 
     _should_estimate_execution_units: Optional[bool] = field(init=False, default=None)
 
+    _tx_size_model: _TransactionSizeModel = field(
+        init=False, repr=False, compare=False, default_factory=_TransactionSizeModel
+    )
+
+    _changeless_fee: int = field(init=False, default=0, repr=False)
+    """The lovelace left by a :class:`BranchAndBoundSelector` selection without change output that may be paid as
+    fee."""
+
     def add_input(self, utxo: UTxO) -> TransactionBuilder:
         """Add a specific UTxO to transaction's inputs.
 
@@ -625,19 +807,19 @@ class TransactionBuilder:
         else:
             return None
 
-    def _calc_change(
-        self, fees, inputs, outputs, address, precise_fee=False, respect_min_utxo=True
-    ) -> List[TransactionOutput]:
-        requested = Value(fees)
+    def _calc_leftover(self, fees, inputs, outputs) -> Value:
+        requested_sum = ValueAccumulator(fees)
         for o in outputs:
-            requested += o.amount
+            requested_sum += o.amount
+        requested = requested_sum.to_value()
 
-        provided = Value()
+        provided_sum = ValueAccumulator()
         for i in inputs:
-            provided += i.output.amount
+            provided_sum += i.output.amount
 
         if self.mint:
-            provided.multi_asset += self.mint
+            provided_sum += self.mint
+        provided = provided_sum.to_value()
 
         if self.withdrawals:
             for v in self.withdrawals.values():
@@ -665,6 +847,13 @@ class TransactionBuilder:
         if change.multi_asset:
             change.multi_asset = change.multi_asset.filter(lambda p, n, v: v > 0)
 
+        return change
+
+    def _calc_change(
+        self, fees, inputs, outputs, address, precise_fee=False, respect_min_utxo=True
+    ) -> List[TransactionOutput]:
+        change = self._calc_leftover(fees, inputs, outputs)
+
         change_output_arr = []
 
         # when there is only ADA left, simply use remaining coin value as change
@@ -743,6 +932,21 @@ class TransactionBuilder:
             # Set fee to max
             self.fee = self._estimate_fee()
 
+            if not merge_change and self._changeless_fee:
+                leftover = self._calc_leftover(self.fee, self.inputs, self.outputs)
+                if (
+                    not leftover.multi_asset
+                    and leftover.coin
+                    < min_lovelace_post_alonzo(
+                        TransactionOutput(change_address, leftover), self.context
+                    )
+                    and leftover.coin <= self._changeless_fee
+                ):
+                    # The selection was made without change output, and the lovelace left is too little for one,
+                    # so it is paid as fee instead.
+                    self.fee += leftover.coin
+                    return self
+
             changes = self._calc_change(
                 self.fee,
                 self.inputs,
@@ -772,109 +976,113 @@ class TransactionBuilder:
 
         return self
 
-    def _adding_asset_make_output_overflow(
+    def _pack_tokens_for_change(
         self,
-        output: TransactionOutput,
-        current_assets: Asset,
-        policy_id: ScriptHash,
-        add_asset_name: AssetName,
-        add_asset_val: int,
+        change_address: Optional[Address],
+        change_estimator: Value,
         max_val_size: int,
-    ) -> bool:
-        """Check if adding the asset will make output exceed maximum size limit
+    ) -> List[MultiAsset]:
+        """Split the assets of the change into groups, each of which fits in the value of one change output.
 
-        Args:
-            output (TransactionOutput): Current output
-            current_assets (Asset): Current Assets to be included in output
-            policy_id (ScriptHash): Policy id containing the MultiAsset
-            add_asset_name (AssetName): Name of asset to add to current MultiAsset
-            add_asset_val (int): Value of asset to add to current MultiAsset
-            max_val_size (int): maximum size limit for output
+        Assets are added to the current output in order, and a new output is started when adding an asset would make
+        the value of the current output, holding the minimum lovelace it requires, larger than ``max_val_size``.
 
-        Returns:
-            bool: whether adding asset will make output greater than maximum size limit
+        The sizes of the values are summed from the sizes of the CBOR of their policies, asset names and amounts,
+        instead of serializing the value for every asset added, so packing takes linear time in the number of assets.
         """
-        attempt_assets = deepcopy(current_assets)
-        attempt_assets += Asset({add_asset_name: add_asset_val})
-        attempt_multi_asset = MultiAsset({policy_id: attempt_assets})
-
-        new_amount = Value(0, attempt_multi_asset)
-        current_amount = deepcopy(output.amount)
-        attempt_amount = new_amount + current_amount
-
-        # Calculate minimum ada requirements for more precise value size
-        required_lovelace = min_lovelace_post_alonzo(
-            TransactionOutput(output.address, attempt_amount), self.context
-        )
-        attempt_amount.coin = required_lovelace
+        change_address = change_address or Address(FAKE_VKEY.hash())
+        coins_per_utxo_byte = self.context.protocol_param.coins_per_utxo_byte
+        # Coin -> minimum lovelace of an output to the change address holding only this coin
+        ada_only_min_lovelace: Dict[int, int] = {}
+
+        def _value_size(coin: int, num_policies: int, policies_size: int) -> int:
+            # Size of a value of ``coin`` lovelace and ``num_policies`` policies, whose keys and assets take
+            # ``policies_size`` bytes.
+            if not num_policies:
+                return _cbor_head_size(coin)
+            return (
+                1
+                + _cbor_head_size(coin)
+                + _cbor_head_size(num_policies)
+                + policies_size
+            )
 
-        return len(attempt_amount.to_cbor()) > max_val_size
+        def _overflows(coin: int, num_policies: int, policies_size: int) -> bool:
+            if coin not in ada_only_min_lovelace:
+                ada_only_min_lovelace[coin] = min_lovelace_post_alonzo(
+                    TransactionOutput(change_address, Value(coin)), self.context
+                )
+            # The multi-asset makes the value an array of the coin and the multi-asset
+            required_lovelace = (
+                ada_only_min_lovelace[coin]
+                + (1 + _cbor_head_size(num_policies) + policies_size)
+                * coins_per_utxo_byte
+            )
+            return (
+                _value_size(required_lovelace, num_policies, policies_size)
+                > max_val_size
+            )
 
-    def _pack_tokens_for_change(
-        self,
-        change_address: Optional[Address],
-        change_estimator: Value,
-        max_val_size: int,
-    ) -> List[MultiAsset]:
         multi_asset_arr = []
-        base_coin = Value(coin=change_estimator.coin)
-        change_address = change_address or Address(FAKE_VKEY.hash())
-        output = TransactionOutput(change_address, base_coin)
+        # ADA and policies of the current output, and the size of the keys and assets of the policies
+        coin = change_estimator.coin
+        policies: List[Tuple[ScriptHash, Dict[AssetName, int]]] = []
+        policies_size = 0
 
-        # iteratively add tokens to output
         for policy_id, assets in change_estimator.multi_asset.items():
-            temp_multi_asset = MultiAsset()
-            temp_value = Value(coin=0)
-            temp_assets = Asset()
-            old_amount = deepcopy(output.amount)
+            policy_size = _cbor_head_size(len(policy_id.payload)) + len(
+                policy_id.payload
+            )
+            # Assets of the policy, which haven't been added to the current output yet, and their size
+            temp_assets: Dict[AssetName, int] = {}
+            temp_size = 0
+            old_policies, old_policies_size = len(policies), policies_size
             for asset_name, asset_value in assets.items():
-                if self._adding_asset_make_output_overflow(
-                    output,
-                    temp_assets,
-                    policy_id,
-                    asset_name,
-                    asset_value,
-                    max_val_size,
+                asset_size = (
+                    _cbor_head_size(len(asset_name.payload))
+                    + len(asset_name.payload)
+                    + _cbor_head_size(asset_value)
+                )
+                if _overflows(
+                    coin,
+                    len(policies) + 1,
+                    policies_size
+                    + policy_size
+                    + _cbor_head_size(len(temp_assets) + 1)
+                    + temp_size
+                    + asset_size,
                 ):
                     # Insert current assets as one group if current assets isn't null
                     # This handles edge case when first Asset from next policy will cause overflow
                     if temp_assets:
-                        temp_multi_asset += MultiAsset({policy_id: temp_assets})
-                        temp_value.multi_asset = temp_multi_asset
-                        output.amount += temp_value
-                    multi_asset_arr.append(output.amount.multi_asset)
-
-                    # Create a new output
-                    base_coin = Value(coin=0)
-                    output = TransactionOutput(change_address, base_coin)
+                        policies.append((policy_id, temp_assets))
+                    multi_asset_arr.append(_to_multi_asset(policies))
 
-                    # Continue building output from where we stopped
-                    old_amount = deepcopy(output.amount)
-                    temp_multi_asset = MultiAsset()
-                    temp_value = Value()
-                    temp_assets = Asset()
+                    # Create a new output, and continue building output from where we stopped
+                    coin = 0
+                    policies = []
+                    policies_size = 0
+                    old_policies, old_policies_size = 0, 0
+                    temp_assets = {}
+                    temp_size = 0
 
-                temp_assets += Asset({asset_name: asset_value})
+                temp_assets[asset_name] = asset_value
+                temp_size += asset_size
 
             # Assess assets in buffer
-            temp_multi_asset += MultiAsset({policy_id: temp_assets})
-            temp_value.multi_asset = temp_multi_asset
-            output.amount += temp_value
-
-            # Calculate min lovelace required for more precise size
-            updated_amount = deepcopy(output.amount)
-            required_lovelace = min_lovelace_post_alonzo(
-                TransactionOutput(change_address, updated_amount), self.context
-            )
-            updated_amount.coin = required_lovelace
+            if temp_assets:
+                policies.append((policy_id, temp_assets))
+                policies_size += (
+                    policy_size + _cbor_head_size(len(temp_assets)) + temp_size
+                )
 
-            if len(updated_amount.to_cbor()) > max_val_size:
-                output.amount = old_amount
+            # The first asset of an output is added without checking its size
+            if _overflows(coin, len(policies), policies_size):
+                del policies[old_policies:]
+                policies_size = old_policies_size
                 break
 
-        multi_asset_arr.append(output.amount.multi_asset)
-        # Remove records where MultiAsset is null due to overflow of adding
-        # items at the beginning of next policy to previous policy MultiAssets
+        multi_asset_arr.append(_to_multi_asset(policies))
         return multi_asset_arr
 
     def _required_signer_vkey_hashes(self) -> Set[VerificationKeyHash]:
@@ -1101,33 +1309,9 @@ class TransactionBuilder:
         return self.witness_override or len(self._build_required_vkeys())
 
     def _build_fake_vkey_witnesses(self) -> NonEmptyOrderedSet[VerificationKeyWitness]:
-        witnesses = []
-        for i in range(self._witness_count()):
-            # Convert index to 32 bytes and use AND operation to create unique keys
-            i_bytes = i.to_bytes(32, "big")
-            unique_vkey = VerificationKey.from_primitive(
-                bytes(
-                    x & y
-                    for x, y in zip(
-                        bytes.fromhex(
-                            "5797dc2cc919dfec0bb849551ebdf30d96e5cbe0f33f734a87fe826db30f7ef9"
-                        ),
-                        i_bytes,
-                    )
-                )
-            )
-            unique_sig = bytes(
-                x & y
-                for x, y in zip(
-                    bytes.fromhex(
-                        "577ccb5b487b64e396b0976c6f71558e52e44ad254db7d06dfb79843e5441a5d"
-                        "763dd42adcf5e8805d70373722ebbce62a58e3f30dd4560b9a898b8ceeab6a03"
-                    ),
-                    i_bytes + i_bytes,  # 64 bytes for signature
-                )
-            )
-            witnesses.append(VerificationKeyWitness(unique_vkey, unique_sig))
-        return NonEmptyOrderedSet(witnesses)
+        return NonEmptyOrderedSet(
+            [_fake_vkey_witness(i) for i in range(self._witness_count())]
+        )
 
     def _build_fake_witness_set(self) -> TransactionWitnessSet:
         witness_set = self.build_witness_set()
@@ -1145,8 +1329,11 @@ class TransactionBuilder:
             tx_body.fee = max_tx_fee(self.context)
 
         witness = self._build_fake_witness_set()
-        tx = Transaction(tx_body, witness, True, self.auxiliary_data)
-        size = len(tx.to_cbor())
+        return Transaction(tx_body, witness, True, self.auxiliary_data)
+
+    def _fake_tx_size(self) -> int:
+        """Size of the fake transaction built by :meth:`_build_full_fake_tx`, which must not exceed the max size."""
+        size = self._tx_size_model.size(self._build_full_fake_tx())
         if size > self.context.protocol_param.max_tx_size:
             raise InvalidTransactionException(
                 f"Transaction size ({size}) exceeds the max limit "
@@ -1154,7 +1341,7 @@ class TransactionBuilder:
                 f"number of inputs or outputs."
             )
 
-        return tx
+        return size
 
     def build_witness_set(
         self, remove_dup_script: bool = False
@@ -1241,7 +1428,7 @@ class TransactionBuilder:
 
         estimated_fee = fee(
             self.context,
-            len(self._build_full_fake_tx().to_cbor()),
+            self._fake_tx_size(),
             plutus_execution_units.steps,
             plutus_execution_units.mem,
             self._ref_script_size(),
@@ -1305,19 +1492,16 @@ class TransactionBuilder:
             self.ttl = max(0, last_slot + auto_ttl_offset)
 
         selected_utxos = []
-        selected_amount = Value()
+        self._changeless_fee = 0
+        selected_sum = ValueAccumulator()
         for i in self.inputs:
             selected_utxos.append(i)
-            selected_amount += i.output.amount
+            selected_sum += i.output.amount
 
         if self.mint:
             # Add positive minted amounts to the selected amount (=source)
-            for pid, m in self.mint.items():
-                for tkn, am in m.items():
-                    if am > 0:
-                        selected_amount += Value(
-                            multi_asset=MultiAsset({pid: Asset({tkn: am})})
-                        )
+            selected_sum += self.mint.filter(lambda p, n, v: v > 0)
+        selected_amount = selected_sum.to_value()
 
         if self.withdrawals:
             for v in self.withdrawals.values():
@@ -1333,21 +1517,17 @@ class TransactionBuilder:
         selected_amount.coin -= self._get_total_key_deposit()
         selected_amount.coin -= self._get_total_proposal_deposit()
 
-        requested_amount = Value()
+        requested_sum = ValueAccumulator()
         for o in self.outputs:
-            requested_amount += o.amount
+            requested_sum += o.amount
 
         if self.mint:
             # Add negative minted amounts to the requested amount (=sink)
-            for pid, m in self.mint.items():
-                for tkn, am in m.items():
-                    if am < 0:
-                        requested_amount += Value(
-                            multi_asset=MultiAsset({pid: Asset({tkn: -am})})
-                        )
+            requested_sum.add(self.mint.filter(lambda p, n, v: v < 0), subtract=True)
 
         # Include min fees associated as part of requested amount
-        requested_amount += self._estimate_fee()
+        requested_sum += self._estimate_fee()
+        requested_amount = requested_sum.to_value()
 
         # Trim off assets that are not requested because they will be returned as changes eventually.
         trimmed_selected_amount = Value(
@@ -1387,32 +1567,21 @@ class TransactionBuilder:
             lambda p, n, v: v > 0
         )
 
-        # Create a set of all seen utxos in addition to other utxo lists.
-        # We need this set to avoid adding the same utxo twice.
-        # The reason of not turning all utxo lists into sets is that we want to keep the order of utxos and make
-        # utxo selection deterministic.
-        seen_utxos = set(selected_utxos)
-
         # When there are positive coin or native asset quantity in unfulfilled Value
         if Value() < unfulfilled_amount:
-            additional_utxo_pool = []
-            additional_amount = Value()
+            # The pool keeps UTxOs in the order they are added, so the selection is deterministic.
+            # UTxOs already selected or excluded are never available for selection.
+            additional_utxo_pool = UTxOPool(self.potential_inputs)
+            # The UTxOs of all input addresses are queried at once
+            for utxos in self.context.utxos_many(self.input_addresses):
+                additional_utxo_pool.extend(
+                    utxo for utxo in utxos if utxo.output.script is None
+                )
+            additional_utxo_pool.exclude(*selected_utxos, *self.excluded_inputs)
 
-            for utxo in self.potential_inputs:
+            additional_amount = ValueAccumulator()
+            for utxo in additional_utxo_pool:
                 additional_amount += utxo.output.amount
-                seen_utxos.add(utxo)
-                additional_utxo_pool.append(utxo)
-
-            for address in self.input_addresses:
-                for utxo in self.context.utxos(address):
-                    if (
-                        utxo not in seen_utxos
-                        and utxo not in self.excluded_inputs
-                        and utxo.output.script is None
-                    ):
-                        additional_utxo_pool.append(utxo)
-                        additional_amount += utxo.output.amount
-                        seen_utxos.add(utxo)
 
             for index, selector in enumerate(self.utxo_selectors):
                 try:
@@ -1432,6 +1601,10 @@ class TransactionBuilder:
                     for s in selected:
                         selected_amount += s.output.amount
                         selected_utxos.append(s)
+                    if isinstance(selector, BranchAndBoundSelector):
+                        self._changeless_fee = _changeless_fee_allowance(
+                            selected, self.context
+                        )
                     break
 
                 except UTxOSelectionException as e:
@@ -1635,12 +1808,11 @@ class TransactionBuilder:
                         f"Cannot find execution unit for redeemer: {r} "
                         f"in estimated execution units: {estimated_execution_units}"
                     )
-                r.ex_units = estimated_execution_units[key]
-                r.ex_units.mem = int(
-                    r.ex_units.mem * (1 + self.execution_memory_buffer)
-                )
-                r.ex_units.steps = int(
-                    r.ex_units.steps * (1 + self.execution_step_buffer)
+                # Evaluated execution units are cached, they are not changed
+                ex_units = estimated_execution_units[key]
+                r.ex_units = ExecutionUnits(
+                    int(ex_units.mem * (1 + self.execution_memory_buffer)),
+                    int(ex_units.steps * (1 + self.execution_step_buffer)),
                 )
 
     def _estimate_execution_units(
@@ -1649,11 +1821,8 @@ class TransactionBuilder:
         merge_change: Optional[bool] = False,
         collateral_change_address: Optional[Address] = None,
     ) -> Dict[str, ExecutionUnits]:
-        # Create a deep copy of current builder, so we won't mess up current builder's internal states
-        tmp_builder = TransactionBuilder(self.context)
-        for f in fields(self):
-            if f.name not in ("context",):
-                setattr(tmp_builder, f.name, deepcopy(getattr(self, f.name)))
+        # Build a copy of current builder, so we won't mess up current builder's internal states
+        tmp_builder = self._copy()
         tmp_builder._should_estimate_execution_units = False
         self._should_estimate_execution_units = False
         tx_body = tmp_builder.build(
@@ -1664,7 +1833,135 @@ class TransactionBuilder:
             tx_body, witness_set, auxiliary_data=tmp_builder.auxiliary_data
         )
 
-        return self.context.evaluate_tx(tx)
+        return _evaluate_tx(self.context, tx)
+
+    def _copy(self) -> TransactionBuilder:
+        """Copy the builder, such that building the copy leaves the state of this builder unchanged.
+
+        Building only changes the containers of the builder, e.g. the lists of inputs, outputs and collaterals, the
+        outputs change is merged into, and the redeemers, whose indices and execution units are set. Those are
+        copied, while UTxOs, scripts and datums are shared with the copy. The copy also shares the size model, so the
+        sizes of shared components are only computed once.
+        """
+        builder = copy(self)
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if isinstance(value, OrderedSet):
+                setattr(builder, f.name, type(value)(list(value), value._use_tag))
+            elif isinstance(value, (list, dict, set)):
+                setattr(builder, f.name, copy(value))
+        builder._outputs = [copy(o) for o in self._outputs]
+
+        # A redeemer added for several scripts is copied once
+        redeemers: Dict[int, Redeemer] = {}
+
+        def _copy_redeemer(redeemer: Redeemer) -> Redeemer:
+            if id(redeemer) not in redeemers:
+                redeemers[id(redeemer)] = copy(redeemer)
+            return redeemers[id(redeemer)]
+
+        builder._inputs_to_redeemers = {
+            utxo: _copy_redeemer(r) for utxo, r in self._inputs_to_redeemers.items()
+        }
+        for name in _SCRIPT_TO_REDEEMERS_FIELDS:
+            setattr(
+                builder,
+                name,
+                [(s, r and _copy_redeemer(r)) for s, r in getattr(self, name)],
+            )
+        return builder
+
+    def _update_redeemers(self, builder: TransactionBuilder):
+        """Set the indices and execution units of the redeemers of this builder to the ones of the redeemers of
+        ``builder``, a copy of this builder made by :meth:`_copy`."""
+        pairs = list(
+            zip(
+                self._inputs_to_redeemers.values(),
+                builder._inputs_to_redeemers.values(),
+            )
+        )
+        for name in _SCRIPT_TO_REDEEMERS_FIELDS:
+            pairs.extend(
+                (r, built)
+                for (_, r), (_, built) in zip(
+                    getattr(self, name), getattr(builder, name)
+                )
+            )
+        for redeemer, built in pairs:
+            if redeemer is not None and built is not None:
+                redeemer.index = built.index
+                redeemer.ex_units = built.ex_units
+
+    async def build_async(
+        self,
+        change_address: Optional[Address] = None,
+        merge_change: Optional[bool] = False,
+        collateral_change_address: Optional[Address] = None,
+        auto_validity_start_offset: Optional[int] = None,
+        auto_ttl_offset: Optional[int] = None,
+        auto_required_signers: Optional[bool] = None,
+    ) -> TransactionBody:
+        """Build a transaction body like :meth:`build`, without blocking the running event loop.
+
+        The context of the builder can be a :class:`ChainContext` or an :class:`AsyncChainContext`. With an
+        asynchronous context, the protocol parameters and the UTxOs of all input addresses are queried
+        concurrently first. The transaction is then built in the default executor of the event loop, where any
+        other query of the context is run on the event loop.
+
+        The transaction is built on a copy of the builder, whose state is set on the builder once the build is done.
+        If the build is cancelled, the builder is left unchanged.
+
+        Args:
+            change_address (Optional[Address]): Address to which changes will be returned.
+            merge_change (Optional[bool]): If the change address match one of the transaction output, the change amount
+                will be directly added to that transaction output, instead of being added as a separate output.
+            collateral_change_address (Optional[Address]): Address to which collateral changes will be returned.
+            auto_validity_start_offset (Optional[int]): Automatically set the validity start interval of the transaction
+                to the current slot number + the given offset (default -1000).
+            auto_ttl_offset (Optional[int]): Automatically set the validity end interval (ttl) of the transaction
+                to the current slot number + the given offset (default 10_000).
+            auto_required_signers (Optional[bool]): Automatically add all pubkeyhashes of transaction inputs
+                to required signatories (default only for Smart Contract transactions).
+
+        Returns:
+            TransactionBody: A transaction body.
+        """
+        loop = asyncio.get_running_loop()
+        context = self.context
+        # The build runs on a copy with its own context, while this builder can be used or built concurrently
+        builder = self._copy()
+        if isinstance(context, AsyncChainContext):
+            addresses = [str(address) for address in self.input_addresses]
+            protocol_param, utxos = await asyncio.gather(
+                context.protocol_param(), context.utxos_many(addresses)
+            )
+            builder.context = _SyncChainContext(
+                context,
+                loop,
+                values={"protocol_param": protocol_param},
+                utxos=dict(zip(addresses, utxos)),
+            )
+
+        tx_body = await loop.run_in_executor(
+            None,
+            partial(
+                builder.build,
+                change_address=change_address,
+                merge_change=merge_change,
+                collateral_change_address=collateral_change_address,
+                auto_validity_start_offset=auto_validity_start_offset,
+                auto_ttl_offset=auto_ttl_offset,
+                auto_required_signers=auto_required_signers,
+            ),
+        )
+        # Like build, leave the builder in the state of the built transaction, e.g. to build its witness set
+        builder.context = context
+        self._update_redeemers(builder)
+        builder._inputs_to_redeemers = self._inputs_to_redeemers
+        for name in _SCRIPT_TO_REDEEMERS_FIELDS:
+            setattr(builder, name, getattr(self, name))
+        vars(self).update(vars(builder))
+        return tx_body
 
     def build_and_sign(
         self,
@@ -1818,3 +2115,322 @@ class TransactionBuilder:
             raise ValueError("Treasury donation amount must be positive")
         self.donation = amount
         return self
+
+
+# Size of a fake verification key witness: an array of a 32-byte key and a 64-byte signature
+_VKEY_WITNESS_SIZE = 1 + 2 + 32 + 2 + 64
+
+
+@dataclass
+class _Batch:
+    """Inputs and outputs of a transaction being packed by :class:`BatchTransactionBuilder`."""
+
+    inputs: List[UTxO] = field(default_factory=list)
+
+    outputs: List[TransactionOutput] = field(default_factory=list)
+
+    # Sum of the inputs minus sum of the outputs
+    balance: ValueAccumulator = field(default_factory=ValueAccumulator)
+
+    inputs_size: int = 0
+
+    outputs_size: int = 0
+
+    # Number of inputs locked by each verification key
+    vkey_hashes: Dict[VerificationKeyHash, int] = field(default_factory=dict)
+
+
+@dataclass
+class BatchTransactionBuilder:
+    """Pack many outputs into a sequence of chained transactions, each close to the maximum transaction size.
+
+    Outputs are added to a transaction in order, until the next one would make the transaction exceed the maximum
+    size. Inputs are taken from ``utxo_pool`` when the transaction needs more funds: the UTxO holding the most of a
+    missing native asset, or the ADA-only UTxO holding the most lovelace. Spent UTxOs are excluded from the pool.
+    The change of each transaction is sent to ``change_address`` and spent by the next transaction, so the
+    transactions can be submitted one after another without waiting for confirmations. Later calls to
+    :meth:`build` keep spending the change of the last transaction.
+
+    The size and fee of a transaction are tracked incrementally while it is packed. Each output and input is
+    encoded once to get its size, and the size of the rest of the transaction, including the change output and a
+    key witness for each payment key of the inputs, is bounded from above. The packed inputs and outputs are then
+    balanced by a :class:`TransactionBuilder`.
+
+    UTxOs of the pool locked by scripts are never spent.
+
+    Args:
+        context (ChainContext): A chain context.
+        utxo_pool (Union[UTxOPool, List[UTxO]]): UTxOs to spend. A list is turned into a pool.
+        change_address (Address): Address receiving the change of each transaction.
+        max_tx_size (Optional[int]): Maximum size of the transactions. Defaults to the protocol maximum.
+    """
+
+    context: ChainContext
+
+    utxo_pool: Union[UTxOPool, List[UTxO]]
+
+    change_address: Address
+
+    max_tx_size: Optional[int] = None
+
+    _change: Optional[UTxO] = field(init=False, default=None, repr=False)
+
+    _ada_utxos: List[UTxO] = field(init=False, default_factory=list, repr=False)
+
+    _ada_change_bounds: Optional[Tuple[int, int]] = field(
+        init=False, default=None, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.utxo_pool, UTxOPool):
+            self.utxo_pool = UTxOPool(self.utxo_pool)
+
+    @property
+    def change(self) -> Optional[UTxO]:
+        """The change of the last transaction built, which the next transaction would spend."""
+        return self._change
+
+    def build(self, outputs: Iterable[TransactionOutput]) -> Iterator[TransactionBody]:
+        """Build balanced transaction bodies paying all outputs.
+
+        Outputs are consumed lazily, and each transaction body is yielded as soon as it is packed.
+
+        Args:
+            outputs (Iterable[TransactionOutput]): Outputs to pay, in order.
+
+        Returns:
+            Iterator[TransactionBody]: Transaction bodies, each spending the change of the previous one.
+
+        Raises:
+            InsufficientUTxOBalanceException: When the pool cannot fund the next output. The transactions packed
+                before it are yielded first.
+            InvalidTransactionException: When an output does not fit in a transaction on its own.
+        """
+        for builder in self._builders(outputs):
+            body = builder.build(change_address=self.change_address)
+            self._chain(body)
+            yield body
+
+    def build_and_sign(
+        self,
+        outputs: Iterable[TransactionOutput],
+        signing_keys: List[Union[SigningKey, ExtendedSigningKey]],
+    ) -> Iterator[Transaction]:
+        """Build and sign transactions paying all outputs.
+
+        Args:
+            outputs (Iterable[TransactionOutput]): Outputs to pay, in order.
+            signing_keys (List[Union[SigningKey, ExtendedSigningKey]]): Signing keys of the UTxOs in the pool and
+                of the change address.
+
+        Returns:
+            Iterator[Transaction]: Signed transactions, each spending the change of the previous one.
+
+        Raises:
+            InsufficientUTxOBalanceException: When the pool cannot fund the next output. The transactions packed
+                before it are yielded first.
+            InvalidTransactionException: When an output does not fit in a transaction on its own.
+        """
+        for builder in self._builders(outputs):
+            tx = builder.build_and_sign(
+                signing_keys, change_address=self.change_address
+            )
+            self._chain(tx.transaction_body)
+            yield tx
+
+    def _chain(self, body: TransactionBody):
+        # Change outputs come last, the last one holds the remaining lovelace if the change was split
+        index = len(body.outputs) - 1
+        self._change = UTxO(TransactionInput(body.id, index), body.outputs[index])
+
+    def _builders(
+        self, outputs: Iterable[TransactionOutput]
+    ) -> Iterator[TransactionBuilder]:
+        assert isinstance(self.utxo_pool, UTxOPool)
+        # Largest last, so the next one is popped from the end
+        self._ada_utxos = [
+            utxo
+            for utxo in self.utxo_pool.sorted_by_lovelace()
+            if not utxo.output.amount.multi_asset and _is_key_locked(utxo)
+        ]
+
+        output_iter = iter(outputs)
+        pending = next(output_iter, None)
+        while pending is not None:
+            batch = _Batch()
+            if self._change is not None:
+                self._add_input(batch, self._change)
+            while pending is not None:
+                try:
+                    if not self._add_output(batch, pending):
+                        break
+                except InsufficientUTxOBalanceException:
+                    if not batch.outputs:
+                        raise
+                    break
+                pending = next(output_iter, None)
+
+            if not batch.outputs:
+                raise InvalidTransactionException(
+                    f"Output does not fit in a transaction: {pending}"
+                )
+
+            builder = TransactionBuilder(self.context)
+            for utxo in batch.inputs:
+                builder.add_input(utxo)
+            for output in batch.outputs:
+                builder.add_output(output)
+            yield builder
+
+    def _add_output(self, batch: _Batch, output: TransactionOutput) -> bool:
+        """Add ``output`` to ``batch``, with the inputs needed to fund it.
+
+        Returns:
+            bool: False if the transaction would exceed the maximum size, in which case ``batch`` is unchanged.
+
+        Raises:
+            InsufficientUTxOBalanceException: When the pool cannot fund the output. ``batch`` is unchanged.
+        """
+        assert isinstance(self.utxo_pool, UTxOPool)
+        max_tx_size = self.max_tx_size or self.context.protocol_param.max_tx_size
+        output_size = len(output.to_cbor())
+        n_inputs = len(batch.inputs)
+        # ADA-only UTxOs taken from self._ada_utxos for this output
+        popped: List[UTxO] = []
+
+        batch.balance.add(output.amount, subtract=True)
+        while True:
+            balance = batch.balance.multi_asset
+            missing = balance.filter(lambda p, n, v: v < 0)
+            change_size, min_change = self._change_bounds(
+                balance.filter(lambda p, n, v: v > 0)
+            )
+            size = self._size(
+                batch,
+                batch.outputs_size + output_size + change_size,
+                len(batch.outputs) + 2,
+            )
+            if size > max_tx_size:
+                break
+            if (
+                not missing
+                and batch.balance.coin >= fee(self.context, size) + min_change
+            ):
+                batch.outputs.append(output)
+                batch.outputs_size += output_size
+                self.utxo_pool.exclude(*batch.inputs[n_inputs:])
+                return True
+
+            utxo = self._next_input(batch, missing, popped)
+            if utxo is None:
+                self._rollback(batch, output, n_inputs, popped)
+                raise InsufficientUTxOBalanceException(
+                    f"UTxO Balance insufficient to pay output: {output}"
+                )
+            self._add_input(batch, utxo)
+
+        self._rollback(batch, output, n_inputs, popped)
+        return False
+
+    def _rollback(
+        self,
+        batch: _Batch,
+        output: TransactionOutput,
+        n_inputs: int,
+        popped: List[UTxO],
+    ):
+        batch.balance.add(output.amount)
+        while len(batch.inputs) > n_inputs:
+            utxo = batch.inputs.pop()
+            batch.balance.add(utxo.output.amount, subtract=True)
+            batch.inputs_size -= len(utxo.input.to_cbor())
+            payment_part = utxo.output.address.payment_part
+            if isinstance(payment_part, VerificationKeyHash):
+                batch.vkey_hashes[payment_part] -= 1
+                if not batch.vkey_hashes[payment_part]:
+                    del batch.vkey_hashes[payment_part]
+        self._ada_utxos.extend(reversed(popped))
+
+    @staticmethod
+    def _add_input(batch: _Batch, utxo: UTxO):
+        batch.inputs.append(utxo)
+        batch.balance.add(utxo.output.amount)
+        batch.inputs_size += len(utxo.input.to_cbor())
+        payment_part = utxo.output.address.payment_part
+        if isinstance(payment_part, VerificationKeyHash):
+            batch.vkey_hashes[payment_part] = batch.vkey_hashes.get(payment_part, 0) + 1
+
+    def _next_input(
+        self, batch: _Batch, missing: MultiAsset, popped: List[UTxO]
+    ) -> Optional[UTxO]:
+        assert isinstance(self.utxo_pool, UTxOPool)
+        for policy_id, asset in missing.items():
+            for asset_name in asset:
+                taken = {utxo.input for utxo in batch.inputs}
+                holders = [
+                    utxo
+                    for utxo in self.utxo_pool.with_asset(policy_id, asset_name)
+                    if utxo.input not in taken and _is_key_locked(utxo)
+                ]
+                if not holders:
+                    return None
+                return max(
+                    holders,
+                    key=lambda utxo: utxo.output.amount.multi_asset[policy_id][
+                        asset_name
+                    ],
+                )
+        while self._ada_utxos:
+            utxo = self._ada_utxos.pop()
+            # Skip UTxOs excluded from the pool since the build started
+            if utxo in self.utxo_pool:
+                popped.append(utxo)
+                return utxo
+        return None
+
+    def _change_bounds(self, assets: MultiAsset) -> Tuple[int, int]:
+        """Upper bounds of the size and the minimum lovelace of a change output holding ``assets``."""
+        if not assets and self._ada_change_bounds is not None:
+            return self._ada_change_bounds
+        size = len(
+            TransactionOutput(self.change_address, Value(2**64 - 1, assets)).to_cbor()
+        )
+        # A change above 2^32 - 1 lovelace is far above its minimum, so the minimum is computed for the largest
+        # amount below it.
+        min_change = min_lovelace_post_alonzo(
+            TransactionOutput(self.change_address, Value(2**32 - 1, assets)),
+            self.context,
+        )
+        if not assets:
+            self._ada_change_bounds = (size, min_change)
+        return size, min_change
+
+    @staticmethod
+    def _size(batch: _Batch, outputs_size: int, n_outputs: int) -> int:
+        """Upper bound of the size of a transaction with the inputs of ``batch`` and the given outputs."""
+        n_witnesses = len(batch.vkey_hashes)
+        return (
+            # Transaction array, body map, and the keys of inputs, outputs and fee
+            2
+            + 3
+            # Inputs, possibly in a tagged set
+            + 3
+            + _cbor_head_size(len(batch.inputs))
+            + batch.inputs_size
+            + _cbor_head_size(n_outputs)
+            + outputs_size
+            # Fee
+            + 9
+            # Witness set map, and the key and tagged set of verification key witnesses
+            + 1
+            + 1
+            + 3
+            + _cbor_head_size(n_witnesses)
+            + n_witnesses * _VKEY_WITNESS_SIZE
+            # Validity flag and auxiliary data
+            + 2
+        )
+
+
+def _is_key_locked(utxo: UTxO) -> bool:
+    return isinstance(utxo.output.address.payment_part, VerificationKeyHash)
@@ -11,9 +11,26 @@ from nacl.encoding import RawEncoder
 from nacl.hash import blake2b
 
 from pycardano.backend.base import ChainContext
-from pycardano.hash import SCRIPT_DATA_HASH_SIZE, SCRIPT_HASH_SIZE, ScriptDataHash
-from pycardano.plutus import COST_MODELS, CostModels, Datum, RedeemerMap, Redeemers
-from pycardano.serialization import NonEmptyOrderedSet, default_encoder
+from pycardano.hash import (
+    SCRIPT_DATA_HASH_SIZE,
+    SCRIPT_HASH_SIZE,
+    DatumHash,
+    ScriptDataHash,
+)
+from pycardano.nativescript import NativeScript
+from pycardano.plutus import (
+    COST_MODELS,
+    CostModels,
+    Datum,
+    PlutusScript,
+    RedeemerMap,
+    Redeemers,
+)
+from pycardano.serialization import (
+    NonEmptyOrderedSet,
+    _cbor_head_size,
+    default_encoder,
+)
 from pycardano.transaction import MultiAsset, TransactionOutput, Value
 
 __all__ = [
@@ -198,12 +215,93 @@ def min_lovelace_pre_alonzo(
     return finalized_size * context.protocol_param.coins_per_utxo_word
 
 
+def _int_size(value: int) -> int:
+    """Size of the CBOR of an integer."""
+    if value < 0:
+        value = -1 - value
+    if value < 1 << 64:
+        return _cbor_head_size(value)
+    return len(cbor2.dumps(value))
+
+
+def _bytes_size(length: int) -> int:
+    """Size of the CBOR of a byte string of ``length`` bytes."""
+    return _cbor_head_size(length) + length
+
+
+def _multi_asset_size(multi_asset: MultiAsset) -> int:
+    """Size of the CBOR of a multi-asset, which leaves out zero amounts and policies without assets."""
+    size = 0
+    num_policies = 0
+    for policy_id, asset in multi_asset.data.items():
+        num_assets = 0
+        assets_size = 0
+        for asset_name, amount in asset.data.items():
+            if amount != 0:
+                num_assets += 1
+                assets_size += _bytes_size(len(asset_name.payload)) + _int_size(amount)
+        if num_assets:
+            num_policies += 1
+            size += (
+                _bytes_size(len(policy_id.payload))
+                + _cbor_head_size(num_assets)
+                + assets_size
+            )
+    return _cbor_head_size(num_policies) + size
+
+
+def _script_ref_size(script: Union[NativeScript, PlutusScript]) -> int:
+    """Size of the CBOR of the reference to a script in an output, a tagged ``[type, script]`` array."""
+    if isinstance(script, PlutusScript):
+        script_size = 2 + _bytes_size(len(script))
+    elif isinstance(script, NativeScript):
+        script_size = 2 + len(script.to_cbor())
+    else:
+        script_size = len(cbor2.dumps([0, script], default=default_encoder))
+    return 2 + _bytes_size(script_size)
+
+
+def _post_alonzo_output_size(output: TransactionOutput) -> int:
+    """Size of the CBOR of ``output`` serialized as a post-alonzo output, i.e. a map, without serializing it.
+
+    An output without ADA is sized as if it held 1 ADA, like in :func:`min_lovelace_post_alonzo`.
+    """
+    amount = output.amount
+    coin_size = _int_size(amount.coin or 1000000)
+    if amount.multi_asset:
+        value_size = 1 + coin_size + _multi_asset_size(amount.multi_asset)
+    else:
+        value_size = coin_size
+
+    # Map header, address and amount, with their keys
+    size = 1 + 1 + _bytes_size(len(bytes(output.address))) + 1 + value_size
+
+    if output.datum is not None or output.datum_hash is not None:
+        datum = output.datum_hash or output.datum
+        if isinstance(datum, DatumHash):
+            datum_size = _bytes_size(len(datum.payload))
+        else:
+            # Inline datums are tagged CBOR
+            datum_size = 2 + _bytes_size(
+                len(cbor2.dumps(datum, default=default_encoder))
+            )
+        size += 1 + 2 + datum_size
+
+    if output.script is not None:
+        size += 1 + _script_ref_size(output.script)
+
+    return size
+
+
 def min_lovelace_post_alonzo(output: TransactionOutput, context: ChainContext) -> int:
     """Calculate minimum lovelace a transaction output needs to hold post alonzo.
 
     This implementation is copied from the original Haskell implementation:
     https://github.com/input-output-hk/cardano-ledger/blob/eb053066c1d3bb51fb05978eeeab88afc0b049b2/eras/babbage/impl/src/Cardano/Ledger/Babbage/Rules/Utxo.hs#L242-L265
 
+    The size of the output is computed from the sizes of its address, value, datum and script, without serializing
+    the output. ``output`` is left unchanged.
+
     Args:
         output (TransactionOutput): A transaction output.
         context (ChainContext): A chain context.
@@ -213,24 +311,9 @@ def min_lovelace_post_alonzo(output: TransactionOutput, context: ChainContext) -
     """
     constant_overhead = 160
 
-    amt = output.amount
-
     # If the amount of ADA is 0, a default value of 1 ADA will be used
-    if amt.coin == 0:
-        amt.coin = 1000000
-
-    # Make sure we are using post-alonzo output
-    tmp_out = TransactionOutput(
-        output.address,
-        output.amount,
-        output.datum_hash,
-        output.datum,
-        output.script,
-        True,
-    )
-
     return (
-        constant_overhead + len(tmp_out.to_cbor())
+        constant_overhead + _post_alonzo_output_size(output)
     ) * context.protocol_param.coins_per_utxo_byte
 
 
@@ -15,10 +15,15 @@ from pycardano.serialization import (
     IndefiniteList,
     MapCBORSerializable,
     NonEmptyOrderedSet,
+    _LazyCBORSerializable,
     limit_primitive_type,
 )
 
-__all__ = ["VerificationKeyWitness", "TransactionWitnessSet"]
+__all__ = [
+    "VerificationKeyWitness",
+    "TransactionWitnessSet",
+    "LazyTransactionWitnessSet",
+]
 
 
 @dataclass(repr=False)
@@ -169,3 +174,7 @@ class TransactionWitnessSet(MapCBORSerializable):
             and not self.plutus_v2_script
             and not self.plutus_v3_script
         )
+
+
+class LazyTransactionWitnessSet(_LazyCBORSerializable, TransactionWitnessSet):
+    """A :class:`TransactionWitnessSet` that decodes each of its fields on first access."""
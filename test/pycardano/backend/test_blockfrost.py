@@ -1,3 +1,4 @@
+import threading
 from fractions import Fraction
 from unittest.mock import MagicMock, patch
 
@@ -7,6 +8,8 @@ from requests import Response
 
 from pycardano import ALONZO_COINS_PER_UTXO_WORD, GenesisParameters, ProtocolParameters
 from pycardano.backend.blockfrost import BlockFrostChainContext
+from pycardano.backend.cache import MemoryCache
+from pycardano.nativescript import NativeScript
 from pycardano.network import Network
 
 
@@ -307,6 +310,96 @@ def test_utxos():
         assert len(utxos) == 3
 
 
+def test_utxos_cache():
+    address = "addr1qxqs59lphg8g6qndelq8xwqn60ag3aeyfcp33c2kdp46a09re5df3pzwwmyq946axfcejy5n4x0y99wqpgtp2gd0k09qsgy6pz"
+    script_hash = "ab" * 28
+    utxos_json = [
+        {
+            "address": address,
+            "tx_hash": f"{i:02x}" * 32,
+            "output_index": 0,
+            "amount": [{"unit": "lovelace", "quantity": "42000000"}],
+            "data_hash": None,
+            "inline_datum": None,
+            "reference_script_hash": script_hash,
+        }
+        for i in range(3)
+    ]
+    script_json = {"type": "sig", "keyHash": "cd" * 28}
+
+    with patch(
+        "blockfrost.api.BlockFrostApi.epoch_latest",
+        return_value=convert_json_to_object({"epoch": 225}),
+    ), patch(
+        "blockfrost.api.BlockFrostApi.address_utxos",
+        return_value=convert_json_to_object(utxos_json),
+    ) as address_utxos, patch(
+        "blockfrost.api.BlockFrostApi.script",
+        return_value=convert_json_to_object({"type": "timelock"}),
+    ) as script, patch(
+        "blockfrost.api.BlockFrostApi.script_json",
+        return_value={"json": script_json},
+    ):
+        cache = MemoryCache()
+        chain_contexts = [
+            BlockFrostChainContext(
+                "project_id",
+                base_url=ApiUrls.preprod.value,
+                cache=cache,
+                utxo_cache_ttl=10,
+            )
+            for _ in range(2)
+        ]
+
+        utxos = chain_contexts[0].utxos(address)
+        assert [u.output.script for u in utxos] == [
+            NativeScript.from_dict(script_json)
+        ] * 3
+        assert chain_contexts[1].utxos(address) == utxos
+        # The UTxOs and their reference script are only fetched once
+        assert address_utxos.call_count == 1
+        assert script.call_count == 1
+
+
+def test_utxos_many():
+    addresses = [
+        "addr1qxqs59lphg8g6qndelq8xwqn60ag3aeyfcp33c2kdp46a09re5df3pzwwmyq946axfcejy5n4x0y99wqpgtp2gd0k09qsgy6pz",
+        "addr1vx2fxv2umyhttkxyxp8x0dlpdt3k6cwng5pxj3jhsydzers66hrl8",
+        "addr1w8phkx6acpnf78fuvxn0mkew3l0fd058hzquvz7w36x4gtcyjy7wx",
+    ]
+    # Every address is queried at once, or the barrier is broken
+    barrier = threading.Barrier(len(addresses), timeout=5)
+
+    def address_utxos(address, **kwargs):
+        barrier.wait()
+        return convert_json_to_object(
+            [
+                {
+                    "address": address,
+                    "tx_hash": f"{addresses.index(address):02x}" * 32,
+                    "output_index": 0,
+                    "amount": [{"unit": "lovelace", "quantity": "42000000"}],
+                    "data_hash": None,
+                    "inline_datum": None,
+                    "reference_script_hash": None,
+                }
+            ]
+        )
+
+    with patch(
+        "blockfrost.api.BlockFrostApi.epoch_latest",
+        return_value=convert_json_to_object({"epoch": 225}),
+    ), patch("blockfrost.api.BlockFrostApi.address_utxos", side_effect=address_utxos):
+        chain_context = BlockFrostChainContext(
+            "project_id", base_url=ApiUrls.preprod.value
+        )
+        utxos = chain_context.utxos_many(addresses)
+
+    assert [
+        str(u.output.address) for address_utxos in utxos for u in address_utxos
+    ] == addresses
+
+
 def test_submit_tx_cbor():
     response = Response()
     response.status_code = 200
@@ -0,0 +1,298 @@
+import contextlib
+import glob
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from test.pycardano.util import FixedChainContext
+
+import cbor2
+import pytest
+
+from pycardano import (
+    Address,
+    MultiAsset,
+    PlutusV2Script,
+    TransactionInput,
+    TransactionOutput,
+    UTxO,
+    Value,
+    VerificationKeyHash,
+)
+from pycardano.backend.cache import (
+    ContentAddressedCache,
+    MemoryCache,
+    SharedMemoryCache,
+    SqliteCache,
+)
+from pycardano.nativescript import InvalidBefore, ScriptAll, ScriptPubkey
+from pycardano.plutus import RawPlutusData
+from pycardano.serialization import RawCBOR
+
+
+def _remove(cache: SqliteCache):
+    cache.close()
+    for path in glob.glob(f"{cache.path}*"):
+        # SQLite removes the -wal and -shm files once other connections are closed
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+
+
+@pytest.fixture(params=["memory", "sqlite", "shared_memory"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryCache(maxsize=100)
+    elif request.param == "sqlite":
+        yield SqliteCache(str(tmp_path / "cache.sqlite"), maxsize=100)
+    else:
+        cache = SharedMemoryCache(f"pycardano-test-{uuid.uuid4().hex}", maxsize=100)
+        yield cache
+        _remove(cache)
+
+
+def test_get_set(cache):
+    assert cache.get("a") is None
+    assert cache.get("a", 1) == 1
+
+    cache.set("a", {"b": [1, 2]})
+    cache.set("c", None)
+    assert cache.get("a") == {"b": [1, 2]}
+    assert cache.get("c", 1) is None
+
+    cache.delete("a")
+    assert cache.get("a") is None
+    cache.clear()
+    assert cache.get("c", 1) == 1
+
+
+def test_ttl(cache):
+    cache.set("a", 1, ttl=0.05)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert len(cache) == 1
+
+
+def test_get_or_fetch(cache):
+    fetched = []
+
+    def fetch():
+        fetched.append(None)
+        return None
+
+    assert cache.get_or_fetch("a", fetch) is None
+    assert cache.get_or_fetch("a", fetch) is None
+    assert len(fetched) == 1
+
+
+def test_maxsize(cache):
+    for i in range(200):
+        cache.set(str(i), i)
+    assert len(cache) <= 100 + SqliteCache._PRUNE_INTERVAL
+    assert cache.get("199") == 199
+    assert cache.get("0") is None
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+
+def test_utxos(cache):
+    address = Address(VerificationKeyHash(b"1" * 28))
+    utxos = [
+        UTxO(
+            TransactionInput.from_primitive(["aa" * 32, i]),
+            TransactionOutput(
+                address,
+                Value(5_000_000, MultiAsset.from_primitive({b"1" * 28: {b"x": i}})),
+                datum=RawCBOR(b"\x01"),
+                script=PlutusV2Script(b"script"),
+            ),
+        )
+        for i in range(3)
+    ]
+    cache.set("utxos", utxos)
+    assert cache.get("utxos") == utxos
+
+
+def test_chain_data(cache):
+    context = FixedChainContext()
+    script = ScriptAll([ScriptPubkey(VerificationKeyHash(b"1" * 28)), InvalidBefore(5)])
+    values = [
+        context.protocol_param,
+        context.genesis_param,
+        script,
+        RawPlutusData.from_cbor(bytes.fromhex("d8799f4100ff")),
+    ]
+    cache.set("values", values)
+    assert cache.get("values") == values
+    assert [type(v) for v in cache.get("values")] == [type(v) for v in values]
+
+
+@pytest.mark.parametrize("value", [object(), [threading.Lock()], {"a": Exception()}])
+def test_sqlite_cache_only_stores_chain_data(tmp_path, value):
+    cache = SqliteCache(str(tmp_path / "cache.sqlite"))
+    with pytest.raises(TypeError):
+        cache.set("a", value)
+
+
+def test_sqlite_cache_only_restores_chain_data(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = SqliteCache(path)
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "INSERT INTO entries (key, value, stored) VALUES ('a', ?, 0)",
+            (cbor2.dumps(cbor2.CBORTag(28793, ["os:system", "echo"])),),
+        )
+    with pytest.raises(ValueError):
+        cache.get("a")
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_sqlite_cache_of_another_user(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.sqlite")
+    SqliteCache(path).set("a", 1)
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+    uid = os.getuid()
+    monkeypatch.setattr(os, "getuid", lambda: uid + 1)
+    with pytest.raises(PermissionError):
+        SqliteCache(path)
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_shared_memory_cache_is_private():
+    cache = SharedMemoryCache(f"pycardano-test-{uuid.uuid4().hex}")
+    try:
+        directory = os.path.dirname(cache.path)
+        assert os.path.basename(directory) == f"pycardano-{os.getuid()}"
+        assert os.stat(directory).st_mode & 0o777 == 0o700
+        assert os.stat(cache.path).st_mode & 0o777 == 0o600
+    finally:
+        _remove(cache)
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_shared_memory_cache_directory_of_another_user(tmp_path, monkeypatch):
+    # A directory of the same name that other users can access
+    monkeypatch.setattr(tempfile, "gettempdir", lambda: str(tmp_path))
+    monkeypatch.setattr(os.path, "isdir", lambda path: False)
+    directory = tmp_path / f"pycardano-{os.getuid()}"
+    directory.mkdir(mode=0o777)
+    directory.chmod(0o777)
+    with pytest.raises(PermissionError):
+        SharedMemoryCache("pycardano")
+
+
+def _set_in_process(path: str, key: str, value: int):
+    SqliteCache(path).set(key, value)
+
+
+def test_sqlite_cache_is_shared_by_processes(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = SqliteCache(path)
+    process = multiprocessing.get_context("spawn").Process(
+        target=_set_in_process, args=(path, "a", 1)
+    )
+    process.start()
+    process.join()
+
+    assert process.exitcode == 0
+    assert cache.get("a") == 1
+    # The cache persists
+    assert SqliteCache(path).get("a") == 1
+
+
+def test_shared_memory_cache_is_shared_by_name():
+    name = f"pycardano-test-{uuid.uuid4().hex}"
+    cache = SharedMemoryCache(name)
+    other_cache = SharedMemoryCache(f"{name}-other")
+    try:
+        SharedMemoryCache(name).set("a", 1)
+        assert cache.get("a") == 1
+        assert other_cache.get("a") is None
+    finally:
+        _remove(cache)
+        _remove(other_cache)
+
+
+def test_content_addressed_cache_coalesces_fetches():
+    cache = ContentAddressedCache()
+    fetched = []
+
+    def fetch():
+        fetched.append(None)
+        time.sleep(0.05)
+        return b"script"
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        values = list(
+            executor.map(lambda _: cache.get_or_fetch("script:ab", fetch), range(8))
+        )
+
+    assert values == [b"script"] * 8
+    assert len(fetched) == 1
+
+
+def test_content_addressed_cache_fetch_error():
+    cache = ContentAddressedCache()
+    barrier = threading.Barrier(2)
+
+    def fetch():
+        barrier.wait()
+        time.sleep(0.05)
+        raise ValueError("Not found")
+
+    def wait_for_fetch():
+        barrier.wait()
+        return cache.get_or_fetch("script:ab", lambda: b"other")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        failed = executor.submit(cache.get_or_fetch, "script:ab", fetch)
+        waiting = executor.submit(wait_for_fetch)
+        with pytest.raises(ValueError):
+            failed.result()
+        # The thread waiting for the value gets the error of its fetch
+        with pytest.raises(ValueError):
+            waiting.result()
+
+    # Errors are not cached
+    assert cache.get_or_fetch("script:ab", lambda: b"script") == b"script"
+
+
+def test_content_addressed_cache_does_not_cache_none():
+    cache = ContentAddressedCache()
+    assert cache.get_or_fetch("datum:ab", lambda: None) is None
+    assert cache.get("datum:ab", 1) == 1
+    assert cache.get_or_fetch("datum:ab", lambda: b"datum") == b"datum"
+    assert cache.get_or_fetch("datum:ab", lambda: None) == b"datum"
+
+
+def test_content_addressed_cache_disk(tmp_path):
+    disk = SqliteCache(str(tmp_path / "cache.sqlite"))
+    cache = ContentAddressedCache(maxsize=1, disk=disk)
+    cache.set("script:ab", b"ab", ttl=0.01)
+    cache.set("script:cd", b"cd")
+    time.sleep(0.02)
+
+    # Values never expire, and the values evicted from memory are kept on disk
+    assert cache.get("script:ab") == b"ab"
+    assert disk.get("script:cd") == b"cd"
+    assert (
+        ContentAddressedCache(disk=SqliteCache(disk.path)).get_or_fetch(
+            "script:cd", lambda: b"other"
+        )
+        == b"cd"
+    )
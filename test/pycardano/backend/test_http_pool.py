@@ -0,0 +1,232 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+import pytest
+import requests
+
+from pycardano.backend.http_pool import HTTPSessionPool
+
+
+class RateLimitedServer(ThreadingHTTPServer):
+    """A local HTTP server, which rate limits requests like a remote API would.
+
+    Requests are answered with the statuses of ``statuses`` first, then with 429 when more than ``limit`` requests
+    are in flight, and 200 otherwise.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, delay: float = 0, limit: Optional[int] = None):
+        super().__init__(("127.0.0.1", 0), _RateLimitedHandler)
+        self.delay = delay
+        self.limit = limit
+        self.statuses: List[int] = []
+        self.retry_after: Optional[str] = None
+        self.requests: List[str] = []
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def handle_error(self, request, client_address):
+        # Clients which timed out closed their connection
+        pass
+
+
+class _RateLimitedHandler(BaseHTTPRequestHandler):
+    server: RateLimitedServer
+    # Keep connections alive, and send responses without waiting for the acknowledgement of previous ones
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def respond(self):
+        with self.server.lock:
+            self.server.requests.append(f"{self.command} {self.path}")
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(
+                self.server.max_in_flight, self.server.in_flight
+            )
+            if self.server.statuses:
+                status = self.server.statuses.pop(0)
+            elif (
+                self.server.limit is not None
+                and self.server.in_flight > self.server.limit
+            ):
+                status = 429
+            else:
+                status = 200
+        time.sleep(self.server.delay)
+        with self.server.lock:
+            self.server.in_flight -= 1
+        body = b'{"path": "%s"}' % self.path.encode()
+        self.send_response(status)
+        if status == 429 and self.server.retry_after is not None:
+            self.send_header("Retry-After", self.server.retry_after)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.respond()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.respond()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = RateLimitedServer()
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_keep_alive(server):
+    pool = HTTPSessionPool()
+    try:
+        for i in range(20):
+            assert pool.get(f"{server.url}/{i}").json() == {"path": f"/{i}"}
+    finally:
+        pool.close()
+
+    assert server.connections == 1
+    metrics = pool.metrics
+    assert metrics.requests == 20
+    assert metrics.status_codes == {200: 20}
+
+
+def test_retry_rate_limited(server):
+    server.statuses = [429, 429, 503]
+    pool = HTTPSessionPool(backoff_factor=0.01)
+
+    response = pool.get(server.url)
+
+    assert response.status_code == 200
+    assert len(server.requests) == 4
+    metrics = pool.metrics
+    assert metrics.requests == 4
+    assert metrics.retries == 3
+    assert metrics.failures == 0
+    assert metrics.status_codes == {429: 2, 503: 1, 200: 1}
+    # Exponential backoff
+    assert metrics.backoff_time == pytest.approx(0.01 + 0.02 + 0.04)
+
+
+def test_retry_after(server):
+    server.statuses = [429]
+    server.retry_after = "1"
+    pool = HTTPSessionPool(backoff_factor=0.01, max_backoff=0.2)
+
+    start = time.perf_counter()
+    assert pool.get(server.url).status_code == 200
+
+    # Retry-After is honored, up to the maximum backoff
+    assert pool.metrics.backoff_time == pytest.approx(0.2)
+    assert time.perf_counter() - start >= 0.2
+
+
+def test_retry_non_idempotent(server):
+    pool = HTTPSessionPool(backoff_factor=0.01)
+
+    # A rate limited request was not processed, and can be retried
+    server.statuses = [429]
+    assert pool.post(server.url, data=b"tx").status_code == 200
+
+    # A request which failed with a server error could have been processed
+    server.statuses = [503]
+    assert pool.post(server.url, data=b"tx").status_code == 503
+    server.statuses = [503]
+    assert pool.post(server.url, data=b"tx", retry=True).status_code == 200
+    assert len(server.requests) == 5
+
+
+def test_max_retries(server):
+    server.statuses = [429] * 10
+    pool = HTTPSessionPool(max_retries=3, backoff_factor=0.01)
+
+    response = pool.get(server.url)
+
+    assert response.status_code == 429
+    assert len(server.requests) == 4
+    assert pool.metrics.failures == 1
+
+
+def test_bounded_concurrency(server):
+    server.delay = 0.02
+    pool = HTTPSessionPool(size=4)
+    try:
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            responses = list(
+                executor.map(lambda i: pool.get(f"{server.url}/{i}"), range(64))
+            )
+    finally:
+        pool.close()
+
+    assert [r.json() for r in responses] == [{"path": f"/{i}"} for i in range(64)]
+    assert server.max_in_flight == 4
+    assert server.connections == 4
+    metrics = pool.metrics
+    assert metrics.max_in_flight == 4
+    assert metrics.in_flight == metrics.waiting == 0
+    assert metrics.wait_time > 0
+
+
+def test_rate_limited_concurrency(server):
+    # The server only accepts 2 concurrent requests, the others are retried
+    server.delay = 0.02
+    server.limit = 2
+    pool = HTTPSessionPool(
+        size=8, backoff_factor=0.01, max_backoff=0.05, max_retries=20
+    )
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(lambda i: pool.get(server.url), range(32)))
+
+    assert {r.status_code for r in responses} == {200}
+    metrics = pool.metrics
+    assert metrics.retries == metrics.status_codes[429] > 0
+    assert metrics.status_codes[200] == 32
+    assert metrics.failures == 0
+
+
+def test_timeout(server):
+    server.delay = 0.2
+    pool = HTTPSessionPool(timeout=0.05, max_retries=1, backoff_factor=0.01)
+
+    with pytest.raises(requests.Timeout):
+        pool.get(server.url)
+    assert pool.metrics.retries == 1
+    assert pool.metrics.failures == 1
+
+
+def test_connection_error():
+    server = RateLimitedServer()
+    url = server.url
+    server.server_close()
+    pool = HTTPSessionPool(max_retries=2, backoff_factor=0.01)
+
+    with pytest.raises(requests.ConnectionError):
+        pool.get(url)
+    assert pool.metrics.requests == 3
+    assert pool.metrics.failures == 1
@@ -0,0 +1,265 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from test.pycardano.util import FixedChainContext
+from typing import Dict, List
+
+import pytest
+import requests
+
+from pycardano import (
+    Address,
+    PlutusV2Script,
+    TransactionBuilder,
+    TransactionOutput,
+    VerificationKeyHash,
+)
+from pycardano.backend.cache import SqliteCache
+from pycardano.backend.http_pool import HTTPSessionPool
+from pycardano.backend.kupo import KupoChainContextExtension
+from pycardano.plutus import script_hash as plutus_script_hash
+from pycardano.serialization import RawCBOR
+
+ADDRESSES = [str(Address(VerificationKeyHash(bytes([i]) * 28))) for i in range(8)]
+
+
+class KupoStub(ThreadingHTTPServer):
+    """A local HTTP server answering Kupo's ``/matches``, ``/scripts`` and ``/datums`` queries, slowly, like a remote
+    Kupo would. The first ``rate_limited`` requests are answered with status 429, as if they were rate limited.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, delay: float):
+        super().__init__(("127.0.0.1", 0), _KupoStubHandler)
+        self.delay = delay
+        self.rate_limited = 0
+        self.matches: Dict[str, List[dict]] = {}
+        self.scripts: Dict[str, dict] = {}
+        self.datums: Dict[str, dict] = {}
+        self.requests: List[str] = []
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class _KupoStubHandler(BaseHTTPRequestHandler):
+    server: KupoStub
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append(self.path)
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(
+                self.server.max_in_flight, self.server.in_flight
+            )
+            rate_limited = len(self.server.requests) <= self.server.rate_limited
+        time.sleep(self.server.delay)
+        _, resource, key = self.path.split("?")[0].split("/")
+        if rate_limited:
+            result = {"hint": "Too many requests"}
+        elif resource == "scripts":
+            result = self.server.scripts.get(key)
+        elif resource == "datums":
+            result = self.server.datums.get(key)
+        else:
+            result = self.server.matches.get(key, [])
+        body = json.dumps(result).encode()
+        with self.server.lock:
+            self.server.in_flight -= 1
+        self.send_response(429 if rate_limited else 200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def kupo():
+    server = KupoStub(delay=0.05)
+    for i, address in enumerate(ADDRESSES):
+        server.matches[address] = [
+            {
+                "transaction_id": bytes([i]).hex() * 32,
+                "output_index": 0,
+                "address": address,
+                "value": {"coins": 5_000_000 * (i + 1), "assets": {}},
+                "datum_hash": None,
+                "script_hash": None,
+                "spent_at": None,
+            }
+        ]
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_utxos_many(kupo):
+    context = KupoChainContextExtension(FixedChainContext(), kupo_url=kupo.url)
+    addresses = ADDRESSES + ADDRESSES[:1]
+
+    utxos = context.utxos_many(addresses)
+
+    # Each address is queried once, concurrently
+    assert sorted(kupo.requests) == sorted(
+        f"/matches/{address}?unspent" for address in ADDRESSES
+    )
+    assert kupo.max_in_flight > 1
+    assert [[u.output.address for u in address_utxos] for address_utxos in utxos] == [
+        [Address.from_primitive(address)] for address in addresses
+    ]
+    assert [u[0].output.amount.coin for u in utxos] == [
+        5_000_000 * (i + 1) for i in range(len(ADDRESSES))
+    ] + [5_000_000]
+
+    # The UTxOs are cached
+    assert context.utxos_many(ADDRESSES[::-1]) == utxos[: len(ADDRESSES)][::-1]
+    assert context.utxos(ADDRESSES[0]) == utxos[0]
+    assert len(kupo.requests) == len(ADDRESSES)
+
+
+def test_utxos_many_default(kupo):
+    kupo_context = KupoChainContextExtension(FixedChainContext(), kupo_url=kupo.url)
+
+    class SingleAddressContext(FixedChainContext):
+        def _utxos(self, address):
+            return kupo_context._utxos_kupo(address)
+
+    # Addresses are queried one after the other by default
+    utxos = SingleAddressContext().utxos_many(ADDRESSES)
+    assert kupo.max_in_flight == 1
+    assert utxos == [kupo_context._utxos_kupo(address) for address in ADDRESSES]
+
+    class ConcurrentContext(SingleAddressContext):
+        _utxos_many_workers = 4
+
+    # Or concurrently by backends that opt in
+    assert ConcurrentContext().utxos_many(ADDRESSES) == utxos
+    assert 1 < kupo.max_in_flight <= 4
+
+
+def test_build_from_many_addresses(kupo):
+    context = KupoChainContextExtension(FixedChainContext(), kupo_url=kupo.url)
+    builder = TransactionBuilder(context)
+    for address in ADDRESSES:
+        builder.add_input_address(address)
+    builder.add_output(TransactionOutput(ADDRESSES[0], 100_000_000))
+
+    tx_body = builder.build(change_address=Address.from_primitive(ADDRESSES[0]))
+
+    assert kupo.max_in_flight > 1
+    assert len(kupo.requests) == len(ADDRESSES)
+    coins = {bytes([i]).hex() * 32: 5_000_000 * (i + 1) for i in range(len(ADDRESSES))}
+    assert sum(o.amount.coin for o in tx_body.outputs) + tx_body.fee == sum(
+        coins[str(tx_in.transaction_id)] for tx_in in tx_body.inputs
+    )
+
+
+def test_shared_cache(kupo, tmp_path):
+    cache = SqliteCache(str(tmp_path / "cache.sqlite"))
+    context = KupoChainContextExtension(
+        FixedChainContext(), kupo_url=kupo.url, cache=cache
+    )
+    utxos = context.utxos_many(ADDRESSES)
+
+    # Another context, e.g. of another process, reuses the UTxOs
+    other_context = KupoChainContextExtension(
+        FixedChainContext(), kupo_url=kupo.url, cache=SqliteCache(cache.path)
+    )
+    assert other_context.utxos_many(ADDRESSES) == utxos
+    assert other_context.utxos(ADDRESSES[0]) == utxos[0]
+    assert len(kupo.requests) == len(ADDRESSES)
+
+
+def test_scripts_and_datums_fetched_once(kupo):
+    script = PlutusV2Script(b"script")
+    script_hash = str(plutus_script_hash(script))
+    datum_hash = "cd" * 32
+    kupo.scripts[script_hash] = {"language": "plutus:v2", "script": script.hex()}
+    kupo.datums[datum_hash] = {"datum": "d87980"}
+    for address in ADDRESSES:
+        for match in kupo.matches[address]:
+            match.update(script_hash=script_hash, datum_hash=datum_hash)
+
+    context = KupoChainContextExtension(FixedChainContext(), kupo_url=kupo.url)
+    utxos = context.utxos_many(ADDRESSES)
+
+    assert [u.output.script for address_utxos in utxos for u in address_utxos] == [
+        script
+    ] * len(ADDRESSES)
+    assert [u.output.datum for address_utxos in utxos for u in address_utxos] == [
+        RawCBOR(bytes.fromhex("d87980"))
+    ] * len(ADDRESSES)
+    # All UTxOs are queried concurrently, and their common script and datum are only fetched once
+    assert kupo.requests.count(f"/scripts/{script_hash}") == 1
+    assert kupo.requests.count(f"/datums/{datum_hash}") == 1
+
+
+def test_datum_not_found_yet(kupo):
+    datum_hash = "cd" * 32
+    context = KupoChainContextExtension(FixedChainContext(), kupo_url=kupo.url)
+
+    # Kupo doesn't know the datum until it sees a transaction including it
+    assert context._get_datum_from_kupo(datum_hash) is None
+    kupo.datums[datum_hash] = {"datum": "d87980"}
+    assert context._get_datum_from_kupo(datum_hash) == RawCBOR(bytes.fromhex("d87980"))
+    assert context._get_datum_from_kupo(datum_hash) == RawCBOR(bytes.fromhex("d87980"))
+    assert kupo.requests.count(f"/datums/{datum_hash}") == 2
+
+
+def test_rate_limited(kupo):
+    kupo.rate_limited = 3
+    context = KupoChainContextExtension(
+        FixedChainContext(),
+        kupo_url=kupo.url,
+        http_pool=HTTPSessionPool(size=4, backoff_factor=0.01, max_backoff=0.05),
+    )
+
+    utxos = context.utxos_many(ADDRESSES)
+
+    # Rate limited queries are retried
+    assert [u[0].output.amount.coin for u in utxos] == [
+        5_000_000 * (i + 1) for i in range(len(ADDRESSES))
+    ]
+    metrics = context.http_metrics
+    assert metrics.max_in_flight == 4
+    assert metrics.retries == metrics.status_codes[429] == 3
+    assert metrics.status_codes[200] == len(ADDRESSES)
+    assert len(kupo.requests) == len(ADDRESSES) + 3
+    # Connections are reused
+    assert kupo.connections <= 4
+    context.close()
+
+
+def test_kupo_error(kupo):
+    kupo.rate_limited = 2
+    context = KupoChainContextExtension(
+        FixedChainContext(),
+        kupo_url=kupo.url,
+        http_pool=HTTPSessionPool(max_retries=1, backoff_factor=0.01),
+    )
+
+    with pytest.raises(requests.HTTPError):
+        context.utxos(ADDRESSES[0])
+    # The query is tried once more
+    assert len(kupo.requests) == 2
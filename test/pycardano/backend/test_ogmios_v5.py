@@ -1,7 +1,11 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from fractions import Fraction
 from unittest.mock import patch
 
 import pytest
+from websockets.sync.server import serve
 
 from pycardano.backend.base import GenesisParameters, ProtocolParameters
 from pycardano.backend.ogmios_v5 import OgmiosV5ChainContext
@@ -217,3 +221,40 @@ class TestOgmiosChainContext:
             2,
         )
         assert not_utxo is None
+
+
+def test_persistent_connection():
+    connections = []
+
+    def handle(websocket):
+        connections.append(websocket)
+        for message in websocket:
+            request = json.loads(message)
+            assert request["args"] == {"query": "currentEpoch"}
+            websocket.send(
+                json.dumps(
+                    {
+                        "type": "jsonwsp/response",
+                        "version": "1.0",
+                        "servicename": "ogmios",
+                        "methodname": request["methodname"],
+                        "result": 300,
+                        "reflection": request["mirror"],
+                    }
+                )
+            )
+
+    with serve(handle, "127.0.0.1", 0) as server:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        context = OgmiosV5ChainContext(
+            f"ws://127.0.0.1:{server.socket.getsockname()[1]}",
+            Network.TESTNET,
+            refetch_chain_tip_interval=10,
+        )
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            epochs = list(executor.map(lambda _: context.epoch, range(16)))
+        context.close()
+        server.shutdown()
+
+    assert epochs == [300] * 16
+    assert len(connections) == 1
@@ -0,0 +1,424 @@
+import asyncio
+import contextlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from test.pycardano.util import FixedChainContext
+from typing import Dict, List, Optional
+
+import pytest
+from ogmios.statequery import QueryUtxo
+from websockets.asyncio.server import serve
+from websockets.exceptions import ConnectionClosed
+
+from pycardano import (
+    Address,
+    TransactionBuilder,
+    TransactionOutput,
+    VerificationKeyHash,
+)
+from pycardano.backend.cache import MemoryCache
+from pycardano.backend.ogmios_v6 import (
+    AsyncOgmiosV6ChainContext,
+    OgmiosV6ChainContext,
+    _utxo_from_ogmios,
+)
+from pycardano.plutus import ExecutionUnits
+
+ADDRESSES = [str(Address(VerificationKeyHash(bytes([i]) * 28))) for i in range(8)]
+
+PROTOCOL_PARAMETERS = {
+    "minFeeCoefficient": 44,
+    "minFeeConstant": {"ada": {"lovelace": 155381}},
+    "minFeeReferenceScripts": {"range": 25600, "base": 15.0, "multiplier": 1.2},
+    "maxReferenceScriptsSize": {"bytes": 204800},
+    "minUtxoDepositCoefficient": 4310,
+    "minUtxoDepositConstant": {"ada": {"lovelace": 0}},
+    "maxBlockBodySize": {"bytes": 90112},
+    "maxBlockHeaderSize": {"bytes": 1100},
+    "maxTransactionSize": {"bytes": 16384},
+    "maxValueSize": {"bytes": 5000},
+    "extraEntropy": "neutral",
+    "stakeCredentialDeposit": {"ada": {"lovelace": 2000000}},
+    "stakePoolDeposit": {"ada": {"lovelace": 500000000}},
+    "stakePoolRetirementEpochBound": 18,
+    "stakePoolPledgeInfluence": "3/10",
+    "minStakePoolCost": {"ada": {"lovelace": 170000000}},
+    "desiredNumberOfStakePools": 500,
+    "monetaryExpansion": "3/1000",
+    "treasuryExpansion": "1/5",
+    "collateralPercentage": 150,
+    "maxCollateralInputs": 3,
+    "plutusCostModels": {},
+    "scriptExecutionPrices": {"memory": "577/10000", "cpu": "721/10000000"},
+    "maxExecutionUnitsPerTransaction": {"memory": 14000000, "cpu": 10000000000},
+    "maxExecutionUnitsPerBlock": {"memory": 62000000, "cpu": 20000000000},
+    "version": {"major": 9, "minor": 0},
+}
+
+
+class FakeOgmios:
+    """A local Ogmios v6 websocket server, answering each request after a delay, in any order.
+
+    If ``hold`` is set, responses are held until that many requests, of method ``hold_method`` if it is set, are in
+    flight at once, to observe that a client sends them concurrently. A client that doesn't is answered after 5
+    seconds.
+    """
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.hold: Optional[int] = None
+        self.hold_method: Optional[str] = None
+        self.held: Optional[asyncio.Event] = None
+        self.held_in_flight = 0
+        self.utxos: Dict[str, List[dict]] = {}
+        self.requests: List[dict] = []
+        self.connections = 0
+        self.open_connections = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.server = None
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    async def __aenter__(self):
+        self.server = await serve(self.handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *args):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, connection):
+        self.connections += 1
+        self.open_connections.add(connection)
+        tasks = set()
+        async for message in connection:
+            task = asyncio.create_task(self.respond(connection, json.loads(message)))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        self.open_connections.discard(connection)
+        await asyncio.gather(*tasks)
+
+    async def disconnect(self):
+        for connection in list(self.open_connections):
+            await connection.close()
+
+    async def respond(self, connection, request: dict):
+        self.requests.append(request)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        held = self.hold is not None and self.hold_method in (None, request["method"])
+        if held:
+            if self.held is None:
+                self.held = asyncio.Event()
+            self.held_in_flight += 1
+            if self.held_in_flight >= self.hold:
+                self.held.set()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self.held.wait(), 5)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        self.held_in_flight -= held
+        method = request["method"]
+        if method == "queryLedgerState/protocolParameters":
+            result = PROTOCOL_PARAMETERS
+        elif method == "queryNetwork/tip":
+            result = {"slot": 1000, "id": "ab" * 32}
+        elif method == "queryLedgerState/epoch":
+            result = 200
+        elif method == "queryLedgerState/utxo":
+            result = [
+                utxo
+                for address in request["params"]["addresses"]
+                for utxo in self.utxos.get(address, [])
+            ]
+        elif method == "evaluateTransaction":
+            result = [
+                {
+                    "validator": {"purpose": "spend", "index": 0},
+                    "budget": {"memory": 100, "cpu": 200},
+                }
+            ]
+        else:
+            result = {"transaction": {"id": "cd" * 32}}
+        with contextlib.suppress(ConnectionClosed):
+            await connection.send(
+                json.dumps(
+                    {
+                        "jsonrpc": "2.0",
+                        "method": method,
+                        "result": result,
+                        "id": request["id"],
+                    }
+                )
+            )
+
+
+@pytest.fixture
+def fake_ogmios():
+    server = FakeOgmios()
+    for i, address in enumerate(ADDRESSES):
+        server.utxos[address] = [
+            {
+                "transaction": {"id": bytes([i]).hex() * 32},
+                "index": 0,
+                "address": address,
+                "value": {"ada": {"lovelace": 5_000_000 * (i + 1)}},
+            }
+        ]
+    return server
+
+
+@pytest.fixture
+def ogmios_server(fake_ogmios):
+    """The fake Ogmios server, run by an event loop in another thread, for synchronous clients."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    fake_ogmios.loop = loop
+    asyncio.run_coroutine_threadsafe(fake_ogmios.__aenter__(), loop).result()
+    yield fake_ogmios
+    asyncio.run_coroutine_threadsafe(fake_ogmios.__aexit__(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def test_concurrent_queries(fake_ogmios):
+    # The chain tip, epoch, UTxOs and evaluation queries. Protocol parameters are queried after the tip.
+    fake_ogmios.hold = 4
+
+    async def query():
+        async with fake_ogmios, AsyncOgmiosV6ChainContext(
+            port=fake_ogmios.port
+        ) as context:
+            return await asyncio.gather(
+                context.protocol_param(),
+                context.epoch(),
+                context.utxos_many(ADDRESSES),
+                context.evaluate_tx_cbor(b"\x00"),
+            )
+
+    protocol_param, epoch, utxos, evaluation = asyncio.run(query())
+
+    # All queries are sent over one connection, without waiting for each other's response
+    assert fake_ogmios.connections == 1
+    assert fake_ogmios.max_in_flight == 4
+    assert len(fake_ogmios.requests) == 5
+
+    assert protocol_param.min_fee_constant == 155381
+    assert protocol_param.coins_per_utxo_byte == 4310
+    assert epoch == 200
+    assert [
+        [u.output.amount.coin for u in address_utxos] for address_utxos in utxos
+    ] == [[5_000_000 * (i + 1)] for i in range(len(ADDRESSES))]
+    assert evaluation == {"spend:0": ExecutionUnits(100, 200)}
+
+    # The UTxOs of all addresses are queried at once
+    assert [r["method"] for r in fake_ogmios.requests].count(
+        "queryLedgerState/utxo"
+    ) == 1
+
+
+def test_coalesce_queries(fake_ogmios):
+    async def query():
+        async with fake_ogmios, AsyncOgmiosV6ChainContext(
+            port=fake_ogmios.port
+        ) as context:
+            return await asyncio.gather(
+                *(context.protocol_param() for _ in range(50)),
+                *(context.last_block_slot() for _ in range(50)),
+            )
+
+    results = asyncio.run(query())
+
+    assert all(r == results[0] for r in results[:50])
+    assert results[50:] == [1000] * 50
+    assert sorted(r["method"] for r in fake_ogmios.requests) == [
+        "queryLedgerState/protocolParameters",
+        "queryNetwork/tip",
+    ]
+
+
+def test_reconnect(fake_ogmios):
+    async def query():
+        async with fake_ogmios, AsyncOgmiosV6ChainContext(
+            port=fake_ogmios.port
+        ) as context:
+            epoch = context.epoch()
+            first = asyncio.create_task(context.epoch())
+            await asyncio.sleep(fake_ogmios.delay / 2)
+            await context._connection.close()
+            with pytest.raises(ConnectionError):
+                await first
+            return await epoch
+
+    assert asyncio.run(query()) == 200
+    assert fake_ogmios.connections == 2
+
+
+def test_build_async(fake_ogmios):
+    builds = 200
+    fake_ogmios.hold = builds
+    fake_ogmios.hold_method = "queryLedgerState/utxo"
+
+    async def build():
+        async with fake_ogmios, AsyncOgmiosV6ChainContext(
+            port=fake_ogmios.port
+        ) as context:
+            builders = []
+            for i in range(builds):
+                builder = TransactionBuilder(context)
+                builder.add_input_address(ADDRESSES[i % len(ADDRESSES)])
+                builder.add_output(TransactionOutput(ADDRESSES[-1], 2_000_000))
+                builders.append(builder)
+            tx_bodies = await asyncio.gather(
+                *(
+                    builder.build_async(change_address=builder.input_addresses[0])
+                    for builder in builders
+                )
+            )
+            methods = [r["method"] for r in fake_ogmios.requests]
+            return tx_bodies, methods, await context.protocol_param()
+
+    tx_bodies, methods, protocol_param = asyncio.run(build())
+
+    # The UTxOs of all builds are queried at once, and the protocol parameters only once
+    assert fake_ogmios.max_in_flight >= builds
+    assert methods.count("queryLedgerState/utxo") == builds
+    assert methods.count("queryLedgerState/protocolParameters") == 1
+
+    # Builds are the same as with a synchronous context
+    class SyncContext(FixedChainContext):
+        def _utxos(self, address):
+            response = {
+                "method": "queryLedgerState/utxo",
+                "result": fake_ogmios.utxos[address],
+            }
+            utxos, _ = QueryUtxo._parse_QueryUtxo_response(response)
+            return [_utxo_from_ogmios(utxo) for utxo in utxos]
+
+    context = SyncContext()
+    context.protocol_param = protocol_param
+    for i, tx_body in enumerate(tx_bodies[: len(ADDRESSES)]):
+        builder = TransactionBuilder(context)
+        builder.add_input_address(ADDRESSES[i])
+        builder.add_output(TransactionOutput(ADDRESSES[-1], 2_000_000))
+        assert tx_body == builder.build(change_address=builder.input_addresses[0])
+
+
+def test_persistent_connection(ogmios_server):
+    context = OgmiosV6ChainContext(port=ogmios_server.port)
+    try:
+        assert context.protocol_param.min_fee_constant == 155381
+        assert context.epoch == 200
+        assert [
+            [u.output.amount.coin for u in address_utxos]
+            for address_utxos in context.utxos_many(ADDRESSES)
+        ] == [[5_000_000 * (i + 1)] for i in range(len(ADDRESSES))]
+        assert context.evaluate_tx_cbor(b"\x00") == {
+            "spend:0": ExecutionUnits(100, 200)
+        }
+        context.submit_tx_cbor(b"\x00")
+        assert len(ogmios_server.requests) == 6
+        assert ogmios_server.connections == 1
+    finally:
+        context.close()
+
+
+def test_pipelined_threads(ogmios_server):
+    context = OgmiosV6ChainContext(port=ogmios_server.port)
+    queries = 64
+    threads = 16
+    ogmios_server.hold = threads
+    try:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            epochs = list(
+                executor.map(lambda _: context._query_current_epoch(), range(queries))
+            )
+    finally:
+        context.close()
+
+    assert epochs == [200] * queries
+    assert len(ogmios_server.requests) == queries
+    # The queries of all threads are in flight at once over one connection
+    assert ogmios_server.connections == 1
+    assert ogmios_server.max_in_flight == threads
+
+
+def test_connection_pool_size(ogmios_server):
+    context = OgmiosV6ChainContext(port=ogmios_server.port, connection_pool_size=3)
+    try:
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            list(executor.map(lambda _: context._query_current_epoch(), range(6)))
+    finally:
+        context.close()
+
+    assert ogmios_server.connections == 3
+
+
+def test_reconnect_closed_connection(ogmios_server):
+    context = OgmiosV6ChainContext(port=ogmios_server.port)
+
+    def disconnect():
+        asyncio.run_coroutine_threadsafe(
+            ogmios_server.disconnect(), ogmios_server.loop
+        ).result()
+
+    try:
+        assert context.epoch == 200
+        disconnect()
+        assert context.epoch == 200
+        assert ogmios_server.connections == 2
+
+        # Queries waiting for a response over a closed connection are retried, transactions are not resubmitted
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            epoch = executor.submit(lambda: context.epoch)
+            submit = executor.submit(context.submit_tx_cbor, b"\x00")
+            time.sleep(ogmios_server.delay / 2)
+            disconnect()
+            assert epoch.result() == 200
+            with pytest.raises(ConnectionError):
+                submit.result()
+        assert ogmios_server.connections == 3
+    finally:
+        context.close()
+
+
+def test_timeout(ogmios_server):
+    context = OgmiosV6ChainContext(
+        port=ogmios_server.port, timeout=ogmios_server.delay / 5
+    )
+    try:
+        with pytest.raises(TimeoutError):
+            context.epoch
+    finally:
+        context.close()
+
+
+def test_shared_cache(ogmios_server):
+    cache = MemoryCache()
+    contexts = [
+        OgmiosV6ChainContext(port=ogmios_server.port, cache=cache) for _ in range(2)
+    ]
+    try:
+        protocol_param = contexts[0].protocol_param
+        utxos = contexts[0].utxos_many(ADDRESSES)
+        assert contexts[1].protocol_param == protocol_param
+        assert contexts[1].utxos_many(ADDRESSES) == utxos
+        assert contexts[1].utxos(ADDRESSES[0]) == utxos[0]
+    finally:
+        for context in contexts:
+            context.close()
+
+    # The second context only queries the chain tip, the slot of the cached UTxOs
+    assert [request["method"] for request in ogmios_server.requests] == [
+        "queryLedgerState/protocolParameters",
+        "queryNetwork/tip",
+        "queryLedgerState/utxo",
+        "queryNetwork/tip",
+    ]
@@ -0,0 +1,253 @@
+import threading
+from test.pycardano.test_key import SK
+from test.pycardano.util import FixedChainContext
+from typing import Dict, List
+from unittest.mock import patch
+
+import pytest
+
+from pycardano import (
+    Address,
+    PendingUTxOChainContext,
+    Transaction,
+    TransactionBuilder,
+    TransactionInput,
+    TransactionOutput,
+    UTxO,
+    VerificationKeyHash,
+)
+from pycardano.hash import TransactionId
+
+SENDER = Address(SK.to_verification_key().hash())
+RECEIVER = Address(VerificationKeyHash(b"2" * 28))
+UNRELATED = Address(VerificationKeyHash(b"9" * 28))
+
+
+class LedgerChainContext(FixedChainContext):
+    """A chain context whose UTxOs are only changed by :meth:`confirm`."""
+
+    def __init__(self):
+        self.ledger: Dict[TransactionInput, UTxO] = {}
+        self.slot = 2000
+        self.queried: List[List[str]] = []
+
+    @property
+    def last_block_slot(self) -> int:
+        return self.slot
+
+    def _utxos(self, address: str) -> List[UTxO]:
+        return [u for u in self.ledger.values() if str(u.output.address) == address]
+
+    def _utxos_many(self, addresses: List[str]) -> List[List[UTxO]]:
+        self.queried.append(addresses)
+        return super()._utxos_many(addresses)
+
+    def confirm(self, tx: Transaction):
+        for tx_in in tx.transaction_body.inputs:
+            del self.ledger[tx_in]
+        for i, output in enumerate(tx.transaction_body.outputs):
+            self.ledger[TransactionInput(tx.id, i)] = UTxO(
+                TransactionInput(tx.id, i), output
+            )
+
+
+@pytest.fixture
+def ledger():
+    ledger = LedgerChainContext()
+    for i, amount in enumerate([10_000_000, 5_000_000]):
+        tx_in = TransactionInput(TransactionId(bytes([i]) * 32), 0)
+        ledger.ledger[tx_in] = UTxO(tx_in, TransactionOutput(SENDER, amount))
+    return ledger
+
+
+def pay(context, amount, ttl=None):
+    builder = TransactionBuilder(context, ttl=ttl)
+    builder.add_input_address(SENDER)
+    builder.add_output(TransactionOutput(RECEIVER, amount))
+    tx = builder.build_and_sign([SK], change_address=SENDER)
+    context.submit_tx(tx)
+    return tx
+
+
+def test_chained_transactions(ledger):
+    context = PendingUTxOChainContext(ledger)
+    tx1 = pay(context, 12_000_000)
+    assert context.pending == [tx1.id]
+
+    # Spent inputs are replaced by the outputs of the pending transaction
+    assert {u.input for u in context.utxos(SENDER)} == {TransactionInput(tx1.id, 1)}
+    assert context.utxos(RECEIVER) == [
+        UTxO(TransactionInput(tx1.id, 0), tx1.transaction_body.outputs[0])
+    ]
+
+    # The next transaction spends the change of the pending one
+    tx2 = pay(context, 1_000_000)
+    assert list(tx2.transaction_body.inputs) == [TransactionInput(tx1.id, 1)]
+    assert context.pending == [tx1.id, tx2.id]
+    assert {u.input for u in context.utxos(SENDER)} == {TransactionInput(tx2.id, 1)}
+    assert len(context.utxos(RECEIVER)) == 2
+
+    # tx1 is confirmed once the wrapped context returns its outputs
+    ledger.confirm(tx1)
+    assert {u.input for u in context.utxos(SENDER)} == {TransactionInput(tx2.id, 1)}
+    assert context.pending == [tx2.id]
+
+    ledger.confirm(tx2)
+    assert {u.input for u in context.utxos(SENDER)} == {TransactionInput(tx2.id, 1)}
+    assert context.pending == []
+
+
+def test_confirm_chained_transactions(ledger):
+    context = PendingUTxOChainContext(ledger)
+    tx1 = pay(context, 12_000_000)
+    tx2 = pay(context, 1_000_000)
+
+    # Confirming tx2 confirms tx1, whose change is already spent
+    ledger.confirm(tx1)
+    ledger.confirm(tx2)
+    context.utxos(RECEIVER)
+    assert context.pending == []
+
+
+def test_confirm_by_querying_outputs(ledger):
+    context = PendingUTxOChainContext(ledger)
+    tx = pay(context, 12_000_000)
+    ledger.confirm(tx)
+
+    # The address of the change output is queried along with the requested one
+    assert context.utxos(UNRELATED) == []
+    assert ledger.queried == [[str(UNRELATED), str(SENDER)]]
+    assert context.pending == []
+
+
+def test_payouts_query_one_address(ledger):
+    tx_in = TransactionInput(TransactionId(b"5" * 32), 0)
+    ledger.ledger[tx_in] = UTxO(tx_in, TransactionOutput(SENDER, 500_000_000))
+    context = PendingUTxOChainContext(ledger)
+    payouts = []
+    for i in range(3):
+        builder = TransactionBuilder(context)
+        builder.add_input_address(SENDER)
+        for j in range(50):
+            builder.add_output(
+                TransactionOutput(
+                    Address(VerificationKeyHash(bytes([i, j]) * 14)), 1_000_000
+                )
+            )
+        tx = builder.build_and_sign([SK], change_address=SENDER)
+        context.submit_tx(tx)
+        payouts.append(tx)
+    ledger.queried.clear()
+
+    # The payouts are chained on their change, so only the sender is queried
+    context.utxos(SENDER)
+    assert ledger.queried == []
+    context.utxos(UNRELATED)
+    assert ledger.queried == [[str(UNRELATED), str(SENDER)]]
+
+    for tx in payouts:
+        ledger.confirm(tx)
+    context.utxos(SENDER)
+    assert context.pending == []
+
+
+def test_confirm_by_querying_inputs(ledger):
+    context = PendingUTxOChainContext(ledger)
+    tx = pay(context, 12_000_000)
+    # The address of the inputs is known once the wrapped context returns them
+    context.utxos(SENDER)
+
+    # The outputs of the transaction are spent by the time it is queried again
+    ledger.confirm(tx)
+    for i in range(len(tx.transaction_body.outputs)):
+        del ledger.ledger[TransactionInput(tx.id, i)]
+    context.utxos(UNRELATED)
+    assert context.pending == []
+
+
+def test_conflicting_transaction(ledger):
+    context = PendingUTxOChainContext(ledger)
+    tx = pay(context, 12_000_000)
+    context.utxos(SENDER)
+
+    # An input is spent by another transaction, so the pending one can never be confirmed
+    del ledger.ledger[tx.transaction_body.inputs[0]]
+    assert context.utxos(SENDER) == ledger.utxos(SENDER)
+    assert context.pending == []
+
+
+def test_pending_until_validity_end(ledger):
+    context = PendingUTxOChainContext(ledger)
+    with patch("pycardano.backend.pending.time.monotonic", return_value=0):
+        tx = pay(context, 12_000_000)
+
+    # Without a pending TTL, a transaction without validity end stays pending until it is confirmed
+    with patch("pycardano.backend.pending.time.monotonic", return_value=86400):
+        context.utxos(SENDER)
+        assert context.pending == [tx.id]
+
+
+def test_concurrent_transactions(ledger):
+    context = PendingUTxOChainContext(ledger)
+    txs = []
+    for _ in range(2):
+        txs.append(pay(context, 1_000_000))
+        context.utxos(SENDER)
+    for tx in txs:
+        context.remove_pending(tx.id)
+
+    def churn():
+        for _ in range(50):
+            for tx in txs:
+                context.add_pending(tx)
+            context.utxos_many([SENDER, RECEIVER])
+            for tx in txs:
+                context.remove_pending(tx.id)
+
+    threads = [threading.Thread(target=churn) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert context.pending == []
+    assert context.utxos(SENDER) == ledger.utxos(SENDER)
+
+
+def test_expire_pending_transactions(ledger):
+    context = PendingUTxOChainContext(ledger, pending_ttl=60)
+    with patch("pycardano.backend.pending.time.monotonic", return_value=0):
+        tx1 = pay(context, 12_000_000)
+    with patch("pycardano.backend.pending.time.monotonic", return_value=30):
+        tx2 = pay(context, 1_000_000)
+        assert context.pending == [tx1.id, tx2.id]
+
+    # tx1 expires, and so does tx2 which spends its output
+    with patch("pycardano.backend.pending.time.monotonic", return_value=61):
+        assert context.utxos(SENDER) == ledger.utxos(SENDER)
+        assert context.pending == []
+
+
+def test_expire_at_validity_end(ledger):
+    context = PendingUTxOChainContext(ledger, pending_ttl=None)
+    tx = pay(context, 12_000_000, ttl=2100)
+    ledger.slot = 2099
+    context.utxos(SENDER)
+    assert context.pending == [tx.id]
+
+    ledger.slot = 2100
+    assert context.utxos(SENDER) == ledger.utxos(SENDER)
+    assert context.pending == []
+
+
+def test_remove_pending(ledger):
+    context = PendingUTxOChainContext(ledger)
+    tx = pay(context, 12_000_000)
+    context.remove_pending(tx.id)
+    assert context.pending == []
+    assert context.utxos(SENDER) == ledger.utxos(SENDER)
+
+    # Transactions submitted by other means can be added
+    context.add_pending(tx)
+    assert context.pending == [tx.id]
+    assert {u.input for u in context.utxos(SENDER)} == {TransactionInput(tx.id, 1)}
@@ -0,0 +1,321 @@
+import asyncio
+import contextlib
+import json
+import pathlib
+import threading
+import time
+from test.pycardano.util import FixedChainContext
+from typing import Dict, List
+
+import pytest
+from websockets.asyncio.server import serve
+from websockets.exceptions import ConnectionClosed
+
+from pycardano import Address, VerificationKeyHash
+from pycardano.backend.utxo_index import ChainSyncUTxOIndex
+
+RECORDING = pathlib.Path(__file__).parent / "../../resources/ogmios/chain_sync.json"
+
+W1, W2, UNWATCHED = (
+    str(Address(VerificationKeyHash(bytes([i]) * 28))) for i in (1, 2, 9)
+)
+
+
+class FakeChainSync:
+    """A local Ogmios v6 websocket server, which replays a recorded chain-sync stream.
+
+    The recording holds the tip of the chain, the UTxOs at the tip, and the results of the following ``nextBlock``
+    requests. Results are only sent once they are released with :meth:`release`, like blocks are produced.
+    """
+
+    def __init__(self, recording: dict):
+        self.utxos: List[dict] = recording["utxos"]
+        self.stream: List[dict] = recording["stream"]
+        self.chain: List[dict] = [recording["tip"]]
+        self.position = 0
+        self.released = 0
+        self.requests: List[str] = []
+        self.connections = 0
+        # Connection -> number of unanswered nextBlock requests, and intersection to roll back to
+        self.followers: Dict = {}
+        self.server = None
+        self.loop = None
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    async def start(self):
+        self.server = await serve(self.handle, "127.0.0.1", 0)
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def release(self, count: int = 1):
+        """Send the next ``count`` results of the stream."""
+
+        async def release():
+            self.released += count
+            for connection in list(self.followers):
+                await self.deliver(connection)
+
+        self.run(release())
+
+    def disconnect(self):
+        async def disconnect():
+            for connection in list(self.followers):
+                # Results released from now on are sent over the next connection
+                del self.followers[connection]
+                await connection.close()
+
+        self.run(disconnect())
+
+    async def handle(self, connection):
+        self.connections += 1
+        self.followers[connection] = {"pending": 0, "intersection": None}
+        try:
+            async for message in connection:
+                await self.respond(connection, json.loads(message))
+        except ConnectionClosed:
+            pass
+        finally:
+            self.followers.pop(connection, None)
+
+    async def send(self, connection, method: str, response: dict):
+        with contextlib.suppress(ConnectionClosed):
+            await connection.send(
+                json.dumps({"jsonrpc": "2.0", "method": method, **response})
+            )
+
+    async def respond(self, connection, request: dict):
+        method = request["method"]
+        self.requests.append(method)
+        follower = self.followers[connection]
+        if method == "nextBlock":
+            follower["pending"] += 1
+            await self.deliver(connection)
+            return
+        if method == "queryNetwork/tip":
+            result = self.chain[-1]
+        elif method == "queryLedgerState/utxo":
+            addresses = request["params"]["addresses"]
+            result = [utxo for utxo in self.utxos if utxo["address"] in addresses]
+        elif method == "findIntersection":
+            point = next(
+                (p for p in request["params"]["points"] if p in self.chain), None
+            )
+            if point is None:
+                await self.send(
+                    connection,
+                    method,
+                    {"error": {"code": 1000, "message": "No intersection found."}},
+                )
+                return
+            follower["intersection"] = point
+            result = {"intersection": point, "tip": self.chain[-1]}
+        else:
+            # acquireLedgerState and releaseLedgerState
+            result = {}
+        await self.send(connection, method, {"result": result})
+
+    async def deliver(self, connection):
+        follower = self.followers.get(connection)
+        while follower is not None and follower["pending"]:
+            # Chain-sync rolls back to the intersection first
+            if follower["intersection"] is not None:
+                result = {
+                    "direction": "backward",
+                    "point": follower["intersection"],
+                    "tip": self.chain[-1],
+                }
+                follower["intersection"] = None
+            elif self.position < min(self.released, len(self.stream)):
+                result = self.stream[self.position]
+                self.position += 1
+                if result["direction"] == "forward":
+                    block = result["block"]
+                    self.chain.append({"slot": block["slot"], "id": block["id"]})
+                else:
+                    del self.chain[self.chain.index(result["point"]) + 1 :]
+            else:
+                return
+            follower["pending"] -= 1
+            await self.send(connection, "nextBlock", {"result": result})
+
+
+@pytest.fixture
+def chain_sync():
+    with open(RECORDING) as f:
+        server = FakeChainSync(json.load(f))
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    server.loop = loop
+    server.run(server.start())
+    yield server
+    server.run(server.stop())
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+@pytest.fixture
+def index(chain_sync):
+    index = ChainSyncUTxOIndex(
+        FixedChainContext(),
+        [W1, Address.from_primitive(W2)],
+        host="127.0.0.1",
+        port=chain_sync.port,
+        pipeline=4,
+        sync_timeout=5,
+        reconnect_interval=0.01,
+    )
+    assert index.wait_synced(5)
+    yield index
+    index.close()
+
+
+def wait_for_slot(index: ChainSyncUTxOIndex, slot: int):
+    deadline = time.monotonic() + 5
+    while index.point is None or index.point["slot"] != slot:
+        assert time.monotonic() < deadline, f"Index stuck at {index.point}"
+        time.sleep(0.005)
+
+
+def balances(index: ChainSyncUTxOIndex, address: str) -> Dict[str, int]:
+    return {
+        f"{utxo.input.transaction_id}#{utxo.input.index}": utxo.output.amount.coin
+        for utxo in index.utxos(address)
+    }
+
+
+def test_seed(chain_sync, index):
+    assert index.point == {"slot": 100, "id": "a0" * 32}
+    assert balances(index, W1) == {f"{'01' * 32}#0": 5_000_000}
+    [utxo] = index.utxos(Address.from_primitive(W2))
+    assert utxo.output.amount.multi_asset.to_primitive() == {
+        bytes.fromhex("5c" * 28): {b"test": 10}
+    }
+    assert chain_sync.requests[:5] == [
+        "queryNetwork/tip",
+        "acquireLedgerState",
+        "queryLedgerState/utxo",
+        "releaseLedgerState",
+        "findIntersection",
+    ]
+
+
+def test_follow(chain_sync, index):
+    chain_sync.release(3)
+    wait_for_slot(index, 140)
+
+    # The outputs created and spent in the same block are not indexed
+    assert balances(index, W1) == {f"{'3a' * 32}#0": 1_000_000}
+    assert balances(index, W2) == {
+        f"{'02' * 32}#0": 3_000_000,
+        f"{'3a' * 32}#1": 600_000,
+    }
+    [utxo] = index.utxos(W1)
+    assert utxo.output.datum.cbor == bytes.fromhex("d87980")
+
+    # A failed transaction only spends its collaterals, and creates its collateral return
+    chain_sync.release()
+    wait_for_slot(index, 160)
+    assert balances(index, W1) == {f"{'4a' * 32}#1": 400_000}
+    assert len(index.utxos(W2)) == 2
+
+    # UTxOs are answered from memory
+    assert chain_sync.requests.count("queryLedgerState/utxo") == 1
+
+
+def test_rollback(chain_sync, index):
+    chain_sync.release(4)
+    wait_for_slot(index, 160)
+
+    chain_sync.release()
+    wait_for_slot(index, 140)
+    assert balances(index, W1) == {f"{'3a' * 32}#0": 1_000_000}
+    assert balances(index, W2) == {
+        f"{'02' * 32}#0": 3_000_000,
+        f"{'3a' * 32}#1": 600_000,
+    }
+
+    chain_sync.release()
+    wait_for_slot(index, 161)
+    assert balances(index, W1) == {
+        f"{'3a' * 32}#0": 1_000_000,
+        f"{'5a' * 32}#0": 3_000_000,
+    }
+    assert balances(index, W2) == {f"{'3a' * 32}#1": 600_000}
+    assert index.synced
+    assert chain_sync.requests.count("queryLedgerState/utxo") == 1
+
+
+def test_unwatched_address(index):
+    assert index.utxos(UNWATCHED) == FixedChainContext().utxos(UNWATCHED)
+    assert index.utxos_many([UNWATCHED, W1]) == [
+        FixedChainContext().utxos(UNWATCHED),
+        index.utxos(W1),
+    ]
+
+
+def test_reconnect(chain_sync, index):
+    chain_sync.release(3)
+    wait_for_slot(index, 140)
+
+    chain_sync.disconnect()
+    chain_sync.release(3)
+    wait_for_slot(index, 161)
+
+    # The index resumed where it left off, without being seeded again
+    assert chain_sync.connections == 2
+    assert chain_sync.requests.count("queryLedgerState/utxo") == 1
+    assert len(index.utxos(W1)) == 2
+
+
+def test_reseed_without_intersection(chain_sync, index):
+    chain_sync.release(3)
+    wait_for_slot(index, 140)
+
+    # None of the recent points of the index is on the chain anymore
+    chain_sync.chain = [{"slot": 500, "id": "e0" * 32}]
+    chain_sync.utxos = [
+        {
+            "transaction": {"id": "e1" * 32},
+            "index": 0,
+            "address": W1,
+            "value": {"ada": {"lovelace": 7_000_000}},
+        }
+    ]
+    chain_sync.disconnect()
+    wait_for_slot(index, 500)
+
+    assert index.wait_synced(5)
+    assert balances(index, W1) == {f"{'e1' * 32}#0": 7_000_000}
+    assert index.utxos(W2) == []
+    assert chain_sync.requests.count("queryLedgerState/utxo") == 2
+
+
+def test_not_synced(chain_sync):
+    port = chain_sync.port
+    chain_sync.run(chain_sync.stop())
+    index = ChainSyncUTxOIndex(
+        FixedChainContext(),
+        [W1],
+        host="127.0.0.1",
+        port=port,
+        sync_timeout=0.05,
+        reconnect_interval=0.01,
+    )
+    try:
+        # The wrapped context answers until the index is synced
+        assert index.utxos(W1) == FixedChainContext().utxos(W1)
+        assert not index.synced
+        assert index.error is not None
+    finally:
+        index.close()
+    chain_sync.run(chain_sync.start())
@@ -0,0 +1,97 @@
+import pytest
+
+from pycardano.crypto.bech32 import (
+    Encoding,
+    bech32_decode,
+    bech32_encode,
+    convertbits,
+    decode,
+    encode,
+)
+
+# Test vectors of BIP-173 and BIP-350, except the ones about the length limit, which is 108 instead of 90 for Cardano
+VALID_BECH32 = [
+    "A12UEL5L",
+    "a12uel5l",
+    "an83characterlonghumanreadablepartthatcontainsthenumber1andtheexcludedcharactersbio1tt5tgs",
+    "abcdef1qpzry9x8gf2tvdw0s3jn54khce6mua7lmqqqxw",
+    "split1checkupstagehandshakeupstreamerranterredcaperred2y9e3w",
+    "?1ezyfcl",
+]
+
+VALID_BECH32M = [
+    "A1LQFN3A",
+    "a1lqfn3a",
+    "an83characterlonghumanreadablepartthatcontainsthetheexcludedcharactersbioandnumber11sg7hg6",
+    "abcdef1l7aum6echk45nj3s0wdvt2fg8x9yrzpqzd3ryx",
+    "split1checkupstagehandshakeupstreamerranterredcaperredlc445v",
+    "?1v759aa",
+]
+
+INVALID = [
+    " 1nwldj5",
+    "\x7f1axkwrx",
+    "\x801eym55h",
+    "pzry9x0s0muk",
+    "1pzry9x0s0muk",
+    "x1b4n0q5v",
+    "li1dgmt3",
+    "de1lg7wt\xff",
+    "A1G7SGD8",
+    "10a06t8",
+    "1qzzfhee",
+    "a12UEL5L",
+    "A12uEL5L",
+]
+
+
+@pytest.mark.parametrize("bech", VALID_BECH32 + VALID_BECH32M)
+def test_valid(bech):
+    hrp, data, spec = bech32_decode(bech)
+    assert spec == (Encoding.BECH32 if bech in VALID_BECH32 else Encoding.BECH32M)
+    assert bech32_encode(hrp, data, spec) == bech.lower()
+
+    # Any changed character invalidates the checksum
+    pos = bech.rfind("1")
+    changed = bech[: pos + 1] + chr(ord(bech[pos + 1]) ^ 1) + bech[pos + 2 :]
+    assert bech32_decode(changed) == (None, None, None)
+
+
+@pytest.mark.parametrize("bech", INVALID)
+def test_invalid(bech):
+    assert bech32_decode(bech) == (None, None, None)
+    assert decode(bech) is None
+
+
+def test_encode_decode():
+    address = "addr1v8xrqjtlfluk9axpmjj5enh0uw0cduwhz7txsqyl36m3ukgqdsn8w"
+    data = bytes.fromhex("61cc30497f4ff962f4c1dca54cceefe39f86f1d7179668009f8eb71e59")
+
+    assert decode(address) == data
+    assert decode(address.upper()) == data
+    assert encode("addr", data) == address
+    assert encode("addr", list(data), verify=True) == address
+
+
+def test_encode_verify():
+    # Bech32 strings are at most 108 characters long
+    assert len(encode("addr", bytes(70))) > 108
+    assert encode("addr", bytes(70), verify=True) is None
+
+
+@pytest.mark.parametrize("length", range(12))
+def test_convertbits(length):
+    data = list(range(256 - length, 256))
+    values = convertbits(data, 8, 5)
+    assert all(0 <= value < 32 for value in values)
+    assert len(values) == (8 * length + 4) // 5
+    assert convertbits(values, 5, 8, False) == data
+    assert convertbits(convertbits(values, 5, 4), 4, 5, False) == values
+
+
+def test_convertbits_invalid():
+    assert convertbits([256], 8, 5) is None
+    assert convertbits([32], 5, 8, False) is None
+    # More than 4 padding bits, or non-zero padding bits
+    assert convertbits([0], 5, 8, False) is None
+    assert convertbits([0, 1], 5, 8, False) is None
@@ -19,13 +19,11 @@ from pycardano.network import Network
 
 
 def test_payment_addr():
-    vk = PaymentVerificationKey.from_json(
-        """{
+    vk = PaymentVerificationKey.from_json("""{
         "type": "GenesisUTxOVerificationKey_ed25519",
         "description": "Genesis Initial UTxO Verification Key",
         "cborHex": "58208be8339e9f3addfa6810d59e2f072f85e64d4c024c087e0d24f8317c6544f62f"
-    }"""
-    )
+    }""")
     assert (
         Address(vk.hash(), network=Network.TESTNET).encode()
         == "addr_test1vr2p8st5t5cxqglyjky7vk98k7jtfhdpvhl4e97cezuhn0cqcexl7"
@@ -223,3 +221,29 @@ def test_save_load_address():
         address.save(f.name)
         loaded_address = Address.load(f.name)
         assert address == loaded_address
+
+
+def test_decode_many_encode_many():
+    byron = "DdzFFzCqrhsxrgB6w6VhgfAqUZ69Va583murc21S4QFTJ6WUHAh4Gk8t1QHofpza5MZxG4dNVQWe8q78h4Utp9MGBQHBLD54rz6CTLsm"
+    addresses = [
+        Address(VerificationKeyHash(bytes([i]) * 28), ScriptHash(b"\x02" * 28))
+        for i in range(3)
+    ] + [
+        Address(ScriptHash(b"\x03" * 28), PointerAddress(1, 2, 3), Network.TESTNET),
+        Address(None, VerificationKeyHash(b"\x04" * 28)),
+        Address.decode(byron),
+    ]
+    encoded = [address.encode() for address in addresses] * 2
+
+    assert Address.encode_many(addresses) == encoded[: len(addresses)]
+    decoded = Address.decode_many(encoded)
+    assert decoded == addresses * 2
+    assert [address.encode() for address in decoded] == encoded
+    # Equal strings are decoded once
+    assert decoded[0] is decoded[len(addresses)]
+
+
+def test_decode_many_invalid():
+    valid = "addr_test1vr2p8st5t5cxqglyjky7vk98k7jtfhdpvhl4e97cezuhn0cqcexl7"
+    with pytest.raises(DecodingException):
+        Address.decode_many([valid, valid[:-1] + "8"])
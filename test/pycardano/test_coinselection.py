@@ -4,13 +4,26 @@ from typing import List
 
 import pytest
 
-from pycardano.coinselection import LargestFirstSelector, RandomImproveMultiAsset
+from pycardano.coinselection import (
+    BranchAndBoundSelector,
+    LargestFirstSelector,
+    RandomImproveMultiAsset,
+    UTxOPool,
+)
 from pycardano.exception import (
     InputUTxODepletedException,
     InsufficientUTxOBalanceException,
     MaxInputCountExceededException,
 )
-from pycardano.transaction import TransactionInput, TransactionOutput, UTxO, Value
+from pycardano.hash import ScriptHash
+from pycardano.transaction import (
+    AssetName,
+    TransactionInput,
+    TransactionOutput,
+    UTxO,
+    Value,
+)
+from pycardano.utils import min_lovelace_post_alonzo
 
 address = "addr_test1vrm9x2zsux7va6w892g38tvchnzahvcd9tykqf3ygnmwtaqyfg52x"
 
@@ -227,3 +240,206 @@ class TestRandomImproveMultiAsset:
             UTXOS[0],
         ]
         assert_request_fulfilled(request, selected)
+
+
+class TestUTxOPool:
+    def test_indexes(self):
+        pool = UTxOPool(reversed(UTXOS))
+        assert len(pool) == TOTAL_UTXOS
+        assert list(pool) == list(reversed(UTXOS))
+        assert pool.sorted_by_lovelace() == UTXOS
+
+        # UTxOs are unique by input
+        assert not pool.add(UTXOS[0])
+        assert len(pool) == TOTAL_UTXOS
+
+        token3 = (ScriptHash(b"1" * 28), AssetName(b"token3"))
+        assert pool.with_asset(*token3) == [UTXOS[3]]
+        assert pool.with_asset(ScriptHash(b"2" * 28), AssetName(b"token3")) == []
+
+        pool.exclude(UTXOS[3], UTXOS[5].input)
+        assert len(pool) == TOTAL_UTXOS - 2
+        assert UTXOS[3] not in pool and UTXOS[5].input not in pool
+        assert UTXOS[4] in pool and UTXOS[4].input in pool
+        assert pool.is_excluded(UTXOS[3].input)
+        assert pool.sorted_by_lovelace() == UTXOS[:3] + [UTXOS[4]] + UTXOS[6:]
+        assert pool.with_asset(*token3) == []
+
+        # Exclusion also applies to UTxOs added later
+        extra = UTxO(
+            TransactionInput.from_primitive([b"2" * 32, 0]),
+            TransactionOutput.from_primitive([address, 1000000]),
+        )
+        pool.exclude(extra)
+        assert pool.add(extra)
+        assert extra not in pool
+        assert len(pool) == TOTAL_UTXOS - 2
+        assert extra not in pool.sorted_by_lovelace()
+
+    def test_largest_first(self, chain_context):
+        request = [TransactionOutput.from_primitive([address, [15000000]])]
+        pool = UTxOPool(UTXOS)
+        selected, change = LargestFirstSelector().select(pool, request, chain_context)
+        assert selected == [UTXOS[-1], UTXOS[-2]]
+
+        # Selected UTxOs stay in the pool until they are excluded
+        pool.exclude(*selected)
+        selected, _ = LargestFirstSelector().select(pool, request, chain_context)
+        assert selected == [UTXOS[-3], UTXOS[-4], UTXOS[-5]]
+
+    def test_random_improve_picks_asset_holders(self, chain_context):
+        request = [
+            TransactionOutput.from_primitive(
+                [address, [1500000, {b"1" * 28: {b"token0": 50, b"token3": 50}}]]
+            )
+        ]
+        selected, _ = RandomImproveMultiAsset(random_generator=[0, 0, 0]).select(
+            UTxOPool(UTXOS),
+            request,
+            chain_context,
+            include_max_fee=False,
+            respect_min_utxo=False,
+        )
+        # token3 is only held by UTXOS[3], so it is picked without drawing from the other UTxOs
+        assert selected == [UTXOS[0], UTXOS[1], UTXOS[3]]
+        assert_request_fulfilled(request, selected)
+
+
+# ADA-only UTxOs, each holding a round amount of ADA plus the fee of spending it
+INPUT_FEE = 36 * 44
+# All UTxOs are spent with the same key, whose witness is paid once
+WITNESS_FEE = 103 * 44
+ADA_UTXOS = [
+    UTxO(
+        TransactionInput.from_primitive([b"2" * 32, i]),
+        TransactionOutput.from_primitive([address, ada * 1000000 + INPUT_FEE]),
+    )
+    for i, ada in enumerate([20, 10, 5, 2, 1])
+]
+
+
+class TestBranchAndBound:
+    selector = BranchAndBoundSelector(fallbacks=[])
+
+    def test_exact_match(self, chain_context):
+        request = [TransactionOutput.from_primitive([address, 7000000 - WITNESS_FEE])]
+        selected, change = self.selector.select(
+            ADA_UTXOS,
+            request,
+            chain_context,
+            include_max_fee=False,
+            respect_min_utxo=False,
+        )
+        assert selected == [ADA_UTXOS[2], ADA_UTXOS[3]]
+        # Only the fee of the selected inputs and their witness is left
+        assert change == Value(2 * INPUT_FEE + WITNESS_FEE)
+
+    def test_changeless(self, chain_context):
+        request = [TransactionOutput.from_primitive([address, 7000000 - WITNESS_FEE])]
+        selected, change = self.selector.select(
+            ADA_UTXOS, request, chain_context, include_max_fee=False
+        )
+        # No change output is needed, so no minimum lovelace is requested for it
+        assert selected == [ADA_UTXOS[2], ADA_UTXOS[3]]
+        assert change == Value(2 * INPUT_FEE + WITNESS_FEE)
+
+    def test_changeless_excess(self, chain_context):
+        # The excess costs less than a change output, and is left to be paid as fee
+        request = [TransactionOutput.from_primitive([address, 6999000 - WITNESS_FEE])]
+        selected, change = self.selector.select(
+            ADA_UTXOS, request, chain_context, include_max_fee=False
+        )
+        assert selected == [ADA_UTXOS[2], ADA_UTXOS[3]]
+        assert change == Value(2 * INPUT_FEE + WITNESS_FEE + 1000)
+
+    def test_respect_min_utxo(self, chain_context):
+        request = [TransactionOutput.from_primitive([address, 6500000])]
+        selected, change = self.selector.select(
+            ADA_UTXOS, request, chain_context, include_max_fee=False
+        )
+        assert selected == [ADA_UTXOS[2], ADA_UTXOS[3], ADA_UTXOS[4]]
+        assert change.coin - 3 * INPUT_FEE >= min_lovelace_post_alonzo(
+            TransactionOutput.from_primitive([address, change.coin]), chain_context
+        )
+
+    def test_equal_effective_values(self, chain_context):
+        # Both UTxOs hold 3 ADA besides the fee of spending them, but the input of an index above 23 is larger
+        utxos = [
+            UTxO(
+                TransactionInput.from_primitive([b"3" * 32, 24]),
+                TransactionOutput.from_primitive([address, 3000000 + 37 * 44]),
+            ),
+            UTxO(
+                TransactionInput.from_primitive([b"4" * 32, 0]),
+                TransactionOutput.from_primitive([address, 3000000 + INPUT_FEE]),
+            ),
+        ]
+        request = [TransactionOutput.from_primitive([address, 3000000 - WITNESS_FEE])]
+        selected, change = self.selector.select(
+            utxos,
+            request,
+            chain_context,
+            include_max_fee=False,
+            respect_min_utxo=False,
+        )
+        assert selected == [utxos[1]]
+        assert change == Value(INPUT_FEE + WITNESS_FEE)
+
+    def test_witnesses(self, chain_context):
+        # The UTxOs of another key hold as much, but spending them takes another witness
+        other = "addr_test1vr2p8st5t5cxqglyjky7vk98k7jtfhdpvhl4e97cezuhn0cqcexl7"
+        utxos = [
+            UTxO(
+                TransactionInput.from_primitive([b"3" * 32, i]),
+                TransactionOutput.from_primitive([addr, 1000000 + INPUT_FEE]),
+            )
+            for i, addr in enumerate([other, address, address])
+        ]
+        request = [TransactionOutput.from_primitive([address, 2000000 - WITNESS_FEE])]
+        selected, change = self.selector.select(
+            utxos,
+            request,
+            chain_context,
+            include_max_fee=False,
+            respect_min_utxo=False,
+        )
+        assert sorted(u.input.index for u in selected) == [1, 2]
+        assert change == Value(2 * INPUT_FEE + WITNESS_FEE)
+
+    def test_multi_asset(self, chain_context):
+        request = [
+            TransactionOutput.from_primitive(
+                [address, [2000000, {b"1" * 28: {b"token3": 300, b"token5": 50}}]]
+            )
+        ]
+        selected, change = self.selector.select(
+            UTXOS + ADA_UTXOS, request, chain_context
+        )
+        # The UTxOs holding the tokens bring enough ADA
+        assert selected == [UTXOS[3], UTXOS[5]]
+        assert_request_fulfilled(request, selected)
+
+    def test_max_input_count(self, chain_context):
+        request = [TransactionOutput.from_primitive([address, 33000000])]
+        with pytest.raises(MaxInputCountExceededException):
+            self.selector.select(
+                ADA_UTXOS,
+                request,
+                chain_context,
+                max_input_count=2,
+                include_max_fee=False,
+                respect_min_utxo=False,
+            )
+
+    def test_insufficient_balance(self, chain_context):
+        request = [TransactionOutput.from_primitive([address, 100000000])]
+        with pytest.raises(InsufficientUTxOBalanceException):
+            self.selector.select(ADA_UTXOS, request, chain_context)
+
+    def test_fallback(self, chain_context):
+        request = [TransactionOutput.from_primitive([address, 7000000])]
+        selector = BranchAndBoundSelector(
+            max_tries=0, fallbacks=[LargestFirstSelector()]
+        )
+        selected, _ = selector.select(ADA_UTXOS, request, chain_context)
+        assert selected == [ADA_UTXOS[0]]
@@ -1,4 +1,8 @@
+import io
 import json
+import mmap
+import pickle
+import socket
 import tempfile
 from collections import defaultdict, deque
 from copy import deepcopy
@@ -30,9 +34,11 @@ from pycardano import (
     MultiAsset,
     Primitive,
     RawPlutusData,
+    ScriptHash,
     Transaction,
     TransactionWitnessSet,
     VerificationKey,
+    VerificationKeyHash,
     VerificationKeyWitness,
 )
 from pycardano.exception import (
@@ -52,8 +58,11 @@ from pycardano.serialization import (
     NonEmptyOrderedSet,
     OrderedSet,
     RawCBOR,
+    decode_cbor,
     default_encoder,
+    iter_cbor,
     limit_primitive_type,
+    skip_validation,
 )
 
 
@@ -253,6 +262,37 @@ def test_map_cbor_serializable_custom_keys():
     check_two_way_cbor(t)
 
 
+def test_codec_plan_is_per_class():
+    @dataclass
+    class Test1(MapCBORSerializable):
+        a: str = field(default="", metadata={"key": 0})
+
+    @dataclass
+    class Test2(Test1):
+        b: List[int] = field(default_factory=list, metadata={"key": 1})
+
+    t1 = Test1(a="a")
+    t2 = Test2(a="a", b=[1, 2])
+    check_two_way_cbor(t1)
+    check_two_way_cbor(t2)
+    assert Test1.from_primitive({0: "a"}) == t1
+    assert Test2.from_primitive({0: "a", 1: [1, 2]}) == t2
+    with pytest.raises(DeserializeException):
+        Test1.from_primitive({0: "a", 1: [1, 2]})
+
+
+def test_codec_plan_object_hook():
+    @dataclass
+    class Test1(ArrayCBORSerializable):
+        a: List[int] = field(metadata={"object_hook": lambda v: [i * 2 for i in v]})
+        b: Optional[List[int]] = None
+
+    assert Test1.from_primitive([[1, 2], [3]]) == Test1(a=[2, 4], b=[3])
+    assert Test1.from_primitive([[1, 2], None]) == Test1(a=[2, 4], b=None)
+    with pytest.raises(DeserializeException):
+        Test1.from_primitive([[1, 2], "b"])
+
+
 def test_map_cbor_serializable_duplicate_keys():
     @dataclass
     class Test3(MapCBORSerializable):
@@ -482,6 +522,100 @@ def test_wrong_nested_type():
         Test2(a=Test1(a=1)).to_cbor_hex()
 
 
+def test_validation_checks_are_per_class():
+    @dataclass
+    class Test1(MapCBORSerializable):
+        a: str = ""
+
+    @dataclass
+    class Test2(Test1):
+        b: int = 0
+
+    Test1(a="a").validate()
+    assert [name for name, _, _ in Test1._field_checks] == ["a"]
+    assert "_field_checks" not in Test2.__dict__
+
+    Test2(a="a", b=1).validate()
+    assert [name for name, _, _ in Test2._field_checks] == ["a", "b"]
+
+    with pytest.raises(TypeError):
+        Test2(a="a", b="b").validate()
+
+
+def test_skip_validation():
+    @dataclass
+    class Test1(MapCBORSerializable):
+        a: str = ""
+
+    @dataclass
+    class Test2(MapCBORSerializable):
+        a: Test1 = ""
+
+    obj = Test2(a=Test1(a=1))
+    with pytest.raises(TypeError):
+        obj.to_cbor()
+
+    expected = cbor2.dumps({"a": {"a": 1}})
+    assert obj.to_cbor(validate=False) == expected
+    assert obj.to_cbor_hex(validate=False) == expected.hex()
+    with skip_validation():
+        assert obj.to_cbor() == expected
+        assert obj.to_validated_primitive() == {"a": {"a": 1}}
+
+    with pytest.raises(TypeError):
+        obj.to_cbor()
+
+
+def _cbor_sequence_items():
+    @dataclass
+    class Test1(ArrayCBORSerializable):
+        a: int
+        b: bytes
+
+    return Test1, [Test1(i, bytes([i]) * i * 50) for i in range(20)]
+
+
+def test_iter_cbor():
+    cls, items = _cbor_sequence_items()
+    payload = b"".join(item.to_cbor() for item in items)
+
+    for chunk_size in (1, 7, 1 << 16):
+        assert list(iter_cbor(cls, io.BytesIO(payload), chunk_size)) == items
+    assert list(iter_cbor(cls, io.BytesIO(b""))) == []
+
+    class IntDict(DictCBORSerializable):
+        KEY_TYPE = int
+        VALUE_TYPE = int
+
+    # Indefinite-length maps, split across chunks
+    stream = io.BytesIO(b"\xbf\x01\x02\xff" * 3)
+    assert [d.data for d in iter_cbor(IntDict, stream, chunk_size=1)] == [{1: 2}] * 3
+
+    with pytest.raises(cbor2.CBORDecodeEOF):
+        list(iter_cbor(cls, io.BytesIO(payload[:-1])))
+
+
+def test_iter_cbor_mmap_and_socket():
+    cls, items = _cbor_sequence_items()
+    payload = b"".join(item.to_cbor() for item in items)
+
+    with tempfile.TemporaryFile() as f:
+        f.write(payload)
+        f.flush()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            assert list(iter_cbor(cls, m, chunk_size=100)) == items
+
+    reader, writer = socket.socketpair()
+    with reader, writer:
+        # Items are yielded as soon as they are received, before the stream ends
+        writer.sendall(payload[:-1])
+        stream = iter_cbor(cls, reader.makefile("rb"))
+        assert [next(stream) for _ in items[:-1]] == items[:-1]
+        writer.sendall(payload[-1:])
+        writer.shutdown(socket.SHUT_WR)
+        assert list(stream) == items[-1:]
+
+
 def test_script_deserialize():
     @dataclass
     class Test(MapCBORSerializable):
@@ -577,6 +711,21 @@ def test_restore_typed_union_primitive():
         t = Test1.from_primitive(["a"])
 
 
+def test_restore_typed_union_order():
+    @dataclass
+    class Test1(ArrayCBORSerializable):
+        a: Union[VerificationKeyHash, ScriptHash]
+
+    @dataclass
+    class Test2(ArrayCBORSerializable):
+        a: Union[ScriptHash, VerificationKeyHash]
+
+    # Union members are tried in the order each class declares them
+    assert type(Test1.from_primitive([b"1" * 28]).a) is VerificationKeyHash
+    assert type(Test2.from_primitive([b"1" * 28]).a) is ScriptHash
+    assert type(Test1.from_primitive([b"1" * 28]).a) is VerificationKeyHash
+
+
 def test_copy():
     @dataclass
     class Test1(ArrayCBORSerializable):
@@ -658,6 +807,67 @@ def test_ordered_set():
     assert list(s) == [1]
 
 
+def test_ordered_set_item_keys():
+    # Hashable items are compared by value, as long as it is consistent with their CBOR
+    s = OrderedSet([1, True, 1.0, b"1", "1", (1, 2)])
+    assert list(s) == [1, True, 1.0, b"1", "1", (1, 2)]
+    assert True in s and 0 not in s and False not in s
+    s.append(True)
+    s.append(ByteString(b"1"))
+    s.append(cbor2.dumps(True))
+    assert len(s) == 8
+
+    # Unhashable items are compared by CBOR
+    s = OrderedSet([[1, 2], {"a": 1}, (1, [2])])
+    assert [1, 2] in s and {"a": 1} in s and (1, [2]) in s
+    s.append([1, 2])
+    assert len(s) == 3
+
+    vkey = VerificationKey.from_primitive(b"1" * 32)
+    witness = VerificationKeyWitness(vkey, b"1" * 64)
+    s = NonEmptyOrderedSet([witness, VerificationKeyWitness(vkey, b"2" * 64)])
+    assert VerificationKeyWitness(vkey, b"1" * 64) in s
+    s.append(VerificationKeyWitness(vkey, b"1" * 64))
+    assert len(s) == 2
+    s.remove(VerificationKeyWitness(vkey, b"1" * 64))
+    assert list(s) == [VerificationKeyWitness(vkey, b"2" * 64)]
+    assert witness not in s
+
+    # Items are looked up by their current value, like the keys of a dict
+    item = [1]
+    s = OrderedSet([item])
+    item.append(2)
+    assert item not in s and [1, 2] not in s
+    s.remove(item)
+    assert len(s) == 1
+
+
+def test_ordered_set_indexing_and_pickling():
+    s = OrderedSet(IndefiniteList(list(range(10))), use_tag=False)
+    for i in range(0, 10, 2):
+        s.remove(i)
+    s.append(0)
+    assert list(s) == [1, 3, 5, 7, 9, 0]
+    assert s[0] == 1 and s[5] == 0 and s[-1] == 0 and s[1:3] == [3, 5]
+    with pytest.raises(IndexError):
+        s[6]
+    # Indexing follows the changes of the set
+    s.append(11)
+    assert s[6] == 11
+    s.remove(1)
+    assert s[0] == 3 and s[-1] == 11 and len(s) == 6
+
+    restored = pickle.loads(pickle.dumps(s))
+    assert restored == s
+    assert restored.to_cbor() == s.to_cbor()
+    assert restored._is_indefinite_list and not restored._use_tag
+
+    s = NonEmptyOrderedSet([[1], [2]])
+    restored = pickle.loads(pickle.dumps(s))
+    assert type(restored) is NonEmptyOrderedSet
+    assert [1] in restored and restored.to_cbor() == s.to_cbor()
+
+
 def test_ordered_set_with_complex_types():
     # Test with VerificationKeyWitness
     vkey = VerificationKey.from_primitive(
@@ -1074,7 +1284,7 @@ def test_indefinite_list_highjacking_does_not_break_cbor2():
     ls.freeze()
     a = {ls: 1}
     encoded = cbor2.dumps(a, default=default_encoder)
-    decoded = cbor2.loads(encoded)
+    decoded = decode_cbor(encoded)
     assert isinstance(list(decoded.keys())[0], IndefiniteList)
 
 
@@ -1083,7 +1293,7 @@ def test_definite_list_highjacking_does_not_break_cbor2():
     ls.freeze()
     a = {ls: 1}
     encoded = cbor2.dumps(a, default=default_encoder)
-    decoded = cbor2.loads(encoded)
+    decoded = decode_cbor(encoded)
     assert isinstance(list(decoded.keys())[0], (list, tuple))
 
 
@@ -1093,7 +1303,7 @@ def test_indefinite_list_highjacking_does_not_break_cbor2_datum():
     datum = CBORTag(251, ls)
     a = {datum: 1}
     encoded = cbor2.dumps(a, default=default_encoder)
-    decoded = cbor2.loads(encoded)
+    decoded = decode_cbor(encoded)
     assert isinstance(list(decoded.keys())[0], CBORTag)
     assert isinstance(list(decoded.keys())[0].value, IndefiniteList)
 
@@ -1104,11 +1314,42 @@ def test_definite_list_highjacking_does_not_break_cbor2_datum():
     datum = CBORTag(251, ls)
     a = {datum: 1}
     encoded = cbor2.dumps(a, default=default_encoder)
-    decoded = cbor2.loads(encoded)
+    decoded = decode_cbor(encoded)
     assert isinstance(list(decoded.keys())[0], CBORTag)
     assert isinstance(list(decoded.keys())[0].value, (list, tuple))
 
 
+def test_decode_cbor_keeps_set_order():
+    items = list(range(30, 0, -1))
+    encoded = cbor2.dumps({"set": CBORTag(258, items), "list": items})
+    decoded = decode_cbor(encoded)
+    assert decoded == {"set": CBORTag(258, items), "list": items}
+    assert cbor2.dumps(decoded) == encoded
+
+
+def test_decode_cbor_keeps_indefinite_lists():
+    ls = IndefiniteList([IndefiniteList([b"a" * 100, 1]), 2] + list(range(30)))
+    encoded = cbor2.dumps(CBORTag(121, ls), default=default_encoder)
+    decoded = decode_cbor(encoded)
+    assert isinstance(decoded.value, IndefiniteFrozenList)
+    assert isinstance(decoded.value[0], IndefiniteFrozenList)
+    assert cbor2.dumps(decoded, default=default_encoder) == encoded
+
+
+def test_decode_cbor_with_substitute_tags_in_payload():
+    tag = int.from_bytes(b"pycardan", "big")
+    value = [CBORTag(tag, 1), CBORTag(tag + 1, 2), CBORTag(258, [2, 1])]
+    encoded = cbor2.dumps(value)
+    assert decode_cbor(encoded) == value
+
+
+def test_decode_cbor_malformed():
+    with pytest.raises(cbor2.CBORDecodeError):
+        decode_cbor(bytes.fromhex("9f0102"))
+    with pytest.raises(cbor2.CBORDecodeError):
+        decode_cbor(bytes.fromhex("d9010283"))
+
+
 def test_ordered_set_as_key_in_dict_indefinite_list():
     a = NonEmptyOrderedSet(IndefiniteList([1, 2, 3]))
 
@@ -1120,3 +1361,401 @@ def test_ordered_set_as_key_in_dict_indefinite_list():
     d[a] = 1
 
     check_two_way_cbor(d)
+
+
+def _encoding_samples() -> List[CBORSerializable]:
+    """Instances of every concrete CBORSerializable in pycardano, directly or nested in other samples."""
+    from fractions import Fraction
+
+    from pycardano import (
+        Address,
+        AlonzoMetadata,
+        AuxiliaryData,
+        ExecutionUnits,
+        InvalidBefore,
+        InvalidHereAfter,
+        LazyTransaction,
+        Metadata,
+        MultiAsset,
+        Network,
+        PaymentExtendedSigningKey,
+        PaymentExtendedVerificationKey,
+        PaymentSigningKey,
+        PaymentVerificationKey,
+        PlutusV3Script,
+        PoolId,
+        Redeemer,
+        RedeemerKey,
+        RedeemerMap,
+        RedeemerTag,
+        RedeemerValue,
+        ScriptAll,
+        ScriptAny,
+        ScriptNofK,
+        ScriptPubkey,
+        ShelleyMarryMetadata,
+        StakeExtendedSigningKey,
+        StakeExtendedVerificationKey,
+        StakePoolSigningKey,
+        StakePoolVerificationKey,
+        StakeSigningKey,
+        StakeVerificationKey,
+        TransactionBody,
+        TransactionInput,
+        TransactionOutput,
+        Unit,
+        UTxO,
+        Value,
+        Withdrawals,
+    )
+    from pycardano.address import PointerAddress
+    from pycardano.certificate import (
+        Anchor,
+        AuthCommitteeHotCertificate,
+        DRep,
+        DRepCredential,
+        DRepKind,
+        PoolRegistration,
+        PoolRetirement,
+        RegDRepCert,
+        ResignCommitteeColdCertificate,
+        StakeAndVoteDelegation,
+        StakeCredential,
+        StakeDelegation,
+        StakeDeregistration,
+        StakeDeregistrationConway,
+        StakeRegistration,
+        StakeRegistrationAndDelegation,
+        StakeRegistrationAndDelegationAndVoteDelegation,
+        StakeRegistrationAndVoteDelegation,
+        StakeRegistrationConway,
+        UnregDRepCertificate,
+        UpdateDRepCertificate,
+        VoteDelegation,
+    )
+    from pycardano.governance import (
+        CommitteeColdCredential,
+        CommitteeColdCredentialEpochMap,
+        DRepVotingThresholds,
+        ExUnitPrices,
+        GovActionId,
+        GovActionIdToVotingProcedure,
+        InfoAction,
+        NewConstitution,
+        NoConfidence,
+        ParameterChangeAction,
+        PoolVotingThresholds,
+        ProposalProcedure,
+        ProtocolParamUpdate,
+        TreasuryWithdrawal,
+        TreasuryWithdrawalsAction,
+        UpdateCommittee,
+        Vote,
+        Voter,
+        VoterType,
+        VotingProcedure,
+        VotingProcedures,
+    )
+    from pycardano.hash import (
+        AnchorDataHash,
+        AuxiliaryDataHash,
+        DatumHash,
+        PolicyHash,
+        PolicyId,
+        PoolKeyHash,
+        PoolMetadataHash,
+        RewardAccountHash,
+        ScriptDataHash,
+        ScriptHash,
+        TransactionId,
+        VerificationKeyHash,
+        VrfKeyHash,
+    )
+    from pycardano.plutus import CostModels
+    from pycardano.pool_params import (
+        MultiHostName,
+        PoolMetadata,
+        PoolParams,
+        SingleHostAddr,
+        SingleHostName,
+    )
+    from pycardano.transaction import (
+        _DatumOption,
+        _Script,
+        _ScriptRef,
+        _TransactionOutputLegacy,
+        _TransactionOutputPostAlonzo,
+    )
+
+    @dataclass
+    class MyDatum(PlutusData):
+        CONSTR_ID = 1
+        a: int
+        b: ByteString
+        c: List[int]
+
+    vkh = VerificationKeyHash(b"1" * 28)
+    script_hash = ScriptHash(b"2" * 28)
+    tx_id = TransactionId(b"3" * 32)
+    anchor = Anchor("https://example.com", AnchorDataHash(b"4" * 32))
+    credential = StakeCredential(vkh)
+    drep = DRep(DRepKind.VERIFICATION_KEY_HASH, vkh)
+    pool_keyhash = PoolKeyHash(b"5" * 28)
+    gov_action_id = GovActionId(tx_id, 0)
+    cold_credential = CommitteeColdCredential(vkh)
+    native_script = ScriptAll(
+        [
+            ScriptPubkey(vkh),
+            ScriptAny([InvalidBefore(10), InvalidHereAfter(20)]),
+            ScriptNofK(1, [ScriptPubkey(vkh)]),
+        ]
+    )
+    signing_key = PaymentSigningKey.generate()
+    address = Address(vkh, vkh, Network.MAINNET)
+    multi_asset = MultiAsset.from_primitive({b"6" * 28: {b"token": 1, b"": 2}})
+    datum = MyDatum(1, ByteString(b"7" * 100), [1, 2, 3])
+    redeemer = Redeemer(datum, ExecutionUnits(1, 2))
+    redeemer.tag = RedeemerTag.SPEND
+    pool_params = PoolParams(
+        operator=pool_keyhash,
+        vrf_keyhash=VrfKeyHash(b"8" * 32),
+        pledge=1,
+        cost=2,
+        margin=Fraction(1, 3),
+        reward_account=RewardAccountHash(b"9" * 29),
+        pool_owners=OrderedSet([vkh]),
+        relays=[
+            SingleHostAddr(3001, ipv4="10.0.0.1", ipv6="::1"),
+            SingleHostName(3001, "relay.example.com"),
+            MultiHostName("relay.example.com"),
+        ],
+        pool_metadata=PoolMetadata("https://example.com", PoolMetadataHash(b"a" * 32)),
+    )
+    voting_procedures = VotingProcedures()
+    voting_procedures[Voter(vkh, VoterType.DREP)] = GovActionIdToVotingProcedure(
+        {gov_action_id: VotingProcedure(Vote.YES, anchor)}
+    )
+    treasury_withdrawal = TreasuryWithdrawal()
+    treasury_withdrawal[b"b" * 29] = 1
+    gov_actions = [
+        ParameterChangeAction(
+            gov_action_id,
+            ProtocolParamUpdate(
+                min_fee_a=1,
+                execution_costs=ExUnitPrices(Fraction(1, 2), Fraction(1, 3)),
+                max_tx_ex_units=ExecutionUnits(1, 2),
+                pool_voting_thresholds=PoolVotingThresholds(*[Fraction(1, 2)] * 5),
+                drep_voting_thresholds=DRepVotingThresholds(*[Fraction(1, 2)] * 10),
+            ),
+            PolicyHash(b"c" * 28),
+        ),
+        TreasuryWithdrawalsAction(treasury_withdrawal, None),
+        NoConfidence(gov_action_id),
+        UpdateCommittee(
+            gov_action_id,
+            OrderedSet([cold_credential]),
+            CommitteeColdCredentialEpochMap({cold_credential: 100}),
+            Fraction(2, 3),
+        ),
+        NewConstitution(gov_action_id, (anchor, script_hash)),
+        InfoAction(),
+    ]
+    certificates = [
+        StakeRegistration(credential),
+        StakeDeregistration(credential),
+        StakeDelegation(credential, pool_keyhash),
+        PoolRegistration(pool_params),
+        PoolRetirement(pool_keyhash, 100),
+        StakeRegistrationConway(credential, 1),
+        StakeDeregistrationConway(credential, 1),
+        VoteDelegation(credential, drep),
+        StakeAndVoteDelegation(credential, pool_keyhash, drep),
+        StakeRegistrationAndDelegation(credential, pool_keyhash, 1),
+        StakeRegistrationAndVoteDelegation(credential, drep, 1),
+        StakeRegistrationAndDelegationAndVoteDelegation(
+            credential, pool_keyhash, drep, 1
+        ),
+        AuthCommitteeHotCertificate(credential, credential),
+        ResignCommitteeColdCertificate(credential, anchor),
+        RegDRepCert(DRepCredential(vkh), 1, anchor),
+        UnregDRepCertificate(DRepCredential(vkh), 1),
+        UpdateDRepCertificate(DRepCredential(vkh), anchor),
+    ]
+    outputs = [
+        TransactionOutput(address, Value(1, multi_asset)),
+        TransactionOutput(address, 1, datum_hash=DatumHash(b"d" * 32)),
+        TransactionOutput(address, 1, datum=datum, script=PlutusV3Script(b"e")),
+        TransactionOutput(
+            address, 1, datum=RawPlutusData(CBORTag(121, [])), script=native_script
+        ),
+    ]
+    body = TransactionBody(
+        inputs=OrderedSet([TransactionInput(tx_id, 1), TransactionInput(tx_id, 0)]),
+        outputs=outputs,
+        fee=1,
+        ttl=10,
+        certificates=NonEmptyOrderedSet(certificates),
+        withdraws=Withdrawals({address.to_primitive(): 1}),
+        auxiliary_data_hash=AuxiliaryDataHash(b"f" * 32),
+        validity_start=1,
+        mint=multi_asset,
+        script_data_hash=ScriptDataHash(b"g" * 32),
+        collateral=NonEmptyOrderedSet([TransactionInput(tx_id, 2)]),
+        required_signers=NonEmptyOrderedSet([vkh]),
+        network_id=Network.MAINNET,
+        collateral_return=outputs[0],
+        total_collateral=1,
+        reference_inputs=NonEmptyOrderedSet([TransactionInput(tx_id, 3)]),
+        voting_procedures=voting_procedures,
+        proposal_procedures=NonEmptyOrderedSet(
+            [ProposalProcedure(1, b"h" * 29, action, anchor) for action in gov_actions]
+        ),
+        current_treasury_value=1,
+        donation=1,
+    )
+    witness_set = TransactionWitnessSet(
+        vkey_witnesses=NonEmptyOrderedSet(
+            [VerificationKeyWitness(signing_key.to_verification_key(), b"i" * 64)]
+        ),
+        native_scripts=NonEmptyOrderedSet([native_script]),
+        plutus_v1_script=NonEmptyOrderedSet([PlutusV1Script(b"j")]),
+        plutus_v2_script=NonEmptyOrderedSet([PlutusV2Script(b"k")]),
+        plutus_v3_script=NonEmptyOrderedSet([PlutusV3Script(b"l")]),
+        plutus_data=NonEmptyOrderedSet([datum, Unit()]),
+        redeemer=RedeemerMap(
+            {
+                RedeemerKey(RedeemerTag.MINT, 0): RedeemerValue(
+                    datum, ExecutionUnits(1, 2)
+                )
+            }
+        ),
+    )
+    transaction = Transaction(
+        body,
+        witness_set,
+        auxiliary_data=AuxiliaryData(
+            AlonzoMetadata(
+                metadata=Metadata({1: {"a": [1, b"b"]}}), native_scripts=[native_script]
+            )
+        ),
+    )
+
+    lazy_transaction = LazyTransaction.from_cbor(
+        Transaction(
+            TransactionBody(
+                inputs=OrderedSet([TransactionInput(tx_id, 0)]), outputs=outputs, fee=1
+            ),
+            TransactionWitnessSet(vkey_witnesses=witness_set.vkey_witnesses),
+            auxiliary_data=transaction.auxiliary_data,
+        ).to_cbor()
+    )
+
+    return [
+        transaction,
+        lazy_transaction.transaction_body,
+        lazy_transaction.transaction_witness_set,
+        lazy_transaction,
+        Transaction(TransactionBody(), TransactionWitnessSet(redeemer=[redeemer])),
+        AuxiliaryData(ShelleyMarryMetadata(Metadata({1: 2}), [native_script])),
+        AuxiliaryData(Metadata({1: 2})),
+        UTxO(TransactionInput(tx_id, 0), outputs[0]),
+        TransactionOutput(Address(vkh, PointerAddress(1, 2, 3), Network.TESTNET), 1),
+        _TransactionOutputLegacy(address, 1, DatumHash(b"d" * 32)),
+        CostModels({0: {"a": 1, "b": 2}}),
+        PoolId("pool1mt8sdg37f2h3rypyuc77k7vxrjshtvjw04zdjlae9vdzyt9uu34"),
+        PolicyId(b"m" * 28),
+        _TransactionOutputPostAlonzo(
+            address,
+            1,
+            _DatumOption(datum),
+            _ScriptRef(_Script(native_script)),
+        ),
+        DRep(DRepKind.ALWAYS_ABSTAIN),
+    ] + [
+        key_type.from_primitive(b"n" * size)
+        for key_type, size in [
+            (PaymentSigningKey, 32),
+            (PaymentVerificationKey, 32),
+            (PaymentExtendedSigningKey, 128),
+            (PaymentExtendedVerificationKey, 64),
+            (StakeSigningKey, 32),
+            (StakeVerificationKey, 32),
+            (StakeExtendedSigningKey, 128),
+            (StakeExtendedVerificationKey, 64),
+            (StakePoolSigningKey, 32),
+            (StakePoolVerificationKey, 32),
+        ]
+    ]
+
+
+def _all_cbor_serializable_classes():
+    import importlib
+    import inspect
+    import pkgutil
+
+    import pycardano
+
+    classes = set()
+    for module_info in pkgutil.walk_packages(pycardano.__path__, "pycardano."):
+        module = importlib.import_module(module_info.name)
+        for obj in vars(module).values():
+            if (
+                inspect.isclass(obj)
+                and issubclass(obj, CBORSerializable)
+                and obj.__module__ == module.__name__
+            ):
+                classes.add(obj)
+    return classes
+
+
+def _collect_cbor_serializables(value, collected):
+    if isinstance(value, CBORSerializable):
+        if any(value is c for c in collected):
+            return
+        collected.append(value)
+        if isinstance(value, DictCBORSerializable):
+            value = value.data
+        elif isinstance(value, OrderedSet):
+            value = list(value)
+        elif hasattr(value, "__dict__"):
+            value = vars(value)
+        else:
+            return
+    if isinstance(value, dict):
+        for k, v in value.items():
+            _collect_cbor_serializables(k, collected)
+            _collect_cbor_serializables(v, collected)
+    elif isinstance(value, (list, tuple, set, IndefiniteList)):
+        for v in value:
+            _collect_cbor_serializables(v, collected)
+    elif isinstance(value, CBORTag):
+        _collect_cbor_serializables(value.value, collected)
+
+
+def test_streaming_encoder_is_byte_identical_for_all_classes():
+    from pycardano.governance import HardForkInitiationAction
+
+    collected: List[CBORSerializable] = []
+    for sample in _encoding_samples():
+        _collect_cbor_serializables(sample, collected)
+
+    for obj in collected:
+        expected = cbor2.dumps(obj.to_validated_primitive(), default=default_encoder)
+        assert obj.to_cbor() == expected, f"{type(obj)}: {obj}"
+
+    covered = {type(obj) for obj in collected}
+    abstract = {
+        CBORSerializable,
+        ArrayCBORSerializable,
+        MapCBORSerializable,
+        DictCBORSerializable,
+        CodedSerializable,
+        # protocol_version is annotated as a Fraction but unpacked as a tuple, so it can't be validated
+        HardForkInitiationAction,
+    }
+    uncovered = {
+        cls
+        for cls in _all_cbor_serializable_classes() - covered - abstract
+        if not any(issubclass(c, cls) for c in covered)
+    }
+    assert not uncovered, sorted(c.__qualname__ for c in uncovered)
@@ -1,27 +1,52 @@
+import pickle
 import tempfile
+from copy import deepcopy
 from dataclasses import dataclass
 from fractions import Fraction
 from test.pycardano.util import check_two_way_cbor
+from unittest.mock import patch
 
+import cbor2
 import pytest
+from nacl.encoding import RawEncoder
+from nacl.hash import blake2b
 from typeguard import TypeCheckError
 
 from pycardano import ParameterChangeAction
 from pycardano.address import Address
-from pycardano.exception import InvalidDataException, InvalidOperationException
+from pycardano.exception import (
+    DeserializeException,
+    InvalidDataException,
+    InvalidOperationException,
+)
 from pycardano.hash import SCRIPT_HASH_SIZE, ScriptHash, TransactionId
 from pycardano.key import PaymentKeyPair, PaymentSigningKey, VerificationKey
 from pycardano.nativescript import ScriptPubkey
-from pycardano.plutus import PlutusData, PlutusV1Script, PlutusV2Script, datum_hash
+from pycardano.plutus import (
+    ExecutionUnits,
+    PlutusData,
+    PlutusV1Script,
+    PlutusV2Script,
+    RawPlutusData,
+    RedeemerKey,
+    RedeemerMap,
+    RedeemerTag,
+    RedeemerValue,
+    datum_hash,
+)
+from pycardano.serialization import _LazyOriginalCBOR, _OriginalCBOR
 from pycardano.transaction import (
     Asset,
     AssetName,
+    LazyTransaction,
+    LazyTransactionBody,
     MultiAsset,
     Transaction,
     TransactionBody,
     TransactionInput,
     TransactionOutput,
     Value,
+    ValueAccumulator,
 )
 from pycardano.witness import TransactionWitnessSet, VerificationKeyWitness
 
@@ -220,13 +245,11 @@ def test_full_tx():
 
 def test_transaction():
     tx_body = make_transaction_body()
-    sk = PaymentSigningKey.from_json(
-        """{
+    sk = PaymentSigningKey.from_json("""{
         "type": "GenesisUTxOSigningKey_ed25519",
         "description": "Genesis Initial UTxO Signing Key",
         "cborHex": "5820093be5cd3987d0c9fd8854ef908f7746b69e2d73320db6dc0f780d81585b84c2"
-    }"""
-    )
+    }""")
     vk = VerificationKey(PaymentKeyPair.from_signing_key(sk).verification_key.payload)
     signature = sk.sign(tx_body.hash())
     assert (
@@ -684,6 +707,83 @@ def test_add_empty_pop():
     assert len(nft_output.multi_asset[ScriptHash(policy)]) == 1
 
 
+def test_value_arithmetic_does_not_share_assets():
+    policy = b"1" * SCRIPT_HASH_SIZE
+    a = Value(10, MultiAsset.from_primitive({policy: {b"Token1": 1, b"Token2": 0}}))
+    b = Value(5, MultiAsset.from_primitive({b"2" * SCRIPT_HASH_SIZE: {b"Token1": 2}}))
+
+    total = a + b
+    assert total == Value(
+        15,
+        MultiAsset.from_primitive(
+            {policy: {b"Token1": 1}, b"2" * SCRIPT_HASH_SIZE: {b"Token1": 2}}
+        ),
+    )
+    total.multi_asset[ScriptHash(policy)][AssetName(b"Token1")] = 100
+    total.multi_asset[ScriptHash(b"2" * SCRIPT_HASH_SIZE)][AssetName(b"Token1")] = 100
+    assert a.multi_asset[ScriptHash(policy)][AssetName(b"Token1")] == 1
+    assert b.multi_asset[ScriptHash(b"2" * SCRIPT_HASH_SIZE)][AssetName(b"Token1")] == 2
+
+    multi_asset = a.multi_asset
+    a += b
+    a -= 5
+    assert a == Value(10, multi_asset + b.multi_asset)
+    assert multi_asset == MultiAsset.from_primitive({policy: {b"Token1": 1}})
+
+    asset = Asset.from_primitive({b"Token1": 1, b"Token2": 2})
+    asset += Asset.from_primitive({b"Token2": -2})
+    assert asset == Asset.from_primitive({b"Token1": 1})
+    assert asset - asset == Asset()
+
+
+def test_multi_asset_arithmetic_keeps_asset_class():
+    class MyAsset(Asset):
+        pass
+
+    policy1 = ScriptHash(b"1" * SCRIPT_HASH_SIZE)
+    policy2 = ScriptHash(b"2" * SCRIPT_HASH_SIZE)
+    a = MultiAsset({policy1: Asset({AssetName(b"Token1"): 1})})
+    b = MultiAsset({policy2: MyAsset({AssetName(b"Token2"): 2})})
+
+    # Policies only held by the right operand keep the class of their assets too
+    assert type((a + b)[policy2]) is MyAsset
+    assert type((a - b)[policy2]) is MyAsset
+    assert type((b + a)[policy1]) is Asset
+
+
+def test_value_accumulator():
+    policy1 = ScriptHash(b"1" * SCRIPT_HASH_SIZE)
+    policy2 = ScriptHash(b"2" * SCRIPT_HASH_SIZE)
+    values = [
+        Value(i, MultiAsset({policy1: Asset({AssetName(b"Token1"): i})}))
+        for i in range(10)
+    ] + [Value(5, MultiAsset({policy2: Asset({AssetName(b"Token2"): 3})})), 7]
+
+    total = ValueAccumulator()
+    for v in values:
+        total += v
+    expected = sum(values, Value())
+    assert total.to_value() == expected
+    assert total.coin == expected.coin
+    assert total.multi_asset == expected.multi_asset
+
+    # The sum is a new value
+    total.to_value().multi_asset[policy1][AssetName(b"Token1")] = 0
+    assert total.to_value() == expected
+
+    total -= MultiAsset({policy2: Asset({AssetName(b"Token2"): 3})})
+    total.add(Value(2), subtract=True)
+    assert total.to_value() == expected - Value(
+        2, MultiAsset({policy2: Asset({AssetName(b"Token2"): 3})})
+    )
+    assert policy2 not in total.multi_asset
+
+    assert ValueAccumulator(expected).to_value() == expected
+    assert repr(ValueAccumulator(1)) == "ValueAccumulator(coin=1, multi_asset={})"
+    with pytest.raises(TypeError):
+        total += "1"
+
+
 def test_decode_param_update_proposal_tx():
     # The proposal of decreasing treasury tax from 20% to 10% on mainnet
     # https://cardanoscan.io/transaction/941502b0aa104c850d197923259444d2b57cab7af18b63143775465aaacc84f5
@@ -696,6 +796,11 @@ def test_decode_param_update_proposal_tx():
     assert tx.transaction_body.proposal_procedures[
         0
     ].gov_action.protocol_param_update.treasury_growth_rate == Fraction(1, 10)
+    # The body map isn't sorted by key, the original CBOR is kept to preserve the hash
+    assert tx.id == TransactionId.from_primitive(
+        "941502b0aa104c850d197923259444d2b57cab7af18b63143775465aaacc84f5"
+    )
+    assert tx.to_cbor_hex() == tx_cbor_hex
 
 
 def test_decode_byron_transaction():
@@ -705,3 +810,215 @@ def test_decode_byron_transaction():
     assert tx.id == TransactionId.from_primitive(
         "52e274237caceb4e0916587d2b4ba19d89fb40e8e85338f9bb4f75fcec1256a2"
     )
+
+
+def _non_canonical_body_cbor() -> bytes:
+    address = Address.from_primitive(
+        "addr_test1vrm9x2zsux7va6w892g38tvchnzahvcd9tykqf3ygnmwtaqyfg52x"
+    )
+    tx_in = TransactionInput.from_primitive(
+        ["732bfd67e66be8e8288349fcaaa2294973ef6271cc189a239bb431275401b8e5", 0]
+    )
+    output = TransactionOutput(address, Value(1000000))
+    # Keys are not in the order pycardano writes them
+    return cbor2.dumps(
+        {2: 200000, 1: [output.to_primitive()], 0: [tx_in.to_primitive()]}
+    )
+
+
+def test_decoded_body_keeps_original_cbor():
+    cbor = _non_canonical_body_cbor()
+    body = TransactionBody.from_cbor(cbor)
+
+    assert body.to_cbor() == cbor
+    assert body.hash() == blake2b(cbor, 32, encoder=RawEncoder)
+    assert deepcopy(body).to_cbor() != cbor
+
+    body.fee = 100000
+    assert body.to_cbor() != cbor
+    assert TransactionBody.from_cbor(body.to_cbor()).fee == 100000
+
+
+def test_decoded_body_detects_nested_changes():
+    cbor = _non_canonical_body_cbor()
+
+    body = TransactionBody.from_cbor(cbor)
+    body.outputs[0].amount.coin += 1
+    assert TransactionBody.from_cbor(body.to_cbor()).outputs[0].amount.coin == 1000001
+
+    body = TransactionBody.from_cbor(cbor)
+    body.outputs.append(body.outputs[0])
+    assert len(TransactionBody.from_cbor(body.to_cbor()).outputs) == 2
+
+    body = TransactionBody.from_cbor(cbor)
+    body.inputs[0].index = 1
+    assert TransactionBody.from_cbor(body.to_cbor()).inputs[0].index == 1
+
+    # Indexing the inputs doesn't change them
+    body = TransactionBody.from_cbor(cbor)
+    assert body.inputs[0].index == 0
+    assert body.to_cbor() == cbor
+    body.inputs.remove(body.inputs[0])
+    assert len(TransactionBody.from_cbor(body.to_cbor()).inputs) == 0
+
+
+def test_decoded_objects_checked_once_per_encoding():
+    body = TransactionBody.from_cbor(_non_canonical_body_cbor())
+    body.outputs = [
+        TransactionOutput(body.outputs[0].address, Value(i)) for i in range(1, 4)
+    ]
+    body = TransactionBody.from_cbor(body.to_cbor())
+    body.outputs[2].amount.coin += 1
+
+    checked = []
+
+    def counted(cls):
+        is_valid_for = cls.is_valid_for
+
+        def counting(self, obj):
+            checked.append(obj)
+            return is_valid_for(self, obj)
+
+        return patch.object(cls, "is_valid_for", counting)
+
+    with counted(_OriginalCBOR), counted(_LazyOriginalCBOR):
+        cbor = body.to_cbor()
+
+    assert TransactionBody.from_cbor(cbor).outputs[2].amount.coin == 4
+    # The outputs checked along with the body are not checked again when the body is serialized
+    assert len(checked) == len({id(obj) for obj in checked}) == 4
+
+
+@pytest.mark.parametrize("cls", [Transaction, LazyTransaction])
+def test_decoded_transaction_redeemer_key_changed_in_place(cls):
+    body = TransactionBody.from_cbor(_non_canonical_body_cbor())
+    witness_set = TransactionWitnessSet(
+        redeemer=RedeemerMap(
+            {
+                RedeemerKey(RedeemerTag.SPEND, 0): RedeemerValue(
+                    42, ExecutionUnits(1000, 2000)
+                )
+            }
+        )
+    )
+    tx = cls.from_cbor(Transaction(body, witness_set).to_cbor())
+
+    [key] = tx.transaction_witness_set.redeemer
+    key.index = 5
+
+    [decoded] = Transaction.from_cbor(tx.to_cbor()).transaction_witness_set.redeemer
+    assert decoded.index == 5
+
+
+def test_decoded_transaction_keeps_body_cbor():
+    body_cbor = _non_canonical_body_cbor()
+    cbor = b"\x84" + body_cbor + b"\xa0\xf5\xf6"
+    tx = Transaction.from_cbor(cbor)
+    assert tx.to_cbor() == cbor
+
+    sk = PaymentSigningKey.generate()
+    tx_id = tx.id
+    tx.transaction_witness_set.vkey_witnesses = [
+        VerificationKeyWitness(sk.to_verification_key(), sk.sign(tx_id.payload))
+    ]
+    signed = tx.to_cbor()
+
+    assert signed != cbor
+    assert signed[1 : 1 + len(body_cbor)] == body_cbor
+    assert Transaction.from_cbor(signed).id == tx_id
+
+
+def test_decoded_inline_datum_keeps_original_cbor():
+    # Definite-length fields, RawPlutusData would write them as an indefinite-length array
+    datum_cbor = cbor2.dumps(cbor2.CBORTag(121, [1, b"test"]))
+    assert RawPlutusData.from_cbor(datum_cbor).to_cbor() == datum_cbor
+
+    address = Address.from_primitive(
+        "addr_test1vrm9x2zsux7va6w892g38tvchnzahvcd9tykqf3ygnmwtaqyfg52x"
+    )
+    cbor = cbor2.dumps(
+        {0: address.to_primitive(), 1: 1000000, 2: [1, cbor2.CBORTag(24, datum_cbor)]}
+    )
+    output = TransactionOutput.from_cbor(cbor)
+    assert output.to_cbor() == cbor
+    assert datum_hash(output.datum) == datum_hash(RawPlutusData.from_cbor(datum_cbor))
+
+    output.amount.coin = 2000000
+    restored = TransactionOutput.from_cbor(output.to_cbor())
+    assert restored.amount.coin == 2000000
+    assert restored.datum.to_cbor() == datum_cbor
+
+
+def test_lazy_transaction_decodes_fields_on_access():
+    body_cbor = _non_canonical_body_cbor()
+    cbor = b"\x84" + body_cbor + b"\xa0\xf5\xf6"
+    tx = LazyTransaction.from_cbor(cbor)
+
+    assert isinstance(tx, Transaction)
+    assert vars(tx) == {}
+    assert tx.id == TransactionId(blake2b(body_cbor, 32, encoder=RawEncoder))
+    assert isinstance(tx.transaction_body, LazyTransactionBody)
+    assert vars(tx.transaction_body) == {}
+
+    assert tx.transaction_body.fee == 200000
+    assert list(vars(tx.transaction_body)) == ["fee"]
+    assert tx.transaction_body.ttl is None
+    assert tx.to_cbor() == cbor
+
+    eager = Transaction.from_cbor(cbor)
+    assert tx == eager
+    assert eager == tx
+    assert repr(tx) == repr(eager)
+
+
+def test_lazy_transaction_detects_changes():
+    body_cbor = _non_canonical_body_cbor()
+    cbor = b"\x84" + body_cbor + b"\xa0\xf5\xf6"
+
+    tx = LazyTransaction.from_cbor(cbor)
+    sk = PaymentSigningKey.generate()
+    tx_id = tx.id
+    tx.transaction_witness_set.vkey_witnesses = [
+        VerificationKeyWitness(sk.to_verification_key(), sk.sign(tx_id.payload))
+    ]
+    signed = tx.to_cbor()
+    assert signed[1 : 1 + len(body_cbor)] == body_cbor
+    assert LazyTransaction.from_cbor(signed).id == tx_id
+
+    tx = LazyTransaction.from_cbor(cbor)
+    tx.transaction_body.outputs[0].amount.coin += 1
+    assert tx.id != tx_id
+    assert Transaction.from_cbor(tx.to_cbor()).transaction_body.outputs[
+        0
+    ].amount == Value(1000001)
+
+    tx = LazyTransaction.from_cbor(cbor)
+    tx.transaction_body.fee = 100000
+    assert Transaction.from_cbor(tx.to_cbor()).transaction_body.fee == 100000
+
+
+def test_lazy_transaction_copies():
+    cbor = b"\x84" + _non_canonical_body_cbor() + b"\xa0\xf5\xf6"
+    tx = LazyTransaction.from_cbor(cbor)
+    tx_id = tx.id
+
+    copied = deepcopy(tx)
+    assert copied == tx
+    copied.transaction_body.fee = 1
+    assert tx.transaction_body.fee == 200000
+    assert tx.id == tx_id
+
+    restored = pickle.loads(pickle.dumps(LazyTransaction.from_cbor(cbor)))
+    assert restored == tx
+    assert restored.id == tx_id
+
+
+def test_lazy_transaction_invalid_cbor():
+    with pytest.raises(DeserializeException):
+        LazyTransaction.from_cbor(cbor2.dumps({0: 1}))
+    with pytest.raises(DeserializeException):
+        LazyTransaction.from_cbor(b"\x84\xa0")
+
+    tx = LazyTransaction.from_cbor(cbor2.dumps([{99: 1}, {}, True, None]))
+    with pytest.raises(DeserializeException):
+        tx.transaction_body.fee
@@ -1,3 +1,4 @@
+import asyncio
 import copy
 import logging
 from dataclasses import replace
@@ -11,7 +12,9 @@ from cbor2 import CBORTag
 from frozenlist import FrozenList
 
 from pycardano import (
+    Asset,
     AssetName,
+    AsyncChainContextAdapter,
     RedeemerKey,
     RedeemerMap,
     RedeemerValue,
@@ -24,10 +27,15 @@ from pycardano.certificate import (
     StakeDelegation,
     StakeRegistration,
 )
-from pycardano.coinselection import RandomImproveMultiAsset
+from pycardano.coinselection import (
+    BranchAndBoundSelector,
+    RandomImproveMultiAsset,
+    UTxOPool,
+)
 from pycardano.exception import (
     InsufficientUTxOBalanceException,
     InvalidArgumentException,
+    InvalidDataException,
     InvalidTransactionException,
     UTxOSelectionException,
 )
@@ -40,7 +48,7 @@ from pycardano.hash import (
     VerificationKeyHash,
 )
 from pycardano.key import VerificationKey
-from pycardano.metadata import AuxiliaryData
+from pycardano.metadata import AuxiliaryData, Metadata
 from pycardano.nativescript import (
     InvalidBefore,
     InvalidHereAfter,
@@ -67,7 +75,7 @@ from pycardano.transaction import (
     Value,
     Withdrawals,
 )
-from pycardano.txbuilder import TransactionBuilder
+from pycardano.txbuilder import BatchTransactionBuilder, TransactionBuilder
 from pycardano.utils import fee
 from pycardano.witness import TransactionWitnessSet, VerificationKeyWitness
 
@@ -105,6 +113,72 @@ def test_tx_builder(chain_context):
     assert expected == tx_body.to_primitive()
 
 
+def test_tx_builder_build_async(chain_context):
+    sender = "addr_test1vrm9x2zsux7va6w892g38tvchnzahvcd9tykqf3ygnmwtaqyfg52x"
+    sender_address = Address.from_primitive(sender)
+
+    def tx_builder(context):
+        builder = TransactionBuilder(context, [RandomImproveMultiAsset([0, 0])])
+        builder.add_input_address(sender).add_output(
+            TransactionOutput.from_primitive([sender, 500000])
+        )
+        return builder
+
+    async_context = AsyncChainContextAdapter(chain_context)
+    async_builder = tx_builder(async_context)
+
+    async def build():
+        # The same builder can be built concurrently
+        return await asyncio.gather(
+            async_builder.build_async(change_address=sender_address),
+            async_builder.build_async(change_address=sender_address),
+            tx_builder(chain_context).build_async(change_address=sender_address),
+        )
+
+    expected_builder = tx_builder(chain_context)
+    expected = expected_builder.build(change_address=sender_address)
+    assert asyncio.run(build()) == [expected, expected, expected]
+    assert async_builder.context is async_context
+    # The builder is left in the state of the built transaction, like with build
+    assert async_builder.inputs == expected_builder.inputs
+    assert async_builder.fee == expected_builder.fee
+
+
+def test_tx_builder_build_async_cancelled(chain_context):
+    sender = "addr_test1vrm9x2zsux7va6w892g38tvchnzahvcd9tykqf3ygnmwtaqyfg52x"
+    sender_address = Address.from_primitive(sender)
+
+    class BlockingContext(AsyncChainContextAdapter):
+        querying: asyncio.Event
+
+        async def last_block_slot(self):
+            self.querying.set()
+            await asyncio.Event().wait()
+
+    context = BlockingContext(chain_context)
+    builder = TransactionBuilder(context, [RandomImproveMultiAsset([0, 0])])
+    builder.add_input_address(sender).add_output(
+        TransactionOutput.from_primitive([sender, 500000])
+    )
+
+    async def build():
+        context.querying = asyncio.Event()
+        build = asyncio.create_task(
+            builder.build_async(change_address=sender_address, auto_ttl_offset=1000)
+        )
+        # Cancel the build while it queries the context from the executor
+        await context.querying.wait()
+        build.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await build
+
+    asyncio.run(build())
+
+    assert builder.context is context
+    assert builder.inputs == []
+    assert builder.ttl is None
+
+
 def test_tx_builder_no_change(chain_context):
     tx_builder = TransactionBuilder(chain_context, [RandomImproveMultiAsset([0, 0])])
     sender = "addr_test1vrm9x2zsux7va6w892g38tvchnzahvcd9tykqf3ygnmwtaqyfg52x"
@@ -182,6 +256,94 @@ def test_tx_builder_with_potential_inputs(chain_context):
     assert len(tx_body.inputs) < len(tx_builder.potential_inputs)
 
 
+def test_tx_builder_excluded_potential_inputs(chain_context):
+    tx_builder = TransactionBuilder(chain_context, [RandomImproveMultiAsset([0, 0])])
+    sender = "addr_test1vrm9x2zsux7va6w892g38tvchnzahvcd9tykqf3ygnmwtaqyfg52x"
+    sender_address = Address.from_primitive(sender)
+    excluded, available = chain_context.utxos(sender)
+
+    # Excluded inputs are never selected, even when they are potential inputs
+    tx_builder.potential_inputs.extend([excluded, available])
+    tx_builder.excluded_inputs.append(excluded)
+    tx_builder.add_output(TransactionOutput.from_primitive([sender, 500000]))
+
+    tx_body = tx_builder.build(change_address=sender_address)
+
+    assert tx_body.inputs == [available.input]
+
+
+def test_tx_builder_selected_potential_inputs(chain_context):
+    tx_builder = TransactionBuilder(chain_context, [RandomImproveMultiAsset([0, 0])])
+    sender = "addr_test1vrm9x2zsux7va6w892g38tvchnzahvcd9tykqf3ygnmwtaqyfg52x"
+    sender_address = Address.from_primitive(sender)
+    utxos = chain_context.utxos(sender)
+
+    # A potential input that is also added as an input is only spent once
+    tx_builder.add_input(utxos[0])
+    tx_builder.potential_inputs.extend(utxos)
+    tx_builder.add_output(TransactionOutput.from_primitive([sender, 8_000_000]))
+
+    tx_body = tx_builder.build(change_address=sender_address)
+
+    assert len(tx_body.inputs) == 2
+    assert set(tx_body.inputs) == {u.input for u in utxos}
+
+
+def test_tx_builder_random_improve_many_addresses(chain_context):
+    utxos = [
+        UTxO(
+            TransactionInput(TransactionId(bytes([i]) * 32), 0),
+            TransactionOutput(Address(VerificationKeyHash(bytes([i]) * 28)), 3_000_000),
+        )
+        for i in range(60)
+    ]
+    tx_builder = TransactionBuilder(chain_context, [RandomImproveMultiAsset()])
+    tx_builder.potential_inputs.extend(utxos)
+    tx_builder.add_output(
+        TransactionOutput(Address(VerificationKeyHash(b"9" * 28)), 5_000_000)
+    )
+    tx_body = tx_builder.build(change_address=Address(VerificationKeyHash(b"8" * 28)))
+
+    # The request is not raised by the fee of the witnesses of every address in the pool
+    assert len(tx_body.inputs) == 3
+    assert tx_body.fee == 177733
+
+
+def test_tx_builder_changeless_selection(chain_context):
+    sender = "addr_test1vrm9x2zsux7va6w892g38tvchnzahvcd9tykqf3ygnmwtaqyfg52x"
+    sender_address = Address.from_primitive(sender)
+    utxos = [
+        UTxO(
+            TransactionInput.from_primitive([bytes([i]) * 32, 0]),
+            TransactionOutput.from_primitive([sender, ada * 1_000_000]),
+        )
+        for i, ada in enumerate([5, 4, 3])
+    ]
+
+    # The fee of the transaction spending the UTxOs of 5 and 3 ADA without change output
+    fee = (
+        TransactionBuilder(chain_context)
+        .add_input(utxos[0])
+        .add_input(utxos[2])
+        .add_output(TransactionOutput.from_primitive([sender, 7_000_000]))
+        .build()
+        .fee
+    )
+
+    tx_builder = TransactionBuilder(
+        chain_context, [BranchAndBoundSelector(fallbacks=[])]
+    )
+    tx_builder.potential_inputs.extend(utxos)
+    tx_builder.add_output(
+        TransactionOutput.from_primitive([sender, 8_000_000 - fee - 1000])
+    )
+    tx_body = tx_builder.build(change_address=sender_address)
+
+    assert set(tx_body.inputs) == {utxos[0].input, utxos[2].input}
+    assert len(tx_body.outputs) == 1
+    assert tx_body.fee == fee + 1000
+
+
 def test_tx_builder_multi_asset(chain_context):
     tx_builder = TransactionBuilder(chain_context)
     sender = "addr_test1vrm9x2zsux7va6w892g38tvchnzahvcd9tykqf3ygnmwtaqyfg52x"
@@ -557,6 +719,82 @@ def test_tx_add_change_split_nfts_not_enough_add(chain_context):
         tx_builder.build(change_address=sender_address)
 
 
+def test_pack_tokens_for_change(chain_context):
+    sender_address = Address.from_primitive(
+        "addr_test1vrm9x2zsux7va6w892g38tvchnzahvcd9tykqf3ygnmwtaqyfg52x"
+    )
+    change = Value(
+        5000000,
+        MultiAsset(
+            {
+                ScriptHash(bytes([p]) * 28): Asset(
+                    {AssetName(b"NFT%d" % i): 1 for i in range(100)}
+                )
+                for p in range(5)
+            }
+        ),
+    )
+    max_val_size = 500
+
+    def value_size(multi_asset):
+        value = Value(0, multi_asset)
+        value.coin = min_lovelace_post_alonzo(
+            TransactionOutput(sender_address, value), chain_context
+        )
+        return len(value.to_cbor())
+
+    packed = TransactionBuilder(chain_context)._pack_tokens_for_change(
+        sender_address, change, max_val_size
+    )
+
+    # All assets are packed, in order, and each group fits in a change output
+    assert len(packed) > 1
+    assert [
+        (p, n, v) for ma in packed for p, asset in ma.items() for n, v in asset.items()
+    ] == [
+        (p, n, v) for p, asset in change.multi_asset.items() for n, v in asset.items()
+    ]
+    assert all(value_size(ma) <= max_val_size for ma in packed)
+
+    # A new group is only started when the first asset of the group doesn't fit in the previous one
+    for ma, next_ma in zip(packed, packed[1:]):
+        policy_id, asset = next(iter(next_ma.items()))
+        asset_name, amount = next(iter(asset.items()))
+        extended = ma + MultiAsset({policy_id: Asset({asset_name: amount})})
+        assert value_size(extended) > max_val_size
+
+
+def test_pack_tokens_for_change_min_lovelace(chain_context):
+    sender_address = Address.from_primitive(
+        "addr_test1vrm9x2zsux7va6w892g38tvchnzahvcd9tykqf3ygnmwtaqyfg52x"
+    )
+    change = Value(
+        5000000,
+        MultiAsset(
+            {
+                ScriptHash(bytes([p]) * 28): Asset(
+                    {AssetName(b"NFT%d" % i): 1 for i in range(20)}
+                )
+                for p in range(2)
+            }
+        ),
+    )
+    # All assets fit in one output, with 2 bytes to spare
+    max_val_size = len(Value(2**32 - 1, change.multi_asset).to_cbor()) + 2
+
+    def pack():
+        return TransactionBuilder(chain_context)._pack_tokens_for_change(
+            sender_address, change, max_val_size
+        )
+
+    # Outputs requiring more than 2^32 lovelace take 4 more bytes to hold it, so fewer assets fit in each of them
+    with patch("pycardano.txbuilder.min_lovelace_post_alonzo", return_value=2**32):
+        packed = pack()
+    assert len(pack()) == 1
+    assert len(packed) == 2
+    assert all(len(Value(2**32, ma).to_cbor()) <= max_val_size for ma in packed)
+
+
 def test_not_enough_input_amount(chain_context):
     tx_builder = TransactionBuilder(chain_context)
     sender = "addr_test1vrm9x2zsux7va6w892g38tvchnzahvcd9tykqf3ygnmwtaqyfg52x"
@@ -1404,6 +1642,74 @@ def test_estimate_execution_unit(chain_context):
     assert [plutus_script] == witness.plutus_v1_script
 
 
+def test_estimate_execution_unit_cached(chain_context):
+    tx_in1 = TransactionInput.from_primitive(
+        ["18cbe6cadecd3f89b60e08e68e5e6c7d72d730aaa1ad21431590f7e6643438ef", 0]
+    )
+    plutus_script = PlutusV1Script(b"dummy test script")
+    script_address = Address(plutus_script_hash(plutus_script))
+    datum = PlutusData()
+    utxo1 = UTxO(
+        tx_in1, TransactionOutput(script_address, 10000000, datum_hash=datum.hash())
+    )
+    receiver = Address.from_primitive(
+        "addr_test1vrm9x2zsux7va6w892g38tvchnzahvcd9tykqf3ygnmwtaqyfg52x"
+    )
+
+    def build():
+        tx_builder = TransactionBuilder(chain_context)
+        tx_builder.add_script_input(utxo1, plutus_script, datum, Redeemer(PlutusData()))
+        tx_builder.add_output(TransactionOutput(receiver, 5000000))
+        tx_body = tx_builder.build(change_address=receiver, merge_change=True)
+        return tx_body, tx_builder.redeemers()
+
+    with patch.object(
+        chain_context, "evaluate_tx_cbor", wraps=chain_context.evaluate_tx_cbor
+    ) as evaluate_tx_cbor:
+        tx_body1, redeemers1 = build()
+        tx_body2, redeemers2 = build()
+
+    # The transaction built to evaluate execution units is only evaluated once
+    assert evaluate_tx_cbor.call_count == 1
+    assert tx_body1 == tx_body2
+    assert redeemers1 == redeemers2
+
+    # The change is only merged once into the output
+    assert len(tx_body1.outputs) == 1
+    assert tx_body1.outputs[0].lovelace + tx_body1.fee == 10000000
+
+
+def test_estimate_execution_unit_build_async(chain_context):
+    tx_in1 = TransactionInput.from_primitive(
+        ["18cbe6cadecd3f89b60e08e68e5e6c7d72d730aaa1ad21431590f7e6643438ef", 0]
+    )
+    plutus_script = PlutusV1Script(b"dummy test script")
+    script_address = Address(plutus_script_hash(plutus_script))
+    datum = PlutusData()
+    utxo1 = UTxO(
+        tx_in1, TransactionOutput(script_address, 10000000, datum_hash=datum.hash())
+    )
+    receiver = Address.from_primitive(
+        "addr_test1vrm9x2zsux7va6w892g38tvchnzahvcd9tykqf3ygnmwtaqyfg52x"
+    )
+    redeemer1 = Redeemer(PlutusData())
+    tx_builder = TransactionBuilder(AsyncChainContextAdapter(chain_context))
+    tx_builder.add_script_input(utxo1, plutus_script, datum, redeemer1)
+    tx_builder.add_output(TransactionOutput(receiver, 5000000))
+
+    # Building a copy of the builder leaves its redeemers unchanged
+    copied_builder = tx_builder._copy()
+    copied_builder.context = chain_context
+    copied_builder.build(change_address=receiver)
+    assert redeemer1.ex_units == ExecutionUnits(0, 0)
+    assert copied_builder._redeemer_list[0].ex_units != ExecutionUnits(0, 0)
+
+    # Like build, build_async sets the redeemers of the builder
+    asyncio.run(tx_builder.build_async(change_address=receiver))
+    assert redeemer1.ex_units == copied_builder._redeemer_list[0].ex_units
+    assert tx_builder._redeemer_list[0] is redeemer1
+
+
 def test_add_script_input_inline_datum_extra(chain_context):
     tx_builder = TransactionBuilder(chain_context)
     tx_in1 = TransactionInput.from_primitive(
@@ -2828,6 +3134,58 @@ def test_fee_buffer_increases_fee(chain_context):
     assert tx_body2.fee >= tx_body1.fee + 50_000
 
 
+def test_fee_estimation_tx_size(chain_context):
+    """Test that the size of fake transactions is tracked incrementally across fee estimations."""
+    tx_builder = TransactionBuilder(chain_context)
+    plutus_script = PlutusV2Script(b"dummy test script")
+    script_address = Address(plutus_script_hash(plutus_script))
+    datum = PlutusData()
+    utxo = UTxO(
+        TransactionInput.from_primitive([b"1" * 32, 0]),
+        TransactionOutput(script_address, 100_000_000, datum_hash=datum.hash()),
+    )
+    receiver = Address.from_primitive(
+        "addr_test1vrm9x2zsux7va6w892g38tvchnzahvcd9tykqf3ygnmwtaqyfg52x"
+    )
+    tx_builder.add_script_input(
+        utxo, plutus_script, datum, Redeemer(PlutusData(), ExecutionUnits(1000, 1000))
+    )
+    tx_builder.add_output(TransactionOutput(receiver, 5_000_000))
+    tx_builder.auxiliary_data = AuxiliaryData(Metadata({1: "payout"}))
+    tx_builder.required_signers = [receiver.payment_part]
+    tx_builder.build(change_address=receiver)
+
+    tx = tx_builder._build_full_fake_tx()
+    assert tx_builder._fake_tx_size() == len(tx.to_cbor())
+
+    # Components changed in place are encoded again
+    tx_builder.outputs[0].amount.coin = 5_000_000_000
+    tx_builder.outputs[1].amount.multi_asset = MultiAsset.from_primitive(
+        {b"1" * 28: {b"Token": 1}}
+    )
+    tx_builder.add_output(TransactionOutput(receiver, 2_000_000))
+    tx_builder.witness_override = 3
+    tx = tx_builder._build_full_fake_tx()
+    assert tx_builder._fake_tx_size() == len(tx.to_cbor())
+
+    # Copies of the builder don't share the sizes
+    tx_builder_copy = copy.deepcopy(tx_builder)
+    tx_builder_copy.outputs[0].amount.coin = 0
+    assert tx_builder._fake_tx_size() == len(tx.to_cbor())
+    assert tx_builder_copy._fake_tx_size() == len(
+        tx_builder_copy._build_full_fake_tx().to_cbor()
+    )
+
+    tx_builder.mint = MultiAsset.from_primitive({b"1" * 28: {b"Token": 2**64}})
+    with pytest.raises(InvalidDataException):
+        tx_builder._fake_tx_size()
+
+    chain_context.protocol_param = replace(chain_context.protocol_param, max_tx_size=10)
+    tx_builder.mint = None
+    with pytest.raises(InvalidTransactionException):
+        tx_builder._fake_tx_size()
+
+
 def test_datum_hash_mismatch(chain_context):
     """Test that adding script input with mismatched datum hash raises exception."""
     tx_builder = TransactionBuilder(chain_context)
@@ -3166,3 +3524,126 @@ def test_inline_datum_error(chain_context):
         tx_builder.add_script_input(utxo, plutus_script, different_datum, redeemer)
 
     assert "Inline Datum found" in str(exc_info.value)
+
+
+def _payouts(count, amount=2_000_000):
+    return [
+        TransactionOutput(
+            Address(VerificationKeyHash(i.to_bytes(28, "big"))), amount + i
+        )
+        for i in range(count)
+    ]
+
+
+def test_batch_builder(chain_context):
+    sender = Address(SK.to_verification_key().hash())
+    pool = UTxOPool(
+        UTxO(
+            TransactionInput(TransactionId(i.to_bytes(32, "big")), 0),
+            TransactionOutput(sender, 50_000_000),
+        )
+        for i in range(100)
+    )
+    outputs = _payouts(1000)
+    batch_builder = BatchTransactionBuilder(chain_context, pool, sender)
+    txs = list(batch_builder.build_and_sign(outputs, [SK]))
+
+    max_tx_size = chain_context.protocol_param.max_tx_size
+    paid = []
+    change = None
+    for tx in txs:
+        body = tx.transaction_body
+        size = len(tx.to_cbor())
+        assert size <= max_tx_size
+        if tx is not txs[-1]:
+            # Packed close to the max size
+            assert size > max_tx_size - 100
+
+        # Each transaction spends the change of the previous one
+        spent = [u for u in pool._utxos.values() if u.input in body.inputs]
+        if change is not None:
+            assert change.input in body.inputs
+            spent.append(change)
+        assert len(spent) == len(body.inputs)
+        assert all(u not in pool for u in spent)
+        assert sum(u.output.lovelace for u in spent) == body.fee + sum(
+            o.lovelace for o in body.outputs
+        )
+        assert body.fee >= fee(chain_context, size)
+
+        paid += body.outputs[:-1]
+        change = UTxO(
+            TransactionInput(body.id, len(body.outputs) - 1), body.outputs[-1]
+        )
+        assert change.output.address == sender
+
+    assert paid == outputs
+    assert batch_builder.change == change
+
+
+def test_batch_builder_native_assets(chain_context):
+    sender = Address(SK.to_verification_key().hash())
+    policy_id = ScriptHash(b"1" * 28)
+    utxos = [
+        UTxO(
+            TransactionInput(TransactionId(i.to_bytes(32, "big")), 0),
+            TransactionOutput(
+                sender,
+                Value(
+                    5_000_000,
+                    MultiAsset.from_primitive(
+                        {policy_id.payload: {b"Token" + bytes([i]): 100}}
+                    ),
+                ),
+            ),
+        )
+        for i in range(3)
+    ] + [
+        UTxO(
+            TransactionInput(TransactionId(i.to_bytes(32, "big")), 1),
+            TransactionOutput(sender, 100_000_000),
+        )
+        for i in range(5)
+    ]
+    outputs = [
+        TransactionOutput(
+            Address(VerificationKeyHash(i.to_bytes(28, "big"))),
+            Value(
+                2_000_000,
+                MultiAsset.from_primitive(
+                    {policy_id.payload: {b"Token" + bytes([i % 3]): 10}}
+                ),
+            ),
+        )
+        for i in range(15)
+    ]
+    txs = list(BatchTransactionBuilder(chain_context, utxos, sender).build(outputs))
+
+    assert len(txs) == 1
+    body = txs[0]
+    assert body.outputs[:-1] == outputs
+    # All token UTxOs are spent, and the tokens not paid are returned as change
+    assert set(u.input for u in utxos[:3]) <= set(body.inputs)
+    assert body.outputs[-1].amount.multi_asset == MultiAsset.from_primitive(
+        {policy_id.payload: {b"Token" + bytes([i]): 100 - 5 * 10 for i in range(3)}}
+    )
+
+
+def test_batch_builder_insufficient_balance(chain_context):
+    sender = Address(SK.to_verification_key().hash())
+    utxos = [
+        UTxO(
+            TransactionInput(TransactionId(i.to_bytes(32, "big")), 0),
+            TransactionOutput(sender, 10_000_000),
+        )
+        for i in range(3)
+    ]
+    txs = BatchTransactionBuilder(chain_context, utxos, sender, max_tx_size=1000).build(
+        _payouts(20)
+    )
+
+    # Transactions funded by the pool are still built
+    body = next(txs)
+    assert len(body.outputs) > 2
+    with pytest.raises(InsufficientUTxOBalanceException):
+        list(txs)
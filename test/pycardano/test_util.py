@@ -1,13 +1,26 @@
+import random
 from test.pycardano.util import chain_context
 
 import pytest
 
 from pycardano import NonEmptyOrderedSet
-from pycardano.hash import SCRIPT_HASH_SIZE, ScriptDataHash
+from pycardano.address import Address, PointerAddress
+from pycardano.hash import (
+    SCRIPT_HASH_SIZE,
+    DatumHash,
+    ScriptDataHash,
+    ScriptHash,
+    VerificationKeyHash,
+)
+from pycardano.nativescript import InvalidHereAfter, ScriptAll, ScriptPubkey
 from pycardano.plutus import (
     COST_MODELS,
     ExecutionUnits,
     PlutusData,
+    PlutusV1Script,
+    PlutusV2Script,
+    PlutusV3Script,
+    RawPlutusData,
     Redeemer,
     RedeemerKey,
     RedeemerMap,
@@ -15,8 +28,15 @@ from pycardano.plutus import (
     RedeemerValue,
     Unit,
 )
-from pycardano.transaction import Value
+from pycardano.transaction import (
+    Asset,
+    AssetName,
+    MultiAsset,
+    TransactionOutput,
+    Value,
+)
 from pycardano.utils import (
+    min_lovelace_post_alonzo,
     min_lovelace_pre_alonzo,
     script_data_hash,
     tiered_reference_script_fee,
@@ -162,6 +182,90 @@ class TestMinLoveLaceMultiAsset:
         assert min_lovelace_pre_alonzo(amount, chain_context, True) == 1827546
 
 
+def _random_output(rng: random.Random) -> TransactionOutput:
+    def random_int():
+        value = rng.choice([0, 1, 23, 24, 255, 256, 65535, 65536, 2**32, 2**64 - 1])
+        return value - rng.choice([0, 1]) if value > 1 else value
+
+    def random_bytes(max_size):
+        return rng.randbytes(rng.choice([0, 1, 23, 24, max_size]))
+
+    address = rng.choice(
+        [
+            Address(VerificationKeyHash(b"1" * 28)),
+            Address(ScriptHash(b"1" * 28), VerificationKeyHash(b"2" * 28)),
+            Address(
+                VerificationKeyHash(b"1" * 28), PointerAddress(random_int(), 2**40, 1)
+            ),
+            Address.from_primitive(
+                "DdzFFzCqrhsxrgB6w6VhgfAqUZ69Va583murc21S4QFTJ6WUHAh4Gk8t1QHofpza5MZxG4dNVQWe8q78h4Utp9MGBQHBLD54rz6CTLsm"
+            ),
+        ]
+    )
+    multi_asset = MultiAsset(
+        {
+            ScriptHash(rng.randbytes(28)): Asset(
+                {
+                    AssetName(random_bytes(32)): random_int()
+                    for _ in range(rng.randint(0, 10))
+                }
+            )
+            for _ in range(rng.choice([0, 1, 2, 10]))
+        }
+    )
+    datum = rng.choice(
+        [
+            None,
+            Unit(),
+            RawPlutusData(random_bytes(300)),
+            random_int(),
+            random_bytes(300),
+        ]
+    )
+    datum_hash = rng.choice([None, DatumHash(rng.randbytes(32))])
+    script = rng.choice(
+        [
+            None,
+            PlutusV1Script(random_bytes(300)),
+            PlutusV2Script(random_bytes(65536)),
+            PlutusV3Script(random_bytes(300)),
+            ScriptAll(
+                [ScriptPubkey(VerificationKeyHash(b"1" * 28)), InvalidHereAfter(100)]
+            ),
+        ]
+    )
+    return TransactionOutput(
+        address,
+        Value(random_int(), multi_asset),
+        datum_hash=datum_hash,
+        datum=datum,
+        script=script,
+    )
+
+
+def test_min_lovelace_post_alonzo_matches_serialized_size(chain_context):
+    rng = random.Random(42)
+    for _ in range(300):
+        output = _random_output(rng)
+        coin = output.amount.coin
+        # Outputs without ADA are sized as if they held 1 ADA
+        serialized = TransactionOutput(
+            output.address,
+            Value(coin or 1000000, output.amount.multi_asset),
+            datum_hash=output.datum_hash,
+            datum=output.datum,
+            script=output.script,
+            post_alonzo=True,
+        )
+        expected = (
+            160 + len(serialized.to_cbor())
+        ) * chain_context.protocol_param.coins_per_utxo_byte
+
+        assert min_lovelace_post_alonzo(output, chain_context) == expected
+        # The output is left unchanged
+        assert output.amount.coin == coin
+
+
 def test_script_data_hash():
     unit = Unit()
     redeemers = [Redeemer(unit, ExecutionUnits(1000000, 1000000))]